@@ -8,52 +8,63 @@ import sys
 import json
 import time
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
+
+import yaml
 
 # 프로젝트 루트를 Python 경로에 추가
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from core.multimodal_processor import MultimodalProcessor
-from core.metadata_extractor import MetadataExtractor  
 from core.vector_engine import VectorEngine
+from core.ingestion_pipeline import IngestionPipeline
+from core.index_manifest import IndexManifest
 
-def find_remaining_documents():
-    """처리되지 않은 문서들을 찾기"""
-    documents_dir = "data/documents"
-    processed_dir = "data/processed"
-    
-    # 모든 PDF 파일 찾기
-    all_pdfs = []
-    for file_name in os.listdir(documents_dir):
-        if file_name.endswith('.pdf') and not file_name.endswith('.pdf:Zone.Identifier'):
-            all_pdfs.append(os.path.join(documents_dir, file_name))
-    
-    # 이미 처리된 문서 ID 찾기
-    processed_ids = set()
-    if os.path.exists(processed_dir):
-        for file_name in os.listdir(processed_dir):
-            if file_name.endswith('_processed.json'):
-                doc_id = file_name.replace('_processed.json', '')
-                processed_ids.add(doc_id)
-    
-    # 미처리 문서 필터링
-    remaining_files = []
-    for pdf_path in all_pdfs:
-        doc_name = os.path.basename(pdf_path)
-        doc_id = doc_name.replace('.pdf', '')
-        if doc_id not in processed_ids:
-            remaining_files.append(pdf_path)
-    
-    return sorted(remaining_files)
+DOCUMENTS_DIR = "data/documents"
+CONFIG_PATH = "config/config.yaml"
 
-def process_documents_batch(pdf_files: List[str], start_idx: int = 0, batch_size: int = 5):
-    """문서들을 배치로 처리"""
-    
-    # 컴포넌트 초기화
-    multimodal_processor = MultimodalProcessor()
-    metadata_extractor = MetadataExtractor()
+def load_config(config_path: str = CONFIG_PATH) -> Dict[str, Any]:
+    """설정 파일 로드 (없으면 빈 설정)"""
+    if not Path(config_path).exists():
+        return {}
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+def find_remaining_documents(manifest: IndexManifest = None):
+    """새로 추가되었거나 내용이 바뀐 문서들을 찾기 (매니페스트 지문 비교)"""
+    manifest = manifest or IndexManifest()
+    diff = manifest.diff_directory(DOCUMENTS_DIR)
+    return diff.to_index
+
+def remove_deleted_documents(manifest: IndexManifest, removed_files: List[str], vector_engine: VectorEngine) -> int:
+    """디렉토리에서 사라진 문서의 벡터를 삭제하고 매니페스트에서 제거"""
+    removed_chunks = 0
+    for file_path in removed_files:
+        entry = manifest.remove(file_path)
+        if entry and entry.get('chunks'):
+            removed_chunks += vector_engine.delete_chunks(entry['chunks'], persist=False)
+        print(f"  ✗ Removed: {os.path.basename(file_path)}")
+    
+    if removed_files:
+        # Sparse 색인은 모든 삭제를 반영한 뒤 save_metadata에서 한 번 저장
+        vector_engine.save_metadata()
+        manifest.save()
+    return removed_chunks
+
+def process_documents_batch(pdf_files: List[str], start_idx: int = 0, batch_size: int = 5,
+                            workers: int = None, manifest: IndexManifest = None,
+                            fingerprints: Dict[str, Dict[str, Any]] = None,
+                            config: Dict[str, Any] = None):
+    """
+    문서들을 배치로 처리 (추출/분석은 프로세스 풀, 임베딩은 단일 단계에서 일괄 처리)
+    
+    manifest가 주어지면 이전 청크 해시와 비교하여 바뀐 청크만 삭제/upsert하고
+    처리 결과를 매니페스트에 기록
+    """
+    
+    # 임베딩/저장 단계는 메인 프로세스에서만 초기화
     vector_engine = VectorEngine()
+    fingerprints = fingerprints or {}
     
     results = {
         'start_time': time.time(),
@@ -68,55 +79,52 @@ def process_documents_batch(pdf_files: List[str], start_idx: int = 0, batch_size
     
     print(f"Processing documents {start_idx+1}-{end_idx} of {len(pdf_files)}")
     
-    for i, pdf_path in enumerate(batch_files):
-        current_idx = start_idx + i + 1
-        print(f"\n[{current_idx}/{len(pdf_files)}] Processing: {os.path.basename(pdf_path)}")
+    def embed_documents(docs):
+        """여러 문서의 계층별 청크를 한 번에 인코딩/저장"""
+        documents = [
+            {
+                'document_id': doc['document_id'],
+                'content': doc['content'],
+                'metadata': doc['extracted_metadata']
+            }
+            for doc in docs
+        ]
         
-        doc_start_time = time.time()
+        if manifest is None:
+            vector_engine.add_documents(documents)
+        else:
+            previous_chunks = {
+                doc['document_id']: manifest.get_chunks(doc['file_path']) for doc in docs
+            }
+            new_chunks = vector_engine.sync_documents(documents, previous_chunks)
+            for doc in docs:
+                manifest.record(
+                    doc['file_path'],
+                    doc['document_id'],
+                    new_chunks[doc['document_id']],
+                    fingerprints.get(str(Path(doc['file_path'])))
+                )
+            vector_engine.save_metadata()
+            manifest.save()
         
-        try:
-            # 1. 멀티모달 처리
-            print("  → Multimodal processing...")
-            processed_doc = multimodal_processor.process_document(pdf_path)
-            
-            if not processed_doc:
-                raise ValueError("멀티모달 처리 실패")
-            
-            # 2. 메타데이터 추출
-            print("  → Metadata extraction...")
-            metadata = metadata_extractor.extract_metadata(processed_doc)
-            
-            # 3. 벡터 통합
-            print("  → Vector integration...")
-            doc_id = processed_doc['document_id']
-            vector_result = vector_engine.add_document(
-                doc_id,
-                processed_doc['content'],
-                metadata
-            )
-            
-            processing_time = time.time() - doc_start_time
-            
-            print(f"  ✓ Success ({processing_time:.2f}s)")
-            
-            results['processed'].append({
-                'file': os.path.basename(pdf_path),
-                'doc_id': doc_id,
-                'processing_time': processing_time
-            })
-            results['total_processed'] += 1
-            
-        except Exception as e:
-            processing_time = time.time() - doc_start_time
-            error_msg = str(e)
-            
-            print(f"  ✗ Error: {error_msg} ({processing_time:.2f}s)")
-            
-            results['failed'].append({
-                'file': os.path.basename(pdf_path),
-                'error': error_msg,
-                'processing_time': processing_time
-            })
+        for doc in docs:
+            print(f"  ✓ Indexed: {doc['file_name']}")
+    
+    def report_progress(file_path, success, seconds):
+        status = "✓ Analyzed" if success else "✗ Error"
+        print(f"  {status}: {os.path.basename(file_path)} ({seconds:.2f}s)")
+    
+    pipeline = IngestionPipeline(workers=workers, keep_documents=True, config=config)
+    pipeline_result = pipeline.run(batch_files, embed_fn=embed_documents, progress_fn=report_progress)
+    
+    for doc in pipeline_result.documents:
+        results['processed'].append({
+            'file': doc['file_name'],
+            'doc_id': doc['document_id']
+        })
+    results['total_processed'] = len(pipeline_result.documents)
+    results['failed'] = pipeline_result.failed
+    results['stage_metrics'] = pipeline_result.stage_metrics
     
     results['end_time'] = time.time()
     results['total_duration'] = results['end_time'] - results['start_time']
@@ -160,6 +168,12 @@ def print_batch_summary(results: dict, batch_num: int):
     print(f"Success rate:       {(success_count/total_count*100):.1f}%" if total_count > 0 else "Success rate: 0%")
     print(f"Total time:         {results['total_duration']:.2f}s")
     
+    if results.get('stage_metrics'):
+        print(f"\nStage throughput:")
+        for stage_name, stage in results['stage_metrics'].items():
+            print(f"  {stage_name:<8} {stage['items_per_sec']:>8.2f} docs/s  "
+                  f"busy {stage['busy_seconds']:>8.2f}s  utilization {stage['utilization']:.2f}")
+    
     if 'collections_status' in results and isinstance(results['collections_status'], dict):
         print(f"\nVector Database Status:")
         for collection_name, count in results['collections_status'].items():
@@ -173,17 +187,29 @@ def print_batch_summary(results: dict, batch_num: int):
 def main():
     print("AI 최적화 벡터 데이터베이스 자동 구축을 시작합니다...")
     
-    # 처리되지 않은 문서들 찾기
-    remaining_files = find_remaining_documents()
+    # 매니페스트와 디렉토리를 비교하여 추가/변경/삭제 문서 찾기
+    config = load_config()
+    manifest = IndexManifest()
+    diff = manifest.diff_directory(DOCUMENTS_DIR)
+    summary = diff.summary()
+    print(f"추가 {summary['added']}개, 변경 {summary['modified']}개, "
+          f"삭제 {summary['removed']}개, 유지 {summary['unchanged']}개")
     
+    # 삭제된 문서의 벡터 제거
+    if diff.removed:
+        removed_chunks = remove_deleted_documents(manifest, diff.removed, VectorEngine())
+        print(f"삭제된 문서의 청크 {removed_chunks}개 제거")
+    
+    remaining_files = diff.to_index
     if not remaining_files:
-        print("모든 문서가 이미 처리되었습니다!")
+        manifest.save()
+        print("모든 문서가 최신 상태입니다!")
         return
     
     print(f"처리할 문서: {len(remaining_files)}개")
     
-    # 배치 크기 설정 (메모리를 고려하여 작게)
-    batch_size = 3
+    # 배치 크기 설정 (단계 간 큐가 메모리를 제한하므로 코어 수에 비례하여 설정)
+    batch_size = max(3, (os.cpu_count() or 1) * 4)
     total_batches = (len(remaining_files) + batch_size - 1) // batch_size
     
     # 배치별로 처리
@@ -195,7 +221,10 @@ def main():
         print(f"{'='*60}")
         
         try:
-            results = process_documents_batch(remaining_files, start_idx, batch_size)
+            results = process_documents_batch(
+                remaining_files, start_idx, batch_size,
+                manifest=manifest, fingerprints=diff.fingerprints, config=config
+            )
             
             # 결과 저장 및 출력
             save_progress(results, batch_num)
@@ -6,7 +6,7 @@
 import logging
 import re
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 import json
 
@@ -43,10 +43,32 @@ class ActualFormulaExtractor:
     별표 33의 실제 정산 공식 추출 및 구조화
     """
     
-    def __init__(self):
+    def __init__(self, registry: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            registry: to_registry()로 저장한 공식 레지스트리 (서빙 스냅샷 등, 없으면 공식을 새로 구성)
+        """
         self.formulas = {}
         self.variables = {}
-        self._initialize_actual_formulas()
+        if registry is None:
+            self._initialize_actual_formulas()
+        else:
+            self._load_registry(registry)
+    
+    def to_registry(self) -> Dict[str, Any]:
+        """JSON으로 저장할 수 있는 공식 레지스트리"""
+        return {formula_id: asdict(formula) for formula_id, formula in self.formulas.items()}
+    
+    def _load_registry(self, registry: Dict[str, Any]):
+        """저장된 공식 레지스트리 로드"""
+        self.formulas = {
+            formula_id: SettlementFormula(**{
+                **formula,
+                "variables": [FormulaVariable(**variable) for variable in formula["variables"]]
+            })
+            for formula_id, formula in registry.items()
+        }
+        logger.info(f"정산 공식 레지스트리 {len(self.formulas)}개 로드 완료")
     
     def _initialize_actual_formulas(self):
         """별표 33에서 추출한 실제 정산 공식들 초기화"""
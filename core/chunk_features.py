@@ -0,0 +1,190 @@
+"""
+청크 텍스트 통계 모듈
+- 청크를 한 번만 토큰화하여 문장 경계, 단어 수, 용어 출현, 상호 참조 수를 담은 가벼운 특성 레코드 생성
+- EnhancedVectorEngine의 가독성/복잡도/키워드 밀도/품질 점수는 모두 이 레코드에서 계산
+- 여러 청크를 이어 붙여 코드포인트 배열 하나로 처리하는 문서 단위(벡터화) 계산 지원
+- 공백 판정은 str.split()/str.strip()과 동일 (str.isspace 기준), 문장 구분은 re.split(r'[.!?]+')과 동일
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from core.keyword_matcher import KeywordMatcher, KeywordScan
+
+# 공백 문자 표 (U+3000 이후에는 공백 문자가 없으므로 마지막 칸은 False로 두고 그 이상은 모두 여기로 매핑)
+_SPACE_TABLE_SIZE = 0x3002
+_SPACE_TABLE = np.array([chr(c).isspace() for c in range(_SPACE_TABLE_SIZE)], dtype=bool)
+_SENTENCE_PUNCTUATION = np.array([ord("."), ord("!"), ord("?")], dtype=np.uint32)
+
+_WORD = re.compile(r"\S+")
+_PUNCTUATION_RUN = re.compile(r"[.!?]+")
+_SENTENCE_WORD = re.compile(r"[^\s.!?]+")
+
+# 기술 용어 패턴 (약어, 숫자+단위, 한글(영문)) - 사전 용어가 아닌 형태 패턴이므로 정규식 유지
+TECHNICAL_TERM_PATTERNS = [
+    re.compile(r'[A-Z]{2,}'),
+    re.compile(r'\d+[A-Za-z]+'),
+    re.compile(r'[가-힣]+\([A-Za-z]+\)'),
+]
+
+# 상호 참조 패턴 (조항, 별표, 부록, 규칙명)
+CROSS_REFERENCE_PATTERNS = [
+    re.compile(r"제\s*\d+\s*조"),
+    re.compile(r"별표\s*\d+"),
+    re.compile(r"부록\s*\w+"),
+    re.compile(r"\w+\s*규칙"),
+]
+
+
+@dataclass
+class ChunkTextFeatures:
+    """청크 텍스트 특성 레코드"""
+    text_length: int
+    stripped_length: int
+    ends_with_terminal: bool      # 공백 제거 후 . ! ? 로 끝나는지
+    word_count: int               # 공백 기준 단어 수
+    complex_word_count: int       # 7자 이상 단어 수
+    sentence_count: int           # [.!?]+ 기준 문장 조각 수
+    sentence_word_count: int      # 문장 조각별 단어 수의 합
+    keyword_word_count: int       # 전력 키워드를 포함한 단어 수
+    technical_term_count: int
+    cross_reference_count: int
+    keyword_scan: Optional[KeywordScan] = field(default=None, compare=False, repr=False)
+
+
+def _run_start_mask(mask: np.ndarray) -> np.ndarray:
+    """True 구간이 시작되는 위치만 True"""
+    starts = mask.copy()
+    starts[1:] &= ~mask[:-1]
+    return starts
+
+
+def _run_starts(mask: np.ndarray) -> np.ndarray:
+    """True 구간의 시작 위치"""
+    return np.flatnonzero(_run_start_mask(mask))
+
+
+def _run_ends(mask: np.ndarray) -> np.ndarray:
+    """True 구간의 마지막 위치"""
+    ends = mask.copy()
+    ends[:-1] &= ~mask[1:]
+    return np.flatnonzero(ends)
+
+
+def _text_features(text: str,
+                   word_count: int,
+                   complex_word_count: int,
+                   sentence_count: int,
+                   sentence_word_count: int,
+                   keyword_word_count: int,
+                   scan: Optional[KeywordScan]) -> ChunkTextFeatures:
+    stripped = text.strip()
+    return ChunkTextFeatures(
+        text_length=len(text),
+        stripped_length=len(stripped),
+        ends_with_terminal=stripped.endswith(('.', '!', '?')),
+        word_count=word_count,
+        complex_word_count=complex_word_count,
+        sentence_count=sentence_count,
+        sentence_word_count=sentence_word_count,
+        keyword_word_count=keyword_word_count,
+        technical_term_count=sum(len(pattern.findall(text)) for pattern in TECHNICAL_TERM_PATTERNS),
+        cross_reference_count=sum(len(pattern.findall(text)) for pattern in CROSS_REFERENCE_PATTERNS),
+        keyword_scan=scan
+    )
+
+
+def compute_text_features(text: str,
+                          keyword_matcher: Optional[KeywordMatcher] = None,
+                          keyword_category: Optional[str] = None) -> ChunkTextFeatures:
+    """청크 하나의 텍스트 특성 계산 (배열 연산 고정 비용이 없는 단일 청크 경로)"""
+    words = text.split()
+
+    scan = None
+    keyword_words = 0
+    if keyword_matcher is not None:
+        scan = keyword_matcher.scan(text)
+        occurrences = scan.occurrences(keyword_category) if keyword_category else []
+        if occurrences:
+            word_starts = [match.start() for match in _WORD.finditer(text)]
+            keyword_words = len({bisect_right(word_starts, m.start) - 1 for m in occurrences})
+
+    return _text_features(
+        text,
+        word_count=len(words),
+        complex_word_count=sum(1 for word in words if len(word) > 6),
+        sentence_count=len(_PUNCTUATION_RUN.findall(text)) + 1,
+        sentence_word_count=len(_SENTENCE_WORD.findall(text)),
+        keyword_word_count=keyword_words,
+        scan=scan
+    )
+
+
+def compute_chunk_features(texts: List[str],
+                           keyword_matcher: Optional[KeywordMatcher] = None,
+                           keyword_category: Optional[str] = None) -> List[ChunkTextFeatures]:
+    """
+    청크들의 텍스트 특성 계산 (문서의 청크 전체를 한 번에 넘기면 배열 연산 한 번으로 처리)
+
+    Args:
+        texts: 청크 텍스트 목록
+        keyword_matcher: 용어 매칭에 사용할 키워드 매처 (없으면 키워드 관련 값은 0)
+        keyword_category: 키워드 밀도 계산에 사용할 범주
+    """
+    if not texts:
+        return []
+
+    # 공백 한 칸으로 이어 붙이면 단어/문장부호 구간이 청크 경계를 넘지 않음
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    offsets = np.zeros(len(texts), dtype=np.int64)
+    offsets[1:] = np.cumsum(lengths[:-1] + 1)
+    joined = " ".join(texts)
+    codepoints = np.frombuffer(joined.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+    space = _SPACE_TABLE[np.minimum(codepoints, _SPACE_TABLE_SIZE - 1)]
+    nonspace = ~space
+    punctuation = np.isin(codepoints, _SENTENCE_PUNCTUATION)
+
+    def per_chunk(positions: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        chunk_ids = np.searchsorted(offsets, positions, side="right") - 1
+        return np.bincount(chunk_ids, weights=weights, minlength=len(texts))
+
+    word_start_mask = _run_start_mask(nonspace)
+    word_starts = np.flatnonzero(word_start_mask)
+    word_lengths = _run_ends(nonspace) - word_starts + 1
+    word_counts = per_chunk(word_starts)
+    complex_counts = per_chunk(word_starts, weights=(word_lengths > 6).astype(np.float64))
+    sentence_counts = per_chunk(_run_starts(punctuation)) + 1
+    sentence_word_counts = per_chunk(_run_starts(nonspace & ~punctuation))
+
+    # 위치 -> 단어 번호 (용어 출현이 속한 단어 판정용)
+    word_index = None
+    if keyword_matcher is not None and keyword_category:
+        word_index = np.cumsum(word_start_mask) - 1
+
+    features = []
+    for i, text in enumerate(texts):
+        scan = None
+        keyword_words = 0
+        if keyword_matcher is not None:
+            scan = keyword_matcher.scan(text)
+            if word_index is not None:
+                occurrences = scan.occurrences(keyword_category)
+                # 용어에는 공백이 없으므로 각 출현은 시작 위치가 속한 단어 하나에 포함됨
+                keyword_words = len({int(word_index[offsets[i] + m.start]) for m in occurrences})
+
+        features.append(_text_features(
+            text,
+            word_count=int(word_counts[i]),
+            complex_word_count=int(complex_counts[i]),
+            sentence_count=int(sentence_counts[i]),
+            sentence_word_count=int(sentence_word_counts[i]),
+            keyword_word_count=keyword_words,
+            scan=scan
+        ))
+
+    return features
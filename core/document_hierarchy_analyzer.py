@@ -88,9 +88,20 @@ class DocumentHierarchyAnalyzer:
     - AI가 활용하기 쉬운 구조화된 정보 제공
     """
     
+    # 라인 분류 시 패턴 그룹 적용 순서 (앞선 패턴이 우선)
+    HIERARCHY_PATTERN_ORDER = (
+        ("legal_article", HierarchyLevel.ARTICLE),
+        ("legal_paragraph", HierarchyLevel.PARAGRAPH),
+        ("chapter", HierarchyLevel.CHAPTER),
+        ("section", HierarchyLevel.SECTION),
+        ("annex", HierarchyLevel.ANNEX),
+        ("legal_item", HierarchyLevel.ITEM),
+    )
+    
     def __init__(self):
         self.document_patterns = self._initialize_patterns()
         self.hierarchy_rules = self._initialize_hierarchy_rules()
+        self._hierarchy_matcher, self._hierarchy_alternatives = self._compile_hierarchy_matcher()
     
     def _initialize_patterns(self) -> Dict[str, List[str]]:
         """문서 패턴 초기화"""
@@ -149,6 +160,28 @@ class DocumentHierarchyAnalyzer:
             ]
         }
     
+    def _compile_hierarchy_matcher(self) -> Tuple["re.Pattern", Dict[str, Tuple[str, HierarchyLevel, str, int, int]]]:
+        """
+        계층 패턴을 하나의 정규식으로 컴파일
+        
+        각 패턴을 이름 있는 그룹으로 감싸 HIERARCHY_PATTERN_ORDER 순서대로 이어 붙이므로
+        re.match 한 번으로 기존 순차 매칭과 같은 (처음 일치한) 패턴이 선택됨
+        
+        Returns:
+            (컴파일된 정규식, {그룹 이름: (패턴 유형, 레벨, 원본 패턴, 첫 그룹 번호, 그룹 수)})
+        """
+        alternatives = []
+        info = {}
+        group_count = 0
+        for pattern_type, level in self.HIERARCHY_PATTERN_ORDER:
+            for pattern in self.document_patterns[pattern_type]:
+                name = f"p{len(alternatives)}"
+                inner_groups = re.compile(pattern).groups
+                alternatives.append(f"(?P<{name}>{pattern})")
+                info[name] = (pattern_type, level, pattern, group_count + 2, inner_groups)
+                group_count += inner_groups + 1
+        return re.compile("|".join(alternatives)), info
+    
     def _initialize_hierarchy_rules(self) -> Dict[str, Any]:
         """계층 규칙 초기화"""
         return {
@@ -315,114 +348,50 @@ class DocumentHierarchyAnalyzer:
         return hierarchy_tree
     
     def _match_hierarchy_patterns(self, line: str, line_num: int) -> Optional[HierarchyNode]:
-        """텍스트 라인을 계층 패턴과 매칭"""
-        
-        # 법령 조항 패턴
-        for pattern in self.document_patterns["legal_article"]:
-            match = re.match(pattern, line)
-            if match:
-                number = match.group(1)
-                title = match.group(3) if len(match.groups()) >= 3 else ""
-                return HierarchyNode(
-                    level=HierarchyLevel.ARTICLE,
-                    number=f"제{number}조",
-                    title=title,
-                    content=line,
-                    metadata={"line_number": line_num, "pattern_type": "legal_article"}
-                )
-        
-        # 법령 항 패턴
-        for pattern in self.document_patterns["legal_paragraph"]:
-            match = re.match(pattern, line)
-            if match:
-                content = match.group(1)
-                return HierarchyNode(
-                    level=HierarchyLevel.PARAGRAPH,
-                    number=line[0],  # ①, ②, ③
-                    title="",
-                    content=content,
-                    metadata={"line_number": line_num, "pattern_type": "legal_paragraph"}
-                )
-        
-        # 장 패턴
-        for pattern in self.document_patterns["chapter"]:
-            match = re.match(pattern, line)
-            if match:
-                if "제" in pattern:  # 제1장 형태
-                    number = match.group(1)
-                    title = match.group(2)
-                    return HierarchyNode(
-                        level=HierarchyLevel.CHAPTER,
-                        number=f"제{number}장",
-                        title=title,
-                        content=line,
-                        metadata={"line_number": line_num, "pattern_type": "chapter"}
-                    )
-                else:  # 1. 형태
-                    number = match.group(1)
-                    title = match.group(2)
-                    return HierarchyNode(
-                        level=HierarchyLevel.CHAPTER,
-                        number=number,
-                        title=title,
-                        content=line,
-                        metadata={"line_number": line_num, "pattern_type": "chapter"}
-                    )
-        
-        # 절 패턴
-        for pattern in self.document_patterns["section"]:
-            match = re.match(pattern, line)
-            if match:
-                if "제" in pattern:  # 제1절 형태
-                    number = match.group(1)
-                    title = match.group(2)
-                    return HierarchyNode(
-                        level=HierarchyLevel.SECTION,
-                        number=f"제{number}절",
-                        title=title,
-                        content=line,
-                        metadata={"line_number": line_num, "pattern_type": "section"}
-                    )
-                else:  # 1.1 형태
-                    number = f"{match.group(1)}.{match.group(2)}"
-                    title = match.group(3)
-                    return HierarchyNode(
-                        level=HierarchyLevel.SECTION,
-                        number=number,
-                        title=title,
-                        content=line,
-                        metadata={"line_number": line_num, "pattern_type": "section"}
-                    )
+        """텍스트 라인을 계층 패턴과 매칭 (컴파일된 단일 정규식으로 한 번에 분류)"""
+        match = self._hierarchy_matcher.match(line)
+        if not match:
+            return None
         
-        # 별표/부록 패턴
-        for pattern in self.document_patterns["annex"]:
-            match = re.match(pattern, line)
-            if match:
-                number = match.group(1)
-                title = match.group(2) if len(match.groups()) >= 2 else ""
-                return HierarchyNode(
-                    level=HierarchyLevel.ANNEX,
-                    number=number,
-                    title=title,
-                    content=line,
-                    metadata={"line_number": line_num, "pattern_type": "annex"}
-                )
+        pattern_type, level, pattern, first_group, group_count = self._hierarchy_alternatives[match.lastgroup]
+        groups = match.groups()[first_group - 1:first_group - 1 + group_count]
         
-        # 번호 매기기 패턴
-        for pattern in self.document_patterns["legal_item"]:
-            match = re.match(pattern, line)
-            if match:
-                number = match.group(1)
-                content = match.group(2)
-                return HierarchyNode(
-                    level=HierarchyLevel.ITEM,
-                    number=number,
-                    title="",
-                    content=content,
-                    metadata={"line_number": line_num, "pattern_type": "legal_item"}
-                )
+        if pattern_type == "legal_article":
+            number = f"제{groups[0]}조"
+            title = groups[2] if group_count >= 3 else ""
+            content = line
+        elif pattern_type == "legal_paragraph":
+            number = line[0]  # ①, ②, ③
+            title = ""
+            content = groups[-1]
+        elif pattern_type in ("chapter", "section"):
+            if "제" in pattern:  # 제1장 / 제1절 형태
+                suffix = "장" if pattern_type == "chapter" else "절"
+                number = f"제{groups[0]}{suffix}"
+                title = groups[1]
+            elif pattern_type == "chapter":  # 1. 형태
+                number = groups[0]
+                title = groups[1]
+            else:  # 1.1 형태
+                number = f"{groups[0]}.{groups[1]}"
+                title = groups[2]
+            content = line
+        elif pattern_type == "annex":
+            number = groups[0]
+            title = groups[1] if group_count >= 2 else ""
+            content = line
+        else:  # legal_item
+            number = groups[0]
+            title = ""
+            content = groups[1]
         
-        return None
+        return HierarchyNode(
+            level=level,
+            number=number,
+            title=title,
+            content=content,
+            metadata={"line_number": line_num, "pattern_type": pattern_type}
+        )
     
     def _generate_structure_metadata(self, hierarchy_tree: List[HierarchyNode], doc_type: DocumentType) -> Dict[str, Any]:
         """구조 메타데이터 생성"""
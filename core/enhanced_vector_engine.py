@@ -5,14 +5,18 @@ Enhanced Vector Engine
 
 import logging
 import json
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Iterable, Iterator, Optional, Union, Any
 from pathlib import Path
 from datetime import datetime
 import numpy as np
 
+from core.chunk_features import ChunkTextFeatures, compute_chunk_features, compute_text_features
+from core.keyword_matcher import get_keyword_matcher, KeywordScan
 from core.metadata_extractor import MetadataExtractor
 from embeddings.text_embedder import PowerMarketEmbedder
-from data.vectors.vector_store import VectorDatabase
+from data.vectors.factory import create_vector_database, deferred_flush, vector_db_options
+from data.vectors.chunk_store import ChunkStore
+from data.vectors.vector_utils import as_embedding_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -25,18 +29,78 @@ class EnhancedVectorEngine:
     - AI 활용을 위한 구조화된 정보 제공
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    # 청크 분류용 용어 사전 (공용 키워드 매처에 "chunk_*:" 범주로 등록, 한 번의 스캔으로 모든 분류 수행)
+    MARKET_DOMAIN_KEYWORDS = {
+        "발전계획": ["발전계획", "발전기", "급전", "출력", "운영계획"],
+        "계통운영": ["계통", "송전", "배전", "전압", "주파수", "안정성"],
+        "전력거래": ["거래", "입찰", "가격", "시장", "정산", "요금"],
+        "시장운영": ["시장운영", "운영자", "참가자", "절차", "규칙"],
+        "예비력": ["예비력", "보조서비스", "주파수조정", "전압조정"],
+        "송전제약": ["송전제약", "제약", "혼잡", "선로", "용량"]
+    }
+    # 우선순위 순서 (앞의 유형부터 판정)
+    REGULATION_TYPE_KEYWORDS = {
+        "규칙": ["규칙", "규정", "기준"],
+        "고시": ["고시", "공고", "알림"],
+        "절차": ["절차", "매뉴얼", "가이드"],
+        "기술기준": ["기술기준", "규격", "표준"]
+    }
+    IMPORTANCE_KEYWORDS = {
+        "critical": ["필수", "의무", "반드시", "금지", "제재"],
+        "important": ["중요", "주의", "권장", "권고"]
+    }
+    COMPLIANCE_KEYWORDS = {
+        "의무": ["의무", "반드시", "하여야"],
+        "권고": ["권장", "권고", "바람직"]
+    }
+    CHUNK_INDICATOR_KEYWORDS = {
+        "power": ["전력", "발전", "계통", "시장", "거래", "운영", "예비력", "가격",
+                  "용량", "송전", "배전", "주파수", "전압", "안정성"],
+        "definition": ["정의", "이란", "라고 함", "기본원칙"],
+        "qa": ["이란", "라고 함", "정의", "의미", "무엇", "어떻게", "언제", "어디서",
+               "절차", "방법", "기준", "조건", "요건"]
+    }
+    
+    def __init__(self, config: Dict[str, Any], load_models: bool = True, vector_db=None):
+        """
+        Args:
+            config: 시스템 설정
+            load_models: False이면 임베딩 모델과 벡터 DB를 로드하지 않음
+                         (병렬 파이프라인 워커에서 청크 메타데이터 강화만 수행할 때 사용)
+            vector_db: 이미 연 벡터 DB (서빙 스냅샷의 읽기 전용 컬렉션 등, 없으면 설정으로 생성)
+        """
         self.config = config
+        # 청크 텍스트 통계 계산 방식: document(문서의 청크 전체를 한 번에) / chunk(청크마다)
+        self.chunk_features_mode = config.get("CHUNK_FEATURES_MODE", "document")
         
         # 구성 요소 초기화
         self.metadata_extractor = MetadataExtractor()
-        self.embedder = PowerMarketEmbedder(
-            model_name=config.get("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-mpnet-base-v2")
-        )
-        self.vector_db = VectorDatabase(
-            db_path=config.get("VECTOR_DB_PATH", "./vector_db"),
-            collection_name=config.get("COLLECTION_NAME", "power_market_docs")
-        )
+        self.embedder = None
+        self.vector_db = None
+        self.chunk_store = None
+        if load_models:
+            self.embedder = PowerMarketEmbedder(
+                model_name=config.get("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"),
+                device=config.get("EMBEDDING_DEVICE"),
+                backend=config.get("EMBEDDING_BACKEND", "torch"),
+                onnx_path=config.get("EMBEDDING_ONNX_PATH", "./models/onnx")
+            )
+            self.vector_db = vector_db or create_vector_database(
+                config.get("VECTOR_DB_TYPE", "chromadb"),
+                db_path=config.get("VECTOR_DB_PATH", "./vector_db"),
+                collection_name=config.get("COLLECTION_NAME", "power_market_docs"),
+                **vector_db_options(config)
+            )
+            if config.get("CHUNK_STORE_PATH"):
+                self.chunk_store = ChunkStore(config["CHUNK_STORE_PATH"])
+        
+        # 공용 키워드 매처에 청크 분류 용어 사전 등록
+        self.keyword_matcher = get_keyword_matcher()
+        self.keyword_matcher.add_vocabulary(self.MARKET_DOMAIN_KEYWORDS, prefix="chunk_domain:")
+        self.keyword_matcher.add_vocabulary(self.REGULATION_TYPE_KEYWORDS, prefix="chunk_regulation:")
+        self.keyword_matcher.add_vocabulary(self.IMPORTANCE_KEYWORDS, prefix="chunk_importance:")
+        self.keyword_matcher.add_vocabulary(self.COMPLIANCE_KEYWORDS, prefix="chunk_compliance:")
+        self.keyword_matcher.add_vocabulary(self.CHUNK_INDICATOR_KEYWORDS, prefix="chunk_indicator:")
         
         # 메타데이터 스키마 정의
         self.metadata_schema = self._define_metadata_schema()
@@ -97,27 +161,106 @@ class EnhancedVectorEngine:
         """
         logger.info(f"문서 처리 시작: {processed_doc.get('document_id', 'unknown')}")
         
+        # 1~3. 메타데이터 추출, 청킹, 청크 메타데이터 강화
+        enhanced_chunks = self.prepare_document_chunks(processed_doc)
+        
+        # 4. 임베딩 생성
+        embedded_chunks = self.embedder.encode_documents(enhanced_chunks, copy=False)
+        
+        logger.info(f"문서 처리 완료: {len(embedded_chunks)}개 청크 생성")
+        return embedded_chunks
+    
+    def prepare_document_chunks(self,
+                                processed_doc: Dict[str, Any],
+                                metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        임베딩 전 단계까지의 청크 준비 (모델 불필요, 워커 프로세스에서 실행 가능)
+        
+        Args:
+            processed_doc: MultimodalProcessor에서 처리된 문서
+            metadata: 이미 추출된 문서 메타데이터 (없으면 새로 추출)
+            
+        Returns:
+            메타데이터가 강화된 청크들 (임베딩 미포함)
+        """
         # 1. 메타데이터 추출
-        metadata = self.metadata_extractor.extract_metadata(processed_doc)
+        if metadata is None:
+            metadata = self.metadata_extractor.extract_metadata(processed_doc)
         
         # 2. 문서를 청크로 분할 (이미 처리된 경우 스킵)
         chunks = processed_doc.get("chunks", [])
         if not chunks:
             chunks = self._create_chunks_from_processed_doc(processed_doc)
         
-        # 3. 각 청크에 대해 풍부한 메타데이터 생성
+        # 3. 각 청크에 대해 풍부한 메타데이터 생성 (문서 모드에서는 텍스트 통계를 한 번에 계산)
+        features = [None] * len(chunks)
+        if self.chunk_features_mode == "document":
+            features = self._compute_text_features([chunk.get("text", "") for chunk in chunks])
+        
         enhanced_chunks = []
         for i, chunk in enumerate(chunks):
             enhanced_chunk = self._enhance_chunk_metadata(
-                chunk, metadata, i, len(chunks), processed_doc
+                chunk, metadata, i, len(chunks), processed_doc, features[i]
             )
             enhanced_chunks.append(enhanced_chunk)
         
-        # 4. 임베딩 생성
-        embedded_chunks = self.embedder.encode_documents(enhanced_chunks)
+        return enhanced_chunks
+    
+    def iter_page_chunks(self, pages: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        페이지 스트림(MultimodalProcessor.iter_pages)을 문단 청크로 바꾸며 메타데이터 강화
+        - 한 페이지씩 처리하므로 문서 전체를 메모리에 올리지 않음
+        - 전체 청크 수는 끝나기 전까지 알 수 없으므로 total_chunks는 -1
         
-        logger.info(f"문서 처리 완료: {len(embedded_chunks)}개 청크 생성")
-        return embedded_chunks
+        Args:
+            pages: PageContent 스트림
+        """
+        chunk_index = 0
+        for page in pages:
+            processed_page = {"document_id": page.document_id, "file_path": page.file_path}
+            chunks = [
+                {
+                    "text": paragraph.get("content", ""),
+                    "metadata": {
+                        "paragraph_index": chunk_index + i,
+                        "page_number": page.page_number,
+                        "chunk_type": "paragraph"
+                    }
+                }
+                for i, paragraph in enumerate(page.paragraphs)
+            ]
+            
+            features = [None] * len(chunks)
+            if self.chunk_features_mode == "document" and chunks:
+                features = self._compute_text_features([chunk["text"] for chunk in chunks])
+            
+            for chunk, chunk_features in zip(chunks, features):
+                yield self._enhance_chunk_metadata(chunk, {}, chunk_index, -1, processed_page, chunk_features)
+                chunk_index += 1
+    
+    def process_document_stream(self,
+                                pages: Iterable[Any],
+                                batch_size: int = 64) -> Iterator[List[Dict[str, Any]]]:
+        """
+        페이지 스트림을 청크 강화 + 임베딩까지 진행하여 배치 단위로 생성
+        
+        사용 예 (배치마다 색인/저장소 파일을 다시 쓰지 않도록 deferred_flush로 감쌈):
+            with deferred_flush(engine.vector_db):
+                for batch in engine.process_document_stream(processor.iter_pages(pdf_path)):
+                    engine.store_enhanced_documents(batch)
+        
+        Args:
+            pages: PageContent 스트림
+            batch_size: 한 번에 임베딩할 청크 수 (메모리에 유지되는 최대 청크 수)
+        """
+        batch = []
+        for chunk in self.iter_page_chunks(pages):
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                yield self.embedder.encode_documents(batch, copy=False)
+                batch = []
+        if batch:
+            yield self.embedder.encode_documents(batch, copy=False)
     
     def _create_chunks_from_processed_doc(self, processed_doc: Dict[str, Any]) -> List[Dict[str, Any]]:
         """처리된 문서에서 청크 생성"""
@@ -177,11 +320,14 @@ class EnhancedVectorEngine:
                                doc_metadata: Dict[str, Any], 
                                chunk_index: int,
                                total_chunks: int,
-                               processed_doc: Dict[str, Any]) -> Dict[str, Any]:
-        """청크 메타데이터 강화"""
+                               processed_doc: Dict[str, Any],
+                               features: Optional[ChunkTextFeatures] = None) -> Dict[str, Any]:
+        """청크 메타데이터 강화 (모든 점수는 한 번 계산한 텍스트 특성 레코드에서 파생)"""
         
         enhanced_chunk = chunk.copy()
         chunk_text = chunk.get("text", "")
+        if features is None:
+            features = compute_text_features(chunk_text, self.keyword_matcher, "chunk_indicator:power")
         
         # 기본 문서 정보
         enhanced_chunk.update({
@@ -194,10 +340,12 @@ class EnhancedVectorEngine:
         })
         
         # 전력시장 도메인 분류
-        enhanced_chunk["market_domain"] = self._classify_market_domain(chunk_text, doc_metadata)
-        enhanced_chunk["regulation_type"] = self._classify_regulation_type(chunk_text, doc_metadata)
-        enhanced_chunk["importance_level"] = self._assess_importance_level(chunk_text)
-        enhanced_chunk["compliance_category"] = self._classify_compliance(chunk_text)
+        scan = features.keyword_scan
+        enhanced_chunk["market_domain"] = self._classify_market_domain(chunk_text, doc_metadata, scan)
+        enhanced_chunk["regulation_type"] = self._classify_regulation_type(chunk_text, doc_metadata, scan)
+        importance_level = self._assess_importance_level(chunk_text, scan)
+        enhanced_chunk["importance_level"] = importance_level
+        enhanced_chunk["compliance_category"] = self._classify_compliance(chunk_text, scan)
         
         # 구조적 정보
         chunk_metadata = chunk.get("metadata", {})
@@ -210,72 +358,68 @@ class EnhancedVectorEngine:
         enhanced_chunk["has_images"] = self._contains_images(chunk_text)
         
         # 내용 특성
-        enhanced_chunk["text_complexity"] = self._assess_text_complexity(chunk_text)
-        enhanced_chunk["readability_score"] = self._calculate_readability(chunk_text)
-        enhanced_chunk["keyword_density"] = self._calculate_keyword_density(chunk_text)
-        enhanced_chunk["technical_term_count"] = self._count_technical_terms(chunk_text)
+        enhanced_chunk["text_complexity"] = self._assess_text_complexity(features)
+        enhanced_chunk["readability_score"] = self._calculate_readability(features)
+        enhanced_chunk["keyword_density"] = self._calculate_keyword_density(features)
+        enhanced_chunk["technical_term_count"] = features.technical_term_count
         
         # AI 최적화 점수
-        enhanced_chunk["searchability_score"] = self._calculate_searchability_score(chunk_text)
-        enhanced_chunk["summarization_priority"] = self._calculate_summarization_priority(chunk_text)
-        enhanced_chunk["qa_potential"] = self._calculate_qa_potential(chunk_text)
-        enhanced_chunk["cross_reference_count"] = self._count_cross_references(chunk_text)
+        enhanced_chunk["searchability_score"] = self._calculate_searchability_score(features)
+        enhanced_chunk["summarization_priority"] = self._calculate_summarization_priority(
+            chunk_text, importance_level, scan
+        )
+        enhanced_chunk["qa_potential"] = self._calculate_qa_potential(chunk_text, scan)
+        enhanced_chunk["cross_reference_count"] = features.cross_reference_count
         
         # 품질 지표
         enhanced_chunk["metadata_completeness"] = self._calculate_metadata_completeness(enhanced_chunk)
-        enhanced_chunk["content_quality"] = self._assess_content_quality(chunk_text)
+        enhanced_chunk["content_quality"] = self._assess_content_quality(features)
         enhanced_chunk["processing_timestamp"] = datetime.now().isoformat()
         
         return enhanced_chunk
     
-    def _classify_market_domain(self, text: str, doc_metadata: Dict[str, Any]) -> str:
+    def _compute_text_features(self, texts: List[str]) -> List[ChunkTextFeatures]:
+        """청크 텍스트 특성 레코드 계산 (여러 청크를 넘기면 한 번의 배열 연산으로 처리)"""
+        return compute_chunk_features(texts, self.keyword_matcher, "chunk_indicator:power")
+    
+    def _keyword_scan(self, text: str, scan: Optional[KeywordScan] = None) -> KeywordScan:
+        """청크 텍스트의 용어 매칭 결과 (특성 레코드의 결과가 있으면 사용, 없으면 매처 캐시에서 재사용)"""
+        return scan if scan is not None else self.keyword_matcher.scan(text)
+    
+    def _classify_market_domain(self, text: str, doc_metadata: Dict[str, Any],
+                                scan: Optional[KeywordScan] = None) -> str:
         """전력시장 도메인 분류"""
-        domain_keywords = {
-            "발전계획": ["발전계획", "발전기", "급전", "출력", "운영계획"],
-            "계통운영": ["계통", "송전", "배전", "전압", "주파수", "안정성"],
-            "전력거래": ["거래", "입찰", "가격", "시장", "정산", "요금"],
-            "시장운영": ["시장운영", "운영자", "참가자", "절차", "규칙"],
-            "예비력": ["예비력", "보조서비스", "주파수조정", "전압조정"],
-            "송전제약": ["송전제약", "제약", "혼잡", "선로", "용량"]
-        }
-        
-        scores = {}
-        for domain, keywords in domain_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            scores[domain] = score
+        scan = self._keyword_scan(text, scan)
+        scores = {domain: scan.count(f"chunk_domain:{domain}") for domain in self.MARKET_DOMAIN_KEYWORDS}
         
         if scores:
             return max(scores, key=scores.get)
         return "기타"
     
-    def _classify_regulation_type(self, text: str, doc_metadata: Dict[str, Any]) -> str:
+    def _classify_regulation_type(self, text: str, doc_metadata: Dict[str, Any],
+                                  scan: Optional[KeywordScan] = None) -> str:
         """규제 유형 분류"""
-        if any(word in text for word in ["규칙", "규정", "기준"]):
-            return "규칙"
-        elif any(word in text for word in ["고시", "공고", "알림"]):
-            return "고시"
-        elif any(word in text for word in ["절차", "매뉴얼", "가이드"]):
-            return "절차"
-        elif any(word in text for word in ["기술기준", "규격", "표준"]):
-            return "기술기준"
+        scan = self._keyword_scan(text, scan)
+        for regulation_type in self.REGULATION_TYPE_KEYWORDS:
+            if scan.any(f"chunk_regulation:{regulation_type}"):
+                return regulation_type
         return "기타"
     
-    def _assess_importance_level(self, text: str) -> str:
+    def _assess_importance_level(self, text: str, scan: Optional[KeywordScan] = None) -> str:
         """중요도 평가"""
-        critical_words = ["필수", "의무", "반드시", "금지", "제재"]
-        important_words = ["중요", "주의", "권장", "권고"]
-        
-        if any(word in text for word in critical_words):
+        scan = self._keyword_scan(text, scan)
+        if scan.any("chunk_importance:critical"):
             return "critical"
-        elif any(word in text for word in important_words):
+        elif scan.any("chunk_importance:important"):
             return "important"
         return "informational"
     
-    def _classify_compliance(self, text: str) -> str:
+    def _classify_compliance(self, text: str, scan: Optional[KeywordScan] = None) -> str:
         """준수 카테고리 분류"""
-        if any(word in text for word in ["의무", "반드시", "하여야"]):
+        scan = self._keyword_scan(text, scan)
+        if scan.any("chunk_compliance:의무"):
             return "의무"
-        elif any(word in text for word in ["권장", "권고", "바람직"]):
+        elif scan.any("chunk_compliance:권고"):
             return "권고"
         return "참고"
     
@@ -316,14 +460,9 @@ class EnhancedVectorEngine:
         image_indicators = ["그림", "Figure", "Fig.", "도", "이미지", "[그림"]
         return any(indicator in text for indicator in image_indicators)
     
-    def _assess_text_complexity(self, text: str) -> str:
+    def _assess_text_complexity(self, features: ChunkTextFeatures) -> str:
         """텍스트 복잡도 평가"""
-        import re
-        sentences = re.split(r'[.!?]+', text)
-        if not sentences:
-            return "simple"
-        
-        avg_length = sum(len(s.split()) for s in sentences) / len(sentences)
+        avg_length = features.sentence_word_count / features.sentence_count
         
         if avg_length > 25:
             return "complex"
@@ -331,68 +470,40 @@ class EnhancedVectorEngine:
             return "moderate"
         return "simple"
     
-    def _calculate_readability(self, text: str) -> float:
+    def _calculate_readability(self, features: ChunkTextFeatures) -> float:
         """가독성 점수 계산"""
-        import re
-        sentences = re.split(r'[.!?]+', text)
-        words = text.split()
-        
-        if not sentences or not words:
+        if not features.word_count:
             return 0.0
         
-        avg_sentence_length = len(words) / len(sentences)
-        complex_words = len([w for w in words if len(w) > 6])
-        complex_ratio = complex_words / len(words) if words else 0
+        avg_sentence_length = features.word_count / features.sentence_count
+        complex_ratio = features.complex_word_count / features.word_count
         
         readability = avg_sentence_length * 0.5 + complex_ratio * 100
         return round(max(0, min(100, readability)), 2)
     
-    def _calculate_keyword_density(self, text: str) -> float:
+    def _calculate_keyword_density(self, features: ChunkTextFeatures) -> float:
         """키워드 밀도 계산"""
-        power_keywords = [
-            "전력", "발전", "계통", "시장", "거래", "운영", "예비력", "가격", 
-            "용량", "송전", "배전", "주파수", "전압", "안정성"
-        ]
-        
-        words = text.split()
-        if not words:
+        if not features.word_count:
             return 0.0
-        
-        keyword_count = sum(1 for word in words if any(kw in word for kw in power_keywords))
-        return round(keyword_count / len(words), 3)
+        return round(features.keyword_word_count / features.word_count, 3)
     
-    def _count_technical_terms(self, text: str) -> int:
-        """기술 용어 개수"""
-        import re
-        # 약어, 단위, 기술용어 패턴
-        patterns = [
-            r'[A-Z]{2,}',  # 약어
-            r'\d+[A-Za-z]+',  # 숫자+단위
-            r'[가-힣]+\([A-Za-z]+\)',  # 한글(영문)
-        ]
-        
-        count = 0
-        for pattern in patterns:
-            count += len(re.findall(pattern, text))
-        
-        return count
-    
-    def _calculate_searchability_score(self, text: str) -> float:
+    def _calculate_searchability_score(self, features: ChunkTextFeatures) -> float:
         """검색 가능성 점수"""
         # 키워드 밀도, 기술용어 수, 텍스트 길이를 종합
-        keyword_density = self._calculate_keyword_density(text)
-        tech_terms = self._count_technical_terms(text)
-        text_length = len(text.split())
+        keyword_density = self._calculate_keyword_density(features)
         
         # 정규화된 점수 계산
-        length_score = min(1.0, text_length / 100)  # 100단어 기준
-        tech_score = min(1.0, tech_terms / 10)  # 10개 기준
+        length_score = min(1.0, features.word_count / 100)  # 100단어 기준
+        tech_score = min(1.0, features.technical_term_count / 10)  # 10개 기준
         
         return round((keyword_density + tech_score + length_score) / 3, 3)
     
-    def _calculate_summarization_priority(self, text: str) -> float:
+    def _calculate_summarization_priority(self, text: str, importance: Optional[str] = None,
+                                          scan: Optional[KeywordScan] = None) -> float:
         """요약 우선순위 점수"""
-        importance = self._assess_importance_level(text)
+        scan = self._keyword_scan(text, scan)
+        if importance is None:
+            importance = self._assess_importance_level(text, scan)
         
         # 중요도에 따른 기본 점수
         base_scores = {
@@ -404,39 +515,18 @@ class EnhancedVectorEngine:
         base_score = base_scores.get(importance, 0.3)
         
         # 정의문, 핵심 정보 포함 시 가산점
-        if any(word in text for word in ["정의", "이란", "라고 함", "기본원칙"]):
+        if scan.any("chunk_indicator:definition"):
             base_score += 0.1
         
         return round(min(1.0, base_score), 3)
     
-    def _calculate_qa_potential(self, text: str) -> float:
+    def _calculate_qa_potential(self, text: str, scan: Optional[KeywordScan] = None) -> float:
         """Q&A 잠재력 점수"""
-        qa_indicators = [
-            "이란", "라고 함", "정의", "의미", "무엇", "어떻게", "언제", "어디서",
-            "절차", "방법", "기준", "조건", "요건"
-        ]
-        
-        indicator_count = sum(1 for indicator in qa_indicators if indicator in text)
+        indicator_count = self._keyword_scan(text, scan).count("chunk_indicator:qa")
         max_indicators = 5
         
         return round(min(1.0, indicator_count / max_indicators), 3)
     
-    def _count_cross_references(self, text: str) -> int:
-        """상호 참조 개수"""
-        import re
-        ref_patterns = [
-            r"제\s*\d+\s*조",
-            r"별표\s*\d+",
-            r"부록\s*\w+",
-            r"\w+\s*규칙"
-        ]
-        
-        count = 0
-        for pattern in ref_patterns:
-            count += len(re.findall(pattern, text))
-        
-        return count
-    
     def _calculate_metadata_completeness(self, chunk: Dict[str, Any]) -> float:
         """메타데이터 완성도 계산"""
         required_fields = [
@@ -447,29 +537,28 @@ class EnhancedVectorEngine:
         present_fields = sum(1 for field in required_fields if chunk.get(field))
         return round(present_fields / len(required_fields), 3)
     
-    def _assess_content_quality(self, text: str) -> float:
+    def _assess_content_quality(self, features: ChunkTextFeatures) -> float:
         """콘텐츠 품질 평가"""
-        if not text or len(text.strip()) < 10:
+        if features.stripped_length < 10:
             return 0.0
         
         # 길이, 구조, 완성도 평가
-        length_score = min(1.0, len(text) / 500)  # 500자 기준
+        length_score = min(1.0, features.text_length / 500)  # 500자 기준
         
         # 문장 구조 평가
-        import re
-        sentences = re.split(r'[.!?]+', text)
-        structure_score = min(1.0, len(sentences) / 3)  # 3문장 기준
+        structure_score = min(1.0, features.sentence_count / 3)  # 3문장 기준
         
         # 완성도 평가 (문장이 온전한지)
-        completeness_score = 1.0 if text.strip().endswith(('.', '!', '?')) else 0.7
+        completeness_score = 1.0 if features.ends_with_terminal else 0.7
         
         return round((length_score + structure_score + completeness_score) / 3, 3)
     
     def store_enhanced_documents(self, enhanced_chunks: List[Dict[str, Any]]) -> bool:
         """강화된 문서들을 벡터 DB에 저장"""
         try:
-            # 벡터 DB 형식으로 변환
+            # 벡터 DB 형식으로 변환 (청크 저장소에는 타입을 유지한 메타데이터로 기록)
             vector_ready_docs = []
+            typed_docs = []
             
             for chunk in enhanced_chunks:
                 # ChromaDB에 저장할 수 있는 형태로 메타데이터 정리
@@ -491,9 +580,22 @@ class EnhancedVectorEngine:
                 }
                 
                 vector_ready_docs.append(vector_doc)
+                typed_docs.append({
+                    'id': chunk.get('chunk_id'),
+                    'file_name': vector_doc['file_name'],
+                    **chunk
+                })
+            
+            embeddings = as_embedding_matrix([chunk.get('embedding') for chunk in enhanced_chunks])
+            if self.chunk_store is not None:
+                try:
+                    self.chunk_store.write_documents(self.vector_db.collection_name, typed_docs, embeddings)
+                except Exception as e:
+                    logger.error(f"청크 저장소 기록 실패: {e}")
             
-            # 벡터 DB에 저장
-            success = self.vector_db.add_documents(vector_ready_docs)
+            # 벡터 DB에 저장 (바깥 deferred_flush 블록 안이면 블록 끝에 한 번 저장)
+            with deferred_flush(self.vector_db):
+                success = self.vector_db.add_documents(vector_ready_docs, embeddings=embeddings)
             
             if success:
                 logger.info(f"Enhanced 문서 {len(enhanced_chunks)}개 저장 완료")
@@ -515,25 +617,36 @@ class EnhancedVectorEngine:
         # 쿼리 임베딩 생성
         query_embedding = self.embedder.encode_text(query)
         
-        # 메타데이터 필터 구성
-        where_clause = {}
+        # 메타데이터 필터 구성 (조건이 여러 개면 ChromaDB 문법상 $and로 묶음)
+        conditions = []
         if domain_filter:
-            where_clause["market_domain"] = {"$eq": domain_filter}
+            conditions.append({"market_domain": {"$eq": domain_filter}})
         if importance_filter:
-            where_clause["importance_level"] = {"$eq": importance_filter}
+            conditions.append({"importance_level": {"$eq": importance_filter}})
         if regulation_filter:
-            where_clause["regulation_type"] = {"$eq": regulation_filter}
-        
-        # 검색 실행
+            conditions.append({"regulation_type": {"$eq": regulation_filter}})
+        where_clause = None
+        if len(conditions) == 1:
+            where_clause = conditions[0]
+        elif conditions:
+            where_clause = {"$and": conditions}
+        
+        # 검색 실행 (범주형 필터는 벡터 DB의 메타데이터 역색인으로 사전/사후 필터 선택)
         results = self.vector_db.search_similar(
             query_embedding=query_embedding,
             top_k=top_k,
-            where=where_clause if where_clause else None
+            where=where_clause
         )
         
         logger.info(f"메타데이터 필터 검색 완료: {len(results)}개 결과")
         return results
     
+    def close(self):
+        """공유 임베딩 모델 반환"""
+        if self.embedder is not None:
+            self.embedder.close()
+            self.embedder = None
+    
     def get_statistics(self) -> Dict[str, Any]:
         """시스템 통계 정보"""
         stats = self.vector_db.get_collection_stats()
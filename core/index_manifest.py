@@ -0,0 +1,170 @@
+"""
+증분 재색인 매니페스트
+- 원본 파일별 (mtime, size, sha256) 지문과 청크별 내용 해시를 기록
+- 문서 디렉토리와 비교하여 추가/변경/삭제/유지 파일을 판별
+- 변경된 문서는 바뀐 청크만 삭제/upsert 하도록 이전 청크 해시를 제공
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 레벨별 {청크 ID: 내용 해시}
+ChunkHashes = Dict[str, Dict[str, str]]
+
+
+def compute_file_hash(file_path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """파일 내용 sha256 해시"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class ManifestDiff:
+    """매니페스트와 디렉토리 비교 결과"""
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    fingerprints: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def to_index(self) -> List[str]:
+        """다시 처리해야 하는 파일들"""
+        return sorted(self.added + self.modified)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added),
+            "modified": len(self.modified),
+            "removed": len(self.removed),
+            "unchanged": len(self.unchanged)
+        }
+
+
+class IndexManifest:
+    """파일/청크 지문 매니페스트"""
+
+    VERSION = 1
+
+    def __init__(self, manifest_path: Union[str, Path] = "data/metadata/index_manifest.json"):
+        self.manifest_path = Path(manifest_path)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self):
+        """매니페스트 파일 로드"""
+        if not self.manifest_path.exists():
+            self.files = {}
+            return
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            logger.info(f"인덱스 매니페스트 로드 완료: {len(self.files)}개 파일")
+        except Exception as e:
+            logger.error(f"인덱스 매니페스트 로드 실패, 빈 매니페스트로 시작: {e}")
+            self.files = {}
+
+    def save(self):
+        """매니페스트 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self.VERSION,
+                "updated_at": datetime.now().isoformat(),
+                "files": self.files
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    @staticmethod
+    def _key(file_path: Union[str, Path]) -> str:
+        return str(Path(file_path))
+
+    def diff_directory(self, documents_dir: Union[str, Path], patterns: Tuple[str, ...] = ("*.pdf",)) -> ManifestDiff:
+        """
+        디렉토리와 매니페스트 비교
+
+        mtime과 size가 같으면 해시를 계산하지 않고 유지로 판단,
+        다르면 해시를 비교하여 실제 내용 변경 여부 확인
+        """
+        diff = ManifestDiff()
+        current = set()
+
+        for pattern in patterns:
+            for file_path in sorted(Path(documents_dir).rglob(pattern)):
+                key = self._key(file_path)
+                current.add(key)
+                stat = file_path.stat()
+                entry = self.files.get(key)
+
+                if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                    diff.unchanged.append(key)
+                    continue
+
+                fingerprint = {
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                    "sha256": compute_file_hash(file_path)
+                }
+                diff.fingerprints[key] = fingerprint
+
+                if entry is None:
+                    diff.added.append(key)
+                elif entry["sha256"] == fingerprint["sha256"]:
+                    # 내용은 같고 mtime만 바뀐 경우 지문만 갱신
+                    entry["mtime"] = fingerprint["mtime"]
+                    entry["size"] = fingerprint["size"]
+                    diff.unchanged.append(key)
+                else:
+                    diff.modified.append(key)
+
+        diff.removed = sorted(set(self.files) - current)
+        logger.info(f"매니페스트 비교 결과: {diff.summary()}")
+        return diff
+
+    def get_chunks(self, file_path: Union[str, Path]) -> Optional[ChunkHashes]:
+        """이전에 기록된 청크 해시 반환 (없으면 None)"""
+        entry = self.files.get(self._key(file_path))
+        return entry.get("chunks") if entry else None
+
+    def get_document_id(self, file_path: Union[str, Path]) -> Optional[str]:
+        entry = self.files.get(self._key(file_path))
+        return entry.get("document_id") if entry else None
+
+    def record(self,
+               file_path: Union[str, Path],
+               document_id: str,
+               chunks: ChunkHashes,
+               fingerprint: Optional[Dict[str, Any]] = None):
+        """파일 지문과 청크 해시 기록"""
+        if fingerprint is None:
+            stat = Path(file_path).stat()
+            fingerprint = {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "sha256": compute_file_hash(file_path)
+            }
+
+        self.files[self._key(file_path)] = {
+            **fingerprint,
+            "document_id": document_id,
+            "chunks": chunks,
+            "indexed_at": datetime.now().isoformat()
+        }
+
+    def remove(self, file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """파일 항목 제거 후 이전 항목 반환"""
+        return self.files.pop(self._key(file_path), None)
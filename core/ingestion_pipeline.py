@@ -0,0 +1,294 @@
+"""
+병렬 문서 적재 파이프라인
+PDF 추출/분석을 프로세스 풀로 분산하고, 임베딩은 단일 단계에서 여러 문서의 청크를 모아 배치 처리
+
+단계:
+1. extract  : MultimodalProcessor (PyMuPDF 추출, 페이지 분석)      - 워커 프로세스
+2. analyze  : MetadataExtractor + DocumentHierarchyAnalyzer (+ 청크 강화) - 워커 프로세스
+3. embed    : 여러 문서를 모아 한 번에 인코딩/저장                   - 메인 프로세스 단일 스레드
+
+단계 사이에는 크기가 제한된 큐를 두어 임베딩 단계가 밀리면 추출 단계가 대기 (backpressure)
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from core.multimodal_processor import multimodal_options
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스별 구성 요소 (프로세스 초기화 시 한 번만 생성)
+_worker_components: Dict[str, Any] = {}
+
+_STOP = object()
+
+
+@dataclass
+class StageMetrics:
+    """단계별 처리량 지표"""
+    name: str
+    items: int = 0
+    failures: int = 0
+    busy_seconds: float = 0.0
+
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "failures": self.failures,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_sec": round(self.items / wall_seconds, 3) if wall_seconds else 0.0,
+            # 누적 작업 시간 / 경과 시간 (워커 단계는 1보다 크면 병렬 처리 중)
+            "utilization": round(self.busy_seconds / wall_seconds, 3) if wall_seconds else 0.0
+        }
+
+
+@dataclass
+class PipelineResult:
+    """파이프라인 실행 결과"""
+    documents: List[Dict[str, Any]] = field(default_factory=list)
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+    stage_metrics: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+
+def _init_worker(data_dir: str,
+                 enhanced_config: Optional[Dict[str, Any]],
+                 processor_options: Optional[Dict[str, Any]] = None):
+    """워커 프로세스 초기화 (프로세스당 한 번)"""
+    from core.multimodal_processor import MultimodalProcessor
+    from core.metadata_extractor import MetadataExtractor
+    from core.document_hierarchy_analyzer import DocumentHierarchyAnalyzer
+
+    _worker_components["processor"] = MultimodalProcessor(data_dir=data_dir, **(processor_options or {}))
+    _worker_components["metadata_extractor"] = MetadataExtractor(data_dir=data_dir)
+    _worker_components["hierarchy_analyzer"] = DocumentHierarchyAnalyzer()
+
+    if enhanced_config is not None:
+        from core.enhanced_vector_engine import EnhancedVectorEngine
+        _worker_components["enhanced_engine"] = EnhancedVectorEngine(enhanced_config, load_models=False)
+
+
+def _analyze_document(file_path: str) -> Dict[str, Any]:
+    """워커에서 실행: 추출 + 메타데이터/계층 분석 (+ 청크 강화)"""
+    timings = {}
+
+    start = time.perf_counter()
+    processed_doc = _worker_components["processor"].process_document(file_path)
+    timings["extract"] = time.perf_counter() - start
+
+    error = processed_doc.get("metadata", {}).get("error") if processed_doc else "멀티모달 처리 실패"
+    if error:
+        return {"file_path": file_path, "error": error, "timings": timings}
+
+    start = time.perf_counter()
+    metadata = _worker_components["metadata_extractor"].extract_metadata(processed_doc)
+    processed_doc["extracted_metadata"] = metadata
+    processed_doc["hierarchy_analysis"] = _worker_components["hierarchy_analyzer"].analyze_document_structure(processed_doc)
+
+    enhanced_engine = _worker_components.get("enhanced_engine")
+    if enhanced_engine is not None:
+        processed_doc["enhanced_chunks"] = enhanced_engine.prepare_document_chunks(processed_doc, metadata)
+    timings["analyze"] = time.perf_counter() - start
+
+    return {"file_path": file_path, "document": processed_doc, "timings": timings}
+
+
+class IngestionPipeline:
+    """
+    병렬 적재 파이프라인
+
+    사용 예:
+        pipeline = IngestionPipeline(workers=8)
+        result = pipeline.run(pdf_files, embed_fn=lambda docs: vector_engine.add_documents(...))
+    """
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 queue_size: Optional[int] = None,
+                 embed_batch_chunks: int = 512,
+                 data_dir: str = "data",
+                 enhanced_config: Optional[Dict[str, Any]] = None,
+                 keep_documents: bool = True,
+                 config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            workers: 추출/분석 워커 프로세스 수 (기본: CPU 코어 수)
+            queue_size: 단계 간 큐 크기 (기본: 워커 수 x 2)
+            embed_batch_chunks: 임베딩 단계에서 모아서 처리할 최소 청크 수
+            data_dir: MultimodalProcessor/MetadataExtractor 데이터 디렉토리
+            enhanced_config: 지정 시 워커에서 EnhancedVectorEngine 청크 강화까지 수행
+            keep_documents: 처리된 문서를 결과에 보관할지 여부 (대용량 적재 시 False 권장)
+            config: MULTIMODAL_* 설정을 읽을 설정 (기본: enhanced_config)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size or self.workers * 2
+        self.embed_batch_chunks = embed_batch_chunks
+        self.data_dir = data_dir
+        self.enhanced_config = enhanced_config
+        self.keep_documents = keep_documents
+        self.processor_options = multimodal_options(config if config is not None else enhanced_config)
+
+    @staticmethod
+    def _count_chunks(doc: Dict[str, Any]) -> int:
+        """임베딩 대상 청크 수 추정"""
+        if "enhanced_chunks" in doc:
+            return len(doc["enhanced_chunks"])
+        content = doc.get("content", {})
+        return 1 + sum(len(content.get(key, [])) for key in ("sections", "paragraphs", "sentences"))
+
+    def run(self,
+            file_paths: List[Union[str, Path]],
+            embed_fn: Callable[[List[Dict[str, Any]]], Any],
+            progress_fn: Optional[Callable[[str, bool, float], None]] = None) -> PipelineResult:
+        """
+        파이프라인 실행
+
+        Args:
+            file_paths: 처리할 문서 경로들
+            embed_fn: 임베딩/저장 단계 함수 (처리된 문서 리스트를 받아 한 번에 처리)
+            progress_fn: 문서별 완료 콜백 (file_path, success, seconds)
+
+        Returns:
+            PipelineResult
+        """
+        result = PipelineResult()
+        metrics = {name: StageMetrics(name) for name in ("extract", "analyze", "embed")}
+        embed_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+
+        def _embed_stage():
+            """단일 임베딩 단계: 큐에서 문서를 모아 청크 수 기준으로 배치 처리"""
+            pending: List[Dict[str, Any]] = []
+            pending_chunks = 0
+
+            def _flush():
+                nonlocal pending, pending_chunks
+                if not pending:
+                    return
+                start = time.perf_counter()
+                try:
+                    embed_fn(pending)
+                    metrics["embed"].items += len(pending)
+                    if self.keep_documents:
+                        result.documents.extend(pending)
+                except Exception as e:
+                    logger.error(f"임베딩 단계 실패 ({len(pending)}개 문서): {e}")
+                    metrics["embed"].failures += len(pending)
+                    for doc in pending:
+                        result.failed.append({"file": doc.get("file_name", ""), "error": f"임베딩 실패: {e}"})
+                metrics["embed"].busy_seconds += time.perf_counter() - start
+                pending = []
+                pending_chunks = 0
+
+            while True:
+                item = embed_queue.get()
+                if item is _STOP:
+                    break
+                pending.append(item)
+                pending_chunks += self._count_chunks(item)
+                if pending_chunks >= self.embed_batch_chunks:
+                    _flush()
+            _flush()
+
+        embed_thread = threading.Thread(target=_embed_stage, name="embed-stage", daemon=True)
+        embed_thread.start()
+
+        wall_start = time.perf_counter()
+        paths = [str(path) for path in file_paths]
+        logger.info(f"병렬 적재 시작: {len(paths)}개 문서, 워커 {self.workers}개, 큐 크기 {self.queue_size}")
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.data_dir, self.enhanced_config, self.processor_options)
+            ) as executor:
+                in_flight: Dict[Any, str] = {}  # future -> 문서 경로
+                path_iter = iter(paths)
+
+                def _submit_next() -> bool:
+                    path = next(path_iter, None)
+                    if path is None:
+                        return False
+                    in_flight[executor.submit(_analyze_document, path)] = path
+                    return True
+
+                # 동시에 진행 중인 작업 수를 제한하여 메모리 사용량 제한
+                for _ in range(self.workers + self.queue_size):
+                    if not _submit_next():
+                        break
+
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        path = in_flight.pop(future)
+                        self._collect(future, path, metrics, result, embed_queue, progress_fn)
+                        _submit_next()
+        finally:
+            embed_queue.put(_STOP)
+            embed_thread.join()
+
+        result.wall_seconds = time.perf_counter() - wall_start
+        result.stage_metrics = {
+            name: stage.to_dict(result.wall_seconds) for name, stage in metrics.items()
+        }
+        self._report_metrics(metrics)
+
+        logger.info(
+            f"병렬 적재 완료: 성공 {len(result.documents)}개, 실패 {len(result.failed)}개, "
+            f"{result.wall_seconds:.2f}초"
+        )
+        return result
+
+    def _collect(self, future, file_path: str, metrics: Dict[str, StageMetrics], result: PipelineResult,
+                 embed_queue: "queue.Queue", progress_fn: Optional[Callable]):
+        """워커 결과 수집 후 임베딩 큐로 전달 (큐가 가득 차면 대기)"""
+        try:
+            outcome = future.result()
+        except Exception as e:
+            logger.error(f"워커 실행 실패 {file_path}: {e}")
+            metrics["extract"].failures += 1
+            result.failed.append({"file": os.path.basename(file_path), "error": str(e)})
+            if progress_fn:
+                progress_fn(file_path, False, 0.0)
+            return
+
+        timings = outcome.get("timings", {})
+        for stage_name, seconds in timings.items():
+            metrics[stage_name].busy_seconds += seconds
+        elapsed = sum(timings.values())
+        file_name = os.path.basename(outcome["file_path"])
+
+        if "error" in outcome:
+            metrics["extract"].failures += 1
+            result.failed.append({"file": file_name, "error": outcome["error"], "processing_time": elapsed})
+            if progress_fn:
+                progress_fn(outcome["file_path"], False, elapsed)
+            return
+
+        metrics["extract"].items += 1
+        metrics["analyze"].items += 1
+        embed_queue.put(outcome["document"])
+
+        if progress_fn:
+            progress_fn(outcome["file_path"], True, elapsed)
+
+    def _report_metrics(self, metrics: Dict[str, StageMetrics]):
+        """단계별 처리 시간을 메트릭 수집기로 전달 (모니터링 의존성이 없으면 생략)"""
+        try:
+            from monitoring.metrics.collector import get_metrics_collector
+            collector = get_metrics_collector()
+        except Exception:
+            return
+
+        for name, stage in metrics.items():
+            if stage.items:
+                collector.record_document_processing(
+                    f"pipeline_{name}", stage.busy_seconds / stage.items, True
+                )
@@ -0,0 +1,253 @@
+"""
+공용 키워드 사전 매칭 모듈
+- 메타데이터 추출, 청크 분류, 답변 도메인 판단, 검색 키워드 점수에 쓰이는 용어 목록을
+  하나의 Aho-Corasick 오토마톤으로 묶어 텍스트를 한 번만 훑어서 모든 용어 출현(위치, 범주)을 찾음
+- 처리 시간은 텍스트 길이 + 출현 수에 비례하며 사전 크기와 무관
+- pyahocorasick이 설치되어 있으면 사용하고, 없으면 용어 트라이를 컴파일한 정규식으로 한 번에 매칭
+- 대소문자 구분 없음 (영문 약어/단위 용도)
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """용어 출현"""
+    term: str
+    category: str
+    start: int
+    end: int
+
+
+class KeywordScan:
+    """한 텍스트의 사전 매칭 결과 (범주별 조회)"""
+
+    def __init__(self, text: str, matches: List[KeywordMatch]):
+        self.text = text
+        self.matches = matches
+        self._by_category: Dict[str, List[KeywordMatch]] = {}
+        for match in matches:
+            self._by_category.setdefault(match.category, []).append(match)
+
+    def occurrences(self, category: str) -> List[KeywordMatch]:
+        """범주의 모든 출현 (위치 순)"""
+        return self._by_category.get(category, [])
+
+    def terms(self, category: str) -> Set[str]:
+        """범주에서 한 번 이상 출현한 용어들"""
+        return {match.term for match in self._by_category.get(category, [])}
+
+    def count(self, category: str) -> int:
+        """범주에서 출현한 서로 다른 용어 수"""
+        return len(self.terms(category))
+
+    def any(self, category: str) -> bool:
+        return category in self._by_category
+
+
+class _TrieRegexAutomaton:
+    """
+    pyahocorasick이 없을 때 사용하는 대체 매칭기
+    - 용어 트라이를 하나의 정규식으로 컴파일하여 C 수준에서 한 번만 훑음 (위치마다 가장 긴 용어)
+    - 같은 위치에서 시작하는 더 짧은 용어는 가장 긴 용어의 접두어이므로 미리 계산한 목록으로 보충
+    """
+
+    def __init__(self, terms: List[str]):
+        trie: Dict[str, dict] = {}
+        for term in terms:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        self.pattern = re.compile(f"(?=({self._trie_pattern(trie)}))") if terms else None
+
+        term_ids = {term: i for i, term in enumerate(terms)}
+        self.term_ids = term_ids
+        self.term_lengths = [len(term) for term in terms]
+        # 용어 번호 -> 자기 자신을 포함한 접두어 용어 번호들
+        self.prefix_ids: List[List[int]] = [
+            [term_ids[term[:n]] for n in range(1, len(term) + 1) if term[:n] in term_ids]
+            for term in terms
+        ]
+
+    @classmethod
+    def _trie_pattern(cls, node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + cls._trie_pattern(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and "" not in node else f"(?:{'|'.join(branches)})"
+        # 용어가 끝나는 노드는 더 긴 용어를 먼저 시도 (탐욕적 선택)
+        return body + "?" if "" in node else body
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(끝 위치(포함), 용어 번호) 생성"""
+        if self.pattern is None:
+            return
+        term_ids, prefix_ids, term_lengths = self.term_ids, self.prefix_ids, self.term_lengths
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            for term_id in prefix_ids[term_ids[match.group(1)]]:
+                yield start + term_lengths[term_id] - 1, term_id
+
+
+class _SubstringScanner:
+    """용어가 적을 때의 대체 매칭기 (용어별 str.find 반복이 정규식 한 번보다 빠름)"""
+
+    def __init__(self, terms: List[str]):
+        self.terms = terms
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(끝 위치(포함), 용어 번호) 생성"""
+        for term_id, term in enumerate(self.terms):
+            position = text.find(term)
+            while position != -1:
+                yield position + len(term) - 1, term_id
+                position = text.find(term, position + 1)
+
+
+class KeywordMatcher:
+    """범주별 용어 사전을 하나의 오토마톤으로 매칭"""
+
+    # pyahocorasick이 없을 때 이 개수 미만의 용어는 str.find 반복으로 매칭
+    SMALL_VOCABULARY_SIZE = 24
+
+    def __init__(self, vocabularies: Optional[Dict[str, Iterable[str]]] = None, scan_cache_size: int = 32):
+        """
+        Args:
+            vocabularies: {범주: 용어 목록}
+            scan_cache_size: 최근 매칭 결과 캐시 크기 (같은 청크를 여러 분류기가 조회할 때 재사용)
+        """
+        self._lock = threading.RLock()
+        self._categories: Dict[str, List[str]] = {}
+        self._terms: List[str] = []
+        self._term_categories: List[List[str]] = []
+        self._automaton = None
+        self._scan_cache: "OrderedDict[str, KeywordScan]" = OrderedDict()
+        self.scan_cache_size = scan_cache_size
+
+        if vocabularies:
+            self.add_vocabulary(vocabularies)
+
+    def add_vocabulary(self, vocabularies: Dict[str, Iterable[str]], prefix: str = "") -> None:
+        """
+        용어 사전 등록 (같은 범주를 다시 등록하면 교체)
+
+        Args:
+            vocabularies: {범주 이름: 용어 목록}
+            prefix: 범주 이름 앞에 붙일 접두어 (예: "market_domain:")
+        """
+        with self._lock:
+            for name, terms in vocabularies.items():
+                self._categories[f"{prefix}{name}"] = [term for term in terms if term]
+            self._automaton = None
+            self._scan_cache.clear()
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self._categories)
+
+    def _build(self):
+        """오토마톤 구축 (등록 후 첫 매칭 시 한 번)"""
+        term_index: Dict[str, int] = {}
+        term_categories: List[List[str]] = []
+        for category, terms in self._categories.items():
+            for term in terms:
+                key = term.lower()
+                if key not in term_index:
+                    term_index[key] = len(term_index)
+                    term_categories.append([])
+                if category not in term_categories[term_index[key]]:
+                    term_categories[term_index[key]].append(category)
+
+        self._terms = list(term_index)
+        self._term_categories = term_categories
+
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for term_id, term in enumerate(self._terms):
+                automaton.add_word(term, term_id)
+            if self._terms:
+                automaton.make_automaton()
+            self._automaton = automaton
+        elif len(self._terms) < self.SMALL_VOCABULARY_SIZE:
+            self._automaton = _SubstringScanner(self._terms)
+        else:
+            self._automaton = _TrieRegexAutomaton(self._terms)
+
+        logger.debug(f"키워드 오토마톤 구축: 용어 {len(self._terms)}개, 범주 {len(self._categories)}개")
+
+    def _snapshot(self):
+        with self._lock:
+            if self._automaton is None:
+                self._build()
+            return self._automaton, self._terms, self._term_categories
+
+    def _iter_term_ids(self, automaton, terms: List[str], text: str) -> Iterator[Tuple[int, int, int]]:
+        if not terms or not text:
+            return
+        # 소문자 변환으로 길이가 바뀌는 드문 문자가 있으면 위치 보존을 위해 원문 사용
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            lowered = text
+        for end, term_id in automaton.iter(lowered):
+            yield end + 1 - len(terms[term_id]), end + 1, term_id
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """(시작, 끝, 용어) 생성 - 겹치는 출현 포함, 끝 위치 순"""
+        automaton, terms, _ = self._snapshot()
+        for start, end, term_id in self._iter_term_ids(automaton, terms, text):
+            yield start, end, terms[term_id]
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """모든 용어 출현을 범주와 함께 반환 (위치 순)"""
+        automaton, terms, term_categories = self._snapshot()
+        matches = []
+        for start, end, term_id in self._iter_term_ids(automaton, terms, text):
+            term = terms[term_id]
+            for category in term_categories[term_id]:
+                matches.append(KeywordMatch(term=term, category=category, start=start, end=end))
+        matches.sort(key=lambda m: (m.start, m.end))
+        return matches
+
+    def scan(self, text: str) -> KeywordScan:
+        """텍스트 매칭 결과 (최근 결과는 캐시에서 재사용)"""
+        with self._lock:
+            cached = self._scan_cache.get(text)
+            if cached is not None:
+                self._scan_cache.move_to_end(text)
+                return cached
+
+        result = KeywordScan(text, self.find_all(text))
+
+        with self._lock:
+            self._scan_cache[text] = result
+            while len(self._scan_cache) > self.scan_cache_size:
+                self._scan_cache.popitem(last=False)
+        return result
+
+
+_shared_matcher: Optional[KeywordMatcher] = None
+_shared_lock = threading.Lock()
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """공용 키워드 매처 싱글톤 반환 (각 구성 요소가 자기 용어 사전을 등록)"""
+    global _shared_matcher
+    with _shared_lock:
+        if _shared_matcher is None:
+            _shared_matcher = KeywordMatcher()
+        return _shared_matcher
@@ -10,6 +10,8 @@ from pathlib import Path
 from datetime import datetime
 import json
 
+from core.keyword_matcher import get_keyword_matcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,6 +78,9 @@ class MetadataExtractor:
             ]
         }
         
+        self.keyword_matcher = get_keyword_matcher()
+        self._register_entity_patterns()
+        
         # 문서 유형 패턴
         self.document_type_patterns = {
             "규칙": [r"규칙", r"규정", r"지침", r"기준"],
@@ -166,17 +171,16 @@ class MetadataExtractor:
         }
         
         # 엔티티 추출
-        for entity_type, patterns in self.entity_patterns.items():
-            entities = []
-            for pattern in patterns:
-                matches = re.finditer(pattern, content, re.IGNORECASE)
-                for match in matches:
-                    entities.append({
-                        "text": match.group(),
-                        "start_pos": match.start(),
-                        "end_pos": match.end(),
-                        "context": content[max(0, match.start()-30):match.end()+30]
-                    })
+        for entity_type, spans in self._find_entity_spans(content).items():
+            entities = [
+                {
+                    "text": content[start:end],
+                    "start_pos": start,
+                    "end_pos": end,
+                    "context": content[max(0, start-30):end+30]
+                }
+                for start, end in spans
+            ]
             
             if entities:
                 power_metadata["market_entities"][entity_type] = entities
@@ -191,6 +195,43 @@ class MetadataExtractor:
         
         return power_metadata
     
+    def _register_entity_patterns(self):
+        """엔티티 패턴 등록: 단순 용어는 공용 키워드 매처(한 번의 스캔)로, 나머지(날짜/시각 등)는 컴파일된 정규식으로 매칭"""
+        self._entity_literal_order: Dict[str, Dict[str, int]] = {}
+        self._entity_regexes: Dict[str, List[Tuple[int, re.Pattern]]] = {}
+        literal_vocabulary = {}
+        for entity_type, patterns in self.entity_patterns.items():
+            literals = {}
+            regexes = []
+            for index, pattern in enumerate(patterns):
+                if re.escape(pattern) == pattern:
+                    literals.setdefault(pattern.lower(), index)
+                else:
+                    regexes.append((index, re.compile(pattern, re.IGNORECASE)))
+            self._entity_literal_order[entity_type] = literals
+            self._entity_regexes[entity_type] = regexes
+            literal_vocabulary[entity_type] = list(literals)
+        self.keyword_matcher.add_vocabulary(literal_vocabulary, prefix="entity:")
+    
+    def _find_entity_spans(self, content: str) -> Dict[str, List[Tuple[int, int]]]:
+        """엔티티 유형별 출현 위치 (패턴 순서, 위치 순 - 패턴별 re.finditer와 같은 결과)"""
+        scan = self.keyword_matcher.scan(content)
+        spans = {}
+        for entity_type in self.entity_patterns:
+            literal_order = self._entity_literal_order[entity_type]
+            # 매처는 겹치는 출현도 모두 보고하므로 re.finditer처럼 용어별로 앞 출현과 겹치는 출현은 제외
+            found = []
+            last_end: Dict[str, int] = {}
+            for match in scan.occurrences(f"entity:{entity_type}"):
+                if match.start >= last_end.get(match.term, 0):
+                    found.append((literal_order[match.term], match.start, match.end))
+                    last_end[match.term] = match.end
+            for index, regex in self._entity_regexes[entity_type]:
+                found.extend((index, match.start(), match.end()) for match in regex.finditer(content))
+            found.sort()
+            spans[entity_type] = [(start, end) for _, start, end in found]
+        return spans
+    
     def _extract_structural_metadata(self, doc: Dict[str, Any]) -> Dict[str, Any]:
         """문서 구조 메타데이터 추출"""
         content = doc.get("content", {})
@@ -468,14 +509,12 @@ class MetadataExtractor:
     
     def _extract_domain_keywords(self, content: str) -> List[str]:
         """도메인 특화 키워드 추출"""
-        domain_keywords = []
+        domain_keywords = set()
         
-        for entity_type, patterns in self.entity_patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                domain_keywords.extend(matches)
+        for spans in self._find_entity_spans(content).values():
+            domain_keywords.update(content[start:end] for start, end in spans)
         
-        return list(set(domain_keywords))
+        return list(domain_keywords)
     
     def _extract_technical_terms(self, content: str) -> List[Dict[str, Any]]:
         """기술 용어 추출"""
@@ -4,13 +4,15 @@
 """
 
 import logging
-from typing import Dict, List, Optional, Union, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Union, Any, Tuple
 from pathlib import Path
+from dataclasses import dataclass, field
 import json
 import base64
 from datetime import datetime
 import re
 import io
+import time
 
 # PDF 처리
 try:
@@ -52,6 +54,44 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# 설정 키 -> MultimodalProcessor 생성자 인자
+MULTIMODAL_CONFIG_KEYS = {
+    "MULTIMODAL_PAGE_GATING": "gate_pages",
+    "MULTIMODAL_TIME_BUDGET": "time_budget_seconds",
+    "MULTIMODAL_INCLUDE_IMAGE_DATA": "include_image_data",
+}
+
+
+def multimodal_options(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """설정에서 MultimodalProcessor 생성자 인자 추출 (값이 없으면 생성자 기본값)"""
+    config = config or {}
+    return {arg: config[key] for key, arg in MULTIMODAL_CONFIG_KEYS.items() if config.get(key) is not None}
+
+
+@dataclass
+class PageContent:
+    """페이지 단위 처리 결과 (스트리밍 API에서 페이지마다 하나씩 생성)"""
+    document_id: str
+    file_path: str
+    page_number: int
+    total_pages: int
+    text: str
+    char_offset: int  # 문서 전체 텍스트(페이지 텍스트 + 줄바꿈 연결)에서 이 페이지의 시작 위치
+    paragraphs: List[Dict[str, Any]] = field(default_factory=list)
+    sentences: List[Dict[str, Any]] = field(default_factory=list)
+    images: List[Dict[str, Any]] = field(default_factory=list)
+    tables: List[Dict[str, Any]] = field(default_factory=list)
+    analysis: Dict[str, Any] = field(default_factory=dict)  # 페이지 사전 분류 신호와 OCR/표 감지 실행 여부
+
+
+@dataclass
+class PageSignals:
+    """OCR/표 감지 실행 여부를 정하는 페이지 사전 분류 신호 (모두 렌더링/디코딩 없이 계산)"""
+    text_chars: int
+    drawing_count: int
+    image_count: int
+    image_area_ratio: float  # 페이지 면적 대비 이미지 배치 영역 비율 (0~1)
+
 
 class MultimodalProcessor:
     """
@@ -65,7 +105,25 @@ class MultimodalProcessor:
     - 문서 구조 분석 (제목, 섹션, 문단)
     """
     
-    def __init__(self, data_dir: str = "data"):
+    # 페이지 사전 분류 기준
+    # - 표 감지: PyMuPDF 기본(lines) 전략은 벡터 선으로 그려진 표만 찾으므로 선이 거의 없으면 생략
+    # - OCR: 이미지가 페이지의 일정 비율 이상을 차지하거나, 텍스트 층이 거의 없는 스캔 페이지일 때만 실행
+    MIN_TABLE_DRAWINGS = 6
+    MIN_OCR_IMAGE_AREA_RATIO = 0.15
+    SCANNED_PAGE_MAX_TEXT_CHARS = 50
+    
+    def __init__(self,
+                 data_dir: str = "data",
+                 gate_pages: bool = True,
+                 time_budget_seconds: Optional[float] = None,
+                 include_image_data: bool = False):
+        """
+        Args:
+            data_dir: 데이터 디렉토리
+            gate_pages: 페이지 사전 분류로 OCR/표 감지 실행 여부 결정 (False면 모든 페이지에서 실행)
+            time_budget_seconds: 문서당 OCR/표 감지에 쓸 최대 시간 (초과 후 페이지는 OCR 지연, 표 감지 생략)
+            include_image_data: 이미지 base64 샘플 포함 여부 (False면 인코딩하지 않음)
+        """
         self.data_dir = Path(data_dir)
         self.documents_dir = self.data_dir / "documents"
         self.processed_dir = self.data_dir / "processed"
@@ -73,14 +131,13 @@ class MultimodalProcessor:
         # 디렉토리 생성
         self.processed_dir.mkdir(parents=True, exist_ok=True)
         
-        # OCR 초기화
+        self.gate_pages = gate_pages
+        self.time_budget_seconds = time_budget_seconds
+        self.include_image_data = include_image_data
+        
+        # OCR 리더는 처음 OCR이 필요할 때 초기화
         self.ocr_reader = None
-        if OCR_AVAILABLE:
-            try:
-                self.ocr_reader = easyocr.Reader(['ko', 'en'])
-                logger.info("OCR 리더 초기화 완료")
-            except Exception as e:
-                logger.warning(f"OCR 리더 초기화 실패: {e}")
+        self._ocr_reader_checked = False
         
         # 처리 통계
         self.processing_stats = {
@@ -88,9 +145,25 @@ class MultimodalProcessor:
             "processed_documents": 0,
             "extracted_images": 0,
             "extracted_tables": 0,
-            "extracted_formulas": 0
+            "extracted_formulas": 0,
+            "ocr_pages": 0,
+            "ocr_deferred_pages": 0,
+            "table_pages": 0,
+            "table_skipped_pages": 0
         }
     
+    def _get_ocr_reader(self):
+        """OCR 리더 지연 초기화 (사용 불가하면 None)"""
+        if not self._ocr_reader_checked:
+            self._ocr_reader_checked = True
+            if OCR_AVAILABLE:
+                try:
+                    self.ocr_reader = easyocr.Reader(['ko', 'en'])
+                    logger.info("OCR 리더 초기화 완료")
+                except Exception as e:
+                    logger.warning(f"OCR 리더 초기화 실패: {e}")
+        return self.ocr_reader
+    
     def process_document(self, file_path: Union[str, Path]) -> Dict[str, Any]:
         """
         문서 전체 처리
@@ -147,41 +220,30 @@ class MultimodalProcessor:
         start_time = datetime.now()
         
         try:
-            # PyMuPDF로 처리 (이미지, 표 추출 가능)
+            # PyMuPDF로 처리 (이미지, 표 추출 가능) - 페이지 스트림을 모아 문서 단위 결과 구성
             if PDF_AVAILABLE:
-                doc = fitz.open(file_path)
-                result["metadata"]["total_pages"] = len(doc)
-                
-                full_text = ""
-                sections = []
+                text_parts = []
                 paragraphs = []
+                sentences = []
                 images = []
                 tables = []
+                page_analysis = []
                 
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    
-                    # 텍스트 추출
-                    page_text = page.get_text()
-                    full_text += page_text + "\n"
-                    
-                    # 이미지 추출
-                    page_images = self._extract_images_from_page(page, page_num)
-                    images.extend(page_images)
-                    
-                    # 표 추출 시도
-                    page_tables = self._extract_tables_from_page(page, page_num)
-                    tables.extend(page_tables)
-                    
-                    # 페이지별 문단 분석
-                    page_paragraphs = self._analyze_paragraphs(page_text, page_num)
-                    paragraphs.extend(page_paragraphs)
+                for page in self.iter_pages(file_path):
+                    result["metadata"]["total_pages"] = page.total_pages
+                    text_parts.append(page.text)
+                    text_parts.append("\n")
+                    paragraphs.extend(page.paragraphs)
+                    sentences.extend(page.sentences)
+                    images.extend(page.images)
+                    tables.extend(page.tables)
+                    page_analysis.append(page.analysis)
                 
-                doc.close()
+                full_text = "".join(text_parts)
+                del text_parts
                 
                 # 문서 구조 분석
                 sections = self._analyze_document_structure(full_text)
-                sentences = self._extract_sentences(paragraphs)
                 
                 # 결과 구성
                 result["content"]["document"] = full_text.strip()
@@ -190,6 +252,10 @@ class MultimodalProcessor:
                 result["content"]["sentences"] = sentences
                 result["multimodal_content"]["images"] = images
                 result["multimodal_content"]["tables"] = tables
+                result["metadata"]["page_analysis"] = page_analysis
+                result["metadata"]["deferred_ocr_pages"] = [
+                    analysis["page_number"] for analysis in page_analysis if analysis.get("ocr") == "deferred"
+                ]
                 
                 # 수식 추출
                 formulas = self._extract_formulas(full_text)
@@ -213,8 +279,210 @@ class MultimodalProcessor:
         logger.info(f"PDF 처리 완료: {file_path.name} ({processing_time:.2f}ms)")
         return result
     
-    def _extract_images_from_page(self, page, page_num: int) -> List[Dict[str, Any]]:
-        """페이지에서 이미지 추출"""
+    def iter_pages(self, file_path: Union[str, Path]) -> Iterator[PageContent]:
+        """
+        PDF를 한 페이지씩 처리하여 생성하는 스트리밍 API
+        - 페이지의 텍스트, 문단, 문장, 표, 이미지를 처리 즉시 반환하고 다음 페이지로 넘어감
+        - 소비하는 쪽이 페이지를 보관하지 않으면 메모리 사용량은 문서 길이와 무관하게 몇 페이지 분량으로 유지
+        - 문서 전체가 필요한 섹션/수식 분석은 process_document에서 수행
+        
+        Args:
+            file_path: PDF 파일 경로
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+        if file_path.suffix.lower() != '.pdf':
+            logger.warning(f"지원하지 않는 파일 타입: {file_path.suffix}")
+            return
+        if not PDF_AVAILABLE:
+            logger.warning("PyMuPDF가 설치되지 않아 페이지를 처리할 수 없습니다")
+            return
+        
+        doc = fitz.open(file_path)
+        try:
+            total_pages = len(doc)
+            char_offset = 0
+            sentence_index = 0
+            spent_seconds = 0.0  # 문서에서 OCR/표 감지에 쓴 시간
+            
+            for page_num in range(total_pages):
+                page = doc.load_page(page_num)
+                page_text = page.get_text()
+                
+                paragraphs = self._analyze_paragraphs(page_text, page_num)
+                sentences = self._extract_sentences(paragraphs, start_index=sentence_index)
+                sentence_index += len(sentences)
+                
+                # 사전 분류 + 시간 예산으로 비싼 단계 실행 여부 결정
+                signals = self._classify_page(page, page_text)
+                within_budget = self.time_budget_seconds is None or spent_seconds < self.time_budget_seconds
+                run_ocr = within_budget and self._should_run_ocr(signals)
+                run_tables = within_budget and self._should_detect_tables(signals)
+                
+                start = time.perf_counter()
+                images = self._extract_images_from_page(page, page_num, run_ocr=run_ocr)
+                tables = self._extract_tables_from_page(page, page_num) if run_tables else []
+                spent_seconds += time.perf_counter() - start
+                
+                analysis = self._page_analysis(page_num, signals, images, run_ocr, run_tables, within_budget)
+                
+                page_content = PageContent(
+                    document_id=file_path.stem,
+                    file_path=str(file_path),
+                    page_number=page_num,
+                    total_pages=total_pages,
+                    text=page_text,
+                    char_offset=char_offset,
+                    paragraphs=paragraphs,
+                    sentences=sentences,
+                    images=images,
+                    tables=tables,
+                    analysis=analysis
+                )
+                page = None
+                
+                yield page_content
+                char_offset += len(page_text) + 1
+        finally:
+            doc.close()
+    
+    def _classify_page(self, page, page_text: str) -> PageSignals:
+        """페이지 사전 분류 신호 계산 (이미지 디코딩/표 분석 없이 배치 정보만 사용)"""
+        page_area = abs(page.rect.width * page.rect.height) or 1.0
+        
+        image_count = 0
+        image_area = 0.0
+        try:
+            for info in page.get_image_info():
+                x0, y0, x1, y1 = info["bbox"]
+                image_area += abs((x1 - x0) * (y1 - y0))
+                image_count += 1
+        except Exception as e:
+            logger.debug(f"이미지 배치 정보 조회 실패: {e}")
+            image_count = len(page.get_images())
+            image_area = page_area if image_count else 0.0
+        
+        try:
+            drawings = page.get_cdrawings() if hasattr(page, "get_cdrawings") else page.get_drawings()
+            drawing_count = len(drawings)
+        except Exception as e:
+            logger.debug(f"벡터 그림 정보 조회 실패: {e}")
+            drawing_count = self.MIN_TABLE_DRAWINGS
+        
+        return PageSignals(
+            text_chars=len(page_text.strip()),
+            drawing_count=drawing_count,
+            image_count=image_count,
+            image_area_ratio=min(1.0, image_area / page_area)
+        )
+    
+    def _should_run_ocr(self, signals: PageSignals) -> bool:
+        """OCR 실행 여부 (이미지가 크거나 텍스트 층이 없는 스캔 페이지)"""
+        if signals.image_count == 0:
+            return False
+        if not self.gate_pages:
+            return True
+        return (signals.image_area_ratio >= self.MIN_OCR_IMAGE_AREA_RATIO
+                or signals.text_chars <= self.SCANNED_PAGE_MAX_TEXT_CHARS)
+    
+    def _should_detect_tables(self, signals: PageSignals) -> bool:
+        """표 감지 실행 여부 (표 테두리가 될 벡터 선이 충분한 페이지)"""
+        if not self.gate_pages:
+            return True
+        return signals.drawing_count >= self.MIN_TABLE_DRAWINGS
+    
+    def _page_analysis(self,
+                       page_num: int,
+                       signals: PageSignals,
+                       images: List[Dict[str, Any]],
+                       run_ocr: bool,
+                       run_tables: bool,
+                       within_budget: bool) -> Dict[str, Any]:
+        """페이지 분석 기록 및 통계 반영"""
+        if not images:
+            ocr_status = "none"
+        elif run_ocr and self.ocr_reader is not None:
+            ocr_status = "done"
+        elif run_ocr:
+            ocr_status = "unavailable"
+        else:
+            ocr_status = "deferred"
+        
+        if run_tables:
+            table_status = "done"
+        elif not within_budget:
+            table_status = "skipped_budget"
+        else:
+            table_status = "skipped"
+        
+        if ocr_status == "done":
+            self.processing_stats["ocr_pages"] += 1
+        elif ocr_status == "deferred":
+            self.processing_stats["ocr_deferred_pages"] += 1
+        if run_tables:
+            self.processing_stats["table_pages"] += 1
+        else:
+            self.processing_stats["table_skipped_pages"] += 1
+        
+        return {
+            "page_number": page_num,
+            "text_chars": signals.text_chars,
+            "drawing_count": signals.drawing_count,
+            "image_count": signals.image_count,
+            "image_area_ratio": round(signals.image_area_ratio, 4),
+            "ocr": ocr_status,
+            "tables": table_status
+        }
+    
+    def run_deferred_ocr(self, file_path: Union[str, Path], page_number: int) -> List[Dict[str, Any]]:
+        """
+        지연된 OCR을 특정 페이지에 대해 실행
+        
+        Args:
+            file_path: PDF 파일 경로
+            page_number: 페이지 번호 (0부터)
+            
+        Returns:
+            OCR 텍스트가 채워진 페이지 이미지 정보
+        """
+        if not PDF_AVAILABLE:
+            logger.warning("PyMuPDF가 설치되지 않아 OCR을 실행할 수 없습니다")
+            return []
+        
+        with fitz.open(Path(file_path)) as doc:
+            page = doc.load_page(page_number)
+            images = self._extract_images_from_page(page, page_number, run_ocr=True)
+        
+        if images and self.ocr_reader is not None:
+            self.processing_stats["ocr_pages"] += 1
+        return images
+    
+    def apply_deferred_ocr(self, processed_doc: Dict[str, Any], page_number: int) -> List[Dict[str, Any]]:
+        """
+        처리된 문서의 특정 페이지에 지연된 OCR을 실행하고 결과를 반영
+        
+        Args:
+            processed_doc: process_document 결과
+            page_number: 페이지 번호 (0부터)
+        """
+        images = self.run_deferred_ocr(processed_doc["file_path"], page_number)
+        if not images or self.ocr_reader is None:
+            return images
+        
+        multimodal = processed_doc.setdefault("multimodal_content", {})
+        others = [image for image in multimodal.get("images", []) if image.get("page_number") != page_number]
+        multimodal["images"] = sorted(others + images, key=lambda image: (image["page_number"], image["image_index"]))
+        
+        metadata = processed_doc.setdefault("metadata", {})
+        metadata["deferred_ocr_pages"] = [p for p in metadata.get("deferred_ocr_pages", []) if p != page_number]
+        for analysis in metadata.get("page_analysis", []):
+            if analysis.get("page_number") == page_number:
+                analysis["ocr"] = "done"
+        return images
+    
+    def _extract_images_from_page(self, page, page_num: int, run_ocr: bool = True) -> List[Dict[str, Any]]:
+        """페이지에서 이미지 추출 (run_ocr=False이면 OCR은 나중에 run_deferred_ocr로 실행)"""
         images = []
         
         try:
@@ -230,30 +498,34 @@ class MultimodalProcessor:
                         # 이미지를 bytes로 변환
                         img_data = pix.tobytes("png")
                         
-                        # Base64 인코딩 (필요시)
-                        img_base64 = base64.b64encode(img_data).decode()
-                        
-                        # OCR 수행 (가능한 경우)
+                        # OCR 수행 (사전 분류에서 선택된 페이지, 가능한 경우)
                         ocr_text = ""
-                        if self.ocr_reader and len(img_data) < 5 * 1024 * 1024:  # 5MB 미만만
+                        ocr_reader = self._get_ocr_reader() if run_ocr else None
+                        if ocr_reader and len(img_data) < 5 * 1024 * 1024:  # 5MB 미만만
                             try:
                                 # PIL Image로 변환하여 OCR
                                 pil_img = Image.open(io.BytesIO(img_data))
-                                ocr_results = self.ocr_reader.readtext(np.array(pil_img))
+                                ocr_results = ocr_reader.readtext(np.array(pil_img))
                                 ocr_text = " ".join([result[1] for result in ocr_results])
                             except Exception as e:
                                 logger.debug(f"OCR 실패 (페이지 {page_num}, 이미지 {img_index}): {e}")
                         
-                        images.append({
+                        image_info = {
                             "page_number": page_num,
                             "image_index": img_index,
                             "width": pix.width,
                             "height": pix.height,
                             "size_bytes": len(img_data),
                             "ocr_text": ocr_text,
-                            "description": self._generate_image_description(ocr_text, pix.width, pix.height),
-                            "base64_data": img_base64[:1000] + "..." if len(img_base64) > 1000 else img_base64  # 샘플만
-                        })
+                            "description": self._generate_image_description(ocr_text, pix.width, pix.height)
+                        }
+                        
+                        # Base64 샘플 (요청 시에만, 1000자 샘플에 필요한 앞 750바이트만 인코딩)
+                        if self.include_image_data:
+                            sample = base64.b64encode(img_data[:750]).decode()
+                            image_info["base64_data"] = sample + "..." if len(img_data) > 750 else sample
+                        
+                        images.append(image_info)
                     
                     pix = None
                     
@@ -393,10 +665,10 @@ class MultimodalProcessor:
         
         return paragraphs
     
-    def _extract_sentences(self, paragraphs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """문장 추출"""
+    def _extract_sentences(self, paragraphs: List[Dict[str, Any]], start_index: int = 0) -> List[Dict[str, Any]]:
+        """문장 추출 (start_index: 페이지 단위로 나눠 호출할 때 이어지는 문장 번호)"""
         sentences = []
-        sentence_index = 0
+        sentence_index = start_index
         
         for para in paragraphs:
             content = para["content"]
@@ -0,0 +1,336 @@
+"""
+관계 그래프 저장소
+- 문서 관계를 CSR(압축 희소 행) 인접 배열로 색인
+- 노드별 이웃은 관련성 점수(strength x confidence) 내림차순으로 정렬되어 저장
+- 이웃 조회는 해당 노드의 차수(degree)에 비례하는 시간에 처리
+- numpy 배열(.npy)로 저장하고 시작 시 메모리 매핑으로 로드
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# os.pread가 없는 플랫폼(Windows)에서는 잠금 안에서 seek + read
+HAS_PREAD = hasattr(os, "pread")
+
+
+class RelationshipGraph:
+    """CSR 인접 배열 기반 관계 그래프"""
+
+    FORMAT_VERSION = 1
+
+    # 인접 항목 방향: 노드 기준으로 나가는 관계(source)인지 들어오는 관계(target)인지
+    OUTGOING = 1
+    INCOMING = 0
+
+    def __init__(self,
+                 node_ids: List[str],
+                 relationship_types: List[str],
+                 indptr: np.ndarray,
+                 neighbors: np.ndarray,
+                 adjacency_edges: np.ndarray,
+                 directions: np.ndarray,
+                 edge_types: np.ndarray,
+                 edge_strength: np.ndarray,
+                 edge_confidence: np.ndarray,
+                 edge_records: Optional[List[Dict[str, Any]]] = None,
+                 edge_file: Optional[Path] = None,
+                 edge_offsets: Optional[np.ndarray] = None):
+        self.node_ids = node_ids
+        self.node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+        self.relationship_types = relationship_types
+        self.type_codes = {name: code for code, name in enumerate(relationship_types)}
+
+        self.indptr = indptr
+        self.neighbors = neighbors
+        self.adjacency_edges = adjacency_edges
+        self.directions = directions
+
+        self.edge_types = edge_types
+        self.edge_strength = edge_strength
+        self.edge_confidence = edge_confidence
+
+        # 관계 상세 정보 (메모리에 보관하거나, 파일 오프셋으로 필요할 때 읽음)
+        self._edge_records = edge_records
+        self._edge_file = edge_file
+        self._edge_offsets = edge_offsets
+        self._edge_handle = None
+        self._edge_lock = threading.Lock()
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.edge_strength.shape[0])
+
+    @classmethod
+    def build(cls, relationships: Iterable[Any], relationship_types: Optional[List[str]] = None) -> "RelationshipGraph":
+        """
+        관계 리스트로부터 그래프 구축 (O(V + E log d))
+
+        Args:
+            relationships: DocumentRelationship 또는 to_dict() 형태의 관계들
+            relationship_types: 관계 유형 이름 목록 (코드 순서 고정용)
+        """
+        records = [rel if isinstance(rel, dict) else rel.to_dict() for rel in relationships]
+
+        type_names = list(relationship_types or [])
+        for record in records:
+            if record["relationship_type"] not in type_names:
+                type_names.append(record["relationship_type"])
+        type_codes = {name: code for code, name in enumerate(type_names)}
+
+        node_index: Dict[str, int] = {}
+        sources = np.empty(len(records), dtype=np.int64)
+        targets = np.empty(len(records), dtype=np.int64)
+        for e, record in enumerate(records):
+            sources[e] = node_index.setdefault(record["source_id"], len(node_index))
+            targets[e] = node_index.setdefault(record["target_id"], len(node_index))
+        node_ids = list(node_index)
+
+        edge_types = np.array([type_codes[r["relationship_type"]] for r in records], dtype=np.int16)
+        edge_strength = np.array([r["strength"] for r in records], dtype=np.float32)
+        edge_confidence = np.array([r["confidence"] for r in records], dtype=np.float32)
+
+        # 양 끝점 모두에 인접 항목 추가 (관계는 양방향으로 조회)
+        edge_ids = np.arange(len(records), dtype=np.int64)
+        owners = np.concatenate([sources, targets])
+        neighbors = np.concatenate([targets, sources])
+        adjacency_edges = np.concatenate([edge_ids, edge_ids])
+        directions = np.concatenate([
+            np.full(len(records), cls.OUTGOING, dtype=np.int8),
+            np.full(len(records), cls.INCOMING, dtype=np.int8)
+        ])
+
+        # 노드 순, 노드 안에서는 관련성 점수 내림차순 정렬
+        relevance = (edge_strength * edge_confidence)[adjacency_edges] if records else np.empty(0, dtype=np.float32)
+        order = np.lexsort((-relevance, owners))
+
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners, minlength=len(node_ids)), out=indptr[1:])
+
+        graph = cls(
+            node_ids=node_ids,
+            relationship_types=type_names,
+            indptr=indptr,
+            neighbors=neighbors[order].astype(np.int32),
+            adjacency_edges=adjacency_edges[order].astype(np.int32),
+            directions=directions[order],
+            edge_types=edge_types,
+            edge_strength=edge_strength,
+            edge_confidence=edge_confidence,
+            edge_records=records
+        )
+        logger.info(f"관계 그래프 구축 완료: 노드 {graph.num_nodes}개, 관계 {graph.num_edges}개")
+        return graph
+
+    def save(self, directory: Union[str, Path]):
+        """그래프를 디렉토리에 저장 (배열은 .npy, 관계 상세는 JSON Lines)"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        np.save(directory / "indptr.npy", np.asarray(self.indptr))
+        np.save(directory / "neighbors.npy", np.asarray(self.neighbors))
+        np.save(directory / "adjacency_edges.npy", np.asarray(self.adjacency_edges))
+        np.save(directory / "directions.npy", np.asarray(self.directions))
+        np.save(directory / "edge_types.npy", np.asarray(self.edge_types))
+        np.save(directory / "edge_strength.npy", np.asarray(self.edge_strength))
+        np.save(directory / "edge_confidence.npy", np.asarray(self.edge_confidence))
+
+        # 관계 상세 정보: 줄 단위 JSON + 바이트 오프셋 (필요한 관계만 읽기 위함)
+        offsets = np.zeros(self.num_edges + 1, dtype=np.int64)
+        with open(directory / "edges.jsonl", "wb") as f:
+            for e in range(self.num_edges):
+                line = (json.dumps(self.get_edge(e), ensure_ascii=False, default=str) + "\n").encode("utf-8")
+                f.write(line)
+                offsets[e + 1] = offsets[e] + len(line)
+        np.save(directory / "edge_offsets.npy", offsets)
+
+        with open(directory / "graph.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "format_version": self.FORMAT_VERSION,
+                "node_ids": self.node_ids,
+                "relationship_types": self.relationship_types,
+                "num_edges": self.num_edges
+            }, f, ensure_ascii=False)
+
+        logger.info(f"관계 그래프 저장 완료: {directory}")
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> "RelationshipGraph":
+        """저장된 그래프 로드 (기본적으로 배열은 읽기 전용 메모리 매핑)"""
+        directory = Path(directory)
+        mmap_mode = "r" if mmap else None
+
+        with open(directory / "graph.json", "r", encoding="utf-8") as f:
+            header = json.load(f)
+
+        def _load(name: str) -> np.ndarray:
+            return np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+
+        graph = cls(
+            node_ids=header["node_ids"],
+            relationship_types=header["relationship_types"],
+            indptr=_load("indptr"),
+            neighbors=_load("neighbors"),
+            adjacency_edges=_load("adjacency_edges"),
+            directions=_load("directions"),
+            edge_types=_load("edge_types"),
+            edge_strength=_load("edge_strength"),
+            edge_confidence=_load("edge_confidence"),
+            edge_file=directory / "edges.jsonl",
+            edge_offsets=_load("edge_offsets")
+        )
+        logger.info(f"관계 그래프 로드 완료: 노드 {graph.num_nodes}개, 관계 {graph.num_edges}개")
+        return graph
+
+    @staticmethod
+    def exists(directory: Union[str, Path]) -> bool:
+        return (Path(directory) / "graph.json").exists()
+
+    def get_edge(self, edge_id: int) -> Dict[str, Any]:
+        """관계 상세 정보 반환"""
+        if self._edge_records is not None:
+            return self._edge_records[edge_id]
+
+        start = int(self._edge_offsets[edge_id])
+        end = int(self._edge_offsets[edge_id + 1])
+        with self._edge_lock:
+            if self._edge_handle is None:
+                self._edge_handle = open(self._edge_file, "rb")
+            if not HAS_PREAD:
+                self._edge_handle.seek(start)
+                return json.loads(self._edge_handle.read(end - start).decode("utf-8"))
+            fd = self._edge_handle.fileno()
+        # 위치 지정 읽기는 파일 위치를 공유하지 않으므로 여러 스레드가 동시에 조회 가능
+        return json.loads(os.pread(fd, end - start, start).decode("utf-8"))
+
+    def degree(self, node_id: str) -> int:
+        node = self.node_index.get(node_id)
+        if node is None:
+            return 0
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def _type_filter(self, relationship_types: Optional[Iterable[Any]]) -> Optional[np.ndarray]:
+        if not relationship_types:
+            return None
+        codes = []
+        for rel_type in relationship_types:
+            name = getattr(rel_type, "value", rel_type)
+            if name in self.type_codes:
+                codes.append(self.type_codes[name])
+        return np.array(codes, dtype=self.edge_types.dtype)
+
+    def neighbors_of(self,
+                     node_id: str,
+                     relationship_types: Optional[Iterable[Any]] = None,
+                     min_strength: float = 0.0,
+                     max_results: Optional[int] = None) -> List[Tuple[str, int, float]]:
+        """
+        노드의 이웃 조회 (O(degree))
+
+        Returns:
+            [(이웃 노드 ID, 관계 번호, 관련성 점수), ...] 관련성 점수 내림차순
+        """
+        node = self.node_index.get(node_id)
+        if node is None:
+            return []
+
+        start, end = int(self.indptr[node]), int(self.indptr[node + 1])
+        edge_ids = np.asarray(self.adjacency_edges[start:end])
+        mask = np.asarray(self.edge_strength)[edge_ids] >= min_strength
+        type_codes = self._type_filter(relationship_types)
+        if type_codes is not None:
+            mask &= np.isin(np.asarray(self.edge_types)[edge_ids], type_codes)
+
+        selected = np.nonzero(mask)[0]
+        if max_results is not None:
+            selected = selected[:max_results]
+
+        neighbor_ids = np.asarray(self.neighbors[start:end])
+        relevance = (np.asarray(self.edge_strength)[edge_ids] * np.asarray(self.edge_confidence)[edge_ids])
+        return [
+            (self.node_ids[int(neighbor_ids[i])], int(edge_ids[i]), float(relevance[i]))
+            for i in selected
+        ]
+
+    def expand(self,
+               node_id: str,
+               max_hops: int = 2,
+               limit: int = 50,
+               relationship_types: Optional[Iterable[Any]] = None,
+               min_strength: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        다중 홉 확장 (너비 우선)
+
+        Returns:
+            [{"document_id", "hops", "path_score", "via"}, ...] - 출발 노드 제외, 최대 limit개
+        """
+        if node_id not in self.node_index:
+            return []
+
+        visited = {node_id}
+        results = []
+        frontier = deque([(node_id, 0, 1.0)])
+
+        while frontier and len(results) < limit:
+            current, hops, score = frontier.popleft()
+            if hops >= max_hops:
+                continue
+            for neighbor, edge_id, relevance in self.neighbors_of(current, relationship_types, min_strength):
+                if neighbor in visited:
+                    continue
+                visited.add(neighbor)
+                path_score = score * relevance
+                results.append({
+                    "document_id": neighbor,
+                    "hops": hops + 1,
+                    "path_score": path_score,
+                    "via": current,
+                    "edge_id": edge_id
+                })
+                frontier.append((neighbor, hops + 1, path_score))
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    def node_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """노드별 입출력 관계 통계 (O(V + E))"""
+        adjacency_edges = np.asarray(self.adjacency_edges)
+        directions = np.asarray(self.directions)
+        strength = np.asarray(self.edge_strength)[adjacency_edges]
+        owners = np.repeat(np.arange(self.num_nodes), np.diff(np.asarray(self.indptr)))
+
+        outgoing = directions == self.OUTGOING
+        out_count = np.bincount(owners[outgoing], minlength=self.num_nodes)
+        in_count = np.bincount(owners[~outgoing], minlength=self.num_nodes)
+        out_sum = np.bincount(owners[outgoing], weights=strength[outgoing], minlength=self.num_nodes)
+        in_sum = np.bincount(owners[~outgoing], weights=strength[~outgoing], minlength=self.num_nodes)
+
+        stats = {}
+        for i, node_id in enumerate(self.node_ids):
+            stats[node_id] = {
+                "incoming_count": int(in_count[i]),
+                "outgoing_count": int(out_count[i]),
+                "total_connections": int(in_count[i] + out_count[i]),
+                "avg_incoming_strength": float(in_sum[i] / in_count[i]) if in_count[i] else 0,
+                "avg_outgoing_strength": float(out_sum[i] / out_count[i]) if out_count[i] else 0
+            }
+        return stats
+
+    def close(self):
+        with self._edge_lock:
+            if self._edge_handle is not None:
+                self._edge_handle.close()
+                self._edge_handle = None
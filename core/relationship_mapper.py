@@ -13,6 +13,10 @@ from datetime import datetime
 import numpy as np
 from collections import defaultdict, Counter
 
+from core.similarity_pairs import blockwise_similar_pairs, approximate_similar_pairs
+from data.vectors.vector_utils import normalize_embeddings
+from core.relationship_graph import RelationshipGraph
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,9 +82,26 @@ class PowerMarketRelationshipMapper:
     - 전력시장 도메인 특화 연관 규칙 적용
     """
     
-    def __init__(self, embedder=None):
+    def __init__(self,
+                 embedder=None,
+                 semantic_top_k: Optional[int] = 20,
+                 semantic_block_size: int = 1024,
+                 approximate_above: int = 50000):
+        """
+        Args:
+            embedder: 임베딩이 없는 문서를 인코딩할 임베더
+            semantic_top_k: 문서별 최대 의미적 유사 관계 수 (None이면 임계값 이상 전부)
+            semantic_block_size: 유사도 행렬 블록 크기 (메모리 사용량 = 블록 x 문서 수)
+            approximate_above: 이 문서 수를 넘으면 근사 이웃 탐색 사용
+        """
         self.embedder = embedder
         self.relationships: List[DocumentRelationship] = []
+        self.graph: Optional[RelationshipGraph] = None
+        
+        # 의미적 유사성 탐색 설정
+        self.semantic_top_k = semantic_top_k
+        self.semantic_block_size = semantic_block_size
+        self.approximate_above = approximate_above
         
         # 전력시장 특화 관계 규칙
         self.domain_rules = self._initialize_domain_rules()
@@ -224,6 +245,10 @@ class PowerMarketRelationshipMapper:
         # 통계 업데이트
         self._update_statistics(relationships, len(documents))
         
+        # 관계 보관 및 인접 색인 구축
+        self.relationships = relationships
+        self.graph = RelationshipGraph.build(relationships, [t.value for t in RelationshipType])
+        
         logger.info(f"관계 분석 완료: {len(relationships)}개 관계 발견")
         return relationships
     
@@ -300,57 +325,64 @@ class PowerMarketRelationshipMapper:
         return referenced_docs
     
     def _extract_semantic_relationships(self, documents: List[Dict[str, Any]]) -> List[DocumentRelationship]:
-        """의미적 유사성 기반 관계 추출"""
+        """
+        의미적 유사성 기반 관계 추출
+        
+        임베딩을 정규화된 float32 행렬로 쌓아 블록 단위 행렬곱으로 유사도를 계산하고,
+        행별 top-k 중 semantic_thresholds["minimum"] 이상인 쌍만 관계로 만듦.
+        문서 수가 approximate_above를 넘으면 군집 기반 근사 탐색 사용
+        """
         relationships = []
         
-        if not self.embedder:
+        if not self.embedder or len(documents) < 2:
             return relationships
         
-        # 문서별 임베딩 추출
-        embeddings = []
-        for doc in documents:
-            embedding = doc.get("embedding")
-            if embedding is not None:
-                if isinstance(embedding, list):
-                    embedding = np.array(embedding)
-                embeddings.append(embedding)
-            else:
-                # 임베딩이 없으면 텍스트로부터 생성
-                text = doc.get("text", "")
-                embedding = self.embedder.encode_text(text)
-                embeddings.append(embedding)
-        
-        # 모든 문서 쌍에 대해 유사도 계산
-        for i, source_doc in enumerate(documents):
-            for j, target_doc in enumerate(documents[i+1:], i+1):
-                if i >= len(embeddings) or j >= len(embeddings):
-                    continue
-                
-                # 코사인 유사도 계산
-                similarity = self._calculate_cosine_similarity(embeddings[i], embeddings[j])
-                
-                if similarity >= self.semantic_thresholds["minimum"]:
-                    # 유사성 강도 결정
-                    strength_category = self._categorize_similarity(similarity)
-                    
-                    relationship = DocumentRelationship(
-                        source_id=source_doc.get("document_id"),
-                        target_id=target_doc.get("document_id"),
-                        relationship_type=RelationshipType.SEMANTIC_SIMILARITY,
-                        strength=similarity,
-                        confidence=0.85,
-                        description=f"의미적 유사성 ({strength_category})",
-                        evidence=[
-                            source_doc.get("text", "")[:100] + "...",
-                            target_doc.get("text", "")[:100] + "..."
-                        ],
-                        metadata={
-                            "similarity_score": similarity,
-                            "strength_category": strength_category
-                        },
-                        created_at=datetime.now().isoformat()
-                    )
-                    relationships.append(relationship)
+        # 문서별 임베딩 추출 (없는 문서는 한 번에 배치 인코딩)
+        embeddings = [doc.get("embedding") for doc in documents]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            encoded = self.embedder.encode_batch([documents[i].get("text", "") for i in missing])
+            for i, embedding in zip(missing, encoded):
+                embeddings[i] = embedding
+        
+        matrix = normalize_embeddings(embeddings)
+        threshold = self.semantic_thresholds["minimum"]
+        
+        if len(documents) > self.approximate_above:
+            rows, cols, sims = approximate_similar_pairs(
+                matrix, threshold, top_k=self.semantic_top_k, block_size=self.semantic_block_size
+            )
+        else:
+            rows, cols, sims = blockwise_similar_pairs(
+                matrix, threshold, top_k=self.semantic_top_k, block_size=self.semantic_block_size
+            )
+        
+        created_at = datetime.now().isoformat()
+        for i, j, similarity in zip(rows.tolist(), cols.tolist(), sims.tolist()):
+            source_doc = documents[i]
+            target_doc = documents[j]
+            
+            # 유사성 강도 결정
+            strength_category = self._categorize_similarity(similarity)
+            
+            relationship = DocumentRelationship(
+                source_id=source_doc.get("document_id"),
+                target_id=target_doc.get("document_id"),
+                relationship_type=RelationshipType.SEMANTIC_SIMILARITY,
+                strength=similarity,
+                confidence=0.85,
+                description=f"의미적 유사성 ({strength_category})",
+                evidence=[
+                    source_doc.get("text", "")[:100] + "...",
+                    target_doc.get("text", "")[:100] + "..."
+                ],
+                metadata={
+                    "similarity_score": similarity,
+                    "strength_category": strength_category
+                },
+                created_at=created_at
+            )
+            relationships.append(relationship)
         
         return relationships
     
@@ -620,17 +652,15 @@ class PowerMarketRelationshipMapper:
             self.stats["by_strength"][rel.get_strength_category().value] += 1
     
     def build_relationship_graph(self, relationships: List[DocumentRelationship]) -> Dict[str, Any]:
-        """관계 그래프 구축"""
+        """관계 그래프 구축 (노드 통계는 인접 색인에서 O(V + E)로 계산)"""
         
-        # 노드와 엣지 추출
-        nodes = set()
-        edges = []
+        if relationships is self.relationships and self.graph is not None:
+            graph = self.graph
+        else:
+            graph = RelationshipGraph.build(relationships, [t.value for t in RelationshipType])
         
-        for rel in relationships:
-            nodes.add(rel.source_id)
-            nodes.add(rel.target_id)
-            
-            edge = {
+        edges = [
+            {
                 "source": rel.source_id,
                 "target": rel.target_id,
                 "type": rel.relationship_type.value,
@@ -638,26 +668,14 @@ class PowerMarketRelationshipMapper:
                 "confidence": rel.confidence,
                 "description": rel.description
             }
-            edges.append(edge)
-        
-        # 노드별 통계 계산
-        node_stats = {}
-        for node in nodes:
-            incoming = [e for e in edges if e["target"] == node]
-            outgoing = [e for e in edges if e["source"] == node]
-            
-            node_stats[node] = {
-                "incoming_count": len(incoming),
-                "outgoing_count": len(outgoing),
-                "total_connections": len(incoming) + len(outgoing),
-                "avg_incoming_strength": np.mean([e["strength"] for e in incoming]) if incoming else 0,
-                "avg_outgoing_strength": np.mean([e["strength"] for e in outgoing]) if outgoing else 0
-            }
+            for rel in relationships
+        ]
+        nodes = graph.node_ids
         
         return {
             "nodes": list(nodes),
             "edges": edges,
-            "node_statistics": node_stats,
+            "node_statistics": graph.node_statistics(),
             "graph_statistics": {
                 "total_nodes": len(nodes),
                 "total_edges": len(edges),
@@ -666,42 +684,67 @@ class PowerMarketRelationshipMapper:
             }
         }
     
+    def _ensure_graph(self) -> Optional[RelationshipGraph]:
+        """관계는 있는데 색인이 없으면 구축"""
+        if self.graph is None and self.relationships:
+            self.graph = RelationshipGraph.build(self.relationships, [t.value for t in RelationshipType])
+        return self.graph
+    
     def get_related_documents(self, 
                             document_id: str, 
                             relationship_types: Optional[List[RelationshipType]] = None,
                             min_strength: float = 0.3,
                             max_results: int = 10) -> List[Dict[str, Any]]:
-        """특정 문서와 관련된 문서들 조회"""
+        """특정 문서와 관련된 문서들 조회 (인접 색인 사용, O(차수))"""
         
-        related = []
+        graph = self._ensure_graph()
+        if graph is None:
+            return []
         
-        for rel in self.relationships:
-            # 관계 유형 필터
-            if relationship_types and rel.relationship_type not in relationship_types:
-                continue
-            
-            # 강도 필터
-            if rel.strength < min_strength:
-                continue
-            
-            # 관련 문서 ID 추출
-            if rel.source_id == document_id:
-                related_id = rel.target_id
-            elif rel.target_id == document_id:
-                related_id = rel.source_id
-            else:
-                continue
-            
-            related.append({
+        # 인접 목록이 관련성 점수 내림차순으로 저장되어 있어 앞에서부터 max_results개만 사용
+        return [
+            {
                 "document_id": related_id,
-                "relationship": rel.to_dict(),
-                "relevance_score": rel.strength * rel.confidence
-            })
-        
-        # 관련성 점수로 정렬
-        related.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        return related[:max_results]
+                "relationship": graph.get_edge(edge_id),
+                "relevance_score": relevance
+            }
+            for related_id, edge_id, relevance in graph.neighbors_of(
+                document_id, relationship_types, min_strength, max_results
+            )
+        ]
+    
+    def expand_related_documents(self,
+                                 document_id: str,
+                                 max_hops: int = 2,
+                                 limit: int = 20,
+                                 relationship_types: Optional[List[RelationshipType]] = None,
+                                 min_strength: float = 0.3) -> List[Dict[str, Any]]:
+        """다중 홉 연관 문서 확장"""
+        graph = self._ensure_graph()
+        if graph is None:
+            return []
+        return graph.expand(document_id, max_hops, limit, relationship_types, min_strength)
+    
+    def save_graph(self, directory: str) -> bool:
+        """관계 그래프 색인을 디스크에 저장"""
+        graph = self._ensure_graph()
+        if graph is None:
+            logger.warning("저장할 관계 그래프가 없습니다")
+            return False
+        graph.save(directory)
+        return True
+    
+    def load_graph(self, directory: str, mmap: bool = True) -> bool:
+        """저장된 관계 그래프 색인 로드 (메모리 매핑)"""
+        if not RelationshipGraph.exists(directory):
+            logger.info(f"관계 그래프 색인이 없습니다: {directory}")
+            return False
+        try:
+            self.graph = RelationshipGraph.load(directory, mmap=mmap)
+            return True
+        except Exception as e:
+            logger.error(f"관계 그래프 로드 실패: {e}")
+            return False
     
     def export_relationships(self, format: str = "json") -> str:
         """관계 데이터 내보내기"""
@@ -0,0 +1,281 @@
+"""
+서빙 스냅샷 모듈
+- 서빙 상태(벡터 컬렉션 + 메타데이터/BM25 색인, 관계 그래프, 정산 공식 레지스트리)를 디렉토리 하나로 묶어 게시
+- 벡터는 청크 저장소(CHUNK_STORE_PATH)에서 exact 계열 백엔드로 구축, 워커는 읽기 전용 메모리 매핑으로 열어 페이지 캐시를 공유
+- 게시 루트 아래 새 디렉토리에 모두 쓴 뒤 CURRENT 파일을 교체하므로 워커는 완성된 스냅샷만 열게 됨
+- StartupProfile로 초기화 단계별 시간과 첫 질문까지의 시간(time-to-first-query)을 측정하여 메트릭으로 전달
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from core.actual_formula_extractor import ActualFormulaExtractor
+from core.relationship_graph import RelationshipGraph
+from data.vectors.chunk_store import ChunkStore
+from data.vectors.factory import VECTOR_DB_TYPES, create_vector_database, vector_db_options
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷에 담을 수 있는 백엔드 (파일 기반, 메모리 매핑 가능) - 그 외(chromadb)는 exact로 구축
+SNAPSHOT_DB_TYPES = ("exact", "hnsw", "ivfpq")
+
+_metrics_collector = None
+_metrics_checked = False
+
+
+def _get_metrics_collector():
+    """메트릭 수집기 지연 로딩 (모니터링 의존성이 없으면 None)"""
+    global _metrics_collector, _metrics_checked
+    if not _metrics_checked:
+        _metrics_checked = True
+        try:
+            from monitoring.metrics.collector import get_metrics_collector
+            _metrics_collector = get_metrics_collector()
+        except Exception as e:
+            logger.debug(f"메트릭 수집기 사용 불가: {e}")
+            _metrics_collector = None
+    return _metrics_collector
+
+
+class StartupProfile:
+    """초기화 단계별 시간과 time-to-first-query 측정"""
+
+    def __init__(self, system: str):
+        self.system = system
+        self.started = time.perf_counter()
+        self._last = self.started
+        self._lock = threading.Lock()
+        self.phases: Dict[str, float] = {}
+        self.startup_seconds: Optional[float] = None
+        self.time_to_first_query: Optional[float] = None
+        self.snapshot: Optional[str] = None
+
+    def mark(self, phase: str):
+        """직전 표시 이후 시간을 단계 소요 시간으로 기록"""
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    def finish(self, snapshot: Optional[str] = None):
+        """초기화 완료 (단계별 시간을 메트릭으로 전달)"""
+        self.startup_seconds = time.perf_counter() - self.started
+        self.snapshot = snapshot
+        phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phases.items())
+        logger.info(f"{self.system} 초기화 {self.startup_seconds:.2f}s (스냅샷: {snapshot or '없음'}) - {phases}")
+
+        collector = _get_metrics_collector()
+        if collector is not None:
+            collector.record_startup(self.system, {**self.phases, "total": self.startup_seconds})
+
+    def record_query(self):
+        """질문 응답 완료 (첫 번째만 time-to-first-query로 기록)"""
+        if self.time_to_first_query is not None:
+            return
+        with self._lock:
+            if self.time_to_first_query is not None:
+                return
+            self.time_to_first_query = time.perf_counter() - self.started
+        logger.info(f"{self.system} time-to-first-query: {self.time_to_first_query:.2f}s")
+
+        collector = _get_metrics_collector()
+        if collector is not None:
+            collector.record_time_to_first_query(self.system, self.time_to_first_query,
+                                                 snapshot=self.snapshot is not None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "system": self.system,
+            "snapshot": self.snapshot,
+            "phases": {phase: round(seconds, 4) for phase, seconds in self.phases.items()},
+            "startup_seconds": round(self.startup_seconds, 4) if self.startup_seconds is not None else None,
+            "time_to_first_query": (round(self.time_to_first_query, 4)
+                                    if self.time_to_first_query is not None else None)
+        }
+
+
+class ServingSnapshot:
+    """게시된 서빙 스냅샷 (읽기 전용)"""
+
+    FORMAT_VERSION = 1
+    CURRENT_FILE = "CURRENT"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, path: Path, manifest: Dict[str, Any]):
+        self.path = path
+        self.manifest = manifest
+
+    @property
+    def name(self) -> str:
+        return self.manifest["name"]
+
+    @classmethod
+    def resolve(cls, root: Union[str, Path]) -> Optional[Path]:
+        """게시 루트(CURRENT가 가리키는 스냅샷) 또는 스냅샷 디렉토리 경로 확인"""
+        root = Path(root)
+        current = root / cls.CURRENT_FILE
+        if current.exists():
+            path = root / current.read_text(encoding="utf-8").strip()
+            return path if (path / cls.MANIFEST_FILE).exists() else None
+        return root if (root / cls.MANIFEST_FILE).exists() else None
+
+    @classmethod
+    def open(cls, root: Union[str, Path]) -> "ServingSnapshot":
+        path = cls.resolve(root)
+        if path is None:
+            raise FileNotFoundError(f"서빙 스냅샷이 없습니다: {root}")
+        with open(path / cls.MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != cls.FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 서빙 스냅샷 형식: {manifest.get('format_version')}")
+        return cls(path, manifest)
+
+    def check_compatible(self, config: Dict[str, Any]):
+        """질문 임베딩 모델이 스냅샷을 만든 모델과 같은지 확인"""
+        model = config.get("EMBEDDING_MODEL")
+        if model and self.manifest.get("embedding_model") and model != self.manifest["embedding_model"]:
+            raise ValueError(f"스냅샷 임베딩 모델({self.manifest['embedding_model']})과 "
+                             f"설정의 EMBEDDING_MODEL({model})이 다릅니다")
+
+    def open_vector_database(self, **kwargs: Any):
+        """스냅샷 벡터 컬렉션을 읽기 전용 메모리 매핑으로 열기"""
+        return create_vector_database(
+            self.manifest["vector_db_type"],
+            db_path=str(self.path / "vectors"),
+            collection_name=self.manifest["collection_name"],
+            read_only=True,
+            **kwargs
+        )
+
+    @property
+    def graph_path(self) -> Optional[str]:
+        return str(self.path / "graph") if self.manifest.get("graph") else None
+
+    def formula_extractor(self) -> ActualFormulaExtractor:
+        with open(self.path / "formulas.json", "r", encoding="utf-8") as f:
+            return ActualFormulaExtractor(registry=json.load(f))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {key: value for key, value in self.manifest.items() if key != "files"}
+
+
+def open_configured_snapshot(config: Dict[str, Any]) -> Optional[ServingSnapshot]:
+    """설정의 SERVING_SNAPSHOT_PATH 스냅샷 열기 (설정하지 않았거나 사용할 수 없으면 None)"""
+    root = config.get("SERVING_SNAPSHOT_PATH")
+    if not root:
+        return None
+    try:
+        snapshot = ServingSnapshot.open(root)
+        snapshot.check_compatible(config)
+        logger.info(f"서빙 스냅샷 사용: {snapshot.path}")
+        return snapshot
+    except Exception as e:
+        logger.warning(f"서빙 스냅샷을 사용할 수 없어 일반 초기화로 진행합니다: {e}")
+        return None
+
+
+def build_snapshot(config: Dict[str, Any],
+                   output_root: Optional[Union[str, Path]] = None,
+                   keep: int = 3,
+                   batch_size: int = 50000) -> ServingSnapshot:
+    """
+    청크 저장소, 관계 그래프, 정산 공식으로 서빙 스냅샷을 구축하고 게시
+
+    Args:
+        config: 시스템 설정 (CHUNK_STORE_PATH, COLLECTION_NAME, VECTOR_DB_TYPE, RELATIONSHIP_GRAPH_PATH 등)
+        output_root: 게시 루트 (기본: SERVING_SNAPSHOT_PATH)
+        keep: 보관할 이전 스냅샷 수 (CURRENT 포함)
+        batch_size: 청크 저장소에서 벡터 컬렉션으로 한 번에 적재할 청크 수
+
+    Returns:
+        게시된 스냅샷
+    """
+    root = Path(output_root or config.get("SERVING_SNAPSHOT_PATH") or "./snapshots")
+    collection_name = config.get("COLLECTION_NAME", "power_market_docs")
+    chunk_store = ChunkStore(config.get("CHUNK_STORE_PATH") or "./data/chunks")
+    if collection_name not in chunk_store:
+        raise FileNotFoundError(f"청크 저장소에 '{collection_name}' 테이블이 없습니다. 문서를 먼저 적재하세요")
+
+    db_type = VECTOR_DB_TYPES.get(str(config.get("VECTOR_DB_TYPE", "exact")).lower())
+    if db_type not in SNAPSHOT_DB_TYPES:
+        db_type = "exact"
+
+    name = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    staging = root / f".{name}.tmp"
+    staging.mkdir(parents=True)
+    started = time.perf_counter()
+    try:
+        # 1. 벡터 컬렉션 (+ 메타데이터 역색인, BM25, ANN 색인)
+        vector_db = create_vector_database(
+            db_type,
+            db_path=str(staging / "vectors"),
+            collection_name=collection_name,
+            **vector_db_options({**config, "VECTOR_DB_TYPE": db_type})
+        )
+        documents = chunk_store.rebuild(collection_name, vector_db, batch_size=batch_size)
+        if hasattr(vector_db, "build_index"):
+            vector_db.build_index()
+
+        # 2. 관계 그래프 (이미 .npy CSR 배열이므로 그대로 복사)
+        graph_source = config.get("RELATIONSHIP_GRAPH_PATH")
+        has_graph = bool(graph_source) and RelationshipGraph.exists(graph_source)
+        if has_graph:
+            shutil.copytree(graph_source, staging / "graph")
+
+        # 3. 정산 공식 레지스트리
+        formulas = ActualFormulaExtractor().to_registry()
+        with open(staging / "formulas.json", "w", encoding="utf-8") as f:
+            json.dump(formulas, f, ensure_ascii=False)
+
+        manifest = {
+            "format_version": ServingSnapshot.FORMAT_VERSION,
+            "name": name,
+            "created_at": datetime.now().isoformat(),
+            "embedding_model": config.get("EMBEDDING_MODEL"),
+            "collection_name": collection_name,
+            "vector_db_type": db_type,
+            "documents": documents,
+            "dimension": vector_db.get_collection_stats().get("dimension"),
+            "graph": has_graph,
+            "formulas": len(formulas),
+            "build_seconds": round(time.perf_counter() - started, 3),
+            "files": {str(path.relative_to(staging)): path.stat().st_size
+                      for path in sorted(staging.rglob("*")) if path.is_file()}
+        }
+        with open(staging / ServingSnapshot.MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        os.replace(staging, root / name)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # 게시: CURRENT 교체 후 오래된 스냅샷 정리 (이미 열린 워커의 메모리 매핑은 파일 삭제 후에도 유효)
+    current_tmp = root / f"{ServingSnapshot.CURRENT_FILE}.tmp"
+    current_tmp.write_text(name, encoding="utf-8")
+    os.replace(current_tmp, root / ServingSnapshot.CURRENT_FILE)
+    _prune_snapshots(root, keep)
+
+    logger.info(f"서빙 스냅샷 게시: {root / name} ({documents}개 청크, {manifest['build_seconds']}s)")
+    return ServingSnapshot(root / name, manifest)
+
+
+def _prune_snapshots(root: Path, keep: int):
+    published = sorted(path for path in root.iterdir()
+                       if path.is_dir() and (path / ServingSnapshot.MANIFEST_FILE).exists())
+    for path in published[:max(0, len(published) - max(keep, 1))]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def list_snapshots(root: Union[str, Path]) -> List[str]:
+    root = Path(root)
+    if not root.exists():
+        return []
+    return sorted(path.name for path in root.iterdir()
+                  if path.is_dir() and (path / ServingSnapshot.MANIFEST_FILE).exists())
@@ -0,0 +1,196 @@
+"""
+블록 단위 유사 쌍 탐색
+- 정규화된 float32 임베딩 행렬에서 코사인 유사도가 임계값 이상인 쌍을 찾음
+- 정확 모드: 캐시 크기 블록 단위 행렬곱 + 행별 top-k (메모리 O(block_size x n))
+- 근사 모드: 구면 k-means 군집으로 후보를 제한 (메모리 O(block_size x 후보 수))
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+from data.vectors.vector_utils import spherical_kmeans
+
+logger = logging.getLogger(__name__)
+
+Pairs = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _empty_pairs() -> Pairs:
+    return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+
+
+def _merge_topk(best_idx: np.ndarray, best_sim: np.ndarray,
+                cand_idx: np.ndarray, cand_sim: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """행별 top-k 후보 병합"""
+    idx = np.concatenate([best_idx, cand_idx], axis=1)
+    sim = np.concatenate([best_sim, cand_sim], axis=1)
+    if sim.shape[1] > k:
+        part = np.argpartition(-sim, k - 1, axis=1)[:, :k]
+        idx = np.take_along_axis(idx, part, axis=1)
+        sim = np.take_along_axis(sim, part, axis=1)
+    return idx, sim
+
+
+def _canonical_pairs(rows: np.ndarray, cols: np.ndarray, sims: np.ndarray, n: int) -> Pairs:
+    """(i, j)와 (j, i)를 i < j 한 쌍으로 합침"""
+    if rows.size == 0:
+        return _empty_pairs()
+    low = np.minimum(rows, cols).astype(np.int64)
+    high = np.maximum(rows, cols).astype(np.int64)
+    keys = low * n + high
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    first = np.ones(keys.size, dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    return low[order][first], high[order][first], sims[order][first]
+
+
+def _collect_block(sim: np.ndarray, row_ids: np.ndarray, col_ids: np.ndarray,
+                   threshold: float, top_k: Optional[int],
+                   best: Optional[Tuple[np.ndarray, np.ndarray]]):
+    """블록 유사도에서 자기 자신을 제외하고 임계값/top-k 적용"""
+    sim[row_ids[:, None] == col_ids[None, :]] = -np.inf
+    if top_k is None:
+        r, c = np.nonzero(sim >= threshold)
+        return row_ids[r], col_ids[c], sim[r, c]
+
+    k = min(top_k, sim.shape[1])
+    if k <= 0:
+        return best
+    part = np.argpartition(-sim, k - 1, axis=1)[:, :k]
+    cand_sim = np.take_along_axis(sim, part, axis=1)
+    cand_idx = col_ids[part]
+    if best is None:
+        return cand_idx, cand_sim
+    return _merge_topk(best[0], best[1], cand_idx, cand_sim, top_k)
+
+
+def _flatten_topk(row_ids: np.ndarray, best_idx: np.ndarray, best_sim: np.ndarray, threshold: float):
+    mask = best_sim >= threshold
+    rows = np.repeat(row_ids, best_idx.shape[1]).reshape(best_idx.shape)
+    return rows[mask], best_idx[mask], best_sim[mask]
+
+
+def blockwise_similar_pairs(matrix: np.ndarray,
+                            threshold: float,
+                            top_k: Optional[int] = None,
+                            block_size: int = 1024) -> Pairs:
+    """
+    정확 모드 유사 쌍 탐색
+
+    Args:
+        matrix: 정규화된 (n, d) float32 임베딩 행렬
+        threshold: 최소 코사인 유사도
+        top_k: 행별 최대 이웃 수 (None이면 임계값 이상인 모든 쌍)
+        block_size: 행/열 블록 크기
+
+    Returns:
+        (rows, cols, similarities) - rows < cols
+    """
+    n = matrix.shape[0]
+    if n < 2:
+        return _empty_pairs()
+
+    rows_out, cols_out, sims_out = [], [], []
+    all_ids = np.arange(n)
+
+    for r0 in range(0, n, block_size):
+        r1 = min(r0 + block_size, n)
+        row_ids = all_ids[r0:r1]
+        row_block = matrix[r0:r1]
+        best = None
+
+        # top-k가 없으면 상삼각만 계산하면 충분
+        c_start = r0 if top_k is None else 0
+        for c0 in range(c_start, n, block_size):
+            c1 = min(c0 + block_size, n)
+            sim = row_block @ matrix[c0:c1].T
+            col_ids = all_ids[c0:c1]
+            if top_k is None:
+                sim[row_ids[:, None] >= col_ids[None, :]] = -np.inf
+                r, c, s = _collect_block(sim, row_ids, col_ids, threshold, None, None)
+                rows_out.append(r)
+                cols_out.append(c)
+                sims_out.append(s)
+            else:
+                best = _collect_block(sim, row_ids, col_ids, threshold, top_k, best)
+
+        if best is not None:
+            r, c, s = _flatten_topk(row_ids, best[0], best[1], threshold)
+            rows_out.append(r)
+            cols_out.append(c)
+            sims_out.append(s)
+
+    if not rows_out:
+        return _empty_pairs()
+    return _canonical_pairs(np.concatenate(rows_out), np.concatenate(cols_out),
+                            np.concatenate(sims_out).astype(np.float32), n)
+
+
+def approximate_similar_pairs(matrix: np.ndarray,
+                              threshold: float,
+                              top_k: Optional[int] = 20,
+                              block_size: int = 1024,
+                              n_clusters: Optional[int] = None,
+                              n_probe: int = 3,
+                              iterations: int = 8,
+                              seed: int = 0) -> Pairs:
+    """
+    근사 모드 유사 쌍 탐색 (IVF 방식)
+
+    각 군집의 점들을 가장 가까운 n_probe개 군집의 점들과만 비교하므로
+    계산량은 n x (n_probe x 평균 군집 크기), 메모리는 block_size x 후보 수로 제한
+
+    Args:
+        matrix: 정규화된 (n, d) float32 임베딩 행렬
+        threshold: 최소 코사인 유사도
+        top_k: 행별 최대 이웃 수
+        block_size: 한 번에 비교하는 질의 행 수
+        n_clusters: 군집 수 (기본: sqrt(n))
+        n_probe: 각 군집이 탐색할 이웃 군집 수
+        iterations: k-means 반복 횟수
+        seed: 난수 시드
+    """
+    n = matrix.shape[0]
+    if n < 2:
+        return _empty_pairs()
+
+    n_clusters = min(n, n_clusters or max(1, int(np.sqrt(n))))
+    n_probe = min(n_probe, n_clusters)
+    rng = np.random.default_rng(seed)
+
+    centroids, assignments = spherical_kmeans(matrix, n_clusters, iterations, block_size, rng)
+    members = [np.nonzero(assignments == c)[0] for c in range(n_clusters)]
+    centroid_sim = centroids @ centroids.T
+    probes = np.argsort(-centroid_sim, axis=1)[:, :n_probe]
+
+    rows_out, cols_out, sims_out = [], [], []
+    for cluster in range(n_clusters):
+        query_ids = members[cluster]
+        if query_ids.size == 0:
+            continue
+        candidate_ids = np.concatenate([members[p] for p in probes[cluster]])
+        candidates = matrix[candidate_ids]
+
+        for q0 in range(0, query_ids.size, block_size):
+            row_ids = query_ids[q0:q0 + block_size]
+            sim = matrix[row_ids] @ candidates.T
+            result = _collect_block(sim, row_ids, candidate_ids, threshold, top_k, None)
+            if result is None:
+                continue
+            if top_k is None:
+                r, c, s = result
+            else:
+                r, c, s = _flatten_topk(row_ids, result[0], result[1], threshold)
+            rows_out.append(r)
+            cols_out.append(c)
+            sims_out.append(s)
+
+    if not rows_out:
+        return _empty_pairs()
+
+    logger.info(f"근사 유사 쌍 탐색 완료: {n}개 벡터, 군집 {n_clusters}개, probe {n_probe}개")
+    return _canonical_pairs(np.concatenate(rows_out), np.concatenate(cols_out),
+                            np.concatenate(sims_out).astype(np.float32), n)
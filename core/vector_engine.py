@@ -4,10 +4,17 @@ Dense + Sparse + Multimodal 벡터를 통합하여 AI가 최적으로 활용할
 """
 
 import asyncio
+import bisect
+import heapq
+import threading
+import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Dict, List, Optional, Union, Any, Tuple
 from pathlib import Path
 import json
+import hashlib
 import logging
 from datetime import datetime
 import pickle
@@ -26,19 +33,13 @@ try:
 except ImportError:
     FAISS_AVAILABLE = False
 
-# Embedding models
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+# Embedding models (프로세스 공용 레지스트리에서 공유)
+from embeddings.model_registry import SENTENCE_TRANSFORMERS_AVAILABLE, get_model_registry
 
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+from data.vectors.vector_utils import as_embedding_matrix
+from data.vectors.chroma_compat import chroma_embeddings
+from retrieval.rank_fusion import reciprocal_rank_fusion
+from retrieval.tfidf_index import TfidfIndex
 
 logger = logging.getLogger(__name__)
 
@@ -54,16 +55,34 @@ class VectorEngine:
     - 계층적 인덱싱: Document > Section > Paragraph > Sentence
     """
     
+    LEVELS = ["document", "section", "paragraph", "sentence"]
+    LEVEL_ITEM_KEYS = ("ids", "documents", "metadatas", "records")
+    # cascade 검색에서 레벨별 부모 ID를 담은 메타데이터 키
+    CASCADE_PARENT_KEYS = {"section": "document_id", "paragraph": "section_id", "sentence": "paragraph_id"}
+    
     def __init__(
         self,
         data_dir: str = "data",
         dense_model: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
         enable_multimodal: bool = True,
-        enable_sparse: bool = True
+        enable_sparse: bool = True,
+        encode_batch_size: int = 64,
+        max_batch_chars: int = 32000,
+        upsert_batch_size: int = 5000,
+        search_mode: str = "flat",
+        cascade_documents: int = 5,
+        cascade_sections: int = 20,
+        cascade_paragraphs: int = 50,
+        search_workers: int = 4,
+        sparse_max_features: int = 10000,
+        enable_chunk_store: bool = True,
+        dense_device: Optional[str] = None
     ):
         self.data_dir = Path(data_dir)
         self.vectors_dir = self.data_dir / "vectors"
         self.metadata_dir = self.data_dir / "metadata"
+        self.sparse_dir = self.vectors_dir / "sparse"
+        self.chunks_dir = self.data_dir / "chunks"
         
         # 디렉토리 생성
         self.vectors_dir.mkdir(parents=True, exist_ok=True)
@@ -71,16 +90,46 @@ class VectorEngine:
         
         # 모델 설정
         self.dense_model_name = dense_model
+        self.dense_device = dense_device
         self.enable_multimodal = enable_multimodal
         self.enable_sparse = enable_sparse
+        self.sparse_max_features = sparse_max_features
+        
+        # 배치 적재 설정
+        # - encode_batch_size: 한 번의 forward pass에 넣을 최대 텍스트 수
+        # - max_batch_chars: 배치 내 (최장 길이 x 텍스트 수) 상한 (패딩 비용 기준)
+        # - upsert_batch_size: ChromaDB 한 번의 upsert 최대 건수
+        self.encode_batch_size = encode_batch_size
+        self.max_batch_chars = max_batch_chars
+        self.upsert_batch_size = upsert_batch_size
+        
+        # 검색 설정
+        # - search_mode: "flat" (레벨별 전체 검색을 동시에 수행) 또는 "cascade" (문서 -> 섹션 -> 문단 -> 문장 축소 검색)
+        # - cascade_*: cascade 모드에서 각 단계가 다음 단계로 넘기는 후보 수 상한
+        # - search_workers: flat 모드에서 레벨 검색을 동시에 수행할 스레드 수
+        self.search_mode = search_mode
+        self.cascade_documents = cascade_documents
+        self.cascade_sections = cascade_sections
+        self.cascade_paragraphs = cascade_paragraphs
+        self.search_workers = search_workers
+        self._search_executor = None
         
         # 벡터 저장소 초기화
         self.dense_model = None
-        self.sparse_vectorizer = None
+        self.sparse_indexes: Dict[str, TfidfIndex] = {}
+        self._sparse_lock = threading.Lock()
+        self._sparse_dirty: set = set()
         self.multimodal_model = None
         self.chroma_client = None
         self.faiss_index = None
         
+        # 청크 저장소 (레벨별 본문 + 타입 유지 메타데이터 + 임베딩, 컬렉션 재구축의 원본)
+        # (chunk_store가 core 패키지를 임포트하므로 순환 임포트를 피해 여기서 임포트)
+        self.chunk_store = None
+        if enable_chunk_store:
+            from data.vectors.chunk_store import ChunkStore
+            self.chunk_store = ChunkStore(self.chunks_dir)
+        
         # 메타데이터 저장소
         self.document_metadata = {}
         self.section_metadata = {}
@@ -96,26 +145,12 @@ class VectorEngine:
         # Dense 벡터 모델 (Sentence Transformers)
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
-                self.dense_model = SentenceTransformer(self.dense_model_name)
+                self.dense_model = get_model_registry().acquire(self.dense_model_name, self.dense_device)
                 logger.info(f"Dense 벡터 모델 로드 완료: {self.dense_model_name}")
             except Exception as e:
                 logger.warning(f"Dense 벡터 모델 로드 실패: {e}")
                 self.dense_model = None
         
-        # Sparse 벡터 모델 (TF-IDF)
-        if self.enable_sparse and SKLEARN_AVAILABLE:
-            try:
-                self.sparse_vectorizer = TfidfVectorizer(
-                    max_features=10000,
-                    ngram_range=(1, 2),
-                    stop_words=None,  # 한국어 불용어는 별도 처리
-                    lowercase=True
-                )
-                logger.info("Sparse 벡터 모델 (TF-IDF) 초기화 완료")
-            except Exception as e:
-                logger.warning(f"Sparse 벡터 모델 초기화 실패: {e}")
-                self.sparse_vectorizer = None
-        
         # ChromaDB 초기화
         if CHROMADB_AVAILABLE:
             try:
@@ -153,19 +188,136 @@ class VectorEngine:
         
         return self.dense_model.encode(texts)
     
-    def encode_sparse(self, texts: List[str]) -> np.ndarray:
-        """Sparse 벡터 인코딩"""
-        if not self.sparse_vectorizer:
-            logger.warning("Sparse 모델이 없습니다. 더미 벡터 반환")
-            return np.random.random((len(texts), 1000)).astype(np.float32)
+    def encode_dense_batched(self, texts: List[str]) -> np.ndarray:
+        """
+        길이순 정렬 + 크기 조정 배치로 Dense 벡터 인코딩
+        
+        비슷한 길이의 텍스트끼리 묶어 패딩 낭비를 줄이고,
+        결과는 입력 순서대로 반환
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        
+        batches = []
+        current = []
+        longest = 0
+        for idx in order:
+            length = max(len(texts[idx]), 1)
+            if current and (
+                len(current) >= self.encode_batch_size
+                or max(longest, length) * (len(current) + 1) > self.max_batch_chars
+            ):
+                batches.append(current)
+                current = []
+                longest = 0
+            current.append(idx)
+            longest = max(longest, length)
+        if current:
+            batches.append(current)
+        
+        embeddings = None
+        for batch in batches:
+            batch_texts = [texts[i] for i in batch]
+            if self.dense_model:
+                batch_vectors = self.dense_model.encode(batch_texts, batch_size=len(batch_texts))
+            else:
+                batch_vectors = self.encode_dense(batch_texts)
+            batch_vectors = np.asarray(batch_vectors, dtype=np.float32)
+            
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch_vectors.shape[1]), dtype=np.float32)
+            embeddings[batch] = batch_vectors
+        
+        return embeddings
+    
+    def encode_sparse(self, texts: List[str], level: str = "document") -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Sparse 벡터 인코딩 (레벨 색인의 용어 사전 사용, 재학습 없음)
+        
+        Returns:
+            텍스트별 정규화된 TF-IDF 희소 벡터 (용어 번호, 가중치)
+        """
+        index = self.get_sparse_index(level)
+        if index is None:
+            return [(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)) for _ in texts]
+        return index.transform(texts)
+    
+    def get_sparse_index(self, level: str) -> Optional[TfidfIndex]:
+        """레벨별 TF-IDF 색인 (첫 사용 시 저장된 색인을 메모리 매핑으로 로드하거나 새로 생성)"""
+        if not self.enable_sparse:
+            return None
+        
+        with self._sparse_lock:
+            index = self.sparse_indexes.get(level)
+            if index is None:
+                index_dir = self.sparse_dir / level
+                try:
+                    if TfidfIndex.exists(index_dir):
+                        index = TfidfIndex.load(index_dir)
+                except Exception as e:
+                    logger.warning(f"Sparse 색인 로드 실패 ({level}), 새로 구축합니다: {e}")
+                if index is None:
+                    index = TfidfIndex(max_features=self.sparse_max_features)
+                self.sparse_indexes[level] = index
+            return index
+    
+    def _update_sparse_indexes(
+        self,
+        added: Optional[Dict[str, Dict[str, List]]] = None,
+        removed: Optional[Dict[str, List[str]]] = None,
+        persist: bool = True
+    ):
+        """
+        레벨별 TF-IDF 색인에 항목 추가/삭제 (기존 행은 재학습하지 않음)
+        
+        Args:
+            persist: True이면 바뀐 레벨을 바로 저장, False이면 flush_sparse_indexes 호출 때까지 저장을 미룸
+                     (문서 한 건씩 추가할 때마다 색인 전체를 다시 쓰지 않도록)
+        """
+        if not self.enable_sparse:
+            return
+        
+        for level in self.LEVELS:
+            ids_to_remove = list((removed or {}).get(level, []))
+            level_items = (added or {}).get(level) or {}
+            if not ids_to_remove and not level_items.get("ids"):
+                continue
+            
+            index = self.get_sparse_index(level)
+            try:
+                if ids_to_remove:
+                    index.remove(ids_to_remove)
+                if level_items.get("ids"):
+                    index.add(level_items["ids"], level_items["documents"])
+                with self._sparse_lock:
+                    self._sparse_dirty.add(level)
+            except Exception as e:
+                logger.error(f"Sparse 색인 갱신 실패 ({level}): {e}")
         
-        return self.sparse_vectorizer.fit_transform(texts).toarray()
+        if persist:
+            self.flush_sparse_indexes()
+    
+    def flush_sparse_indexes(self):
+        """저장이 미뤄진 레벨의 TF-IDF 색인을 파일로 저장"""
+        with self._sparse_lock:
+            levels, self._sparse_dirty = self._sparse_dirty, set()
+        for level in levels:
+            index = self.sparse_indexes.get(level)
+            if index is None:
+                continue
+            try:
+                index.save(self.sparse_dir / level)
+            except Exception as e:
+                logger.error(f"Sparse 색인 저장 실패 ({level}): {e}")
     
     def add_document(
         self,
         doc_id: str,
         content: Dict[str, Any],
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        batched: bool = True
     ) -> bool:
         """
         계층적 문서 추가
@@ -174,10 +326,17 @@ class VectorEngine:
             doc_id: 문서 ID
             content: 계층별 컨텐츠 {'document': str, 'sections': [...], 'paragraphs': [...], 'sentences': [...]}
             metadata: 문서 메타데이터
+            batched: True이면 4개 레벨의 텍스트를 모아 한 번에 인코딩하고 레벨별로 일괄 upsert
+                     False이면 레벨별/항목별로 개별 인코딩 (기존 방식)
         """
         try:
             logger.info(f"문서 추가 시작: {doc_id}")
             
+            if batched:
+                self.add_documents([{"document_id": doc_id, "content": content, "metadata": metadata}])
+                logger.info(f"문서 추가 완료: {doc_id}")
+                return True
+            
             # 1. Document Level
             if 'document' in content:
                 self._add_document_level(doc_id, content['document'], metadata)
@@ -186,13 +345,19 @@ class VectorEngine:
             if 'sections' in content:
                 self._add_section_level(doc_id, content['sections'])
             
+            section_ids, paragraph_ids = self._parent_ids(doc_id, content)
+            
             # 3. Paragraph Level
             if 'paragraphs' in content:
-                self._add_paragraph_level(doc_id, content['paragraphs'])
+                self._add_paragraph_level(doc_id, content['paragraphs'], section_ids)
             
             # 4. Sentence Level
             if 'sentences' in content:
-                self._add_sentence_level(doc_id, content['sentences'])
+                self._add_sentence_level(doc_id, content['sentences'], paragraph_ids)
+            
+            # 5. Sparse 색인
+            self._update_sparse_indexes(added=self._collect_level_items(doc_id, content, metadata),
+                                        persist=False)
             
             logger.info(f"문서 추가 완료: {doc_id}")
             return True
@@ -201,6 +366,365 @@ class VectorEngine:
             logger.error(f"문서 추가 실패 {doc_id}: {e}")
             return False
     
+    @staticmethod
+    def _locate_chunks(text: str, chunks: List[str]) -> List[Tuple[int, int]]:
+        """
+        청크들을 본문에서 순서대로 찾아 (시작, 끝) 위치 반환 (찾지 못한 청크는 (-1, -1))
+        
+        청크는 본문에 나오는 순서로 주어진다고 보고 직전 청크 다음부터 찾음
+        """
+        spans = []
+        cursor = 0
+        for chunk in chunks:
+            start = text.find(chunk, cursor) if chunk else -1
+            if start < 0:
+                spans.append((-1, -1))
+                continue
+            spans.append((start, start + len(chunk)))
+            cursor = start
+        return spans
+    
+    def _parent_ids(self, doc_id: str, content: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """
+        문단별 부모 섹션 ID, 문장별 부모 문단 ID (저장 ID 형식, 부모가 없으면 "")
+        
+        추출기가 넘겨주는 section_id/paragraph_id는 페이지 단위 번호라 저장 ID와 일치하지 않으므로
+        문서 본문에서 각 청크의 위치를 찾아 부모를 정함
+        - 문단: 문단 시작 위치 이전에 시작한 마지막 섹션 (섹션 위치는 제목 기준)
+        - 문장: 문장 위치를 포함하는 문단
+        """
+        sections = content.get('sections', [])
+        paragraphs = content.get('paragraphs', [])
+        sentences = content.get('sentences', [])
+        section_ids = [""] * len(paragraphs)
+        paragraph_ids = [""] * len(sentences)
+        
+        text = content.get('document') or ""
+        if not text:
+            return section_ids, paragraph_ids
+        
+        section_starts = []  # (시작 위치, 섹션 번호) - 본문에서 찾은 섹션만
+        for i, (start, _) in enumerate(self._locate_chunks(
+            text, [section.get('title') or section.get('content', '') for section in sections]
+        )):
+            if start >= 0:
+                section_starts.append((start, i))
+        
+        paragraph_spans = self._locate_chunks(text, [paragraph.get('content', '') for paragraph in paragraphs])
+        starts = [start for start, _ in section_starts]
+        for j, (start, _) in enumerate(paragraph_spans):
+            position = bisect.bisect_right(starts, start) - 1
+            if start >= 0 and position >= 0:
+                i = section_starts[position][1]
+                if sections[i].get('content'):
+                    section_ids[j] = f"{doc_id}_section_{i}"
+        
+        located = sorted(
+            (start, end, j) for j, (start, end) in enumerate(paragraph_spans)
+            if start >= 0 and paragraphs[j].get('content')
+        )
+        starts = [start for start, _, _ in located]
+        for k, (start, end) in enumerate(self._locate_chunks(
+            text, [sentence.get('content', '') for sentence in sentences]
+        )):
+            position = bisect.bisect_right(starts, start) - 1
+            if start >= 0 and position >= 0 and end <= located[position][1]:
+                paragraph_ids[k] = f"{doc_id}_para_{located[position][2]}"
+        
+        return section_ids, paragraph_ids
+    
+    def _collect_level_items(
+        self,
+        doc_id: str,
+        content: Dict[str, Any],
+        metadata: Dict[str, Any]
+    ) -> Dict[str, Dict[str, List]]:
+        """레벨별 (ids, documents, metadatas, records) 수집 (records는 변환 전 타입 그대로의 메타데이터)"""
+        added_at = datetime.now().isoformat()
+        items = {
+            level: {key: [] for key in self.LEVEL_ITEM_KEYS}
+            for level in self.LEVELS
+        }
+        
+        def _append(level: str, item_id: str, text: str, item_metadata: Dict[str, Any]):
+            items[level]["ids"].append(item_id)
+            items[level]["documents"].append(text)
+            items[level]["metadatas"].append(self._sanitize_metadata(item_metadata))
+            items[level]["records"].append(item_metadata)
+        
+        section_ids, paragraph_ids = self._parent_ids(doc_id, content)
+        
+        document_text = content.get('document')
+        if document_text:
+            _append("document", doc_id, document_text, {
+                **metadata,
+                "level": "document",
+                "added_at": added_at
+            })
+        
+        for i, section in enumerate(content.get('sections', [])):
+            text = section.get('content', '')
+            if text:
+                _append("section", f"{doc_id}_section_{i}", text, {
+                    "document_id": doc_id,
+                    "section_index": i,
+                    "title": section.get('title', ''),
+                    "level": "section",
+                    "added_at": added_at
+                })
+        
+        for i, paragraph in enumerate(content.get('paragraphs', [])):
+            text = paragraph.get('content', '')
+            if text:
+                _append("paragraph", f"{doc_id}_para_{i}", text, {
+                    "document_id": doc_id,
+                    "paragraph_index": i,
+                    "section_id": section_ids[i],
+                    "level": "paragraph",
+                    "added_at": added_at
+                })
+        
+        for i, sentence in enumerate(content.get('sentences', [])):
+            text = sentence.get('content', '')
+            if text:
+                _append("sentence", f"{doc_id}_sent_{i}", text, {
+                    "document_id": doc_id,
+                    "sentence_index": i,
+                    "paragraph_id": paragraph_ids[i],
+                    "level": "sentence",
+                    "added_at": added_at
+                })
+        
+        return items
+    
+    def add_documents(self, documents: List[Dict[str, Any]]) -> int:
+        """
+        여러 문서를 한 번에 계층적으로 추가
+        
+        모든 문서의 4개 레벨 텍스트를 모아 길이순 배치로 한 번에 인코딩하고,
+        레벨별로 일괄 upsert
+        
+        Args:
+            documents: [{'document_id': str, 'content': {...}, 'metadata': {...}}, ...]
+        
+        Returns:
+            추가된 문서 수
+        """
+        if not documents:
+            return 0
+        
+        merged = self._merge_level_items(documents)
+        self._upsert_level_items(merged)
+        self._update_sparse_indexes(added=merged)
+        self._update_local_metadata(documents, merged)
+        
+        return len(documents)
+    
+    def sync_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        previous_chunks: Dict[str, Dict[str, Dict[str, str]]]
+    ) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """
+        이전 청크 해시와 비교하여 바뀐 청크만 삭제/upsert (증분 재색인)
+        
+        Args:
+            documents: add_documents와 같은 형식의 문서 리스트
+            previous_chunks: {document_id: {level: {chunk_id: hash}}} 이전 색인 상태
+        
+        Returns:
+            {document_id: {level: {chunk_id: hash}}} 새 색인 상태 (매니페스트에 기록)
+        """
+        merged = self._merge_level_items(documents)
+        new_chunks = {doc["document_id"]: {level: {} for level in self.LEVELS} for doc in documents}
+        changed = {level: {key: [] for key in self.LEVEL_ITEM_KEYS} for level in self.LEVELS}
+        
+        for level in self.LEVELS:
+            level_items = merged[level]
+            for idx, (item_id, text, item_metadata) in enumerate(zip(
+                level_items["ids"], level_items["documents"], level_items["metadatas"]
+            )):
+                doc_id = item_id if level == "document" else item_metadata["document_id"]
+                chunk_hash = self._chunk_hash(text, item_metadata)
+                new_chunks[doc_id][level][item_id] = chunk_hash
+                
+                previous_hash = (previous_chunks.get(doc_id) or {}).get(level, {}).get(item_id)
+                if previous_hash != chunk_hash:
+                    for key in self.LEVEL_ITEM_KEYS:
+                        changed[level][key].append(level_items[key][idx])
+        
+        # 사라진 청크 삭제 (내용이 바뀐 청크는 같은 ID로 덮어씀)
+        stale = {level: [] for level in self.LEVELS}
+        for doc_id, chunks in new_chunks.items():
+            previous = previous_chunks.get(doc_id) or {}
+            for level in self.LEVELS:
+                stale[level].extend(
+                    chunk_id for chunk_id in previous.get(level, {}) if chunk_id not in chunks[level]
+                )
+        
+        deleted = self.delete_chunks(stale, persist=False)
+        self._upsert_level_items(changed)
+        # 삭제와 추가를 반영한 Sparse 색인은 배치당 한 번만 저장
+        self._update_sparse_indexes(added=changed, persist=False)
+        self.flush_sparse_indexes()
+        self._update_local_metadata(documents, merged)
+        
+        upserted = sum(len(changed[level]["ids"]) for level in self.LEVELS)
+        logger.info(f"증분 재색인: {len(documents)}개 문서, {upserted}개 청크 upsert, {deleted}개 청크 삭제")
+        return new_chunks
+    
+    def _update_local_metadata(self, documents: List[Dict[str, Any]], merged: Dict[str, Dict[str, List]]):
+        """문서/섹션 메타데이터 저장소 갱신"""
+        vector_dim = self.dense_model.get_sentence_embedding_dimension() if self.dense_model else 384
+        document_texts = dict(zip(merged["document"]["ids"], merged["document"]["documents"]))
+        for doc in documents:
+            doc_id = doc["document_id"]
+            if doc_id in document_texts:
+                self.document_metadata[doc_id] = {
+                    **doc.get("metadata", {}),
+                    "content_length": len(document_texts[doc_id]),
+                    "vector_dim": vector_dim,
+                    "level": "document"
+                }
+        for section_id, text, section_meta in zip(
+            merged["section"]["ids"], merged["section"]["documents"], merged["section"]["metadatas"]
+        ):
+            self.section_metadata[section_id] = {
+                "document_id": section_meta["document_id"],
+                "section_index": section_meta["section_index"],
+                "title": section_meta["title"],
+                "content_length": len(text)
+            }
+    
+    def delete_chunks(self, chunk_ids: Dict[str, List[str]], persist: bool = True) -> int:
+        """
+        레벨별 청크 ID 삭제
+        
+        Args:
+            chunk_ids: {level: [chunk_id, ...]} (매니페스트의 청크 해시 dict도 그대로 전달 가능)
+            persist: False이면 Sparse 색인 저장을 flush_sparse_indexes 호출 때까지 미룸
+        
+        Returns:
+            삭제 요청한 청크 수
+        """
+        deleted = 0
+        removed = {}
+        for level, ids in chunk_ids.items():
+            ids = list(ids)
+            if not ids:
+                continue
+            removed[level] = ids
+            collection = self.get_collection(f"{level}s")
+            if collection:
+                for start in range(0, len(ids), self.upsert_batch_size):
+                    collection.delete(ids=ids[start:start + self.upsert_batch_size])
+            if self.chunk_store is not None:
+                self.chunk_store.delete(f"{level}s", ids)
+            deleted += len(ids)
+            
+            if level == "document":
+                for doc_id in ids:
+                    self.document_metadata.pop(doc_id, None)
+            elif level == "section":
+                for section_id in ids:
+                    self.section_metadata.pop(section_id, None)
+        
+        self._update_sparse_indexes(removed=removed, persist=persist)
+        return deleted
+    
+    @staticmethod
+    def _chunk_hash(text: str, metadata: Dict[str, Any]) -> str:
+        """청크 내용 해시 (적재 시각은 제외)"""
+        stable_metadata = {k: v for k, v in metadata.items() if k != "added_at"}
+        payload = text + "\x00" + json.dumps(stable_metadata, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _merge_level_items(self, documents: List[Dict[str, Any]]) -> Dict[str, Dict[str, List]]:
+        """여러 문서의 레벨별 항목을 하나로 병합"""
+        merged = {level: {key: [] for key in self.LEVEL_ITEM_KEYS} for level in self.LEVELS}
+        for doc in documents:
+            items = self._collect_level_items(doc["document_id"], doc["content"], doc.get("metadata", {}))
+            for level in self.LEVELS:
+                for key in self.LEVEL_ITEM_KEYS:
+                    merged[level][key].extend(items[level][key])
+        return merged
+    
+    def _upsert_level_items(self, merged: Dict[str, Dict[str, List]]) -> Optional[np.ndarray]:
+        """레벨별 항목을 한 번에 인코딩하고 레벨별로 일괄 upsert"""
+        # 전 레벨 텍스트를 하나의 리스트로 모아 길이순 배치 인코딩
+        all_texts = []
+        for level in self.LEVELS:
+            all_texts.extend(merged[level]["documents"])
+        if not all_texts:
+            return None
+        embeddings = self.encode_dense_batched(all_texts)
+        
+        offset = 0
+        for level in self.LEVELS:
+            count = len(merged[level]["ids"])
+            if count == 0:
+                continue
+            level_embeddings = embeddings[offset:offset + count]
+            offset += count
+            
+            self._write_chunk_store(level, merged[level], level_embeddings)
+            collection = self.get_collection(f"{level}s")
+            if collection:
+                self._bulk_upsert(collection, merged[level], level_embeddings)
+        
+        return embeddings
+    
+    def _write_chunk_store(self, level: str, level_items: Dict[str, List], embeddings: np.ndarray):
+        """청크 저장소에 레벨 항목 기록 (테이블 이름 = 컬렉션 이름)"""
+        if self.chunk_store is None:
+            return
+        try:
+            self.chunk_store.write(
+                f"{level}s", level_items["ids"], level_items["documents"], level_items["records"], embeddings
+            )
+        except Exception as e:
+            logger.error(f"청크 저장소 기록 실패 ({level}): {e}")
+    
+    def rebuild_from_chunk_store(self, levels: Optional[List[str]] = None) -> int:
+        """
+        청크 저장소의 본문/임베딩으로 레벨 컬렉션과 Sparse 색인 재구축 (재인코딩 없음)
+        
+        Returns:
+            upsert한 청크 수
+        """
+        if self.chunk_store is None:
+            return 0
+        
+        rebuilt = 0
+        for level in levels or self.LEVELS:
+            collection = self.get_collection(f"{level}s")
+            for batch in self.chunk_store.iter_batches(f"{level}s", batch_size=self.upsert_batch_size):
+                level_items = {
+                    "ids": batch.ids,
+                    "documents": batch.texts,
+                    "metadatas": [self._sanitize_metadata(metadata) for metadata in batch.metadatas]
+                }
+                if collection:
+                    self._bulk_upsert(collection, level_items, as_embedding_matrix(batch.embeddings))
+                self._update_sparse_indexes(added={level: level_items}, persist=False)
+                rebuilt += len(batch)
+        
+        self.flush_sparse_indexes()
+        logger.info(f"청크 저장소에서 {rebuilt}개 청크 재구축")
+        return rebuilt
+    
+    def _bulk_upsert(self, collection, level_items: Dict[str, List], embeddings: np.ndarray):
+        """레벨 단위 일괄 upsert (ChromaDB 최대 배치 크기 단위로 분할)"""
+        total = len(level_items["ids"])
+        for start in range(0, total, self.upsert_batch_size):
+            end = start + self.upsert_batch_size
+            collection.upsert(
+                ids=level_items["ids"][start:end],
+                documents=level_items["documents"][start:end],
+                embeddings=chroma_embeddings(embeddings[start:end]),
+                metadatas=level_items["metadatas"][start:end]
+            )
+    
     def _sanitize_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """ChromaDB 호환 메타데이터로 변환"""
         sanitized = {}
@@ -235,7 +759,7 @@ class VectorEngine:
             doc_collection.add(
                 ids=[doc_id],
                 documents=[content],
-                embeddings=[dense_vector.tolist()],
+                embeddings=chroma_embeddings(as_embedding_matrix(dense_vector)),
                 metadatas=[clean_metadata]
             )
         
@@ -271,7 +795,7 @@ class VectorEngine:
                 section_collection.add(
                     ids=[section_id],
                     documents=[content],
-                    embeddings=[dense_vector.tolist()],
+                    embeddings=chroma_embeddings(as_embedding_matrix(dense_vector)),
                     metadatas=[clean_metadata]
                 )
                 
@@ -282,8 +806,9 @@ class VectorEngine:
                     "content_length": len(content)
                 }
     
-    def _add_paragraph_level(self, doc_id: str, paragraphs: List[Dict[str, Any]]):
-        """문단 레벨 벡터 추가"""
+    def _add_paragraph_level(self, doc_id: str, paragraphs: List[Dict[str, Any]],
+                             section_ids: Optional[List[str]] = None):
+        """문단 레벨 벡터 추가 (section_ids: 문단별 부모 섹션 저장 ID)"""
         paragraph_collection = self.get_collection("paragraphs")
         if not paragraph_collection:
             return
@@ -298,7 +823,7 @@ class VectorEngine:
                 clean_metadata = self._sanitize_metadata({
                     "document_id": doc_id,
                     "paragraph_index": i,
-                    "section_id": paragraph.get('section_id', ''),
+                    "section_id": section_ids[i] if section_ids else '',
                     "level": "paragraph",
                     "added_at": datetime.now().isoformat()
                 })
@@ -306,12 +831,13 @@ class VectorEngine:
                 paragraph_collection.add(
                     ids=[paragraph_id],
                     documents=[content],
-                    embeddings=[dense_vector.tolist()],
+                    embeddings=chroma_embeddings(as_embedding_matrix(dense_vector)),
                     metadatas=[clean_metadata]
                 )
     
-    def _add_sentence_level(self, doc_id: str, sentences: List[Dict[str, Any]]):
-        """문장 레벨 벡터 추가"""
+    def _add_sentence_level(self, doc_id: str, sentences: List[Dict[str, Any]],
+                            paragraph_ids: Optional[List[str]] = None):
+        """문장 레벨 벡터 추가 (paragraph_ids: 문장별 부모 문단 저장 ID)"""
         sentence_collection = self.get_collection("sentences")
         if not sentence_collection:
             return
@@ -335,18 +861,18 @@ class VectorEngine:
                     clean_metadata = self._sanitize_metadata({
                         "document_id": doc_id,
                         "sentence_index": i + j,
-                        "paragraph_id": sentence.get('paragraph_id', ''),
+                        "paragraph_id": paragraph_ids[i + j] if paragraph_ids else '',
                         "level": "sentence",
                         "added_at": datetime.now().isoformat()
                     })
                     metadatas.append(clean_metadata)
             
             if ids:
-                embeddings = self.encode_dense(documents)
+                embeddings = as_embedding_matrix(self.encode_dense(documents))
                 sentence_collection.add(
                     ids=ids,
                     documents=documents,
-                    embeddings=embeddings.tolist(),
+                    embeddings=chroma_embeddings(embeddings),
                     metadatas=metadatas
                 )
     
@@ -358,7 +884,8 @@ class VectorEngine:
         top_k: int = 10,
         include_metadata: bool = True,
         include_context: bool = True,
-        ai_friendly: bool = True
+        ai_friendly: bool = True,
+        mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         AI 최적화 하이브리드 검색
@@ -371,32 +898,40 @@ class VectorEngine:
             include_metadata: 메타데이터 포함 여부
             include_context: 관련 컨텍스트 포함 여부
             ai_friendly: AI 친화적 형태로 반환 여부
+            mode: "flat" 또는 "cascade" (없으면 엔진 설정의 search_mode)
         
         Returns:
             AI가 활용하기 쉬운 구조화된 검색 결과
         """
         start_time = datetime.now()
+        search_mode = mode or self.search_mode
         
         try:
-            # 레벨별 검색 수행
-            results = {}
-            
             if level == "all":
-                levels_to_search = ["document", "section", "paragraph", "sentence"]
+                levels_to_search = list(self.LEVELS)
             else:
                 levels_to_search = [level]
             
-            for search_level in levels_to_search:
-                level_results = self._search_level(
-                    query, search_level, search_type, top_k // len(levels_to_search)
+            # 쿼리 벡터는 한 번만 계산하여 모든 레벨 검색에 전달
+            query_vector = None
+            if search_type in ["dense", "hybrid"]:
+                query_vector = self.encode_dense(query)
+            
+            # 레벨별 검색 수행
+            if search_mode == "cascade":
+                results, search_details = self._cascade_search(
+                    query, levels_to_search, search_type, top_k, query_vector
                 )
-                if level_results:
-                    results[search_level] = level_results
+            else:
+                results, search_details = self._fan_out_search(
+                    query, levels_to_search, search_type, top_k // len(levels_to_search), query_vector
+                )
+            search_details["search_mode"] = search_mode
             
             # AI 친화적 결과 구성
             if ai_friendly:
                 return self._format_ai_friendly_results(
-                    results, query, include_metadata, include_context, start_time
+                    results, query, include_metadata, include_context, start_time, search_details
                 )
             else:
                 return results
@@ -409,68 +944,296 @@ class VectorEngine:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def _search_level(self, query: str, level: str, search_type: str, top_k: int) -> List[Dict]:
-        """특정 레벨에서 검색 수행"""
+    def close(self):
+        """미뤄둔 Sparse 색인 저장, 검색 스레드 풀 종료 및 공유 Dense 모델 반환"""
+        self.flush_sparse_indexes()
+        if self._search_executor is not None:
+            self._search_executor.shutdown(wait=False)
+            self._search_executor = None
+        if self.dense_model is not None:
+            self.dense_model = None
+            get_model_registry().release(self.dense_model_name, self.dense_device)
+    
+    def _get_search_executor(self) -> ThreadPoolExecutor:
+        """레벨 검색용 스레드 풀 (첫 사용 시 생성)"""
+        if self._search_executor is None:
+            self._search_executor = ThreadPoolExecutor(
+                max_workers=self.search_workers, thread_name_prefix="vector-search"
+            )
+        return self._search_executor
+    
+    def _timed_search_level(self, *args, **kwargs) -> Tuple[List[Dict], float]:
+        """레벨 검색 + 소요 시간(ms)"""
+        started = time.perf_counter()
+        level_results = self._search_level(*args, **kwargs)
+        return level_results, (time.perf_counter() - started) * 1000
+    
+    def _fan_out_search(
+        self,
+        query: str,
+        levels: List[str],
+        search_type: str,
+        top_k: int,
+        query_vector: Optional[np.ndarray]
+    ) -> Tuple[Dict[str, List], Dict[str, Any]]:
+        """
+        레벨별 전체 검색을 스레드 풀에서 동시에 수행
+        
+        다중 레벨 검색 지연 시간이 가장 느린 레벨 하나의 지연 시간에 가까워짐
+        """
+        def run(search_level: str) -> Tuple[List[Dict], float]:
+            return self._timed_search_level(
+                query, search_level, search_type, top_k, query_vector=query_vector
+            )
+        
+        if len(levels) > 1 and self.search_workers > 1:
+            outcomes = list(self._get_search_executor().map(run, levels))
+        else:
+            outcomes = [run(search_level) for search_level in levels]
+        
+        results = {}
+        level_latency = {}
+        for search_level, (level_results, elapsed_ms) in zip(levels, outcomes):
+            level_latency[search_level] = elapsed_ms
+            if level_results:
+                results[search_level] = level_results
+        
+        return results, {"level_latency_ms": level_latency}
+    
+    def _cascade_search(
+        self,
+        query: str,
+        levels: List[str],
+        search_type: str,
+        top_k: int,
+        query_vector: Optional[np.ndarray]
+    ) -> Tuple[Dict[str, List], Dict[str, Any]]:
+        """
+        계층 축소 검색: 문서 -> 섹션 -> 문단 -> 문장
+        
+        - 상위 단계 결과에 남은 청크를 다음 단계의 부모 범위로 삼아 where 필터로 제한
+          (섹션은 document_id, 문단은 section_id, 문장은 paragraph_id 기준)
+        - 단계별 후보 수 상한은 cascade_documents / cascade_sections / cascade_paragraphs,
+          요청한 가장 하위 레벨은 top_k개 반환
+        - 부모 범위에서 결과가 없으면 지금까지 남은 문서 범위로 다시 검색
+          (부모 ID 없이 색인된 청크, 문서 컬렉션이 비어 있으면 전체 검색)
+        """
+        deepest = max(self.LEVELS.index(search_level) for search_level in levels)
+        candidate_bounds = {
+            "document": self.cascade_documents,
+            "section": self.cascade_sections,
+            "paragraph": self.cascade_paragraphs
+        }
+        
+        results = {}
+        level_latency = {}
+        parent_counts = {}
+        parents = None  # 직전 단계에서 남은 청크 ID
+        documents = None  # 지금까지 남은 문서 ID
+        
+        for depth, search_level in enumerate(self.LEVELS[:deepest + 1]):
+            n_results = top_k if depth == deepest else candidate_bounds[search_level]
+            scopes = []
+            if parents is not None:
+                scopes.append((self.CASCADE_PARENT_KEYS[search_level], parents))
+            if documents is not None and (not scopes or scopes[0][0] != "document_id"):
+                scopes.append(("document_id", documents))
+            if not scopes:
+                scopes.append((None, None))
+            
+            # 부모 범위에서 찾지 못하면 (부모 ID 없이 색인된 청크 등) 문서 범위로 다시 검색
+            elapsed_ms = 0.0
+            for scope_key, scope in scopes:
+                where = {scope_key: {"$in": scope}} if scope is not None else None
+                level_results, scope_ms = self._timed_search_level(
+                    query, search_level, search_type, n_results, query_vector=query_vector, where=where
+                )
+                elapsed_ms += scope_ms
+                if level_results:
+                    break
+            level_latency[search_level] = elapsed_ms
+            parent_counts[search_level] = len(scope) if scope is not None else None
+            
+            if level_results and search_level in levels:
+                results[search_level] = level_results
+            
+            survivors = list(dict.fromkeys(result["id"] for result in level_results))
+            if search_level != "document":
+                survivor_documents = [
+                    (result.get("metadata") or {}).get("document_id") for result in level_results
+                ]
+                survivor_documents = [doc_id for doc_id in dict.fromkeys(survivor_documents) if doc_id]
+            else:
+                survivor_documents = survivors
+            parents = survivors or None
+            if survivor_documents:
+                documents = survivor_documents
+        
+        return results, {
+            "level_latency_ms": level_latency,
+            "cascade": {
+                "parent_counts": parent_counts,
+                "candidate_bounds": candidate_bounds
+            }
+        }
+    
+    def _search_level(
+        self,
+        query: str,
+        level: str,
+        search_type: str,
+        top_k: int,
+        query_vector: Optional[np.ndarray] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict]:
+        """
+        특정 레벨에서 검색 수행
+        
+        Args:
+            query_vector: 미리 계산한 쿼리 벡터 (없으면 여기서 인코딩)
+            where: ChromaDB 메타데이터 필터 (cascade 모드의 부모 범위 제한)
+        """
         collection = self.get_collection(f"{level}s")
         if not collection:
             return []
         
         try:
+            dense_results = []
+            sparse_results = []
+            
             # Dense 검색
             if search_type in ["dense", "hybrid"]:
-                query_vector = self.encode_dense(query)
+                if query_vector is None:
+                    query_vector = self.encode_dense(query)
+                
+                query_kwargs = {}
+                if where:
+                    query_kwargs["where"] = where
                 
                 results = collection.query(
-                    query_embeddings=[query_vector.tolist()],
+                    query_embeddings=chroma_embeddings(as_embedding_matrix(query_vector)),
                     n_results=top_k,
-                    include=['documents', 'metadatas', 'distances']
+                    include=['documents', 'metadatas', 'distances'],
+                    **query_kwargs
                 )
                 
-                formatted_results = []
                 for i in range(len(results['ids'][0])):
-                    formatted_results.append({
+                    dense_results.append({
                         "id": results['ids'][0][i],
                         "content": results['documents'][0][i],
                         "metadata": results['metadatas'][0][i],
                         "score": 1 - results['distances'][0][i],  # distance를 similarity로 변환
                         "search_type": "dense"
                     })
-                
-                return formatted_results
             
-            return []
+            # Sparse 검색 (TF-IDF 색인)
+            if search_type in ["sparse", "hybrid"]:
+                sparse_results = self._sparse_search_level(collection, query, level, top_k, where)
+            
+            if search_type == "hybrid" and self.enable_sparse:
+                return self._fuse_level_results(dense_results, sparse_results, top_k)
+            return dense_results or sparse_results
             
         except Exception as e:
             logger.error(f"레벨 {level} 검색 실패: {e}")
             return []
     
+    def _sparse_search_level(
+        self,
+        collection,
+        query: str,
+        level: str,
+        top_k: int,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict]:
+        """TF-IDF 색인으로 후보를 찾고 본문/메타데이터는 ChromaDB에서 조회"""
+        index = self.get_sparse_index(level)
+        if index is None or not len(index):
+            return []
+        
+        # 메타데이터 필터가 있으면 필터를 통과한 ID 안에서만 점수 계산
+        candidates = None
+        if where:
+            candidates = collection.get(where=where, include=[])['ids']
+            if not candidates:
+                return []
+        
+        hits = index.search(query, top_k, candidates=candidates)
+        if not hits:
+            return []
+        
+        scores = dict(hits)
+        fetched = collection.get(ids=list(scores), include=['documents', 'metadatas'])
+        sparse_results = []
+        for i, item_id in enumerate(fetched['ids']):
+            sparse_results.append({
+                "id": item_id,
+                "content": fetched['documents'][i],
+                "metadata": fetched['metadatas'][i],
+                "score": scores[item_id],
+                "search_type": "sparse"
+            })
+        sparse_results.sort(key=lambda x: x['score'], reverse=True)
+        return sparse_results
+    
+    def _fuse_level_results(self, dense_results: List[Dict], sparse_results: List[Dict], top_k: int) -> List[Dict]:
+        """
+        Dense/Sparse 결과를 순위 융합(RRF)으로 결합
+        
+        순위는 융합 점수(fused_score)로 정하고, score는 dense 검색과 같은 유사도(1 - distance)를 유지
+        (dense 상위 결과에 없고 sparse에서만 찾은 항목의 score는 0, 원래 점수는 dense_score / sparse_score)
+        """
+        fused_scores = reciprocal_rank_fusion([
+            [result["id"] for result in dense_results],
+            [result["id"] for result in sparse_results]
+        ])
+        
+        by_id = {}
+        for result in sparse_results:
+            by_id[result["id"]] = {**result, "sparse_score": result["score"]}
+        for result in dense_results:
+            by_id[result["id"]] = {**by_id.get(result["id"], {}), **result, "dense_score": result["score"]}
+        
+        fused_results = []
+        for item_id, fused_score in heapq.nlargest(top_k, fused_scores.items(), key=lambda item: item[1]):
+            result = by_id[item_id]
+            result["score"] = result.get("dense_score", 0.0)
+            result["fused_score"] = fused_score
+            result["search_type"] = "hybrid"
+            fused_results.append(result)
+        return fused_results
+    
     def _format_ai_friendly_results(
         self,
         results: Dict[str, List],
         query: str,
         include_metadata: bool,
         include_context: bool,
-        start_time: datetime
+        start_time: datetime,
+        search_details: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """AI가 활용하기 쉬운 형태로 결과 포맷팅"""
         
-        # 결과 통합 및 정렬
-        all_results = []
+        # 결과 통합: 레벨별 결과는 이미 점수 내림차순이므로 힙 병합으로 상위 20개만 추출
+        # (hybrid 결과는 융합 점수 순으로 정렬되어 있으므로 fused_score로 병합, 표시 점수는 score)
+        total_results = 0
         for level, level_results in results.items():
             for result in level_results:
                 result['level'] = level
-                all_results.append(result)
+            total_results += len(level_results)
         
-        # 점수순 정렬
-        all_results.sort(key=lambda x: x.get('score', 0), reverse=True)
+        all_results = heapq.merge(
+            *results.values(), key=lambda x: x.get('fused_score', x.get('score', 0)), reverse=True
+        )
         
         # AI 친화적 구조 생성
         ai_response = {
             "query": query,
             "search_metadata": {
                 "search_time_ms": (datetime.now() - start_time).total_seconds() * 1000,
-                "total_results": len(all_results),
+                "total_results": total_results,
                 "levels_searched": list(results.keys()),
+                **(search_details or {}),
                 "timestamp": datetime.now().isoformat()
             },
             "primary_results": [],
@@ -479,13 +1242,15 @@ class VectorEngine:
         }
         
         # 결과 분류
-        for i, result in enumerate(all_results[:20]):  # 상위 20개만
+        for i, result in enumerate(islice(all_results, 20)):  # 상위 20개만
             formatted_result = {
                 "content": result['content'],
                 "relevance_score": result.get('score', 0),
                 "source_level": result['level'],
                 "source_id": result['id']
             }
+            if 'fused_score' in result:
+                formatted_result['fused_score'] = result['fused_score']
             
             if include_metadata and 'metadata' in result:
                 formatted_result['metadata'] = result['metadata']
@@ -532,7 +1297,8 @@ class VectorEngine:
         return stats
     
     def save_metadata(self):
-        """메타데이터를 파일로 저장"""
+        """메타데이터와 저장이 미뤄진 Sparse 색인을 파일로 저장"""
+        self.flush_sparse_indexes()
         try:
             # 문서 메타데이터 저장
             with open(self.metadata_dir / "documents.json", "w", encoding="utf-8") as f:
@@ -0,0 +1,457 @@
+"""
+근사 최근접 이웃(ANN) 벡터 데이터베이스 모듈
+- ExactVectorDatabase의 저장 형식(정규화 임베딩 .npy, ID 배열, 열 단위 메타데이터)을 그대로 쓰고 검색만 ANN 색인 사용
+- HNSW: 낮은 지연 시간 (faiss 사용, requirements.txt의 faiss-cpu가 설치되지 않은 환경에서는 정확 검색으로 동작)
+- IVF-PQ: 메모리 압축 (faiss 사용, 설치되지 않은 환경에서는 numpy 구현: 구면 k-means 조대 양자화 + 잔차 곱양자화, 거리표 계산)
+- 질문마다 efSearch / nprobe 조절 가능, 후보는 원본 벡터로 다시 계산하여 거리/유사도는 정확 검색과 같은 기준
+- 색인은 컬렉션 디렉토리에 저장하고, 컬렉션 버전이 같으면 재구축 없이 로드
+  (읽기 전용으로 열 때 버전이 다르면 메모리에서 재구축하지 않고 열기 실패)
+- 추가만 있으면 새 행만 색인에 추가, 삭제/교체가 있으면 다음 검색 때 재구축
+"""
+
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from data.vectors.exact_store import ExactVectorDatabase
+from data.vectors.vector_utils import normalize_embeddings, spherical_kmeans
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _kmeans(points: np.ndarray, n_clusters: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """유클리드 k-means 중심 (곱양자화 코드북 학습용)"""
+    centroids = points[rng.choice(len(points), size=n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        distances = (np.sum(points ** 2, axis=1, keepdims=True)
+                     - 2.0 * points @ centroids.T + np.sum(centroids ** 2, axis=1))
+        assignments = np.argmin(distances, axis=1)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, points)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        # 빈 군집은 임의의 점으로 재시작
+        if not filled.all():
+            centroids[~filled] = points[rng.choice(len(points), size=int((~filled).sum()), replace=False)]
+    return centroids
+
+
+class _NumpyIVFPQ:
+    """faiss가 없을 때의 IVF-PQ (내적 기준, 정규화 벡터용)"""
+
+    def __init__(self, dim: int, nlist: int, pq_m: int, n_bits: int = 8, seed: int = 0):
+        self.dim = dim
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.dsub = dim // pq_m
+        self.ksub = 2 ** n_bits
+        self.seed = seed
+        self.centroids = np.zeros((0, dim), dtype=np.float32)
+        self.codebooks = np.zeros((pq_m, 0, self.dsub), dtype=np.float32)
+        self.list_rows: List[np.ndarray] = []
+        self.list_codes: List[np.ndarray] = []
+        self.ntotal = 0
+
+    def _assign(self, matrix: np.ndarray) -> np.ndarray:
+        assignments = np.empty(len(matrix), dtype=np.int64)
+        for start in range(0, len(matrix), 4096):
+            assignments[start:start + 4096] = np.argmax(matrix[start:start + 4096] @ self.centroids.T, axis=1)
+        return assignments
+
+    def train(self, matrix: np.ndarray, iterations: int = 10) -> None:
+        rng = np.random.default_rng(self.seed)
+        nlist = min(self.nlist, len(matrix))
+        self.centroids, assignments = spherical_kmeans(matrix, nlist, iterations, 4096, rng)
+        self.centroids = self.centroids.astype(np.float32)
+        self.nlist = nlist
+
+        residuals = matrix - self.centroids[assignments]
+        sample_size = min(len(matrix), self.ksub * 64)
+        sample = residuals[rng.choice(len(matrix), size=sample_size, replace=False)]
+        ksub = min(self.ksub, sample_size)
+        self.codebooks = np.stack([
+            _kmeans(sample[:, j * self.dsub:(j + 1) * self.dsub], ksub, iterations, rng)
+            for j in range(self.pq_m)
+        ]).astype(np.float32)
+        self.list_rows = [np.empty(0, dtype=np.int64) for _ in range(self.nlist)]
+        self.list_codes = [np.empty((0, self.pq_m), dtype=np.uint8) for _ in range(self.nlist)]
+        self.ntotal = 0
+
+    def _encode(self, residuals: np.ndarray) -> np.ndarray:
+        codes = np.empty((len(residuals), self.pq_m), dtype=np.uint8)
+        for j, codebook in enumerate(self.codebooks):
+            sub = residuals[:, j * self.dsub:(j + 1) * self.dsub]
+            distances = -2.0 * sub @ codebook.T + np.sum(codebook ** 2, axis=1)
+            codes[:, j] = np.argmin(distances, axis=1)
+        return codes
+
+    def add(self, matrix: np.ndarray) -> None:
+        """행 번호는 추가 순서대로 ntotal부터 부여"""
+        assignments = self._assign(matrix)
+        codes = self._encode(matrix - self.centroids[assignments])
+        rows = np.arange(self.ntotal, self.ntotal + len(matrix), dtype=np.int64)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(self.nlist + 1))
+        for list_id in range(self.nlist):
+            members = order[bounds[list_id]:bounds[list_id + 1]]
+            if members.size:
+                self.list_rows[list_id] = np.concatenate([self.list_rows[list_id], rows[members]])
+                self.list_codes[list_id] = np.concatenate([self.list_codes[list_id], codes[members]])
+        self.ntotal += len(matrix)
+
+    def search(self, queries: np.ndarray, k: int, nprobe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(근사 내적, 행 번호) - 후보가 k개보다 적으면 -1로 채움"""
+        nprobe = max(1, min(nprobe, self.nlist))
+        coarse = queries @ self.centroids.T
+        probes = np.argpartition(-coarse, nprobe - 1, axis=1)[:, :nprobe]
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        rows = np.full((len(queries), k), -1, dtype=np.int64)
+        subspaces = np.arange(self.pq_m)
+
+        for q, query in enumerate(queries):
+            # 질문-코드북 내적 거리표 (pq_m, ksub)
+            table = np.einsum("jd,jkd->jk", query.reshape(self.pq_m, self.dsub), self.codebooks)
+            candidate_rows = []
+            candidate_scores = []
+            for list_id in probes[q]:
+                codes = self.list_codes[list_id]
+                if not len(codes):
+                    continue
+                candidate_rows.append(self.list_rows[list_id])
+                candidate_scores.append(coarse[q, list_id] + table[subspaces, codes].sum(axis=1))
+            if not candidate_rows:
+                continue
+            candidate_rows = np.concatenate(candidate_rows)
+            candidate_scores = np.concatenate(candidate_scores)
+            top = min(k, len(candidate_rows))
+            best = np.argpartition(-candidate_scores, top - 1)[:top]
+            best = best[np.argsort(-candidate_scores[best], kind="stable")]
+            scores[q, :top] = candidate_scores[best]
+            rows[q, :top] = candidate_rows[best]
+        return scores, rows
+
+    def save(self, path: str) -> None:
+        lengths = np.array([len(rows) for rows in self.list_rows], dtype=np.int64)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                header=np.array([self.dim, self.nlist, self.pq_m, self.ksub, self.ntotal], dtype=np.int64),
+                centroids=self.centroids,
+                codebooks=self.codebooks,
+                list_lengths=lengths,
+                list_rows=np.concatenate(self.list_rows) if self.list_rows else np.empty(0, dtype=np.int64),
+                list_codes=(np.concatenate(self.list_codes) if self.list_codes
+                            else np.empty((0, self.pq_m), dtype=np.uint8))
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "_NumpyIVFPQ":
+        with np.load(path) as data:
+            dim, nlist, pq_m, ksub, ntotal = data["header"].tolist()
+            index = cls(dim, nlist, pq_m, n_bits=int(np.log2(ksub)))
+            index.centroids = data["centroids"]
+            index.codebooks = data["codebooks"]
+            offsets = np.concatenate([[0], np.cumsum(data["list_lengths"])])
+            list_rows, list_codes = data["list_rows"], data["list_codes"]
+            index.list_rows = [list_rows[offsets[i]:offsets[i + 1]] for i in range(nlist)]
+            index.list_codes = [list_codes[offsets[i]:offsets[i + 1]] for i in range(nlist)]
+            index.ntotal = ntotal
+        return index
+
+
+class AnnVectorDatabase(ExactVectorDatabase):
+    """HNSW / IVF-PQ 근사 검색 벡터 데이터베이스 (VectorDatabase와 같은 메서드)"""
+
+    INDEX_TYPES = ("hnsw", "ivfpq")
+
+    # 이보다 작은 컬렉션은 정확 검색 (색인 구축 비용 대비 이득이 없음)
+    MIN_INDEX_ROWS = 1024
+
+    # 필터 일치 비율이 이 값 이하이면 일치 행만 정확 계산, 넘으면 근사 검색 후 필터
+    PREFILTER_RATIO = 0.1
+
+    def __init__(self,
+                 db_path: str = "./vector_db",
+                 collection_name: str = "power_market_docs",
+                 enable_lexical_index: bool = True,
+                 index_type: str = "hnsw",
+                 hnsw_m: int = 32,
+                 ef_construction: int = 200,
+                 ef_search: int = 64,
+                 nlist: Optional[int] = None,
+                 nprobe: int = 8,
+                 pq_m: int = 48,
+                 refine_factor: int = 10,
+                 read_only: bool = False):
+        """
+        Args:
+            index_type: "hnsw" 또는 "ivfpq"
+            hnsw_m: HNSW 노드당 이웃 수
+            ef_construction: HNSW 구축 시 후보 수
+            ef_search: HNSW 검색 후보 수 기본값 (질문마다 변경 가능)
+            nlist: IVF 군집 수 (기본: 4 x sqrt(n))
+            nprobe: IVF 검색 군집 수 기본값 (질문마다 변경 가능)
+            pq_m: 곱양자화 부분공간 수 (차원의 약수로 조정, 벡터당 pq_m 바이트)
+            refine_factor: 근사 후보를 top_k x 이 값만큼 가져와 원본 벡터로 재정렬
+            read_only: 읽기 전용으로 열기 (faiss 색인은 메모리 매핑, 색인을 다시 만들지 않음 -
+                       저장된 색인이 컬렉션과 다르면 ValueError, 색인이 없으면 정확 검색)
+        """
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"지원하지 않는 ANN 색인: {index_type} (가능한 값: {', '.join(self.INDEX_TYPES)})")
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.pq_m = pq_m
+        self.refine_factor = refine_factor
+
+        self._ann = None
+        self._ann_rows = 0
+        self._ann_stale = False
+        super().__init__(db_path=db_path, collection_name=collection_name,
+                         enable_lexical_index=enable_lexical_index, read_only=read_only)
+
+        if index_type == "hnsw" and not FAISS_AVAILABLE:
+            self.logger.warning("faiss가 설치되지 않아 HNSW 색인을 사용할 수 없습니다 "
+                                "(pip install -r requirements.txt). 정확 검색으로 동작합니다")
+        self._load_index()
+
+    # ------------------------------------------------------------------ 색인 관리
+
+    @property
+    def _index_file(self) -> str:
+        return self._path(f"ann_{self.index_type}.{'faiss' if FAISS_AVAILABLE else 'npz'}")
+
+    @property
+    def _index_meta_file(self) -> str:
+        return self._path(f"ann_{self.index_type}.json")
+
+    def _version_marker(self) -> str:
+        return self.get_version()[1]
+
+    def _load_index(self):
+        """저장된 색인 로드 (컬렉션 버전과 행 수가 같을 때만, 읽기 전용이면 다를 때 열기 실패)"""
+        if not os.path.exists(self._index_meta_file) or not os.path.exists(self._index_file):
+            return
+        try:
+            with open(self._index_meta_file, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            if self.read_only:
+                self.logger.error(f"ANN 색인 정보 로드 실패: {e}")
+                raise
+            self.logger.warning(f"ANN 색인 정보 로드 실패, 다음 검색 때 재구축합니다: {e}")
+            return
+        if meta.get("version") != self._version_marker() or meta.get("rows") != len(self.ids):
+            if self.read_only:
+                message = (f"ANN 색인이 컬렉션과 다릅니다 (색인 {meta.get('rows')}행, 컬렉션 {len(self.ids)}행): "
+                           f"{self._index_file} - 읽기 전용에서는 재구축하지 않습니다")
+                self.logger.error(message)
+                raise ValueError(message)
+            self.logger.info("ANN 색인이 컬렉션과 다릅니다. 다음 검색 때 재구축합니다")
+            return
+        try:
+            if FAISS_AVAILABLE:
+                flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if self.read_only else 0
+                self._ann = faiss.read_index(self._index_file, flags)
+            else:
+                self._ann = _NumpyIVFPQ.load(self._index_file)
+            self._ann_rows = meta["rows"]
+            self.logger.info(f"ANN 색인 로드 완료: {self.index_type}, {self._ann_rows}개 벡터")
+        except Exception as e:
+            if self.read_only:
+                self.logger.error(f"ANN 색인 로드 실패: {e}")
+                raise
+            self.logger.warning(f"ANN 색인 로드 실패, 다음 검색 때 재구축합니다: {e}")
+            self._ann = None
+
+    def _save_index(self):
+        if self.read_only:
+            return
+        try:
+            if FAISS_AVAILABLE:
+                faiss.write_index(self._ann, self._index_file + ".tmp")
+            else:
+                self._ann.save(self._index_file + ".tmp")
+            os.replace(self._index_file + ".tmp", self._index_file)
+            with open(self._index_meta_file, "w", encoding="utf-8") as f:
+                json.dump({"index_type": self.index_type, "rows": self._ann_rows,
+                           "version": self._version_marker()}, f)
+        except Exception as e:
+            self.logger.warning(f"ANN 색인 저장 실패: {e}")
+
+    def _pq_subspaces(self, dim: int) -> int:
+        """dim의 약수 중 pq_m 이하에서 가장 큰 값"""
+        return max(m for m in range(1, min(self.pq_m, dim) + 1) if dim % m == 0)
+
+    def _new_index(self, matrix: np.ndarray):
+        """빈 색인 생성 및 학습"""
+        dim = matrix.shape[1]
+        nlist = min(len(matrix), self.nlist or max(1, int(4 * np.sqrt(len(matrix)))))
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = self.ef_construction
+            return index
+        if FAISS_AVAILABLE:
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, self._pq_subspaces(dim), 8, faiss.METRIC_INNER_PRODUCT)
+            index.train(matrix)
+            return index
+        index = _NumpyIVFPQ(dim, nlist, self._pq_subspaces(dim))
+        index.train(matrix)
+        return index
+
+    def build_index(self) -> bool:
+        """현재 컬렉션 전체로 색인 재구축"""
+        with self._lock:
+            if not self._ann_supported():
+                return False
+            matrix = np.ascontiguousarray(self.embeddings, dtype=np.float32)
+            self._ann = self._new_index(matrix)
+            self._ann.add(matrix)
+            self._ann_rows = len(matrix)
+            self._ann_stale = False
+            self._save_index()
+            self.logger.info(f"ANN 색인 구축 완료: {self.index_type}, {self._ann_rows}개 벡터")
+            return True
+
+    def _ann_supported(self) -> bool:
+        if self.index_type == "hnsw" and not FAISS_AVAILABLE:
+            return False
+        return len(self.ids) >= self.MIN_INDEX_ROWS
+
+    def _ensure_index(self) -> bool:
+        """색인을 컬렉션과 맞춤 (추가된 행만 있으면 증분 추가, 삭제/교체가 있었으면 재구축)"""
+        if not self._ann_supported():
+            return False
+        if self.read_only:
+            # 읽기 전용 컬렉션은 변하지 않으므로 저장된 색인이 없으면 정확 검색
+            return self._ann is not None
+        if self._ann is None or self._ann_stale or self._ann_rows > len(self.ids):
+            return self.build_index()
+        if self._ann_rows < len(self.ids):
+            self._ann.add(np.ascontiguousarray(self.embeddings[self._ann_rows:], dtype=np.float32))
+            self._ann_rows = len(self.ids)
+            self._save_index()
+        return True
+
+    def _remove_rows(self, doc_ids: List[str]) -> int:
+        removed = super()._remove_rows(doc_ids)
+        if removed:
+            self._ann_stale = True
+        return removed
+
+    def clear_collection(self) -> bool:
+        with self._lock:
+            self._ann = None
+            self._ann_rows = 0
+            self._ann_stale = False
+            return super().clear_collection()
+
+    # ------------------------------------------------------------------ 검색
+
+    def _ann_search(self, queries: np.ndarray, k: int,
+                    ef_search: Optional[int], nprobe: Optional[int]) -> np.ndarray:
+        """근사 후보 행 번호 (없으면 -1)"""
+        if FAISS_AVAILABLE:
+            if self.index_type == "hnsw":
+                self._ann.hnsw.efSearch = max(ef_search or self.ef_search, k)
+            else:
+                self._ann.nprobe = nprobe or self.nprobe
+            _, rows = self._ann.search(queries, k)
+            return rows
+        _, rows = self._ann.search(queries, k, nprobe or self.nprobe)
+        return rows
+
+    def search_similar(self,
+                       query_embedding: Union[np.ndarray, List[float]],
+                       top_k: int = 5,
+                       where: Optional[Dict] = None,
+                       ef_search: Optional[int] = None,
+                       nprobe: Optional[int] = None) -> List[Dict[str, any]]:
+        """유사한 문서 검색 (ef_search / nprobe로 재현율-지연 시간 조절)"""
+        results = self.search_similar_batch([query_embedding], top_k=top_k, where=where,
+                                            ef_search=ef_search, nprobe=nprobe)
+        formatted_results = results[0] if results else []
+        self.logger.info(f"{len(formatted_results)}개의 유사 문서를 찾았습니다")
+        return formatted_results
+
+    def search_similar_batch(self,
+                             query_embeddings: Union[np.ndarray, List[List[float]]],
+                             top_k: int = 5,
+                             where: Optional[Dict] = None,
+                             ef_search: Optional[int] = None,
+                             nprobe: Optional[int] = None) -> List[List[Dict[str, any]]]:
+        """
+        여러 질문 근사 검색
+
+        메타데이터 필터는 선택도에 따라 계획: 일치 문서가 적으면 일치 행만 정확 계산(사전 필터),
+        많으면 근사 후보를 더 가져와 거른 뒤 top_k가 모자라면 정확 검색(사후 필터)
+        색인을 쓸 수 없으면 정확 검색
+        """
+        try:
+            if len(query_embeddings) == 0:
+                return []
+            with self._lock:
+                plan = self.plan_where(where, top_k)
+                if plan.strategy not in ("none", "postfilter") or not self._ensure_index():
+                    return super().search_similar_batch(query_embeddings, top_k=top_k, where=where)
+
+                allowed = None
+                fetch_k = top_k
+                if plan.strategy == "postfilter":
+                    allowed = np.zeros(len(self.ids), dtype=bool)
+                    allowed[plan.doc_numbers] = True
+                    fetch_k = plan.fetch_k
+
+                queries = normalize_embeddings(query_embeddings)
+                candidates = self._ann_search(queries, fetch_k * max(1, self.refine_factor), ef_search, nprobe)
+
+                batch_results = []
+                for query, rows in zip(queries, candidates):
+                    rows = rows[rows >= 0]
+                    if allowed is not None:
+                        rows = rows[allowed[rows]]
+                        if rows.size < min(top_k, plan.doc_numbers.size):
+                            batch_results.extend(super().search_similar_batch([query], top_k=top_k, where=where))
+                            continue
+                    # 후보를 원본 벡터로 다시 계산하여 정확 검색과 같은 거리 기준으로 정렬
+                    cosine = np.asarray(self.embeddings[rows]) @ query
+                    order = np.argsort(-cosine, kind="stable")[:top_k]
+                    formatted_results = []
+                    for row, similarity in zip(rows[order].tolist(), cosine[order].tolist()):
+                        distance = 2.0 - 2.0 * similarity
+                        formatted_results.append({
+                            'id': self.ids[row],
+                            'text': self.documents[row],
+                            'metadata': self._metadata(row),
+                            'distance': distance,
+                            'similarity': 1.0 - distance
+                        })
+                    batch_results.append(formatted_results)
+            return batch_results
+
+        except Exception as e:
+            self.logger.error(f"근사 검색 실패: {e}")
+            return [[] for _ in range(len(query_embeddings))]
+
+    def get_collection_stats(self) -> Dict[str, any]:
+        stats = super().get_collection_stats()
+        stats.update({
+            'backend': self.index_type,
+            'ann_backend': 'faiss' if FAISS_AVAILABLE else 'numpy',
+            'ann_indexed_rows': self._ann_rows if self._ann is not None else 0
+        })
+        return stats
@@ -0,0 +1,24 @@
+"""
+ChromaDB 버전 호환 유틸리티
+- 임베딩은 수집/질문 경로 전체에서 (n, d) float32 행렬로 전달하고 ChromaDB 호출 직전에만 변환
+- ChromaDB 0.5 이상은 numpy 배열을 그대로 받으므로 변환하지 않음, 0.4.x는 리스트만 받으므로 행렬 단위로 한 번 변환
+"""
+
+from typing import List, Union
+
+import numpy as np
+
+try:
+    import chromadb
+    _CHROMA_VERSION = tuple(int(part) for part in chromadb.__version__.split(".")[:2] if part.isdigit())
+except (ImportError, AttributeError, ValueError):
+    _CHROMA_VERSION = (0, 0)
+
+CHROMA_ACCEPTS_NDARRAY = _CHROMA_VERSION >= (0, 5)
+
+
+def chroma_embeddings(matrix: np.ndarray) -> Union[np.ndarray, List[List[float]]]:
+    """(n, d) float32 행렬을 ChromaDB가 받는 형식으로 (가능하면 복사 없이 그대로)"""
+    if CHROMA_ACCEPTS_NDARRAY:
+        return matrix
+    return matrix.tolist()
@@ -0,0 +1,622 @@
+"""
+열 단위 청크 저장소 모듈
+- 청크 본문, 타입이 유지된 메타데이터 열, 임베딩을 레벨(테이블)마다 한 곳에 저장하는 단일 원본
+- pyarrow가 있으면 Parquet(임베딩은 float32 고정 길이 리스트 열), 없으면 .npy(임베딩, 메모리 매핑) + JSON 열 파일
+- 추가/교체는 새 세그먼트 파일로 쓰고(기존 파일은 다시 쓰지 않음), 삭제는 삭제 표시 후 일정 비율을 넘으면 압축
+- where 필터(ChromaDB 문법)는 본문/임베딩을 읽기 전에 메타데이터 열에서 먼저 계산 (Parquet은 행 그룹 통계로 건너뜀)
+- 벡터 백엔드는 재인코딩 없이 이 저장소에서 다시 구축 (rebuild)
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from data.vectors.factory import deferred_flush
+from data.vectors.vector_utils import as_embedding_matrix
+from data.vectors.metadata_index import scan_mask
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 저장소 내부 열 이름 (메타데이터 키는 밑줄로 시작할 수 없음)
+ID_COLUMN = "_id"
+TEXT_COLUMN = "_text"
+EMBEDDING_COLUMN = "_embedding"
+ROW_COLUMN = "_row"
+
+
+@dataclass
+class ChunkBatch:
+    """청크 묶음 (행 순서가 같은 ID, 본문, 메타데이터, (n, d) float32 임베딩)"""
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    embeddings: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_documents(self) -> List[Dict[str, Any]]:
+        """VectorDatabase.add_documents 입력 형식 (임베딩은 embeddings 인자로 따로 전달)"""
+        return [{**metadata, 'text': text} for metadata, text in zip(self.metadatas, self.texts)]
+
+
+def _concat_batches(batches: List[ChunkBatch]) -> ChunkBatch:
+    if not batches:
+        return ChunkBatch([], [], [])
+    if len(batches) == 1:
+        return batches[0]
+    embeddings = [batch.embeddings for batch in batches if batch.embeddings.size]
+    return ChunkBatch(
+        ids=[doc_id for batch in batches for doc_id in batch.ids],
+        texts=[text for batch in batches for text in batch.texts],
+        metadatas=[metadata for batch in batches for metadata in batch.metadatas],
+        embeddings=np.concatenate(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32)
+    )
+
+
+def _metadata_columns(metadatas: Sequence[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """행 단위 메타데이터 -> 열 단위 (값이 없는 행은 None)"""
+    keys = sorted({key for metadata in metadatas for key in metadata})
+    for key in keys:
+        if key.startswith("_"):
+            raise ValueError(f"밑줄로 시작하는 메타데이터 키는 저장소 내부 열 이름으로 예약됨: {key}")
+    return {key: [metadata.get(key) for metadata in metadatas] for key in keys}
+
+
+def _metadata_rows(columns: Dict[str, List[Any]], count: int) -> List[Dict[str, Any]]:
+    """열 단위 -> 행 단위 메타데이터 (None 값은 키 생략)"""
+    rows = [{} for _ in range(count)]
+    for key, values in columns.items():
+        for row, value in zip(rows, values):
+            if value is not None:
+                row[key] = value
+    return rows
+
+
+# ---------------------------------------------------------------------- 세그먼트 형식
+
+
+class _NumpySegments:
+    """pyarrow 없이 쓰는 세그먼트: 디렉토리 하나에 ids.npy, embeddings.npy(메모리 매핑), texts.json, columns.json"""
+
+    name = "numpy"
+
+    @staticmethod
+    def path(level_dir: Path, name: str) -> Path:
+        return level_dir / name
+
+    def write(self, path: Path, ids: List[str], texts: List[str],
+              metadatas: Sequence[Dict[str, Any]], embeddings: np.ndarray):
+        temp_path = path.with_name(path.name + ".tmp")
+        shutil.rmtree(temp_path, ignore_errors=True)
+        temp_path.mkdir(parents=True)
+        np.save(temp_path / "ids.npy", np.asarray(ids, dtype=str) if ids else np.empty(0, dtype="<U1"))
+        np.save(temp_path / "embeddings.npy", embeddings)
+        with open(temp_path / "texts.json", "w", encoding="utf-8") as f:
+            json.dump(texts, f, ensure_ascii=False)
+        with open(temp_path / "columns.json", "w", encoding="utf-8") as f:
+            json.dump({"columns": _metadata_columns(metadatas)}, f, ensure_ascii=False, default=str)
+        os.replace(temp_path, path)
+
+    def read_ids(self, path: Path) -> List[str]:
+        return np.load(path / "ids.npy").tolist()
+
+    def size(self, path: Path) -> int:
+        return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+    def read(self, path: Path, rows: np.ndarray, total: int, where: Optional[Dict],
+             columns: Optional[Sequence[str]], with_embeddings: bool) -> ChunkBatch:
+        with open(path / "columns.json", "r", encoding="utf-8") as f:
+            metadata_columns = json.load(f)["columns"]
+
+        # 본문/임베딩을 읽기 전에 메타데이터 열로 필터
+        if where:
+            rows = rows[scan_mask(metadata_columns, total, where)[rows]]
+        if columns is not None:
+            metadata_columns = {key: values for key, values in metadata_columns.items() if key in columns}
+
+        ids = np.load(path / "ids.npy")
+        with open(path / "texts.json", "r", encoding="utf-8") as f:
+            texts = json.load(f)
+        embeddings = np.zeros((0, 0), dtype=np.float32)
+        if with_embeddings:
+            embeddings = np.load(path / "embeddings.npy", mmap_mode="r")
+            # 세그먼트 전체가 살아 있으면 메모리 매핑 그대로 반환
+            embeddings = embeddings if len(rows) == total else np.asarray(embeddings[rows], dtype=np.float32)
+
+        row_list = rows.tolist()
+        return ChunkBatch(
+            ids=[ids[row].item() for row in row_list],
+            texts=[texts[row] for row in row_list],
+            metadatas=_metadata_rows({key: [values[row] for row in row_list]
+                                      for key, values in metadata_columns.items()}, len(row_list)),
+            embeddings=embeddings
+        )
+
+
+class _ParquetSegments:
+    """Parquet 세그먼트: 파일 하나에 _id, _text, _row, 메타데이터 열(타입 유지), _embedding(float32 고정 길이 리스트)"""
+
+    name = "parquet"
+
+    # 행 그룹 크기 (행 그룹 통계로 where 필터에 맞지 않는 그룹을 건너뜀)
+    ROW_GROUP_SIZE = 8192
+
+    # where 연산자 -> pyarrow 표현식 (값이 없는 행은 모든 연산자에서 불일치)
+    _EXPRESSIONS = {
+        "$eq": lambda column, operand: column == operand,
+        "$ne": lambda column, operand: column != operand,
+        "$gt": lambda column, operand: column > operand,
+        "$gte": lambda column, operand: column >= operand,
+        "$lt": lambda column, operand: column < operand,
+        "$lte": lambda column, operand: column <= operand,
+        "$in": lambda column, operand: column.isin(list(operand)),
+        "$nin": lambda column, operand: column.is_valid() & ~column.isin(list(operand))
+    }
+
+    @staticmethod
+    def path(level_dir: Path, name: str) -> Path:
+        return level_dir / f"{name}.parquet"
+
+    @staticmethod
+    def _storable(data_type: "pa.DataType") -> bool:
+        """Parquet에 그대로 쓸 수 있는 타입인지 (값이 모두 None인 열, 빈 dict/list만 있는 열은 제외)"""
+        if pa.types.is_null(data_type):
+            return False
+        if pa.types.is_struct(data_type):
+            return data_type.num_fields > 0 and all(
+                _ParquetSegments._storable(data_type.field(i).type) for i in range(data_type.num_fields))
+        if pa.types.is_list(data_type) or pa.types.is_large_list(data_type):
+            return _ParquetSegments._storable(data_type.value_type)
+        return True
+
+    @staticmethod
+    def _column(key: str, values: List[Any]) -> Tuple["pa.Field", "pa.Array"]:
+        """값 타입으로 열 타입 추론 (int64/double/bool/string/list/struct), 타입이 섞인 열은 JSON 문자열"""
+        try:
+            array = pa.array(values)
+            if _ParquetSegments._storable(array.type):
+                return pa.field(key, array.type), array
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        encoded = [None if value is None else json.dumps(value, ensure_ascii=False, default=str) for value in values]
+        return pa.field(key, pa.string(), metadata={b"encoding": b"json"}), pa.array(encoded, pa.string())
+
+    def write(self, path: Path, ids: List[str], texts: List[str],
+              metadatas: Sequence[Dict[str, Any]], embeddings: np.ndarray):
+        fields = [pa.field(ID_COLUMN, pa.string()), pa.field(TEXT_COLUMN, pa.string()),
+                  pa.field(ROW_COLUMN, pa.int32())]
+        arrays = [pa.array(ids, pa.string()), pa.array(texts, pa.string()),
+                  pa.array(np.arange(len(ids), dtype=np.int32))]
+        for key, values in _metadata_columns(metadatas).items():
+            column_field, array = self._column(key, values)
+            fields.append(column_field)
+            arrays.append(array)
+        fields.append(pa.field(EMBEDDING_COLUMN, pa.list_(pa.float32(), embeddings.shape[1])))
+        arrays.append(pa.FixedSizeListArray.from_arrays(pa.array(embeddings.reshape(-1)), embeddings.shape[1]))
+
+        temp_path = path.with_name(path.name + ".tmp")
+        pq.write_table(pa.Table.from_arrays(arrays, schema=pa.schema(fields)), temp_path,
+                       row_group_size=self.ROW_GROUP_SIZE)
+        os.replace(temp_path, path)
+
+    def read_ids(self, path: Path) -> List[str]:
+        return pq.read_table(path, columns=[ID_COLUMN], memory_map=True)[ID_COLUMN].to_pylist()
+
+    def size(self, path: Path) -> int:
+        return path.stat().st_size
+
+    def _expression(self, where: Dict, schema: "pa.Schema") -> Optional["pc.Expression"]:
+        """where -> pyarrow 필터 표현식 (없는 열/list·struct·JSON 인코딩 열/$contains가 있으면 None)"""
+        parts = []
+        for key, condition in where.items():
+            if key in ("$and", "$or"):
+                clauses = [self._expression(clause, schema) for clause in condition]
+                if any(clause is None for clause in clauses) or not clauses:
+                    return None
+                combined = clauses[0]
+                for clause in clauses[1:]:
+                    combined = combined & clause if key == "$and" else combined | clause
+                parts.append(combined)
+                continue
+
+            index = schema.get_field_index(key)
+            if index < 0 or (schema.field(index).metadata or {}).get(b"encoding") == b"json":
+                return None
+            column_type = schema.field(index).type
+            if not (pa.types.is_primitive(column_type) or pa.types.is_string(column_type)):
+                return None
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, operand in condition.items():
+                build = self._EXPRESSIONS.get(op)
+                if build is None:
+                    return None
+                parts.append(build(pc.field(key), operand))
+
+        if not parts:
+            return None
+        combined = parts[0]
+        for part in parts[1:]:
+            combined = combined & part
+        return combined
+
+    @staticmethod
+    def _decode(table: "pa.Table", name: str) -> List[Any]:
+        values = table[name].to_pylist()
+        if (table.schema.field(name).metadata or {}).get(b"encoding") == b"json":
+            return [None if value is None else json.loads(value) for value in values]
+        return values
+
+    def read(self, path: Path, rows: np.ndarray, total: int, where: Optional[Dict],
+             columns: Optional[Sequence[str]], with_embeddings: bool) -> ChunkBatch:
+        schema = pq.read_schema(path)
+        metadata_names = [name for name in schema.names
+                          if not name.startswith("_") and (columns is None or name in columns)]
+        names = [ID_COLUMN, TEXT_COLUMN, ROW_COLUMN] + metadata_names + ([EMBEDDING_COLUMN] if with_embeddings else [])
+
+        expression = self._expression(where, schema) if where else None
+        if where and expression is None:
+            # 표현식으로 옮길 수 없는 조건은 필터에 쓰인 메타데이터 열만 읽어서 검사
+            where_names = [name for name in schema.names if not name.startswith("_")]
+            where_table = pq.read_table(path, columns=where_names, memory_map=True)
+            mask = scan_mask({name: self._decode(where_table, name) for name in where_names}, total, where)
+            rows = rows[mask[rows]]
+
+        table = pq.read_table(path, columns=names, filters=expression, memory_map=True)
+        if len(rows) != total or expression is not None:
+            table = table.filter(pa.array(np.isin(table[ROW_COLUMN].to_numpy(), rows)))
+
+        embeddings = np.zeros((0, 0), dtype=np.float32)
+        if with_embeddings:
+            dim = schema.field(EMBEDDING_COLUMN).type.list_size
+            values = table[EMBEDDING_COLUMN].combine_chunks().flatten()
+            embeddings = values.to_numpy(zero_copy_only=False).reshape(-1, dim)
+
+        return ChunkBatch(
+            ids=table[ID_COLUMN].to_pylist(),
+            texts=table[TEXT_COLUMN].to_pylist(),
+            metadatas=_metadata_rows({name: self._decode(table, name) for name in metadata_names}, table.num_rows),
+            embeddings=embeddings
+        )
+
+
+_SEGMENT_FORMATS = {"numpy": _NumpySegments, "parquet": _ParquetSegments}
+
+
+# ---------------------------------------------------------------------- 저장소
+
+
+class _Level:
+    """레벨(테이블) 하나의 매니페스트와 살아 있는 행 위치"""
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any]):
+        self.directory = directory
+        self.manifest = manifest
+        self.segments = _SEGMENT_FORMATS[manifest["format"]]()
+        # ID -> (세그먼트 이름, 행 번호), 같은 ID는 나중 세그먼트가 우선
+        self.live: Dict[str, Tuple[str, int]] = {}
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.manifest.get("dim")
+
+    def segment_path(self, name: str) -> Path:
+        return self.segments.path(self.directory, name)
+
+    def live_rows(self) -> Dict[str, np.ndarray]:
+        """세그먼트 이름 -> 살아 있는 행 번호 (오름차순)"""
+        rows: Dict[str, List[int]] = {}
+        for name, row in self.live.values():
+            rows.setdefault(name, []).append(row)
+        return {name: np.sort(np.asarray(values, dtype=np.int64)) for name, values in rows.items()}
+
+
+class ChunkStore:
+    """레벨별 열 단위 청크 저장소"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self,
+                 root: Union[str, Path] = "data/chunks",
+                 compact_ratio: float = 0.3,
+                 max_segments: int = 32):
+        """
+        Args:
+            root: 저장소 디렉토리 (레벨마다 하위 디렉토리 하나)
+            compact_ratio: 삭제/교체된 행 비율이 이 값을 넘으면 레벨을 세그먼트 하나로 압축
+            max_segments: 세그먼트 수가 이 값을 넘으면 압축
+        """
+        self.root = Path(root)
+        self.compact_ratio = compact_ratio
+        self.max_segments = max_segments
+        self._lock = threading.RLock()
+        self._levels: Dict[str, _Level] = {}
+
+    # ------------------------------------------------------------------ 레벨 로드
+
+    def levels(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if (path / "manifest.json").exists())
+
+    def _level(self, level: str, create_format: Optional[str] = None) -> Optional[_Level]:
+        """레벨 로드 (처음이면 세그먼트 ID만 읽어 살아 있는 행 위치 구성)"""
+        loaded = self._levels.get(level)
+        if loaded is not None:
+            return loaded
+
+        directory = self.root / level
+        manifest_path = directory / "manifest.json"
+        if manifest_path.exists():
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("format_version") != self.FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 청크 저장소 형식: {manifest.get('format_version')}")
+        elif create_format is not None:
+            manifest = {"format_version": self.FORMAT_VERSION, "format": create_format, "dim": None,
+                        "next_seq": 1, "segments": [], "tombstones": {}}
+        else:
+            return None
+
+        if manifest["format"] == "parquet" and not PYARROW_AVAILABLE:
+            raise RuntimeError(f"청크 저장소 레벨 '{level}'은 Parquet 형식입니다. pyarrow를 설치하세요")
+
+        loaded = _Level(directory, manifest)
+        seqs = {}
+        for segment in manifest["segments"]:
+            seqs[segment["name"]] = segment["seq"]
+            for row, doc_id in enumerate(loaded.segments.read_ids(loaded.segment_path(segment["name"]))):
+                loaded.live[doc_id] = (segment["name"], row)
+        # 삭제 표시보다 먼저 쓰인 행은 삭제된 행
+        for doc_id, seq in manifest["tombstones"].items():
+            location = loaded.live.get(doc_id)
+            if location is not None and seqs[location[0]] < seq:
+                del loaded.live[doc_id]
+
+        self._levels[level] = loaded
+        return loaded
+
+    def _save_manifest(self, loaded: _Level):
+        loaded.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = loaded.directory / "manifest.json.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(loaded.manifest, f, ensure_ascii=False)
+        os.replace(temp_path, loaded.directory / "manifest.json")
+
+    # ------------------------------------------------------------------ 갱신
+
+    def write(self,
+              level: str,
+              ids: Sequence[str],
+              texts: Sequence[str],
+              metadatas: Sequence[Dict[str, Any]],
+              embeddings: Union[np.ndarray, Sequence[Sequence[float]]]) -> int:
+        """
+        청크 추가 (같은 ID가 있으면 교체)
+
+        Args:
+            level: 테이블 이름 (예: "chunks", "document", "section")
+            ids: 청크 ID
+            texts: 청크 본문
+            metadatas: 타입을 유지한 메타데이터 (dict/list 값도 그대로)
+            embeddings: (n, d) 임베딩 행렬
+        """
+        if not ids:
+            return 0
+        matrix = as_embedding_matrix(embeddings)
+        if not (len(ids) == len(texts) == len(metadatas) == len(matrix)):
+            raise ValueError("ids, texts, metadatas, embeddings의 길이가 다릅니다")
+
+        # 같은 배치 안의 중복 ID는 마지막 항목만 유지
+        last = {doc_id: i for i, doc_id in enumerate(ids)}
+        if len(last) != len(ids):
+            keep = sorted(last.values())
+            ids, texts, metadatas = [ids[i] for i in keep], [texts[i] for i in keep], [metadatas[i] for i in keep]
+            matrix = matrix[keep]
+
+        with self._lock:
+            loaded = self._level(level, create_format="parquet" if PYARROW_AVAILABLE else "numpy")
+            if loaded.dim is not None and matrix.shape[1] != loaded.dim:
+                raise ValueError(f"임베딩 차원 불일치 ({matrix.shape[1]} != {loaded.dim})")
+
+            manifest = loaded.manifest
+            seq = manifest["next_seq"]
+            name = f"part-{seq:06d}"
+            loaded.directory.mkdir(parents=True, exist_ok=True)
+            loaded.segments.write(loaded.segment_path(name), list(ids), list(texts), metadatas, matrix)
+
+            manifest["next_seq"] = seq + 1
+            manifest["dim"] = int(matrix.shape[1])
+            manifest["segments"].append({"name": name, "seq": seq, "rows": len(ids)})
+            for row, doc_id in enumerate(ids):
+                loaded.live[doc_id] = (name, row)
+                manifest["tombstones"].pop(doc_id, None)
+            self._save_manifest(loaded)
+            self._maybe_compact(level, loaded)
+        return len(ids)
+
+    def write_documents(self,
+                        level: str,
+                        documents: List[Dict[str, Any]],
+                        embeddings: Optional[np.ndarray] = None) -> int:
+        """
+        VectorDatabase.add_documents 입력 형식의 문서 조각 기록
+
+        ID는 VectorDatabase와 같은 규칙(파일명 + 조각 ID)으로 만들고, 'text'/'embedding'을 뺀 나머지를
+        메타데이터로 저장하므로 rebuild로 같은 ID의 컬렉션을 다시 만들 수 있음
+        """
+        ids, texts, metadatas = [], [], []
+        for doc in documents:
+            metadata = {k: v for k, v in doc.items() if k not in ['embedding', 'text'] and v is not None}
+            metadata.setdefault('id', str(uuid.uuid4()))
+            ids.append(f"{metadata.get('file_name', 'unknown')}_{metadata['id']}")
+            texts.append(doc.get('text', ''))
+            metadatas.append(metadata)
+        matrix = embeddings if embeddings is not None else [doc.get('embedding', []) for doc in documents]
+        return self.write(level, ids, texts, metadatas, matrix)
+
+    def delete(self, level: str, ids: Sequence[str]) -> int:
+        """청크 삭제 (세그먼트는 그대로 두고 삭제 표시)"""
+        with self._lock:
+            loaded = self._level(level)
+            if loaded is None:
+                return 0
+            removed = 0
+            for doc_id in ids:
+                if loaded.live.pop(doc_id, None) is not None:
+                    loaded.manifest["tombstones"][doc_id] = loaded.manifest["next_seq"]
+                    removed += 1
+            if removed:
+                self._save_manifest(loaded)
+                self._maybe_compact(level, loaded)
+            return removed
+
+    def drop(self, level: str) -> None:
+        """레벨 전체 삭제"""
+        with self._lock:
+            self._levels.pop(level, None)
+            shutil.rmtree(self.root / level, ignore_errors=True)
+
+    def _maybe_compact(self, level: str, loaded: _Level):
+        total = sum(segment["rows"] for segment in loaded.manifest["segments"])
+        dead = total - len(loaded.live)
+        if len(loaded.manifest["segments"]) > self.max_segments or (total and dead / total > self.compact_ratio):
+            self.compact(level)
+
+    def compact(self, level: str) -> None:
+        """살아 있는 행만 세그먼트 하나로 다시 쓰기"""
+        with self._lock:
+            loaded = self._level(level)
+            if loaded is None:
+                return
+            batch = self.scan(level)
+            old_segments = list(loaded.manifest["segments"])
+
+            manifest = loaded.manifest
+            manifest["segments"] = []
+            manifest["tombstones"] = {}
+            loaded.live = {}
+            if len(batch):
+                seq = manifest["next_seq"]
+                name = f"part-{seq:06d}"
+                loaded.segments.write(loaded.segment_path(name), batch.ids, batch.texts,
+                                      batch.metadatas, as_embedding_matrix(batch.embeddings))
+                manifest["next_seq"] = seq + 1
+                manifest["segments"].append({"name": name, "seq": seq, "rows": len(batch)})
+                loaded.live = {doc_id: (name, row) for row, doc_id in enumerate(batch.ids)}
+            self._save_manifest(loaded)
+
+            for segment in old_segments:
+                path = loaded.segment_path(segment["name"])
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                elif path.exists():
+                    path.unlink()
+            logger.info(f"청크 저장소 압축: {level} ({len(old_segments)}개 세그먼트 -> {len(manifest['segments'])}개)")
+
+    # ------------------------------------------------------------------ 조회
+
+    def count(self, level: str) -> int:
+        with self._lock:
+            loaded = self._level(level)
+            return len(loaded.live) if loaded is not None else 0
+
+    def __contains__(self, level: str) -> bool:
+        return self.count(level) > 0
+
+    def iter_batches(self,
+                     level: str,
+                     where: Optional[Dict] = None,
+                     columns: Optional[Sequence[str]] = None,
+                     with_embeddings: bool = True,
+                     batch_size: Optional[int] = None) -> Iterator[ChunkBatch]:
+        """
+        세그먼트 단위로 살아 있는 청크 읽기
+
+        Args:
+            where: ChromaDB 문법 메타데이터 필터 (본문/임베딩을 읽기 전에 적용)
+            columns: 읽을 메타데이터 열 (None이면 전부)
+            with_embeddings: 임베딩 읽기 여부 (메타데이터만 필요하면 False)
+            batch_size: 세그먼트를 이 크기로 나눠 반환 (None이면 세그먼트 하나씩)
+        """
+        with self._lock:
+            loaded = self._level(level)
+            if loaded is None:
+                return
+            segments = list(loaded.manifest["segments"])
+            live_rows = loaded.live_rows()
+
+        for segment in segments:
+            rows = live_rows.get(segment["name"])
+            if rows is None or not rows.size:
+                continue
+            batch = loaded.segments.read(loaded.segment_path(segment["name"]), rows, segment["rows"],
+                                         where, columns, with_embeddings)
+            if not len(batch):
+                continue
+            if batch_size is None or len(batch) <= batch_size:
+                yield batch
+                continue
+            for start in range(0, len(batch), batch_size):
+                end = start + batch_size
+                yield ChunkBatch(batch.ids[start:end], batch.texts[start:end], batch.metadatas[start:end],
+                                 batch.embeddings[start:end] if with_embeddings else batch.embeddings)
+
+    def scan(self,
+             level: str,
+             where: Optional[Dict] = None,
+             columns: Optional[Sequence[str]] = None,
+             with_embeddings: bool = True) -> ChunkBatch:
+        """살아 있는 청크 전체를 하나의 묶음으로 읽기"""
+        return _concat_batches(list(self.iter_batches(level, where, columns, with_embeddings)))
+
+    def rebuild(self, level: str, vector_db, where: Optional[Dict] = None, batch_size: int = 5000) -> int:
+        """
+        저장된 청크와 임베딩으로 벡터 백엔드 다시 구축 (재인코딩 없음)
+
+        Args:
+            vector_db: add_documents(documents, embeddings=...)를 제공하는 벡터 데이터베이스
+                       (deferred_flush를 제공하면 배치마다 저장하지 않고 끝에 한 번 저장)
+        """
+        added = 0
+        with deferred_flush(vector_db):
+            for batch in self.iter_batches(level, where=where, batch_size=batch_size):
+                if not vector_db.add_documents(batch.to_documents(), embeddings=batch.embeddings):
+                    raise RuntimeError(f"벡터 데이터베이스 적재 실패 ({level}, {added}개 적재 후)")
+                added += len(batch)
+        logger.info(f"청크 저장소에서 벡터 데이터베이스 재구축: {level} {added}개")
+        return added
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {"root": str(self.root), "pyarrow": PYARROW_AVAILABLE, "levels": {}}
+        with self._lock:
+            for level in self.levels():
+                loaded = self._level(level)
+                segments = loaded.manifest["segments"]
+                stats["levels"][level] = {
+                    "format": loaded.manifest["format"],
+                    "chunks": len(loaded.live),
+                    "rows": sum(segment["rows"] for segment in segments),
+                    "segments": len(segments),
+                    "dim": loaded.dim,
+                    "bytes": sum(loaded.segments.size(loaded.segment_path(segment["name"]))
+                                 for segment in segments)
+                }
+        return stats
@@ -0,0 +1,588 @@
+"""
+정확 검색 벡터 데이터베이스 모듈
+- ChromaDB 없이 프로세스 안에서 동작하는 VectorDatabase 대체 백엔드 (같은 메서드 제공)
+- 정규화된 float32 임베딩 행렬을 .npy로 저장하고 메모리 매핑으로 로드, ID 배열과 열 단위 메타데이터를 함께 저장
+- 파일 저장은 변경마다 하지 않고 flush()에서 한 번에 (auto_flush=True이면 변경 직후, deferred_flush() 블록 안에서는 블록 끝에)
+- 여러 질문을 한 번의 행렬곱(GEMM)으로 계산하고 top-k는 argpartition으로 선택
+- 거리/유사도는 ChromaDB 기본 거리(제곱 L2)를 정규화된 벡터에 적용한 값: distance = 2 - 2cos, similarity = 1 - distance
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from data.vectors.vector_utils import normalize_embeddings
+from data.vectors.metadata_index import FilterPlan, MetadataIndex, plan_filter, scan_mask
+from retrieval.bm25_index import BM25Index
+
+
+class ExactVectorDatabase:
+    """메모리 매핑 정확 검색 벡터 데이터베이스"""
+
+    # 필터 일치 비율이 이 값 이하이면 일치 행만 모아 계산, 넘으면 전체 행렬곱 후 불일치 행 제외
+    # (메모리 매핑 행을 모으는 복사 비용이 행렬곱보다 커지는 지점)
+    PREFILTER_RATIO = 0.2
+
+    def __init__(self,
+                 db_path: str = "./vector_db",
+                 collection_name: str = "power_market_docs",
+                 enable_lexical_index: bool = True,
+                 read_only: bool = False,
+                 auto_flush: bool = True):
+        """
+        Args:
+            db_path: 데이터베이스 저장 경로
+            collection_name: 컬렉션 이름 (db_path/{collection_name}_exact 디렉토리에 저장)
+            enable_lexical_index: BM25 어휘 색인 사용 여부 (컬렉션 변경 시 함께 갱신)
+            read_only: 읽기 전용으로 열기 (서빙 스냅샷처럼 여러 프로세스가 같은 파일을 메모리 매핑할 때,
+                       파일을 쓰지 않으며 추가/삭제는 실패)
+            auto_flush: 추가/삭제 직후 파일로 저장 (False이면 flush() 호출 시 저장,
+                        저장은 컬렉션 전체를 다시 쓰므로 여러 배치를 적재할 때는 끝에 한 번만 저장)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.collection_name = collection_name
+        self.read_only = read_only
+        self.auto_flush = auto_flush
+        self._dirty = False
+        self.store_path = os.path.join(db_path, f"{collection_name}_exact")
+        if read_only and not os.path.exists(os.path.join(self.store_path, "ids.npy")):
+            raise FileNotFoundError(f"읽기 전용으로 열 컬렉션이 없습니다: {self.store_path}")
+        os.makedirs(self.store_path, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self.ids: List[str] = []
+        self.id_index: Dict[str, int] = {}
+        self.documents: List[str] = []
+        self.columns: Dict[str, List[Any]] = {}
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._embedding_buffer: Optional[np.ndarray] = None  # 추가용 여유 용량 버퍼 (embeddings는 앞부분 뷰)
+        self._load()
+
+        self.lexical_index_path = os.path.join(self.store_path, "bm25")
+        self.lexical_index = self._load_lexical_index() if enable_lexical_index else None
+        self.metadata_index_path = os.path.join(self.store_path, "metadata_index")
+        self.metadata_index = self._load_metadata_index()
+
+        self.logger.info(f"정확 검색 벡터 데이터베이스 초기화 완료: {self.store_path} ({len(self.ids)}개 문서)")
+
+    # ------------------------------------------------------------------ 저장소
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.store_path, name)
+
+    def _load(self):
+        """저장된 컬렉션 로드 (임베딩은 읽기 전용 메모리 매핑)"""
+        if not os.path.exists(self._path("ids.npy")):
+            return
+        self.embeddings = np.load(self._path("embeddings.npy"), mmap_mode="r")
+        self.ids = np.load(self._path("ids.npy")).tolist()
+        self.id_index = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        with open(self._path("documents.json"), "r", encoding="utf-8") as f:
+            self.documents = json.load(f)
+        with open(self._path("metadata.json"), "r", encoding="utf-8") as f:
+            self.columns = json.load(f)["columns"]
+
+    def _write_atomic(self, name: str, write: Callable):
+        """임시 파일에 쓴 뒤 교체 (기존 파일을 메모리 매핑 중이어도 안전)"""
+        temp_path = self._path(f"{name}.tmp")
+        with open(temp_path, "wb") as f:
+            write(f)
+        os.replace(temp_path, self._path(name))
+
+    def _save(self):
+        """컬렉션 전체 저장 후 임베딩을 메모리 매핑으로 다시 열어 힙 메모리 해제 (flush에서 호출)"""
+        embeddings = np.ascontiguousarray(self.embeddings, dtype=np.float32)
+        ids = np.asarray(self.ids, dtype=str) if self.ids else np.empty(0, dtype="<U1")
+        self._write_atomic("embeddings.npy", lambda f: np.save(f, embeddings))
+        self._write_atomic("ids.npy", lambda f: np.save(f, ids))
+        self._write_atomic("documents.json", lambda f: f.write(
+            json.dumps(self.documents, ensure_ascii=False).encode("utf-8")))
+        self._write_atomic("metadata.json", lambda f: f.write(
+            json.dumps({"columns": self.columns}, ensure_ascii=False).encode("utf-8")))
+        if embeddings.size:
+            self.embeddings = np.load(self._path("embeddings.npy"), mmap_mode="r")
+            self._embedding_buffer = None
+        self.metadata_index.save(self.metadata_index_path)
+
+    def _load_lexical_index(self) -> Optional[BM25Index]:
+        """BM25 색인 로드 (없거나 문서 수가 다르면 저장된 본문으로 재구축)"""
+        try:
+            if BM25Index.exists(self.lexical_index_path):
+                index = BM25Index.load(self.lexical_index_path)
+                if len(index) == len(self.ids):
+                    return index
+                self.logger.warning(f"BM25 색인 문서 수 불일치 ({len(index)} != {len(self.ids)}), 재구축합니다")
+
+            index = BM25Index()
+            index.add(self.ids, [text or '' for text in self.documents])
+            if not self.read_only:
+                index.save(self.lexical_index_path)
+            return index
+
+        except Exception as e:
+            self.logger.error(f"BM25 색인 준비 실패, 어휘 검색 비활성화: {e}")
+            return None
+
+    def _save_lexical_index(self):
+        try:
+            self.lexical_index.save(self.lexical_index_path)
+        except Exception as e:
+            self.logger.error(f"BM25 색인 저장 실패: {e}")
+
+    def _changed(self):
+        """변경 표시 (auto_flush이면 바로 저장)"""
+        self._dirty = True
+        self._touch_version()
+        if self.auto_flush:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        저장하지 않은 변경을 파일로 저장 (임베딩, ID, 본문, 메타데이터 열, 메타데이터 역색인, BM25)
+
+        Returns:
+            저장했으면 True, 변경이 없었으면 False
+        """
+        with self._lock:
+            if not self._dirty or self.read_only:
+                return False
+            self._save()
+            if self.lexical_index is not None:
+                self._save_lexical_index()
+            self._dirty = False
+            return True
+
+    @contextmanager
+    def deferred_flush(self) -> Iterator["ExactVectorDatabase"]:
+        """with 블록 안의 추가/삭제는 메모리에만 반영하고 블록이 끝날 때 한 번 저장 (여러 배치 적재용)"""
+        with self._lock:
+            auto_flush, self.auto_flush = self.auto_flush, False
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.auto_flush = auto_flush
+                # 바깥 deferred_flush 블록 안이면 바깥 블록이 끝날 때 저장
+                if auto_flush:
+                    self.flush()
+
+    def _load_metadata_index(self) -> MetadataIndex:
+        """
+        메타데이터 역색인 로드 (문서 번호 = 행 번호, 저장된 색인이 컬렉션과 다르면 열에서 재구축)
+
+        삭제 즉시 압축(compact_ratio=0)하므로 행 삭제/추가 후에도 문서 번호와 행 번호가 같음
+        """
+        try:
+            if MetadataIndex.exists(self.metadata_index_path):
+                index = MetadataIndex.load(self.metadata_index_path)
+                if index.doc_ids == self.ids:
+                    index.compact_ratio = 0.0
+                    return index
+                self.logger.warning("메타데이터 색인이 컬렉션과 다릅니다. 재구축합니다")
+        except Exception as e:
+            self.logger.warning(f"메타데이터 색인 로드 실패, 재구축합니다: {e}")
+
+        index = MetadataIndex(compact_ratio=0.0)
+        if self.ids:
+            index.add(self.ids, [self._metadata(row) for row in range(len(self.ids))])
+            if not self.read_only:
+                index.save(self.metadata_index_path)
+        return index
+
+    def _writable(self) -> bool:
+        if self.read_only:
+            self.logger.error(f"읽기 전용 컬렉션은 변경할 수 없습니다: {self.store_path}")
+        return not self.read_only
+
+    def _metadata(self, row: int) -> Dict[str, Any]:
+        return {key: column[row] for key, column in self.columns.items() if column[row] is not None}
+
+    def _append_embeddings(self, matrix: np.ndarray):
+        """임베딩 행 추가 (여유 용량을 두 배씩 늘린 버퍼에 써서 배치마다 전체 행렬을 복사하지 않음)"""
+        count = self.embeddings.shape[0] if self.embeddings.size else 0
+        needed = count + matrix.shape[0]
+        buffer = self._embedding_buffer
+        if buffer is None or self.embeddings.base is not buffer or buffer.shape[0] < needed:
+            # 저장 후 메모리 매핑으로 바뀌었거나 삭제로 다시 구성된 경우에도 새 버퍼로 한 번 복사
+            capacity = max(needed, 2 * count, 1024)
+            buffer = np.empty((capacity, matrix.shape[1]), dtype=np.float32)
+            if count:
+                buffer[:count] = self.embeddings
+            self._embedding_buffer = buffer
+        buffer[count:needed] = matrix
+        self.embeddings = buffer[:needed]
+
+    def _remove_rows(self, doc_ids: List[str]) -> int:
+        """행 삭제 (남은 행으로 배열/열을 다시 구성)"""
+        rows = {self.id_index[doc_id] for doc_id in doc_ids if doc_id in self.id_index}
+        if not rows:
+            return 0
+        self.metadata_index.remove(doc_ids)
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[list(rows)] = False
+        kept = np.flatnonzero(keep).tolist()
+
+        self.embeddings = np.asarray(self.embeddings[keep], dtype=np.float32)
+        self._embedding_buffer = None
+        self.ids = [self.ids[i] for i in kept]
+        self.id_index = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self.documents = [self.documents[i] for i in kept]
+        self.columns = {key: [column[i] for i in kept] for key, column in self.columns.items()}
+        return len(rows)
+
+    # ------------------------------------------------------------------ 메타데이터 필터
+
+    def _where_mask(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        """where 필터를 만족하는 행 마스크 (필터가 없으면 None, 색인한 필드는 역색인으로 계산)"""
+        if not where:
+            return None
+        rows = self.metadata_index.evaluate(where)
+        if rows is None:
+            return self._scan_mask(where)
+        mask = np.zeros(len(self.ids), dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def plan_where(self, where: Optional[Dict], top_k: int) -> FilterPlan:
+        """where 필터 실행 계획 (색인하지 않은 필드는 열 검사 결과로 계획)"""
+        plan = self.metadata_index.plan(where, top_k, prefilter_ratio=self.PREFILTER_RATIO)
+        if plan.strategy == "native":
+            plan = plan_filter(np.flatnonzero(self._scan_mask(where)), len(self.ids), top_k,
+                               prefilter_ratio=self.PREFILTER_RATIO)
+        return plan
+
+    def _scan_mask(self, where: Dict) -> np.ndarray:
+        """색인하지 않은 필드가 포함된 필터는 열 값을 하나씩 검사"""
+        return scan_mask(self.columns, len(self.ids), where)
+
+    # ------------------------------------------------------------------ VectorDatabase 메서드
+
+    def add_documents(self, documents: List[Dict[str, any]],
+                      embeddings: Optional[np.ndarray] = None) -> bool:
+        """
+        문서들을 벡터 데이터베이스에 추가 (같은 ID가 있으면 교체)
+
+        Args:
+            documents: 문서 조각 (text, file_name, id, 메타데이터)
+            embeddings: 문서 순서대로의 (n, d) 임베딩 행렬 (없으면 각 문서의 'embedding'을 한 번에 쌓음)
+        """
+        try:
+            if not documents:
+                self.logger.warning("추가할 문서가 없습니다")
+                return False
+            if not self._writable():
+                return False
+
+            ids = []
+            metadatas = []
+            documents_text = []
+            for doc in documents:
+                # 고유 ID 생성 (파일명 + 조각 ID) - VectorDatabase와 같은 규칙
+                ids.append(f"{doc.get('file_name', 'unknown')}_{doc.get('id', uuid.uuid4())}")
+
+                metadata = {k: v for k, v in doc.items()
+                            if k not in ['embedding', 'text'] and v is not None}
+                for key, value in metadata.items():
+                    if not isinstance(value, (str, int, float, bool)):
+                        metadata[key] = str(value)
+                metadatas.append(metadata)
+                documents_text.append(doc.get('text', ''))
+
+            matrix = normalize_embeddings(
+                embeddings if embeddings is not None else [doc.get('embedding', []) for doc in documents]
+            )
+
+            # 배치 안에서 같은 ID가 반복되면 마지막 항목만 남김 (ChunkStore.write와 같은 규칙)
+            last = {doc_id: i for i, doc_id in enumerate(ids)}
+            if len(last) != len(ids):
+                keep = sorted(last.values())
+                ids = [ids[i] for i in keep]
+                metadatas = [metadatas[i] for i in keep]
+                documents_text = [documents_text[i] for i in keep]
+                matrix = matrix[keep]
+
+            with self._lock:
+                self._remove_rows(ids)
+                if self.embeddings.size and matrix.shape[1] != self.embeddings.shape[1]:
+                    raise ValueError(f"임베딩 차원 불일치 ({matrix.shape[1]} != {self.embeddings.shape[1]})")
+
+                old_count = len(self.ids)
+                self._append_embeddings(matrix)
+                for doc_id in ids:
+                    self.id_index[doc_id] = len(self.ids)
+                    self.ids.append(doc_id)
+                self.documents.extend(documents_text)
+
+                for key in {key for metadata in metadatas for key in metadata}:
+                    self.columns.setdefault(key, [None] * old_count)
+                for key, column in self.columns.items():
+                    column.extend(metadata.get(key) for metadata in metadatas)
+                self.metadata_index.add(ids, metadatas)
+
+                if self.lexical_index is not None:
+                    self.lexical_index.add(ids, documents_text)
+                self._changed()
+
+            self.logger.info(f"{len(documents)}개 문서를 벡터 데이터베이스에 추가했습니다")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"문서 추가 실패: {e}")
+            return False
+
+    def search_similar(self,
+                       query_embedding: Union[np.ndarray, List[float]],
+                       top_k: int = 5,
+                       where: Optional[Dict] = None) -> List[Dict[str, any]]:
+        """유사한 문서 검색"""
+        results = self.search_similar_batch([query_embedding], top_k=top_k, where=where)
+        formatted_results = results[0] if results else []
+        self.logger.info(f"{len(formatted_results)}개의 유사 문서를 찾았습니다")
+        return formatted_results
+
+    def search_similar_batch(self,
+                             query_embeddings: Union[np.ndarray, List[List[float]]],
+                             top_k: int = 5,
+                             where: Optional[Dict] = None) -> List[List[Dict[str, any]]]:
+        """여러 질문 임베딩을 한 번의 행렬곱으로 검색 (질문별 결과 리스트 반환)"""
+        try:
+            if len(query_embeddings) == 0:
+                return []
+            queries = normalize_embeddings(query_embeddings)
+
+            with self._lock:
+                plan = self.plan_where(where, top_k)
+                if not len(self.ids) or plan.strategy == "empty":
+                    return [[] for _ in range(len(queries))]
+
+                candidates = plan.doc_numbers if plan.strategy == "prefilter" else None
+                matrix = self.embeddings if candidates is None else self.embeddings[candidates]
+                similarities = queries @ matrix.T
+                if plan.strategy == "postfilter":
+                    # 일치 행이 많으면 모으는 비용보다 전체 계산 후 제외가 빠름 (결과는 같음)
+                    excluded = np.ones(len(self.ids), dtype=bool)
+                    excluded[plan.doc_numbers] = False
+                    similarities[:, excluded] = -np.inf
+
+                k = min(top_k, similarities.shape[1] if plan.doc_numbers is None else plan.doc_numbers.size)
+                if k < similarities.shape[1]:
+                    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+                else:
+                    top = np.broadcast_to(np.arange(k), (len(queries), k))
+                top_similarities = np.take_along_axis(similarities, top, axis=1)
+                order = np.argsort(-top_similarities, axis=1, kind="stable")
+                top = np.take_along_axis(top, order, axis=1)
+                top_similarities = np.take_along_axis(top_similarities, order, axis=1)
+                rows = top if candidates is None else candidates[top]
+
+                batch_results = []
+                for q in range(len(queries)):
+                    formatted_results = []
+                    for row, cosine in zip(rows[q].tolist(), top_similarities[q].tolist()):
+                        distance = 2.0 - 2.0 * cosine
+                        formatted_results.append({
+                            'id': self.ids[row],
+                            'text': self.documents[row],
+                            'metadata': self._metadata(row),
+                            'distance': distance,
+                            'similarity': 1.0 - distance
+                        })
+                    batch_results.append(formatted_results)
+            return batch_results
+
+        except Exception as e:
+            self.logger.error(f"일괄 유사 문서 검색 실패: {e}")
+            return [[] for _ in range(len(query_embeddings))]
+
+    def search_by_text(self,
+                       query_text: str,
+                       top_k: int = 5,
+                       where: Optional[Dict] = None) -> List[Dict[str, any]]:
+        """텍스트로 직접 검색 (임베딩 함수가 없으므로 질문 단어 포함 여부로 조회)"""
+        return self.search_by_keywords(query_text.split(), top_k=top_k, where=where)
+
+    def search_lexical(self,
+                       query_text: str,
+                       top_k: int = 20,
+                       query_embedding: Optional[Union[np.ndarray, List[float]]] = None,
+                       where: Optional[Dict] = None) -> List[Dict[str, any]]:
+        """BM25 어휘 검색 (VectorDatabase.search_lexical과 같은 결과 형식)"""
+        try:
+            if self.lexical_index is None:
+                return []
+
+            hits = self.lexical_index.search(query_text, top_k * 2 if where else top_k)
+            if not hits:
+                return []
+
+            with self._lock:
+                mask = self._where_mask(where)
+                query = normalize_embeddings(query_embedding)[0] if query_embedding is not None else None
+
+                formatted_results = []
+                for doc_id, score in hits:
+                    row = self.id_index.get(doc_id)
+                    if row is None or (mask is not None and not mask[row]):
+                        continue
+                    similarity = 0.0
+                    if query is not None:
+                        similarity = 1.0 - float(np.sum((self.embeddings[row] - query) ** 2))
+                    formatted_results.append({
+                        'id': doc_id,
+                        'text': self.documents[row],
+                        'metadata': self._metadata(row),
+                        'similarity': similarity,
+                        'score': score
+                    })
+            return formatted_results[:top_k]
+
+        except Exception as e:
+            self.logger.error(f"BM25 검색 실패: {e}")
+            return []
+
+    def search_by_keywords(self,
+                           terms: List[str],
+                           top_k: int = 20,
+                           query_embedding: Optional[Union[np.ndarray, List[float]]] = None,
+                           where: Optional[Dict] = None) -> List[Dict[str, any]]:
+        """키워드 포함 문서 조회 (하나라도 포함되면 후보, 저장 순서대로 top_k개)"""
+        try:
+            terms = [term for term in dict.fromkeys(terms) if term]
+            if not terms:
+                return []
+
+            with self._lock:
+                mask = self._where_mask(where)
+                rows = []
+                for row, text in enumerate(self.documents):
+                    if mask is not None and not mask[row]:
+                        continue
+                    if any(term in text for term in terms):
+                        rows.append(row)
+                        if len(rows) >= top_k:
+                            break
+
+                similarities = None
+                if query_embedding is not None and rows:
+                    query = normalize_embeddings(query_embedding)[0]
+                    similarities = 1.0 - np.sum((self.embeddings[rows] - query) ** 2, axis=1)
+
+                formatted_results = []
+                for i, row in enumerate(rows):
+                    formatted_results.append({
+                        'id': self.ids[row],
+                        'text': self.documents[row],
+                        'metadata': self._metadata(row),
+                        'similarity': float(similarities[i]) if similarities is not None else 0.0
+                    })
+
+            self.logger.info(f"키워드 {len(terms)}개로 {len(formatted_results)}개 문서를 찾았습니다")
+            return formatted_results
+
+        except Exception as e:
+            self.logger.error(f"키워드 검색 실패: {e}")
+            return []
+
+    def get_document_by_id(self, doc_id: str) -> Optional[Dict[str, any]]:
+        """ID로 특정 문서 가져오기"""
+        with self._lock:
+            row = self.id_index.get(doc_id)
+            if row is None:
+                return None
+            return {
+                'id': doc_id,
+                'text': self.documents[row],
+                'metadata': self._metadata(row),
+                'embedding': np.asarray(self.embeddings[row]).tolist()
+            }
+
+    def delete_documents(self, doc_ids: List[str]) -> bool:
+        """문서들 삭제"""
+        if not self._writable():
+            return False
+        try:
+            with self._lock:
+                self._remove_rows(doc_ids)
+                if self.lexical_index is not None:
+                    self.lexical_index.remove(doc_ids)
+                self._changed()
+            self.logger.info(f"{len(doc_ids)}개 문서를 삭제했습니다")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"문서 삭제 실패: {e}")
+            return False
+
+    def clear_collection(self) -> bool:
+        """컬렉션의 모든 데이터 삭제"""
+        if not self._writable():
+            return False
+        try:
+            with self._lock:
+                self.ids = []
+                self.id_index = {}
+                self.documents = []
+                self.columns = {}
+                self.embeddings = np.zeros((0, 0), dtype=np.float32)
+                self._embedding_buffer = None
+                self.metadata_index.clear()
+                if self.lexical_index is not None:
+                    self.lexical_index.clear()
+                self._changed()
+            self.logger.info("컬렉션을 초기화했습니다")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"컬렉션 초기화 실패: {e}")
+            return False
+
+    @property
+    def _version_file(self) -> str:
+        return self._path("version")
+
+    def _touch_version(self):
+        """컬렉션 변경 표시 (다른 프로세스의 변경도 감지할 수 있도록 파일로 기록)"""
+        try:
+            with open(self._version_file, "w", encoding="utf-8") as f:
+                f.write(uuid.uuid4().hex)
+        except OSError as e:
+            self.logger.warning(f"컬렉션 버전 기록 실패: {e}")
+
+    def get_version(self) -> tuple:
+        """컬렉션 버전 (문서 수, 마지막 변경 표시) - 답변 캐시 무효화 기준"""
+        try:
+            with open(self._version_file, "r", encoding="utf-8") as f:
+                marker = f.read()
+        except OSError:
+            marker = ""
+        return (len(self.ids), marker)
+
+    def get_collection_stats(self) -> Dict[str, any]:
+        """컬렉션 통계 정보"""
+        return {
+            'document_count': len(self.ids),
+            'collection_name': self.collection_name,
+            'db_path': self.db_path,
+            'backend': 'exact',
+            'dimension': int(self.embeddings.shape[1]) if self.embeddings.size else 0
+        }
+
+    def filter_by_source(self, source_file: str, top_k: int = 10) -> List[Dict[str, any]]:
+        """특정 소스 파일에서 온 문서들만 조회"""
+        with self._lock:
+            mask = self._where_mask({"source_file": {"$eq": source_file}})
+            rows = np.flatnonzero(mask)[:top_k].tolist()
+            formatted_results = [{
+                'id': self.ids[row],
+                'text': self.documents[row],
+                'metadata': self._metadata(row)
+            } for row in rows]
+        self.logger.info(f"소스 파일 '{source_file}'에서 {len(formatted_results)}개 문서를 찾았습니다")
+        return formatted_results
@@ -0,0 +1,73 @@
+"""
+벡터 데이터베이스 백엔드 선택 모듈
+- 설정의 VECTOR_DB_TYPE으로 같은 메서드를 가진 백엔드 중 하나를 생성
+- 선택하지 않은 백엔드의 의존성(chromadb 등)은 임포트하지 않음
+"""
+
+import contextlib
+from typing import Any, ContextManager, Dict
+
+# VECTOR_DB_TYPE 값 -> 백엔드 이름
+VECTOR_DB_TYPES = {
+    "chromadb": "chromadb",
+    "exact": "exact",
+    "numpy": "exact",
+    "hnsw": "hnsw",
+    "ivfpq": "ivfpq"
+}
+
+# 설정 키 -> ANN 백엔드 생성자 인자
+ANN_CONFIG_KEYS = {
+    "ANN_HNSW_M": "hnsw_m",
+    "ANN_EF_SEARCH": "ef_search",
+    "ANN_NLIST": "nlist",
+    "ANN_NPROBE": "nprobe",
+    "ANN_PQ_M": "pq_m"
+}
+
+
+def vector_db_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """설정에서 VECTOR_DB_TYPE에 해당하는 백엔드 생성자 인자 추출 (값이 없으면 백엔드 기본값)"""
+    if VECTOR_DB_TYPES.get(str(config.get("VECTOR_DB_TYPE", "chromadb")).lower()) not in ("hnsw", "ivfpq"):
+        return {}
+    return {arg: config[key] for key, arg in ANN_CONFIG_KEYS.items() if config.get(key) is not None}
+
+
+def create_vector_database(db_type: str = "chromadb",
+                           db_path: str = "./vector_db",
+                           collection_name: str = "power_market_docs",
+                           **kwargs: Any):
+    """
+    벡터 데이터베이스 생성
+
+    Args:
+        db_type: "chromadb" (기본), "exact" (메모리 매핑 정확 검색),
+                 "hnsw" / "ivfpq" (근사 검색)
+        db_path: 데이터베이스 저장 경로
+        collection_name: 컬렉션 이름
+        **kwargs: 백엔드 생성자에 그대로 전달 (예: enable_lexical_index, ef_search)
+    """
+    backend = VECTOR_DB_TYPES.get((db_type or "chromadb").lower())
+    if backend is None:
+        raise ValueError(f"지원하지 않는 VECTOR_DB_TYPE: {db_type} (가능한 값: {', '.join(VECTOR_DB_TYPES)})")
+
+    if backend in ("hnsw", "ivfpq"):
+        from data.vectors.ann_store import AnnVectorDatabase
+        return AnnVectorDatabase(db_path=db_path, collection_name=collection_name, index_type=backend, **kwargs)
+
+    if backend == "exact":
+        from data.vectors.exact_store import ExactVectorDatabase
+        return ExactVectorDatabase(db_path=db_path, collection_name=collection_name, **kwargs)
+
+    from data.vectors.vector_store import VectorDatabase
+    return VectorDatabase(db_path=db_path, collection_name=collection_name, **kwargs)
+
+
+def deferred_flush(vector_db) -> ContextManager:
+    """
+    벡터 데이터베이스의 deferred_flush() 블록 (제공하지 않는 백엔드면 아무것도 하지 않는 블록)
+
+    여러 번 add_documents/delete_documents를 호출하는 적재 경로를 감싸 색인/저장소 파일을 끝에 한 번만 저장
+    """
+    deferred = getattr(vector_db, "deferred_flush", None)
+    return deferred() if deferred is not None else contextlib.nullcontext()
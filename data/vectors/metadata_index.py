@@ -0,0 +1,414 @@
+"""
+메타데이터 역색인 모듈
+- 범주형 메타데이터 값(market_domain, importance_level, regulation_type 등)마다 문서 번호 정렬 배열(int32)을 유지
+- where 필터(ChromaDB 문법)를 벡터 검색 전에 집합 연산(교집합/합집합/차집합)으로 계산
+- 연산자는 필드의 고유값에 대해서만 평가하므로 $contains / $ne / $in도 행 수와 무관하게 계산
+- 선택도에 따라 사전 필터(후보 행만 정확 계산) 또는 사후 필터(필터 없이 더 많이 가져온 뒤 거름) 선택
+- 추가는 새 문서 번호를 배열 끝에 붙이고(정렬 유지), 삭제는 삭제 표시 후 일정 비율을 넘으면 압축
+"""
+
+import json
+import logging
+import math
+import operator
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# EnhancedVectorEngine._enhance_chunk_metadata가 만드는 범주형 필드와 기본 문서 필드
+DEFAULT_FIELDS = (
+    "market_domain",
+    "regulation_type",
+    "importance_level",
+    "compliance_category",
+    "text_complexity",
+    "section_hierarchy",
+    "has_tables",
+    "has_formulas",
+    "has_images",
+    "document_id",
+    "file_name",
+    "file_type",
+    "source_file"
+)
+
+
+def _contains(value: Any, operand: Any) -> bool:
+    return isinstance(value, str) and str(operand) in value
+
+
+# where 필터 연산자 (ChromaDB 문법)
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$in": lambda value, operand: value in operand,
+    "$nin": lambda value, operand: value not in operand,
+    "$contains": _contains
+}
+
+# 값 종류 태그 (True와 1을 구분하기 위해 값과 함께 키로 사용)
+_BOOL, _NUMBER, _STRING = "b", "n", "s"
+
+
+def _value_key(value: Any) -> Optional[Tuple[str, Any]]:
+    if isinstance(value, bool):
+        return (_BOOL, value)
+    if isinstance(value, (int, float)):
+        return (_NUMBER, value)
+    if isinstance(value, str):
+        return (_STRING, value)
+    return None
+
+
+def _safe_test(test: Callable[[Any, Any], bool], value: Any, operand: Any) -> bool:
+    """비교 불가능한 타입(문자열 vs 숫자 등)은 불일치로 처리"""
+    if value is None:
+        return False
+    try:
+        return bool(test(value, operand))
+    except TypeError:
+        return False
+
+
+def scan_mask(columns: Dict[str, Sequence[Any]], count: int, where: Dict) -> np.ndarray:
+    """
+    열 단위 메타데이터를 직접 검사하여 where 필터 마스크 계산 (색인하지 않은 필드용)
+
+    Args:
+        columns: 필드 -> 행 순서의 값 목록 (값이 없는 행은 None)
+        count: 행 수
+        where: ChromaDB 문법 where 필터
+    """
+    mask = np.ones(count, dtype=bool)
+    for key, condition in where.items():
+        if key == "$and":
+            for clause in condition:
+                mask &= scan_mask(columns, count, clause)
+        elif key == "$or":
+            any_mask = np.zeros(count, dtype=bool)
+            for clause in condition:
+                any_mask |= scan_mask(columns, count, clause)
+            mask &= any_mask
+        else:
+            mask &= _column_mask(columns.get(key), count, condition)
+    return mask
+
+
+def _column_mask(column: Optional[Sequence[Any]], count: int, condition: Any) -> np.ndarray:
+    """열 하나에 대한 조건 마스크 (열이 없거나 값이 없는 행은 불일치)"""
+    if column is None:
+        return np.zeros(count, dtype=bool)
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+
+    mask = np.ones(count, dtype=bool)
+    for op, operand in condition.items():
+        test = _OPERATORS.get(op)
+        if test is None:
+            raise ValueError(f"지원하지 않는 where 연산자: {op}")
+        mask &= np.fromiter((_safe_test(test, value, operand) for value in column),
+                            dtype=bool, count=count)
+    return mask
+
+
+@dataclass
+class FilterPlan:
+    """where 필터 실행 계획"""
+    strategy: str  # none(필터 없음), empty(일치 없음), prefilter, postfilter, native(색인으로 계산 불가)
+    doc_numbers: Optional[np.ndarray] = None  # 필터를 만족하는 문서 번호 (정렬)
+    selectivity: float = 1.0  # 일치 문서 비율
+    fetch_k: int = 0  # postfilter: 필터 없이 가져올 후보 수
+
+
+def plan_filter(doc_numbers: np.ndarray,
+                total: int,
+                top_k: int,
+                prefilter_ratio: float = 0.1,
+                overfetch: float = 2.0) -> FilterPlan:
+    """
+    필터 결과의 선택도로 실행 방식 선택
+
+    Args:
+        doc_numbers: 필터를 만족하는 문서(행) 번호
+        total: 전체 문서 수
+        top_k: 필요한 결과 수
+        prefilter_ratio: 일치 비율이 이 값 이하이면 사전 필터 (일치 문서만 정확 계산)
+        overfetch: 사후 필터에서 top_k / 선택도에 곱할 여유 배수
+    """
+    if not doc_numbers.size:
+        return FilterPlan("empty", doc_numbers, 0.0)
+    selectivity = doc_numbers.size / max(total, 1)
+    if selectivity <= prefilter_ratio or doc_numbers.size <= top_k:
+        return FilterPlan("prefilter", doc_numbers, selectivity)
+    fetch_k = min(total, math.ceil(top_k / selectivity * overfetch))
+    return FilterPlan("postfilter", doc_numbers, selectivity, fetch_k)
+
+
+class MetadataIndex:
+    """범주형 메타데이터 역색인"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self,
+                 fields: Sequence[str] = DEFAULT_FIELDS,
+                 compact_ratio: float = 0.2):
+        """
+        Args:
+            fields: 색인할 메타데이터 필드 (그 외 필드 조건은 native로 계획)
+            compact_ratio: 삭제된 문서 비율이 이 값을 넘으면 압축 (0이면 삭제 즉시 압축하여
+                           문서 번호가 추가 순서상의 위치와 항상 같음)
+        """
+        self.fields = tuple(fields)
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.RLock()
+        self.doc_ids: List[str] = []
+        self.doc_index: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._alive_count = 0
+
+        # 필드 -> 값 키 -> 문서 번호 오름차순 배열
+        self.postings: Dict[str, Dict[Tuple[str, Any], np.ndarray]] = {field: {} for field in self.fields}
+
+    # ------------------------------------------------------------------ 갱신
+
+    def __len__(self) -> int:
+        return self._alive_count
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_index
+
+    def add(self, doc_ids: Sequence[str], metadatas: Sequence[Dict[str, Any]]) -> None:
+        """문서 추가 (같은 ID가 있으면 교체, 배치 안에서 같은 ID가 반복되면 마지막 항목만 남김)"""
+        last = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        if len(last) != len(doc_ids):
+            keep = sorted(last.values())
+            doc_ids = [doc_ids[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+        with self._lock:
+            self.remove(doc_ids)
+
+            start = len(self.doc_ids)
+            grouped: Dict[Tuple[str, Tuple[str, Any]], List[int]] = {}
+            for offset, (doc_id, metadata) in enumerate(zip(doc_ids, metadatas)):
+                doc = start + offset
+                self.doc_ids.append(doc_id)
+                self.doc_index[doc_id] = doc
+                for field in self.fields:
+                    key = _value_key((metadata or {}).get(field))
+                    if key is not None:
+                        grouped.setdefault((field, key), []).append(doc)
+
+            self._alive = np.concatenate([self._alive, np.ones(len(self.doc_ids) - start, dtype=bool)])
+            self._alive_count += len(self.doc_ids) - start
+
+            # 새 문서 번호는 기존보다 항상 크므로 끝에 붙이면 정렬이 유지됨
+            for (field, key), docs in grouped.items():
+                existing = self.postings[field].get(key)
+                new_docs = np.asarray(docs, dtype=np.int32)
+                self.postings[field][key] = new_docs if existing is None else np.concatenate([existing, new_docs])
+
+    def remove(self, doc_ids: Sequence[str]) -> int:
+        """문서 삭제 (삭제 표시 후 필요하면 압축)"""
+        with self._lock:
+            removed = 0
+            for doc_id in doc_ids:
+                doc = self.doc_index.pop(doc_id, None)
+                if doc is None:
+                    continue
+                self._alive[doc] = False
+                self._alive_count -= 1
+                removed += 1
+            if removed and len(self.doc_ids) - self._alive_count > self.compact_ratio * len(self.doc_ids):
+                self.compact()
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self.doc_ids = []
+            self.doc_index = {}
+            self._alive = np.zeros(0, dtype=bool)
+            self._alive_count = 0
+            self.postings = {field: {} for field in self.fields}
+
+    def compact(self) -> None:
+        """삭제된 문서를 제거하고 문서 번호를 다시 부여 (순서 유지)"""
+        with self._lock:
+            renumber = np.cumsum(self._alive, dtype=np.int64) - 1
+            for field, values in self.postings.items():
+                compacted = {}
+                for key, docs in values.items():
+                    docs = docs[self._alive[docs]]
+                    if docs.size:
+                        compacted[key] = renumber[docs].astype(np.int32)
+                self.postings[field] = compacted
+            self.doc_ids = [doc_id for doc_id, alive in zip(self.doc_ids, self._alive.tolist()) if alive]
+            self.doc_index = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+            self._alive = np.ones(len(self.doc_ids), dtype=bool)
+            self._alive_count = len(self.doc_ids)
+
+    # ------------------------------------------------------------------ 필터 계산
+
+    def evaluate(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        """
+        where 필터를 만족하는 문서 번호 (정렬된 int64 배열)
+
+        색인하지 않은 필드가 있으면 None (호출한 쪽에서 기존 방식으로 필터링)
+        """
+        with self._lock:
+            docs = self._evaluate(where) if where else None
+            if docs is None:
+                return None
+            return docs[self._alive[docs]].astype(np.int64)
+
+    def _evaluate(self, where: Dict) -> Optional[np.ndarray]:
+        result = None
+        for key, condition in where.items():
+            if key == "$and":
+                parts = [self._evaluate(clause) for clause in condition]
+                if any(part is None for part in parts):
+                    return None
+                docs = self._intersect(parts)
+            elif key == "$or":
+                parts = [self._evaluate(clause) for clause in condition]
+                if any(part is None for part in parts):
+                    return None
+                docs = self._union(parts)
+            else:
+                docs = self._field_docs(key, condition)
+                if docs is None:
+                    return None
+            result = docs if result is None else np.intersect1d(result, docs, assume_unique=True)
+        return result if result is not None else np.arange(len(self.doc_ids), dtype=np.int32)
+
+    def _field_docs(self, field: str, condition: Any) -> Optional[np.ndarray]:
+        """필드 하나에 대한 조건 (값이 없는 문서는 불일치)"""
+        values = self.postings.get(field)
+        if values is None:
+            return None
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        parts = []
+        for op, operand in condition.items():
+            test = _OPERATORS.get(op)
+            if test is None:
+                raise ValueError(f"지원하지 않는 where 연산자: {op}")
+            if op == "$eq":
+                docs = values.get(_value_key(operand))
+                parts.append(docs if docs is not None else np.empty(0, dtype=np.int32))
+            elif op == "$in":
+                keys = {_value_key(item) for item in operand}
+                parts.append(self._union([docs for key, docs in values.items() if key in keys]))
+            else:
+                # 고유값에 대해서만 조건을 평가
+                parts.append(self._union([docs for (_, value), docs in values.items()
+                                          if _safe_test(test, value, operand)]))
+        return self._intersect(parts)
+
+    @staticmethod
+    def _intersect(parts: List[np.ndarray]) -> np.ndarray:
+        parts = sorted(parts, key=len)
+        result = parts[0]
+        for part in parts[1:]:
+            if not result.size:
+                break
+            result = np.intersect1d(result, part, assume_unique=True)
+        return result
+
+    @staticmethod
+    def _union(parts: List[np.ndarray]) -> np.ndarray:
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        if len(parts) == 1:
+            return parts[0]
+        # 같은 필드의 값끼리는 겹치지 않지만 $or 절끼리는 겹칠 수 있음
+        return np.unique(np.concatenate(parts))
+
+    def plan(self,
+             where: Optional[Dict],
+             top_k: int,
+             prefilter_ratio: float = 0.1,
+             overfetch: float = 2.0) -> FilterPlan:
+        """where 필터 실행 계획 (색인으로 계산할 수 없으면 native)"""
+        if not where:
+            return FilterPlan("none")
+        docs = self.evaluate(where)
+        if docs is None:
+            return FilterPlan("native")
+        return plan_filter(docs, self._alive_count, top_k, prefilter_ratio, overfetch)
+
+    def ids_for(self, doc_numbers: np.ndarray) -> List[str]:
+        return [self.doc_ids[doc] for doc in doc_numbers.tolist()]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "documents": self._alive_count,
+            "deleted": len(self.doc_ids) - self._alive_count,
+            "values": {field: len(values) for field, values in self.postings.items()}
+        }
+
+    # ------------------------------------------------------------------ 저장/로드
+
+    @staticmethod
+    def exists(path: Union[str, Path]) -> bool:
+        return (Path(path) / "index.json").exists()
+
+    def save(self, path: Union[str, Path]) -> None:
+        """색인 저장 (압축 후 문서 ID/값 목록은 JSON, 포스팅은 .npy 하나로 연결)"""
+        with self._lock:
+            if self._alive_count != len(self.doc_ids):
+                self.compact()
+            path = Path(path)
+            path.mkdir(parents=True, exist_ok=True)
+
+            entries = []
+            arrays = []
+            offset = 0
+            for field, values in self.postings.items():
+                for (kind, value), docs in values.items():
+                    entries.append([field, kind, value, offset, offset + len(docs)])
+                    arrays.append(docs)
+                    offset += len(docs)
+            postings = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int32)
+
+            with open(path / "postings.npy.tmp", "wb") as f:
+                np.save(f, postings.astype(np.int32))
+            os.replace(path / "postings.npy.tmp", path / "postings.npy")
+            with open(path / "index.json.tmp", "w", encoding="utf-8") as f:
+                json.dump({
+                    "format_version": self.FORMAT_VERSION,
+                    "fields": list(self.fields),
+                    "compact_ratio": self.compact_ratio,
+                    "doc_ids": self.doc_ids,
+                    "entries": entries
+                }, f, ensure_ascii=False)
+            os.replace(path / "index.json.tmp", path / "index.json")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "MetadataIndex":
+        path = Path(path)
+        with open(path / "index.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != cls.FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 메타데이터 색인 형식: {meta.get('format_version')}")
+
+        index = cls(fields=meta["fields"], compact_ratio=meta["compact_ratio"])
+        postings = np.load(path / "postings.npy")
+        index.doc_ids = meta["doc_ids"]
+        index.doc_index = {doc_id: i for i, doc_id in enumerate(index.doc_ids)}
+        index._alive = np.ones(len(index.doc_ids), dtype=bool)
+        index._alive_count = len(index.doc_ids)
+        for field, kind, value, start, end in meta["entries"]:
+            index.postings.setdefault(field, {})[(kind, value)] = postings[start:end]
+        return index
@@ -2,31 +2,52 @@
 벡터 데이터베이스 모듈
 - 임베딩된 벡터들을 저장하고 검색
 - ChromaDB를 사용한 벡터 저장소 구현
+- 범주형 메타데이터 where 필터는 역색인으로 먼저 계산하여 선택도에 따라 사전/사후 필터 선택
+- BM25 / 메타데이터 색인 파일 저장은 변경마다 하지 않고 flush()에서 한 번에 (auto_flush=True이면 변경 직후, deferred_flush() 블록 안에서는 블록 끝에)
 """
 
 import logging
 import os
-from typing import List, Dict, Optional, Union
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional, Union
 import numpy as np
 import chromadb
 from chromadb.config import Settings
 import uuid
 import json
 
+from data.vectors.vector_utils import as_embedding_matrix
+from data.vectors.chroma_compat import chroma_embeddings
+from data.vectors.metadata_index import FilterPlan, MetadataIndex
+from retrieval.bm25_index import BM25Index
+
 class VectorDatabase:
     """벡터 데이터베이스 클래스"""
     
+    # 필터 일치 문서가 이 비율 또는 이 개수 이하이면 일치 문서의 임베딩만 가져와 정확 계산
+    PREFILTER_RATIO = 0.1
+    PREFILTER_MAX_ROWS = 2000
+    
     def __init__(self, 
                  db_path: str = "./vector_db",
-                 collection_name: str = "power_market_docs"):
+                 collection_name: str = "power_market_docs",
+                 enable_lexical_index: bool = True,
+                 auto_flush: bool = True):
         """
         Args:
             db_path: 데이터베이스 저장 경로
             collection_name: 컬렉션(테이블) 이름
+            enable_lexical_index: BM25 어휘 색인 사용 여부 (컬렉션 변경 시 함께 갱신)
+            auto_flush: 추가/삭제 직후 색인 파일 저장 (False이면 flush() 호출 시 저장,
+                        저장은 색인 전체를 다시 쓰므로 여러 배치를 적재할 때는 끝에 한 번만 저장)
         """
         self.logger = logging.getLogger(__name__)
         self.db_path = db_path
         self.collection_name = collection_name
+        self.auto_flush = auto_flush
+        self._dirty = False
+        self._lock = threading.RLock()
         
         # 데이터베이스 디렉토리 생성
         os.makedirs(db_path, exist_ok=True)
@@ -51,9 +72,118 @@ class VectorDatabase:
         except Exception as e:
             self.logger.error(f"벡터 데이터베이스 초기화 실패: {e}")
             raise
+        
+        self.lexical_index_path = os.path.join(db_path, f"{collection_name}_bm25")
+        self.lexical_index = self._load_lexical_index() if enable_lexical_index else None
+        self.metadata_index_path = os.path.join(db_path, f"{collection_name}_metadata")
+        self.metadata_index = self._load_metadata_index()
+    
+    def _load_lexical_index(self) -> Optional[BM25Index]:
+        """BM25 색인 로드 (없거나 컬렉션과 문서 수가 다르면 컬렉션에서 재구축)"""
+        try:
+            count = self.collection.count()
+            if BM25Index.exists(self.lexical_index_path):
+                index = BM25Index.load(self.lexical_index_path)
+                if len(index) == count:
+                    return index
+                self.logger.warning(f"BM25 색인 문서 수 불일치 ({len(index)} != {count}), 재구축합니다")
+            
+            index = BM25Index()
+            page_size = 5000
+            for offset in range(0, count, page_size):
+                page = self.collection.get(offset=offset, limit=page_size, include=['documents'])
+                index.add(page['ids'], [text or '' for text in page['documents']])
+            index.save(self.lexical_index_path)
+            self.logger.info(f"BM25 색인 구축 완료: {len(index)}개 문서")
+            return index
+            
+        except Exception as e:
+            self.logger.error(f"BM25 색인 준비 실패, 어휘 검색 비활성화: {e}")
+            return None
+    
+    def _save_lexical_index(self):
+        try:
+            self.lexical_index.save(self.lexical_index_path)
+        except Exception as e:
+            self.logger.error(f"BM25 색인 저장 실패: {e}")
+    
+    def _changed(self):
+        """변경 표시 (auto_flush이면 바로 저장)"""
+        with self._lock:
+            self._dirty = True
+        self._touch_version()
+        if self.auto_flush:
+            self.flush()
     
-    def add_documents(self, documents: List[Dict[str, any]]) -> bool:
-        """문서들을 벡터 데이터베이스에 추가"""
+    def flush(self) -> bool:
+        """
+        저장하지 않은 변경을 파일로 저장 (BM25 색인, 메타데이터 역색인 - ChromaDB 컬렉션은 자체적으로 저장)
+        
+        Returns:
+            저장했으면 True, 변경이 없었으면 False
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            if self.lexical_index is not None:
+                self._save_lexical_index()
+            if self.metadata_index is not None:
+                self._save_metadata_index()
+            self._dirty = False
+            return True
+    
+    @contextmanager
+    def deferred_flush(self) -> Iterator["VectorDatabase"]:
+        """with 블록 안의 추가/삭제는 색인을 메모리에만 반영하고 블록이 끝날 때 한 번 저장 (여러 배치 적재용)"""
+        with self._lock:
+            auto_flush, self.auto_flush = self.auto_flush, False
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.auto_flush = auto_flush
+                # 바깥 deferred_flush 블록 안이면 바깥 블록이 끝날 때 저장
+                if auto_flush:
+                    self.flush()
+    
+    def _load_metadata_index(self) -> Optional[MetadataIndex]:
+        """메타데이터 역색인 로드 (없거나 컬렉션과 문서 수가 다르면 컬렉션에서 재구축)"""
+        try:
+            count = self.collection.count()
+            if MetadataIndex.exists(self.metadata_index_path):
+                index = MetadataIndex.load(self.metadata_index_path)
+                if len(index) == count:
+                    return index
+                self.logger.warning(f"메타데이터 색인 문서 수 불일치 ({len(index)} != {count}), 재구축합니다")
+            
+            index = MetadataIndex()
+            page_size = 5000
+            for offset in range(0, count, page_size):
+                page = self.collection.get(offset=offset, limit=page_size, include=['metadatas'])
+                index.add(page['ids'], page['metadatas'])
+            index.save(self.metadata_index_path)
+            self.logger.info(f"메타데이터 색인 구축 완료: {len(index)}개 문서")
+            return index
+            
+        except Exception as e:
+            self.logger.error(f"메타데이터 색인 준비 실패, ChromaDB 필터만 사용: {e}")
+            return None
+    
+    def _save_metadata_index(self):
+        try:
+            self.metadata_index.save(self.metadata_index_path)
+        except Exception as e:
+            self.logger.error(f"메타데이터 색인 저장 실패: {e}")
+    
+    def add_documents(self, documents: List[Dict[str, any]],
+                      embeddings: Optional[np.ndarray] = None) -> bool:
+        """
+        문서들을 벡터 데이터베이스에 추가
+        
+        Args:
+            documents: 문서 조각 (text, file_name, id, 메타데이터)
+            embeddings: 문서 순서대로의 (n, d) 임베딩 행렬 (없으면 각 문서의 'embedding'을 한 번에 쌓음)
+        """
         try:
             if not documents:
                 self.logger.warning("추가할 문서가 없습니다")
@@ -61,21 +191,19 @@ class VectorDatabase:
             
             # 데이터 준비
             ids = []
-            embeddings = []
             metadatas = []
             documents_text = []
             
+            # 임베딩은 (n, d) float32 행렬 하나로 전달하고 ChromaDB 호출 직전에만 변환
+            matrix = as_embedding_matrix(
+                embeddings if embeddings is not None else [doc.get('embedding', []) for doc in documents]
+            )
+            
             for doc in documents:
                 # 고유 ID 생성 (파일명 + 조각 ID)
                 doc_id = f"{doc.get('file_name', 'unknown')}_{doc.get('id', uuid.uuid4())}"
                 ids.append(doc_id)
                 
-                # 임베딩 벡터
-                embedding = doc.get('embedding', [])
-                if isinstance(embedding, np.ndarray):
-                    embedding = embedding.tolist()
-                embeddings.append(embedding)
-                
                 # 메타데이터 (임베딩 제외한 모든 정보)
                 metadata = {k: v for k, v in doc.items() 
                            if k not in ['embedding', 'text'] and v is not None}
@@ -93,11 +221,17 @@ class VectorDatabase:
             # 데이터베이스에 추가
             self.collection.add(
                 ids=ids,
-                embeddings=embeddings,
+                embeddings=chroma_embeddings(matrix),
                 metadatas=metadatas,
                 documents=documents_text
             )
             
+            if self.lexical_index is not None:
+                self.lexical_index.add(ids, documents_text)
+            if self.metadata_index is not None:
+                self.metadata_index.add(ids, metadatas)
+            
+            self._changed()
             self.logger.info(f"{len(documents)}개 문서를 벡터 데이터베이스에 추가했습니다")
             return True
             
@@ -111,13 +245,16 @@ class VectorDatabase:
                       where: Optional[Dict] = None) -> List[Dict[str, any]]:
         """유사한 문서 검색"""
         try:
-            # numpy 배열을 리스트로 변환
-            if isinstance(query_embedding, np.ndarray):
-                query_embedding = query_embedding.tolist()
+            queries = as_embedding_matrix(query_embedding)
+            
+            if where and self.metadata_index is not None:
+                formatted_results = self._search_filtered(queries, top_k, where)[0]
+                self.logger.info(f"{len(formatted_results)}개의 유사 문서를 찾았습니다")
+                return formatted_results
             
             # 검색 실행
             results = self.collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=chroma_embeddings(queries),
                 n_results=top_k,
                 where=where  # 메타데이터 필터링
             )
@@ -143,6 +280,129 @@ class VectorDatabase:
             self.logger.error(f"유사 문서 검색 실패: {e}")
             return []
     
+    def search_similar_batch(self,
+                             query_embeddings: Union[np.ndarray, List[List[float]]],
+                             top_k: int = 5,
+                             where: Optional[Dict] = None) -> List[List[Dict[str, any]]]:
+        """여러 질문 임베딩을 한 번의 질의로 검색 (질문별 결과 리스트 반환)"""
+        try:
+            if len(query_embeddings) == 0:
+                return []
+            queries = as_embedding_matrix(query_embeddings)
+            
+            if where and self.metadata_index is not None:
+                return self._search_filtered(queries, top_k, where)
+            
+            results = self.collection.query(
+                query_embeddings=chroma_embeddings(queries),
+                n_results=top_k,
+                where=where
+            )
+            
+            batch_results = [self._format_query_results(results, q) for q in range(len(queries))]
+            
+            self.logger.info(f"{len(query_embeddings)}개 질문 일괄 검색 완료")
+            return batch_results
+            
+        except Exception as e:
+            self.logger.error(f"일괄 유사 문서 검색 실패: {e}")
+            return [[] for _ in range(len(query_embeddings))]
+    
+    @staticmethod
+    def _format_query_results(results: Dict, q: int) -> List[Dict[str, any]]:
+        """collection.query 결과 중 q번째 질문의 결과 목록"""
+        formatted_results = []
+        ids = results['ids'][q] if results['ids'] else []
+        for i in range(len(ids)):
+            distance = results['distances'][q][i] if results['distances'] else 0.0
+            formatted_results.append({
+                'id': ids[i],
+                'text': results['documents'][q][i] if results['documents'] else '',
+                'metadata': results['metadatas'][q][i] if results['metadatas'] else {},
+                'distance': distance,
+                'similarity': 1 - distance
+            })
+        return formatted_results
+    
+    def plan_where(self, where: Optional[Dict], top_k: int) -> FilterPlan:
+        """where 필터 실행 계획 (색인이 없으면 native)"""
+        if not where:
+            return FilterPlan("none")
+        if self.metadata_index is None:
+            return FilterPlan("native")
+        prefilter_ratio = min(self.PREFILTER_RATIO, self.PREFILTER_MAX_ROWS / max(len(self.metadata_index), 1))
+        return self.metadata_index.plan(where, top_k, prefilter_ratio=prefilter_ratio)
+    
+    def _search_filtered(self,
+                         queries: np.ndarray,
+                         top_k: int,
+                         where: Dict) -> List[List[Dict[str, any]]]:
+        """
+        메타데이터 역색인으로 where 필터를 먼저 계산한 뒤 선택도에 따라 검색
+        
+        - prefilter: 일치 문서의 임베딩만 가져와 정확 계산 (ChromaDB 기본 거리인 제곱 L2)
+        - postfilter: 필터 없이 top_k / 선택도만큼 가져와 거름, 모자라면 ChromaDB 필터로 다시 검색
+        - native: 색인하지 않은 필드는 ChromaDB 필터 그대로 사용
+        """
+        index = self.metadata_index
+        plan = self.plan_where(where, top_k)
+        
+        if plan.strategy == "empty":
+            return [[] for _ in range(len(queries))]
+        
+        if plan.strategy == "prefilter":
+            candidates = self.collection.get(
+                ids=index.ids_for(plan.doc_numbers),
+                include=['embeddings', 'documents', 'metadatas']
+            )
+            if not candidates['ids']:
+                return [[] for _ in range(len(queries))]
+            matrix = np.asarray(candidates['embeddings'], dtype=np.float32)
+            distances = (np.sum(queries ** 2, axis=1, keepdims=True)
+                         - 2.0 * queries @ matrix.T + np.sum(matrix ** 2, axis=1))
+            
+            batch_results = []
+            for q_distances in distances:
+                order = np.argsort(q_distances, kind="stable")[:top_k]
+                batch_results.append([{
+                    'id': candidates['ids'][i],
+                    'text': candidates['documents'][i] if candidates['documents'] else '',
+                    'metadata': candidates['metadatas'][i] if candidates['metadatas'] else {},
+                    'distance': float(q_distances[i]),
+                    'similarity': 1 - float(q_distances[i])
+                } for i in order.tolist()])
+            return batch_results
+        
+        if plan.strategy == "postfilter":
+            allowed = np.zeros(len(index.doc_ids), dtype=bool)
+            allowed[plan.doc_numbers] = True
+            results = self.collection.query(
+                query_embeddings=chroma_embeddings(queries),
+                n_results=plan.fetch_k
+            )
+            batch_results = []
+            for q in range(len(queries)):
+                formatted_results = [
+                    result for result in self._format_query_results(results, q)
+                    if result['id'] in index.doc_index and allowed[index.doc_index[result['id']]]
+                ][:top_k]
+                if len(formatted_results) < min(top_k, plan.doc_numbers.size):
+                    retry = self.collection.query(
+                        query_embeddings=chroma_embeddings(queries[q:q + 1]),
+                        n_results=top_k,
+                        where=where
+                    )
+                    formatted_results = self._format_query_results(retry, 0)
+                batch_results.append(formatted_results)
+            return batch_results
+        
+        results = self.collection.query(
+            query_embeddings=chroma_embeddings(queries),
+            n_results=top_k,
+            where=where
+        )
+        return [self._format_query_results(results, q) for q in range(len(queries))]
+    
     def search_by_text(self, 
                       query_text: str, 
                       top_k: int = 5,
@@ -176,6 +436,115 @@ class VectorDatabase:
             self.logger.error(f"텍스트 검색 실패: {e}")
             return []
     
+    def search_lexical(self,
+                       query_text: str,
+                       top_k: int = 20,
+                       query_embedding: Optional[Union[np.ndarray, List[float]]] = None,
+                       where: Optional[Dict] = None) -> List[Dict[str, any]]:
+        """
+        BM25 어휘 검색 (임베딩 모델을 사용하지 않음)
+        
+        Args:
+            query_text: 질문 텍스트
+            top_k: 최대 결과 수
+            query_embedding: 지정 시 search_similar와 같은 기준의 유사도 계산
+            where: 메타데이터 필터 (BM25 후보에 적용)
+            
+        Returns:
+            BM25 점수('score') 내림차순 결과
+        """
+        try:
+            if self.lexical_index is None:
+                return []
+            
+            # 메타데이터 필터로 일부가 빠질 수 있으므로 넉넉히 가져옴
+            hits = self.lexical_index.search(query_text, top_k * 2 if where else top_k)
+            if not hits:
+                return []
+            
+            scores = dict(hits)
+            include = ['metadatas', 'documents']
+            if query_embedding is not None:
+                include.append('embeddings')
+            results = self.collection.get(ids=list(scores), where=where, include=include)
+            
+            similarities = {}
+            if query_embedding is not None and results['ids']:
+                vectors = np.asarray(results['embeddings'], dtype=np.float32)
+                query = np.asarray(query_embedding, dtype=np.float32)
+                similarities = dict(zip(results['ids'], (1.0 - np.sum((vectors - query) ** 2, axis=1)).tolist()))
+            
+            formatted_results = []
+            for i, doc_id in enumerate(results['ids']):
+                formatted_results.append({
+                    'id': doc_id,
+                    'text': results['documents'][i] if results['documents'] else '',
+                    'metadata': results['metadatas'][i] if results['metadatas'] else {},
+                    'similarity': similarities.get(doc_id, 0.0),
+                    'score': scores[doc_id]
+                })
+            formatted_results.sort(key=lambda r: r['score'], reverse=True)
+            return formatted_results[:top_k]
+            
+        except Exception as e:
+            self.logger.error(f"BM25 검색 실패: {e}")
+            return []
+    
+    def search_by_keywords(self,
+                           terms: List[str],
+                           top_k: int = 20,
+                           query_embedding: Optional[Union[np.ndarray, List[float]]] = None,
+                           where: Optional[Dict] = None) -> List[Dict[str, any]]:
+        """
+        키워드 포함 문서 조회 (ChromaDB 전문 검색 색인 사용, 임베딩 계산 없음)
+        
+        Args:
+            terms: 포함 여부를 확인할 키워드들 (하나라도 포함되면 후보)
+            top_k: 최대 결과 수
+            query_embedding: 지정 시 search_similar와 같은 기준의 유사도 계산
+            where: 메타데이터 필터
+        """
+        try:
+            terms = [term for term in dict.fromkeys(terms) if term]
+            if not terms:
+                return []
+            
+            clauses = [{"$contains": term} for term in terms]
+            where_document = clauses[0] if len(clauses) == 1 else {"$or": clauses}
+            include = ['metadatas', 'documents']
+            if query_embedding is not None:
+                include.append('embeddings')
+            
+            results = self.collection.get(
+                where=where,
+                where_document=where_document,
+                limit=top_k,
+                include=include
+            )
+            
+            similarities = None
+            if query_embedding is not None and results['ids']:
+                # 컬렉션 기본 거리(제곱 L2)와 같은 기준: similarity = 1 - distance
+                vectors = np.asarray(results['embeddings'], dtype=np.float32)
+                query = np.asarray(query_embedding, dtype=np.float32)
+                similarities = 1.0 - np.sum((vectors - query) ** 2, axis=1)
+            
+            formatted_results = []
+            for i in range(len(results['ids'])):
+                formatted_results.append({
+                    'id': results['ids'][i],
+                    'text': results['documents'][i] if results['documents'] else '',
+                    'metadata': results['metadatas'][i] if results['metadatas'] else {},
+                    'similarity': float(similarities[i]) if similarities is not None else 0.0
+                })
+            
+            self.logger.info(f"키워드 {len(terms)}개로 {len(formatted_results)}개 문서를 찾았습니다")
+            return formatted_results
+            
+        except Exception as e:
+            self.logger.error(f"키워드 검색 실패: {e}")
+            return []
+    
     def get_document_by_id(self, doc_id: str) -> Optional[Dict[str, any]]:
         """ID로 특정 문서 가져오기"""
         try:
@@ -202,6 +571,11 @@ class VectorDatabase:
         """문서들 삭제"""
         try:
             self.collection.delete(ids=doc_ids)
+            if self.lexical_index is not None:
+                self.lexical_index.remove(doc_ids)
+            if self.metadata_index is not None:
+                self.metadata_index.remove(doc_ids)
+            self._changed()
             self.logger.info(f"{len(doc_ids)}개 문서를 삭제했습니다")
             return True
             
@@ -218,7 +592,12 @@ class VectorDatabase:
                 name=self.collection_name,
                 metadata={"description": "전력시장 문서 벡터 저장소"}
             )
+            if self.lexical_index is not None:
+                self.lexical_index.clear()
+            if self.metadata_index is not None:
+                self.metadata_index.clear()
             
+            self._changed()
             self.logger.info("컬렉션을 초기화했습니다")
             return True
             
@@ -226,6 +605,34 @@ class VectorDatabase:
             self.logger.error(f"컬렉션 초기화 실패: {e}")
             return False
     
+    @property
+    def _version_file(self) -> str:
+        return os.path.join(self.db_path, f"{self.collection_name}.version")
+
+    def _touch_version(self):
+        """컬렉션 변경 표시 (다른 프로세스의 변경도 감지할 수 있도록 파일로 기록)"""
+        try:
+            with open(self._version_file, "w", encoding="utf-8") as f:
+                f.write(uuid.uuid4().hex)
+        except OSError as e:
+            self.logger.warning(f"컬렉션 버전 기록 실패: {e}")
+
+    def get_version(self) -> tuple:
+        """
+        컬렉션 버전 (문서 수, 마지막 변경 표시)
+        추가/삭제/초기화 시 값이 바뀌므로 답변 캐시 무효화 기준으로 사용
+        """
+        try:
+            with open(self._version_file, "r", encoding="utf-8") as f:
+                marker = f.read()
+        except OSError:
+            marker = ""
+        try:
+            count = self.collection.count()
+        except Exception:
+            count = -1
+        return (count, marker)
+
     def get_collection_stats(self) -> Dict[str, any]:
         """컬렉션 통계 정보"""
         try:
@@ -0,0 +1,62 @@
+"""
+벡터 행렬 공용 유틸리티
+- 벡터 백엔드(data/vectors)와 유사 쌍 탐색(core)이 함께 쓰는 계산
+- 임베딩 행렬 변환/정규화, 구면 k-means
+"""
+
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+
+def as_embedding_matrix(embeddings: Union[np.ndarray, Sequence]) -> np.ndarray:
+    """
+    임베딩을 C 연속 (n, d) float32 행렬로 변환
+
+    이미 C 연속 float32 배열이면 복사하지 않고, 벡터 목록은 한 번에 쌓음 (1차원 벡터는 (1, d))
+    """
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    return np.ascontiguousarray(matrix)
+
+
+def normalize_embeddings(embeddings: Union[np.ndarray, Sequence]) -> np.ndarray:
+    """임베딩을 (n, d) float32 행렬로 쌓고 L2 정규화 (영벡터는 그대로 유지, 입력 배열은 변경하지 않음)"""
+    matrix = as_embedding_matrix(embeddings)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    if isinstance(embeddings, np.ndarray) and np.may_share_memory(matrix, embeddings):
+        return matrix / norms
+    # 새로 쌓은 행렬은 제자리에서 정규화
+    matrix /= norms
+    return matrix
+
+
+def spherical_kmeans(matrix: np.ndarray, n_clusters: int, iterations: int,
+                     block_size: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    구면 k-means (정규화된 행렬, 내적 기준 할당은 블록 단위로 계산)
+
+    Returns:
+        (정규화된 군집 중심 (n_clusters, d), 행별 군집 번호)
+    """
+    n = matrix.shape[0]
+    centroids = matrix[rng.choice(n, size=n_clusters, replace=False)].copy()
+    assignments = np.zeros(n, dtype=np.int64)
+
+    for _ in range(iterations):
+        for r0 in range(0, n, block_size):
+            assignments[r0:r0 + block_size] = np.argmax(matrix[r0:r0 + block_size] @ centroids.T, axis=1)
+
+        new_centroids = np.zeros_like(centroids)
+        np.add.at(new_centroids, assignments, matrix)
+        norms = np.linalg.norm(new_centroids, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # 빈 군집은 임의의 점으로 재시작
+        if empty.any():
+            new_centroids[empty] = matrix[rng.choice(n, size=int(empty.sum()), replace=False)]
+            norms[empty] = 1.0
+        centroids = new_centroids / norms
+
+    return centroids, assignments
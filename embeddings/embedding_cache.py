@@ -0,0 +1,213 @@
+"""
+임베딩 캐시 모듈
+- (모델명, 전처리 버전, 텍스트 해시)를 키로 하는 디스크 기반 임베딩 캐시
+- 내용이 바뀌지 않은 청크는 재구축 시 다시 인코딩하지 않음
+- 최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Sequence
+
+import numpy as np
+
+_metrics_collector = None
+_metrics_checked = False
+
+
+def _get_metrics_collector():
+    """메트릭 수집기 지연 로딩 (모니터링 의존성이 없으면 None)"""
+    global _metrics_collector, _metrics_checked
+    if not _metrics_checked:
+        _metrics_checked = True
+        try:
+            from monitoring.metrics.collector import get_metrics_collector
+            _metrics_collector = get_metrics_collector()
+        except Exception as e:
+            logging.getLogger(__name__).debug(f"메트릭 수집기 사용 불가: {e}")
+            _metrics_collector = None
+    return _metrics_collector
+
+
+class EmbeddingCache:
+    """SQLite 기반 영구 임베딩 캐시"""
+
+    def __init__(self,
+                 cache_dir: str = "data/embedding_cache",
+                 max_entries: int = 200000,
+                 namespace: str = "embedding"):
+        """
+        Args:
+            cache_dir: 캐시 파일을 저장할 디렉토리
+            max_entries: 보관할 최대 임베딩 수 (초과 시 LRU 제거)
+            namespace: 메트릭에 사용할 캐시 네임스페이스
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.namespace = namespace
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_file = os.path.join(cache_dir, "embeddings.sqlite3")
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model_name TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)"
+        )
+        self._conn.commit()
+        self._entry_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+        self._last_access = 0.0
+
+        # 히트/미스 카운터
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0
+        }
+
+    def _tick(self) -> float:
+        """단조 증가하는 접근 시각 (같은 시각에 여러 번 접근해도 LRU 순서 보장)"""
+        self._last_access = max(time.time(), self._last_access + 1e-6)
+        return self._last_access
+
+    @staticmethod
+    def make_key(model_name: str, preprocessing_version: str, text: str) -> str:
+        """캐시 키 생성 (내용 주소 방식)"""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model_name}|{preprocessing_version}|{text_hash}"
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """여러 키를 한 번에 조회 (찾은 항목만 반환)"""
+        found = {}
+        if not keys:
+            return found
+
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            now = self._tick()
+            # SQLite 변수 개수 제한을 고려하여 나누어 조회
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).copy()
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            hits = sum(1 for key in keys if key in found)
+            misses = len(keys) - hits
+            self.stats["hits"] += hits
+            self.stats["misses"] += misses
+
+        self._report_lookups(hits, misses)
+        return found
+
+    def _report_lookups(self, hits: int, misses: int) -> None:
+        """히트/미스 수를 메트릭 수집기로 전달"""
+        collector = _get_metrics_collector()
+        if collector is None:
+            return
+        try:
+            collector.record_cache_lookups(self.namespace, hits, misses)
+            lookups = self.stats["hits"] + self.stats["misses"]
+            hit_ratio = self.stats["hits"] / lookups if lookups else 0.0
+            collector.update_namespace_cache_statistics(self.namespace, hit_ratio, self._entry_count)
+        except Exception as e:
+            self.logger.debug(f"캐시 메트릭 기록 실패: {e}")
+
+    def put_many(self, items: Dict[str, np.ndarray], model_name: str) -> None:
+        """여러 임베딩을 한 번에 저장"""
+        if not items:
+            return
+
+        rows = []
+        for key, vector in items.items():
+            vector = np.ascontiguousarray(vector, dtype=np.float32)
+            rows.append([key, model_name, int(vector.shape[-1]), vector.tobytes()])
+
+        with self._lock:
+            now = self._tick()
+            rows = [tuple(row) + (now,) for row in rows]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model_name, dimension, vector, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self.stats["writes"] += len(rows)
+            self._evict_if_needed()
+
+    def _evict_if_needed(self) -> None:
+        """최대 크기 초과 시 오래된 항목 제거 (잠금 상태에서 호출)"""
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self._entry_count = count
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (excess,)
+        )
+        self._conn.commit()
+        self.stats["evictions"] += excess
+        self._entry_count = count - excess
+        self.logger.info(f"임베딩 캐시 LRU 제거: {excess}개 항목")
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._entry_count = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, float]:
+        """캐시 통계 반환"""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self)
+        stats["max_entries"] = self.max_entries
+        stats["size_bytes"] = os.path.getsize(self.db_file) if os.path.exists(self.db_file) else 0
+        return stats
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
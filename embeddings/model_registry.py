@@ -0,0 +1,224 @@
+"""
+임베딩 모델 레지스트리
+- 프로세스 전체에서 (모델 이름, 장치, 백엔드)마다 모델을 한 번만 로드하여 공유
+  (백엔드: torch = SentenceTransformer, onnx / onnx-int8 = 내보낸 ONNX 디렉토리를 ONNX Runtime으로 실행)
+- TextEmbedder, VectorEngine 등 임베딩을 사용하는 구성 요소는 모두 여기서 모델을 받음
+- 참조 카운트: acquire/release 짝으로 사용, 마지막 사용자가 반환하면 메모리에서 해제 (prewarm한 모델은 유지)
+- 처음 요청될 때 로드 (서버 시작 시 prewarm_configured_model로 설정의 모델을 미리 로드)
+"""
+
+import gc
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, Optional[str], str]
+
+# EMBEDDING_BACKEND 값 (torch 외에는 embeddings.onnx_backend 필요)
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+@dataclass
+class _ModelEntry:
+    """레지스트리 항목 (모델 하나)"""
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    model: Any = None
+    refs: int = 0
+    pinned: bool = False
+    load_seconds: float = 0.0
+    loads: int = 0
+
+
+def _load_sentence_transformer(model_name: str, device: Optional[str]):
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        raise ImportError("sentence-transformers가 설치되지 않았습니다: pip install sentence-transformers")
+    return SentenceTransformer(model_name, device=device)
+
+
+def _load_onnx_encoder(model_dir: str, device: Optional[str], quantized: bool):
+    from embeddings.onnx_backend import OnnxEncoder
+    return OnnxEncoder(model_dir, quantized=quantized, device=device)
+
+
+class ModelRegistry:
+    """(모델 이름, 장치, 백엔드)별 공유 모델 레지스트리 (스레드 안전)"""
+
+    def __init__(self, loader: Optional[Callable[[str, Optional[str]], Any]] = None):
+        """
+        Args:
+            loader: torch 백엔드 로더 (모델 이름, 장치) -> 모델 (기본: SentenceTransformer)
+        """
+        self._loaders: Dict[str, Callable[[str, Optional[str]], Any]] = {
+            "torch": loader or _load_sentence_transformer,
+            "onnx": lambda model_dir, device: _load_onnx_encoder(model_dir, device, quantized=False),
+            "onnx-int8": lambda model_dir, device: _load_onnx_encoder(model_dir, device, quantized=True)
+        }
+        self._lock = threading.Lock()
+        self._entries: Dict[ModelKey, _ModelEntry] = {}
+
+    @staticmethod
+    def _key(model_name: str, device: Optional[str], backend: str = "torch") -> ModelKey:
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"지원하지 않는 임베딩 백엔드: {backend} (가능한 값: {', '.join(EMBEDDING_BACKENDS)})")
+        return (model_name, device or None, backend)
+
+    def _entry(self, key: ModelKey) -> _ModelEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _ModelEntry()
+            return entry
+
+    def _ensure_loaded(self, key: ModelKey, entry: _ModelEntry):
+        """항목 잠금을 잡은 상태에서 호출 (다른 모델 로드는 막지 않음)"""
+        if entry.model is not None:
+            return
+        model_name, device, backend = key
+        logger.info(f"임베딩 모델 로딩 중: {model_name} (장치: {device or 'auto'}, 백엔드: {backend})")
+        started = time.perf_counter()
+        entry.model = self._loaders[backend](model_name, device)
+        entry.load_seconds = time.perf_counter() - started
+        entry.loads += 1
+        logger.info(f"임베딩 모델 로딩 완료: {model_name} ({entry.load_seconds:.1f}초)")
+
+    def acquire(self, model_name: str, device: Optional[str] = None, backend: str = "torch") -> Any:
+        """
+        모델 사용 시작 (처음 요청이면 로드, 이미 로드되었으면 같은 객체 반환)
+
+        사용이 끝나면 같은 인자로 release() 호출
+
+        Args:
+            model_name: torch는 모델 이름, onnx 계열은 내보낸 디렉토리 경로
+            device: 장치 (None이면 자동)
+            backend: torch, onnx, onnx-int8
+        """
+        key = self._key(model_name, device, backend)
+        entry = self._entry(key)
+        with entry.lock:
+            self._ensure_loaded(key, entry)
+            entry.refs += 1
+            return entry.model
+
+    def release(self, model_name: str, device: Optional[str] = None, backend: str = "torch"):
+        """모델 사용 종료 (참조가 모두 반환되고 prewarm하지 않은 모델이면 해제)"""
+        key = self._key(model_name, device, backend)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return
+        with entry.lock:
+            if entry.refs <= 0:
+                logger.warning(f"acquire 없이 release된 모델: {model_name}")
+                return
+            entry.refs -= 1
+            if entry.refs == 0 and not entry.pinned and entry.model is not None:
+                entry.model = None
+                logger.info(f"임베딩 모델 해제: {model_name}")
+                unloaded = True
+            else:
+                unloaded = False
+        if unloaded:
+            gc.collect()
+
+    @contextmanager
+    def lease(self, model_name: str, device: Optional[str] = None, backend: str = "torch") -> Iterator[Any]:
+        """with 블록 동안 모델 사용"""
+        model = self.acquire(model_name, device, backend)
+        try:
+            yield model
+        finally:
+            self.release(model_name, device, backend)
+
+    def prewarm(self, model_names: Iterable[str], device: Optional[str] = None,
+                backend: str = "torch") -> Dict[str, float]:
+        """
+        모델 미리 로드 (참조가 0이 되어도 해제하지 않음)
+
+        Returns:
+            모델 이름 -> 로드 시간(초, 이미 로드되어 있으면 0)
+        """
+        timings = {}
+        for model_name in model_names:
+            key = self._key(model_name, device, backend)
+            entry = self._entry(key)
+            with entry.lock:
+                loaded = entry.model is not None
+                self._ensure_loaded(key, entry)
+                entry.pinned = True
+                timings[model_name] = 0.0 if loaded else entry.load_seconds
+        return timings
+
+    def unpin(self, model_name: str, device: Optional[str] = None, backend: str = "torch"):
+        """prewarm 고정 해제 (사용 중인 곳이 없으면 바로 해제)"""
+        key = self._key(model_name, device, backend)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return
+        with entry.lock:
+            entry.pinned = False
+            if entry.refs == 0:
+                entry.model = None
+
+    def is_loaded(self, model_name: str, device: Optional[str] = None, backend: str = "torch") -> bool:
+        with self._lock:
+            entry = self._entries.get(self._key(model_name, device, backend))
+        return entry is not None and entry.model is not None
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """로드된 모델별 참조 수, 고정 여부, 로드 시간/횟수"""
+        with self._lock:
+            entries = list(self._entries.items())
+        return {
+            f"{model_name}@{device or 'auto'}" + (f"[{backend}]" if backend != "torch" else ""): {
+                "loaded": entry.model is not None,
+                "refs": entry.refs,
+                "pinned": entry.pinned,
+                "load_seconds": round(entry.load_seconds, 3),
+                "loads": entry.loads
+            }
+            for (model_name, device, backend), entry in entries
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """프로세스 공용 모델 레지스트리"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+def prewarm_configured_model(config: Mapping[str, Any]) -> Dict[str, float]:
+    """
+    설정의 임베딩 모델을 레지스트리에 미리 로드 (API 서버 시작 시 호출)
+
+    TextEmbedder와 같은 키(EMBEDDING_MODEL 또는 내보낸 ONNX 디렉토리, EMBEDDING_DEVICE, EMBEDDING_BACKEND)로
+    로드하므로 이후 초기화되는 구성 요소가 같은 모델을 받음
+
+    Returns:
+        모델 이름 -> 로드 시간(초)
+    """
+    backend = config.get("EMBEDDING_BACKEND") or "torch"
+    model_name = config.get("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    if backend != "torch":
+        from embeddings.onnx_backend import resolve_onnx_model
+        model_name = str(resolve_onnx_model(model_name, config.get("EMBEDDING_ONNX_PATH") or "./models/onnx"))
+    return get_model_registry().prewarm([model_name], device=config.get("EMBEDDING_DEVICE"), backend=backend)
@@ -0,0 +1,350 @@
+"""
+ONNX Runtime 임베딩 백엔드
+- 설정된 SentenceTransformer 모델(Transformer + Pooling [+ Normalize])을 ONNX로 내보내고
+  동적 int8 양자화 모델을 함께 생성
+- OnnxEncoder는 SentenceTransformer와 같은 encode / get_sentence_embedding_dimension을 제공하므로
+  모델 레지스트리를 통해 TextEmbedder가 그대로 사용 (EMBEDDING_BACKEND: onnx / onnx-int8)
+- 내보내기에는 torch + sentence-transformers, 실행에는 onnxruntime + transformers(토크나이저)만 필요
+- 내보내기는 명시적인 구축 단계, 서빙 프로세스는 내보낸 디렉토리를 읽기만 함
+  python -m embeddings.onnx_backend --export [--force] [--config config/config.yaml]
+  (scripts/build_serving_snapshot.py, scripts/benchmark_onnx_embedder.py도 같은 함수로 내보냄)
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    ONNX_QUANTIZATION_AVAILABLE = True
+except ImportError:
+    ONNX_QUANTIZATION_AVAILABLE = False
+
+try:
+    from transformers import AutoTokenizer
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    TRANSFORMERS_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ENCODER_CONFIG_FILE = "encoder.json"
+FP32_MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model.int8.onnx"
+POOLING_MODES = ("mean", "cls", "max")
+DEFAULT_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+DEFAULT_ONNX_ROOT = "./models/onnx"
+
+
+def onnx_model_dir(model_name: str, root: Union[str, Path]) -> Path:
+    """모델 이름별 내보내기 디렉토리"""
+    return Path(root) / model_name.replace("/", "__")
+
+
+def onnx_model_exists(model_dir: Union[str, Path]) -> bool:
+    return (Path(model_dir) / ENCODER_CONFIG_FILE).exists()
+
+
+def resolve_onnx_model(model_name: str, root: Union[str, Path]) -> Path:
+    """내보낸 모델 디렉토리 반환 (없으면 FileNotFoundError - 서빙 중에는 내보내지 않음)"""
+    model_dir = onnx_model_dir(model_name, root)
+    if not onnx_model_exists(model_dir):
+        raise FileNotFoundError(
+            f"ONNX 모델이 없습니다: {model_dir} "
+            f"(python -m embeddings.onnx_backend --export로 먼저 내보내세요)"
+        )
+    return model_dir
+
+
+@contextmanager
+def _export_lock(output_dir: Path) -> Iterator[None]:
+    """같은 모델을 여러 프로세스가 동시에 내보내지 않도록 잠금 파일로 직렬화"""
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_dir.parent / f".{output_dir.name}.lock", "w") as lock_file:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            logger.warning("fcntl을 사용할 수 없어 ONNX 내보내기 잠금 없이 진행합니다")
+        try:
+            yield
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def pool_token_embeddings(token_embeddings: np.ndarray,
+                          attention_mask: np.ndarray,
+                          mode: str = "mean",
+                          normalize: bool = False) -> np.ndarray:
+    """
+    토큰 임베딩 (n, seq, d) -> 문장 임베딩 (n, d), sentence-transformers Pooling과 같은 계산
+
+    Args:
+        token_embeddings: Transformer 마지막 은닉 상태
+        attention_mask: (n, seq) 패딩 마스크
+        mode: mean (패딩 제외 평균), cls (첫 토큰), max (패딩 제외 최댓값)
+        normalize: L2 정규화 여부 (Normalize 모듈이 있는 모델)
+    """
+    token_embeddings = token_embeddings.astype(np.float32, copy=False)
+    mask = attention_mask.astype(np.float32)[:, :, None]
+    if mode == "mean":
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    elif mode == "cls":
+        pooled = token_embeddings[:, 0]
+    elif mode == "max":
+        pooled = np.where(mask > 0, token_embeddings, np.float32(-1e9)).max(axis=1)
+    else:
+        raise ValueError(f"지원하지 않는 pooling 방식: {mode}")
+
+    if normalize:
+        pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+    return np.ascontiguousarray(pooled, dtype=np.float32)
+
+
+def export_onnx_model(model_name: str,
+                      output_dir: Union[str, Path],
+                      quantize: bool = True,
+                      opset: int = 14,
+                      overwrite: bool = True) -> Path:
+    """
+    SentenceTransformer 모델을 ONNX (fp32 + 동적 int8)로 내보내기
+
+    Transformer 출력(토큰 임베딩)까지만 그래프로 내보내고 pooling/정규화는 pool_token_embeddings로 계산
+    같은 디렉토리로 내보내는 프로세스끼리는 잠금 파일로 직렬화
+
+    Args:
+        overwrite: False이면 잠금을 잡은 뒤 이미 내보낸 모델이 있을 때 그대로 사용
+
+    Returns:
+        내보낸 디렉토리
+    """
+    output_dir = Path(output_dir)
+    with _export_lock(output_dir):
+        if not overwrite and onnx_model_exists(output_dir):
+            return output_dir
+        return _export_onnx_model(model_name, output_dir, quantize, opset)
+
+
+def export_configured_model(config: Dict[str, Any],
+                            model_name: Optional[str] = None,
+                            root: Optional[Union[str, Path]] = None,
+                            overwrite: bool = False) -> Path:
+    """
+    설정의 EMBEDDING_MODEL을 EMBEDDING_ONNX_PATH 아래로 내보내기 (없을 때만, overwrite이면 다시 내보내기)
+
+    Args:
+        model_name: 모델 이름 (기본: EMBEDDING_MODEL)
+        root: 내보내기 경로 (기본: EMBEDDING_ONNX_PATH)
+
+    Returns:
+        내보낸 디렉토리 (서빙 시 resolve_onnx_model이 찾는 경로와 같음)
+    """
+    model_name = model_name or config.get("EMBEDDING_MODEL", DEFAULT_MODEL_NAME)
+    model_dir = onnx_model_dir(model_name, root or config.get("EMBEDDING_ONNX_PATH") or DEFAULT_ONNX_ROOT)
+    return export_onnx_model(model_name, model_dir, overwrite=overwrite)
+
+
+def _export_onnx_model(model_name: str, output_dir: Path, quantize: bool, opset: int) -> Path:
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    started = time.perf_counter()
+    model = SentenceTransformer(model_name, device="cpu")
+    modules = [type(module).__name__ for module in model]
+    if modules[:2] != ["Transformer", "Pooling"] or any(name != "Normalize" for name in modules[2:]):
+        raise ValueError(f"ONNX로 내보낼 수 없는 모듈 구성입니다: {modules}")
+
+    transformer, pooling = model[0], model[1]
+    pooling_mode = pooling.get_pooling_mode_str()
+    if pooling_mode not in POOLING_MODES:
+        raise ValueError(f"지원하지 않는 pooling 방식: {pooling_mode}")
+
+    tokenizer = transformer.tokenizer
+    sample = tokenizer(["전력시장 정산 규칙", "계통한계가격"], padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class _TokenEmbeddings(torch.nn.Module):
+        """Transformer 마지막 은닉 상태만 반환"""
+
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *inputs):
+            return self.auto_model(**dict(zip(input_names, inputs)))[0]
+
+    # 프로세스별 임시 디렉토리에 모두 쓴 뒤 교체 (다른 프로세스가 반쯤 쓴 모델을 읽지 않도록)
+    staging = Path(tempfile.mkdtemp(prefix=f".{output_dir.name}.", suffix=".tmp", dir=output_dir.parent))
+    try:
+        wrapper = _TokenEmbeddings(transformer.auto_model.eval())
+        with torch.no_grad():
+            torch.onnx.export(
+                wrapper,
+                tuple(sample[name] for name in input_names),
+                str(staging / FP32_MODEL_FILE),
+                input_names=input_names,
+                output_names=["token_embeddings"],
+                dynamic_axes={name: {0: "batch", 1: "sequence"} for name in input_names + ["token_embeddings"]},
+                opset_version=opset,
+                do_constant_folding=True
+            )
+
+        files = {"fp32": FP32_MODEL_FILE}
+        if quantize:
+            if not ONNX_QUANTIZATION_AVAILABLE:
+                raise ImportError("onnxruntime이 설치되지 않았습니다: pip install onnxruntime")
+            quantize_dynamic(str(staging / FP32_MODEL_FILE), str(staging / INT8_MODEL_FILE),
+                             weight_type=QuantType.QInt8)
+            files["int8"] = INT8_MODEL_FILE
+
+        tokenizer.save_pretrained(str(staging))
+        config = {
+            "model_name": model_name,
+            "pooling": pooling_mode,
+            "normalize": "Normalize" in modules,
+            "max_seq_length": int(model.max_seq_length),
+            "dimension": int(model.get_sentence_embedding_dimension()),
+            "input_names": input_names,
+            "files": files,
+            "opset": opset,
+            "exported_at": datetime.now().isoformat()
+        }
+        with open(staging / ENCODER_CONFIG_FILE, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.replace(staging, output_dir)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    logger.info(f"ONNX 내보내기 완료: {model_name} -> {output_dir} ({time.perf_counter() - started:.1f}초)")
+    return output_dir
+
+
+class OnnxEncoder:
+    """ONNX Runtime 문장 인코더 (SentenceTransformer.encode 호환)"""
+
+    def __init__(self,
+                 model_dir: Union[str, Path],
+                 quantized: bool = True,
+                 device: Optional[str] = None,
+                 intra_op_threads: Optional[int] = None):
+        """
+        Args:
+            model_dir: export_onnx_model로 내보낸 디렉토리
+            quantized: int8 양자화 모델 사용 여부 (False면 fp32)
+            device: cuda로 시작하면 CUDA 실행 공급자 우선 (없으면 CPU)
+            intra_op_threads: 연산 내부 스레드 수 (None이면 onnxruntime 기본값)
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime이 설치되지 않았습니다: pip install onnxruntime")
+        if not TRANSFORMERS_AVAILABLE:
+            raise ImportError("transformers가 설치되지 않았습니다: pip install transformers")
+
+        self.model_dir = Path(model_dir)
+        with open(self.model_dir / ENCODER_CONFIG_FILE, "r", encoding="utf-8") as f:
+            self.config: Dict[str, Any] = json.load(f)
+
+        variant = "int8" if quantized else "fp32"
+        if variant not in self.config["files"]:
+            raise FileNotFoundError(f"{variant} 모델이 없습니다: {self.model_dir}")
+        self.variant = variant
+        self.max_seq_length = self.config["max_seq_length"]
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        providers = ["CPUExecutionProvider"]
+        if device and device.startswith("cuda") and "CUDAExecutionProvider" in ort.get_available_providers():
+            providers.insert(0, "CUDAExecutionProvider")
+
+        self.session = ort.InferenceSession(str(self.model_dir / self.config["files"][variant]),
+                                            sess_options=options, providers=providers)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+        logger.info(f"ONNX 인코더 로드 완료: {self.config['model_name']} ({variant}, {providers[0]})")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["dimension"]
+
+    def encode(self,
+               sentences: Union[str, List[str]],
+               batch_size: int = 32,
+               convert_to_numpy: bool = True,
+               show_progress_bar: bool = False,
+               **kwargs: Any) -> np.ndarray:
+        """문장 임베딩 (길이순으로 묶어 패딩을 줄이고 입력 순서대로 반환)"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = np.zeros((len(texts), self.config["dimension"]), dtype=np.float32)
+        if not texts:
+            return embeddings
+
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        for start in range(0, len(texts), batch_size):
+            rows = order[start:start + batch_size]
+            tokens = self.tokenizer([texts[row] for row in rows], padding=True, truncation=True,
+                                    max_length=self.max_seq_length, return_tensors="np")
+            feeds = {name: tokens[name].astype(np.int64) for name in self.config["input_names"]}
+            token_embeddings = self.session.run(None, feeds)[0]
+            embeddings[rows] = pool_token_embeddings(token_embeddings, tokens["attention_mask"],
+                                                     self.config["pooling"], self.config["normalize"])
+
+        return embeddings[0] if single else embeddings
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """python -m embeddings.onnx_backend --export: 서빙 전에 질문 임베딩용 ONNX 모델 내보내기"""
+    import yaml
+
+    parser = argparse.ArgumentParser(description="ONNX 임베딩 모델 내보내기")
+    parser.add_argument("--config", default=str(Path(__file__).parent.parent / "config" / "config.yaml"))
+    parser.add_argument("--model", default=None, help="모델 이름 (기본: EMBEDDING_MODEL)")
+    parser.add_argument("--onnx-path", default=None, help="내보내기 경로 (기본: EMBEDDING_ONNX_PATH)")
+    parser.add_argument("--export", action="store_true", help="내보낸 모델이 없으면 내보내기")
+    parser.add_argument("--force", action="store_true", help="이미 내보낸 모델이 있어도 다시 내보내기")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if Path(args.config).exists():
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+
+    model_name = args.model or config.get("EMBEDDING_MODEL", DEFAULT_MODEL_NAME)
+    model_dir = onnx_model_dir(model_name, args.onnx_path or config.get("EMBEDDING_ONNX_PATH") or DEFAULT_ONNX_ROOT)
+    if not (args.export or args.force):
+        print(f"ONNX 모델: {model_dir} ({'있음' if onnx_model_exists(model_dir) else '없음 - --export로 내보내기'})")
+        return 0 if onnx_model_exists(model_dir) else 1
+
+    started = time.perf_counter()
+    export_configured_model(config, model_name=model_name, root=args.onnx_path, overwrite=args.force)
+    print(f"ONNX 모델: {model_dir} ({time.perf_counter() - started:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,32 +5,80 @@
 """
 
 import logging
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Optional
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import torch
 
+from embeddings.embedding_cache import EmbeddingCache
+from embeddings.model_registry import get_model_registry
+
 class TextEmbedder:
     """텍스트를 벡터로 변환하는 클래스"""
     
-    def __init__(self, model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"):
+    # 캐시 키는 모델에 실제로 들어가는 텍스트(하위 클래스 전처리 후)의 해시이므로 전처리 결과는 키에 이미 반영됨
+    # 모델 입력을 만드는 방식(토큰화, 정규화 등)이 바뀌면 버전을 올려 기존 캐시 항목을 무효화
+    PREPROCESSING_VERSION = "raw-v1"
+    
+    def __init__(self, model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+                 cache_dir: Optional[str] = "data/embedding_cache",
+                 cache_max_entries: int = 200000,
+                 device: Optional[str] = None,
+                 backend: str = "torch",
+                 onnx_path: Optional[str] = "./models/onnx"):
         """
         Args:
             model_name: 사용할 임베딩 모델 이름
                       - paraphrase-multilingual-MiniLM-L12-v2: 다국어 지원, 경량화
                       - paraphrase-multilingual-mpnet-base-v2: 더 높은 성능, 무거움
+            cache_dir: 임베딩 캐시 디렉토리 (None이면 캐시 비활성화)
+            cache_max_entries: 캐시에 보관할 최대 임베딩 수
+            device: 모델 장치 (cpu, cuda 등, None이면 자동)
+            backend: torch (SentenceTransformer), onnx (ONNX Runtime fp32), onnx-int8 (동적 int8 양자화)
+            onnx_path: ONNX 내보내기 디렉토리 (onnx 계열 백엔드는 미리 내보낸 모델이 있어야 함,
+                       없거나 로드에 실패하면 torch로 바꾸지 않고 예외 발생)
         """
         self.logger = logging.getLogger(__name__)
         self.model_name = model_name
+        self.device = device
+        self.backend = backend
+        self.model = None
+        self._model_key = model_name
+        
+        self.cache = None
+        if cache_dir:
+            try:
+                self.cache = EmbeddingCache(cache_dir, max_entries=cache_max_entries)
+            except Exception as e:
+                self.logger.warning(f"임베딩 캐시 초기화 실패, 캐시 없이 진행: {e}")
         
         try:
-            self.logger.info(f"임베딩 모델 로딩 중: {model_name}")
-            self.model = SentenceTransformer(model_name)
+            # 같은 프로세스의 다른 구성 요소와 모델 공유 (이미 로드되어 있으면 재사용)
+            self.model = self._acquire_model(onnx_path)
             self.embedding_dimension = self.model.get_sentence_embedding_dimension()
-            self.logger.info(f"모델 로딩 완료. 임베딩 차원: {self.embedding_dimension}")
+            self.logger.info(f"모델 준비 완료: {model_name} ({self.backend}), 임베딩 차원: {self.embedding_dimension}")
         except Exception as e:
-            self.logger.error(f"모델 로딩 실패: {e}")
+            self.logger.error(f"모델 로딩 실패 ({backend}): {e}")
             raise
+        
+        # 백엔드마다 임베딩 값이 조금씩 다르므로 캐시 키를 구분
+        self.cache_model_id = model_name if self.backend == "torch" else f"{model_name}#{self.backend}"
+    
+    def _acquire_model(self, onnx_path: Optional[str]):
+        """레지스트리에서 설정한 백엔드의 모델 받기"""
+        registry = get_model_registry()
+        if self.backend != "torch":
+            from embeddings.onnx_backend import resolve_onnx_model
+            model_dir = str(resolve_onnx_model(self.model_name, onnx_path or "./models/onnx"))
+            model = registry.acquire(model_dir, self.device, self.backend)
+            self._model_key = model_dir
+            return model
+        return registry.acquire(self.model_name, self.device)
+    
+    def close(self):
+        """공유 모델 반환 (다른 곳에서 사용하지 않으면 레지스트리가 해제)"""
+        if self.model is not None:
+            self.model = None
+            get_model_registry().release(self._model_key, self.device, self.backend)
     
     def encode_text(self, text: str) -> np.ndarray:
         """단일 텍스트를 벡터로 변환"""
@@ -40,9 +88,8 @@ class TextEmbedder:
                 self.logger.warning("빈 텍스트가 입력되었습니다")
                 return np.zeros(self.embedding_dimension)
             
-            # 임베딩 생성
-            embedding = self.model.encode(text, convert_to_numpy=True)
-            return embedding
+            # 임베딩 생성 (캐시 우선)
+            return self._encode_with_cache([text])[0]
             
         except Exception as e:
             self.logger.error(f"텍스트 임베딩 실패: {e}")
@@ -55,32 +102,92 @@ class TextEmbedder:
                 self.logger.warning("빈 텍스트 리스트가 입력되었습니다")
                 return np.array([])
             
-            # 빈 텍스트 필터링
-            valid_texts = [text for text in texts if text and text.strip()]
+            # 빈 텍스트는 영벡터로 두고 입력 순서를 유지
+            valid_indices = [i for i, text in enumerate(texts) if text and text.strip()]
             
-            if not valid_texts:
+            if not valid_indices:
                 self.logger.warning("유효한 텍스트가 없습니다")
-                return np.zeros((len(texts), self.embedding_dimension))
+                return np.zeros((len(texts), self.embedding_dimension), dtype=np.float32)
             
-            self.logger.info(f"{len(valid_texts)}개 텍스트 배치 임베딩 시작")
+            self.logger.info(f"{len(valid_indices)}개 텍스트 배치 임베딩 시작")
             
-            # 배치로 임베딩 생성
-            embeddings = self.model.encode(
-                valid_texts,
+            # 배치로 임베딩 생성 (캐시 우선)
+            valid_embeddings = self._encode_with_cache(
+                [texts[i] for i in valid_indices],
                 batch_size=batch_size,
-                convert_to_numpy=True,
                 show_progress_bar=True
             )
             
+            valid_embeddings = np.asarray(valid_embeddings, dtype=np.float32)
+            if len(valid_indices) == len(texts):
+                # 빈 텍스트가 없으면 모델 출력 행렬을 그대로 반환 (복사 없음)
+                embeddings = valid_embeddings
+            else:
+                embeddings = np.zeros((len(texts), valid_embeddings.shape[1]), dtype=np.float32)
+                embeddings[valid_indices] = valid_embeddings
+            
             self.logger.info("배치 임베딩 완료")
             return embeddings
             
         except Exception as e:
             self.logger.error(f"배치 임베딩 실패: {e}")
-            return np.zeros((len(texts), self.embedding_dimension))
+            return np.zeros((len(texts), self.embedding_dimension), dtype=np.float32)
+    
+    def encode_queries(self, queries: List[str], batch_size: int = 32) -> np.ndarray:
+        """여러 질문을 한 번에 임베딩 (encode_text와 같은 결과를 배치로)"""
+        return self.encode_batch(queries, batch_size=batch_size)
     
-    def encode_documents(self, documents: List[Dict[str, any]]) -> List[Dict[str, any]]:
-        """문서 조각들을 임베딩하고 메타데이터와 함께 반환"""
+    def _encode_with_cache(self, texts: List[str], batch_size: int = 32,
+                           show_progress_bar: bool = False) -> np.ndarray:
+        """캐시에 없는 텍스트만 모델로 인코딩하여 입력 순서대로 반환"""
+        if self.cache is None:
+            return self.model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=show_progress_bar
+            )
+        
+        keys = [EmbeddingCache.make_key(self.cache_model_id, self.PREPROCESSING_VERSION, text)
+                for text in texts]
+        cached = self.cache.get_many(keys)
+        
+        # 미스 항목은 중복 제거 후 한 번만 인코딩
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        
+        if missing:
+            new_embeddings = self.model.encode(
+                list(missing.values()),
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=show_progress_bar and len(missing) > batch_size
+            )
+            computed = dict(zip(missing.keys(), new_embeddings))
+            self.cache.put_many(computed, self.cache_model_id)
+            cached.update(computed)
+        
+        self.logger.debug(f"임베딩 캐시: {len(texts) - len(missing)}/{len(texts)} 히트")
+        return np.vstack([cached[key] for key in keys]).astype(np.float32, copy=False)
+    
+    def get_cache_stats(self) -> Dict[str, float]:
+        """임베딩 캐시 통계 반환"""
+        if self.cache is None:
+            return {}
+        return self.cache.get_stats()
+    
+    def encode_documents(self, documents: List[Dict[str, any]], copy: bool = True) -> List[Dict[str, any]]:
+        """
+        문서 조각들을 임베딩하고 메타데이터와 함께 반환
+        
+        각 문서의 'embedding'은 배치 임베딩 (n, d) float32 행렬의 행 뷰 (벡터마다 복사하지 않음)
+        
+        Args:
+            documents: 문서 조각 목록
+            copy: False이면 문서 dict를 복사하지 않고 그대로 채워서 반환 (호출한 쪽이 문서를 소유할 때)
+        """
         try:
             if not documents:
                 self.logger.warning("처리할 문서가 없습니다")
@@ -90,13 +197,14 @@ class TextEmbedder:
             texts = [doc.get('text', '') for doc in documents]
             
             # 배치 임베딩
-            embeddings = self.encode_batch(texts)
+            embeddings = np.ascontiguousarray(self.encode_batch(texts), dtype=np.float32)
             
             # 원본 문서에 임베딩 추가
             embedded_documents = []
             for i, doc in enumerate(documents):
-                embedded_doc = doc.copy()
-                embedded_doc['embedding'] = embeddings[i] if i < len(embeddings) else np.zeros(self.embedding_dimension)
+                embedded_doc = doc.copy() if copy else doc
+                embedded_doc['embedding'] = (embeddings[i] if i < len(embeddings)
+                                             else np.zeros(self.embedding_dimension, dtype=np.float32))
                 embedded_doc['embedding_model'] = self.model_name
                 embedded_documents.append(embedded_doc)
             
@@ -152,8 +260,14 @@ class TextEmbedder:
 class PowerMarketEmbedder(TextEmbedder):
     """전력시장 특화 임베딩 클래스"""
     
-    def __init__(self, model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"):
-        super().__init__(model_name)
+    def __init__(self, model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+                 cache_dir: Optional[str] = "data/embedding_cache",
+                 cache_max_entries: int = 200000,
+                 device: Optional[str] = None,
+                 backend: str = "torch",
+                 onnx_path: Optional[str] = "./models/onnx"):
+        super().__init__(model_name, cache_dir=cache_dir, cache_max_entries=cache_max_entries,
+                         device=device, backend=backend, onnx_path=onnx_path)
         
         # 전력시장 전문용어 사전
         self.power_market_terms = {
@@ -188,6 +302,11 @@ class PowerMarketEmbedder(TextEmbedder):
         # 전처리 후 임베딩
         processed_text = self.preprocess_power_market_text(text)
         return super().encode_text(processed_text)
+    
+    def encode_queries(self, queries: List[str], batch_size: int = 32) -> np.ndarray:
+        """전력시장 특화 질문 배치 임베딩 (encode_text와 같은 전처리 적용)"""
+        processed = [self.preprocess_power_market_text(query) for query in queries]
+        return super().encode_queries(processed, batch_size=batch_size)
 
 if __name__ == "__main__":
     # 테스트 코드
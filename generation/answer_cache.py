@@ -0,0 +1,306 @@
+"""
+답변 캐시 모듈
+- ask / ask_enhanced 앞단에서 동작하는 2단계 답변 캐시
+- 1단계(정확 일치): 정규화된 질문 + 필터(도메인/중요도/검색 방법) 키
+- 2단계(유사 질문): 같은 필터의 캐시된 질문 임베딩과 코사인 거리가 임계값 이내이면 재사용
+- TTL 만료 + 최대 크기 초과 시 LRU 제거
+- 컬렉션 버전이 바뀌면 (문서 추가/삭제/초기화) 전체 무효화
+"""
+
+import copy
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+_metrics_collector = None
+_metrics_checked = False
+
+
+def _get_metrics_collector():
+    """메트릭 수집기 지연 로딩 (모니터링 의존성이 없으면 None)"""
+    global _metrics_collector, _metrics_checked
+    if not _metrics_checked:
+        _metrics_checked = True
+        try:
+            from monitoring.metrics.collector import get_metrics_collector
+            _metrics_collector = get_metrics_collector()
+        except Exception as e:
+            logging.getLogger(__name__).debug(f"메트릭 수집기 사용 불가: {e}")
+            _metrics_collector = None
+    return _metrics_collector
+
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCT = re.compile(r"[\s?？!！.。]+$")
+
+
+def normalize_query(query: str) -> str:
+    """질문 정규화 (유니코드 NFKC, 소문자, 공백 축약, 끝 문장부호 제거)"""
+    text = unicodedata.normalize("NFKC", query or "").lower()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _TRAILING_PUNCT.sub("", text)
+
+
+@dataclass
+class AnswerCacheEntry:
+    """캐시 항목"""
+    query: str
+    filter_key: str
+    value: Dict[str, Any]
+    embedding: Optional[np.ndarray]
+    created_at: float
+
+
+class AnswerCache:
+    """2단계(정확 일치 + 유사 질문) 답변 캐시"""
+
+    def __init__(self,
+                 ttl_seconds: float = 3600,
+                 max_entries: int = 1000,
+                 max_distance: float = 0.05,
+                 namespace: str = "answer"):
+        """
+        Args:
+            ttl_seconds: 항목 유효 시간 (초)
+            max_entries: 보관할 최대 답변 수 (초과 시 LRU 제거)
+            max_distance: 유사 질문으로 볼 최대 코사인 거리 (0 이하이면 유사 질문 단계 비활성화)
+            namespace: 메트릭에 사용할 캐시 네임스페이스
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.namespace = namespace
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], AnswerCacheEntry]" = OrderedDict()
+        self._version: Any = None
+
+        # 유사 질문 검색용: 필터별 (키 목록, 정규화 임베딩 행렬) - 변경 시 지연 재구성
+        self._semantic_index: Dict[str, Tuple[list, np.ndarray]] = {}
+        self._dirty_filters: set = set()
+
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0,
+                      "expired": 0, "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def make_filter_key(**filters: Any) -> str:
+        """필터 값들을 정렬된 문자열 키로 변환"""
+        return json.dumps(filters, sort_keys=True, ensure_ascii=False, default=str)
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.max_distance > 0
+
+    def check_version(self, version: Any) -> None:
+        """컬렉션 버전이 바뀌었으면 캐시 전체 무효화"""
+        with self._lock:
+            if version == self._version:
+                return
+            if self._entries:
+                self.logger.info(f"컬렉션 변경 감지, 답변 캐시 무효화 ({len(self._entries)}개)")
+                self.stats["invalidations"] += 1
+            self._clear_locked()
+            self._version = version
+
+    def invalidate(self) -> None:
+        """캐시 전체 무효화"""
+        with self._lock:
+            if self._entries:
+                self.stats["invalidations"] += 1
+            self._clear_locked()
+            self._version = None
+
+    def _clear_locked(self) -> None:
+        self._entries.clear()
+        self._semantic_index.clear()
+        self._dirty_filters.clear()
+
+    def _is_expired(self, entry: AnswerCacheEntry, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry.created_at > self.ttl_seconds
+
+    def _remove_locked(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry.embedding is not None:
+            self._dirty_filters.add(entry.filter_key)
+
+    def get_exact(self, query: str, filter_key: str) -> Optional[Dict[str, Any]]:
+        """정확 일치 조회 (미스는 기록하지 않음 - 유사 질문 단계에서 최종 판정)"""
+        key = (normalize_query(query), filter_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._is_expired(entry, time.time()):
+                self._remove_locked(key)
+                self.stats["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["exact_hits"] += 1
+            value = copy.deepcopy(entry.value)
+
+        self._report(hits=1, misses=0)
+        value["cache"] = {"hit": "exact"}
+        return value
+
+    def get_similar(self, query_embedding: np.ndarray, filter_key: str) -> Optional[Dict[str, Any]]:
+        """유사 질문 조회 (같은 필터의 캐시 항목 중 코사인 거리가 가장 가까운 항목)"""
+        result = None
+        with self._lock:
+            if self.semantic_enabled and query_embedding is not None:
+                result = self._lookup_similar_locked(query_embedding, filter_key)
+            if result is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["semantic_hits"] += 1
+
+        self._report(hits=int(result is not None), misses=int(result is None))
+        return result
+
+    def _lookup_similar_locked(self, query_embedding: np.ndarray, filter_key: str) -> Optional[Dict[str, Any]]:
+        keys, matrix = self._get_semantic_index_locked(filter_key)
+        if not keys:
+            return None
+
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != matrix.shape[1]:
+            return None
+
+        similarities = matrix @ (query / norm)
+        now = time.time()
+        # 가까운 순으로 확인하며 만료 항목은 건너뜀
+        for i in np.argsort(-similarities):
+            distance = 1.0 - float(similarities[i])
+            if distance > self.max_distance:
+                break
+            key = keys[i]
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            if self._is_expired(entry, now):
+                self._remove_locked(key)
+                self.stats["expired"] += 1
+                continue
+            self._entries.move_to_end(key)
+            value = copy.deepcopy(entry.value)
+            value["cache"] = {"hit": "semantic", "matched_query": entry.query, "distance": round(distance, 6)}
+            return value
+        return None
+
+    def _get_semantic_index_locked(self, filter_key: str) -> Tuple[list, np.ndarray]:
+        if filter_key in self._dirty_filters or filter_key not in self._semantic_index:
+            keys = [key for key, entry in self._entries.items()
+                    if entry.filter_key == filter_key and entry.embedding is not None]
+            if keys:
+                matrix = np.stack([self._entries[key].embedding for key in keys])
+            else:
+                matrix = np.empty((0, 0), dtype=np.float32)
+            self._semantic_index[filter_key] = (keys, matrix)
+            self._dirty_filters.discard(filter_key)
+        return self._semantic_index[filter_key]
+
+    def put(self,
+            query: str,
+            filter_key: str,
+            value: Dict[str, Any],
+            query_embedding: Optional[np.ndarray] = None) -> None:
+        """답변 저장"""
+        embedding = None
+        if query_embedding is not None:
+            embedding = np.asarray(query_embedding, dtype=np.float32).ravel()
+            norm = np.linalg.norm(embedding)
+            embedding = embedding / norm if norm else None
+
+        key = (normalize_query(query), filter_key)
+        entry = AnswerCacheEntry(
+            query=query,
+            filter_key=filter_key,
+            value=copy.deepcopy(value),
+            embedding=embedding,
+            created_at=time.time()
+        )
+
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = entry
+            if embedding is not None:
+                self._dirty_filters.add(filter_key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self.stats["evictions"] += 1
+
+        self._report(hits=0, misses=0)
+
+    def get_or_compute(self,
+                       query: str,
+                       filter_key: str,
+                       compute: Callable[[], Dict[str, Any]],
+                       embed: Optional[Callable[[str], np.ndarray]] = None,
+                       version: Any = None) -> Dict[str, Any]:
+        """
+        캐시 조회 후 없으면 계산하여 저장
+
+        Args:
+            query: 원본 질문
+            filter_key: make_filter_key()로 만든 필터 키
+            compute: 답변 생성 함수 (캐시 미스 시 호출)
+            embed: 질문 임베딩 함수 (유사 질문 단계용, 정확 일치 미스일 때만 호출)
+            version: 현재 컬렉션 버전 (바뀌었으면 먼저 무효화)
+        """
+        self.check_version(version)
+
+        cached = self.get_exact(query, filter_key)
+        if cached is not None:
+            return cached
+
+        query_embedding = None
+        if embed is not None and self.semantic_enabled:
+            try:
+                query_embedding = embed(query)
+            except Exception as e:
+                self.logger.debug(f"질문 임베딩 실패, 유사 질문 단계 생략: {e}")
+
+        cached = self.get_similar(query_embedding, filter_key)
+        if cached is not None:
+            return cached
+
+        value = compute()
+        # 오류 응답은 캐시하지 않음
+        if value and "error" not in value:
+            self.put(query, filter_key, value, query_embedding)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_ratio": hits / lookups if lookups else 0.0
+        }
+
+    def _report(self, hits: int, misses: int) -> None:
+        """캐시 메트릭 기록"""
+        collector = _get_metrics_collector()
+        if collector is None:
+            return
+        try:
+            if hits or misses:
+                collector.record_cache_lookups(self.namespace, hits, misses)
+            stats = self.get_stats()
+            collector.update_namespace_cache_statistics(self.namespace, stats["hit_ratio"], stats["entries"])
+        except Exception as e:
+            self.logger.debug(f"캐시 메트릭 기록 실패: {e}")
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 import json
 import re
 
+from core.keyword_matcher import get_keyword_matcher
+
 @dataclass
 class GenerationResult:
     """답변 생성 결과를 담는 데이터 클래스"""
@@ -22,6 +24,15 @@ class GenerationResult:
 class AnswerGenerator:
     """답변 생성 엔진 클래스"""
     
+    # 도메인 판단용 용어 사전 (공용 키워드 매처에 "answer_domain:" 범주로 등록)
+    DOMAIN_KEYWORDS = {
+        "발전계획": ["발전계획", "하루전", "당일", "실시간", "계획수립"],
+        "계통운영": ["계통운영", "운영기준", "안전운전", "계통제약"],
+        "전력거래": ["전력거래", "입찰", "가격", "시장"],
+        "예비력": ["예비력", "예비력시장", "예비력용량"],
+        "송전제약": ["송전제약", "제약정보", "계통제약"]
+    }
+    
     def __init__(self, 
                  model_type: str = "rule_based",
                  temperature: float = 0.3,
@@ -37,6 +48,9 @@ class AnswerGenerator:
         self.temperature = temperature
         self.max_length = max_length
         
+        self.keyword_matcher = get_keyword_matcher()
+        self.keyword_matcher.add_vocabulary(self.DOMAIN_KEYWORDS, prefix="answer_domain:")
+        
         # 전력시장 특화 답변 템플릿
         self.answer_templates = {
             "발전계획": """
@@ -125,20 +139,9 @@ class AnswerGenerator:
     
     def determine_domain(self, query: str, context: str) -> str:
         """질문과 컨텍스트를 바탕으로 도메인 판단"""
-        domain_keywords = {
-            "발전계획": ["발전계획", "하루전", "당일", "실시간", "계획수립"],
-            "계통운영": ["계통운영", "운영기준", "안전운전", "계통제약"],
-            "전력거래": ["전력거래", "입찰", "가격", "시장"],
-            "예비력": ["예비력", "예비력시장", "예비력용량"],
-            "송전제약": ["송전제약", "제약정보", "계통제약"]
-        }
-        
-        combined_text = (query + " " + context).lower()
+        scan = self.keyword_matcher.scan(query + " " + context)
         
-        domain_scores = {}
-        for domain, keywords in domain_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in combined_text)
-            domain_scores[domain] = score
+        domain_scores = {domain: scan.count(f"answer_domain:{domain}") for domain in self.DOMAIN_KEYWORDS}
         
         # 가장 높은 점수의 도메인 반환
         if domain_scores:
@@ -34,10 +34,11 @@ def process_power_market_rules():
     # 임베딩 모델 초기화
     embedder = TextEmbedder()
     
-    # 벡터 DB 초기화 (기존 DB에 추가)
+    # 벡터 DB 초기화 (기존 DB에 추가, BM25 색인은 모든 파일을 추가한 뒤 한 번만 저장)
     vector_db = VectorDatabase(
         db_path="./vector_db",
-        collection_name="power_market_docs"
+        collection_name="power_market_docs",
+        auto_flush=False
     )
     
     # 2. PowerMarketRules 폴더 처리
@@ -111,6 +112,8 @@ def process_power_market_rules():
             logger.error(f"{pdf_file.name} 처리 중 오류 발생: {e}")
             continue
     
+    vector_db.flush()
+    
     # 4. 처리 결과 출력
     logger.info(f"\n{'='*50}")
     logger.info(f"처리 완료!")
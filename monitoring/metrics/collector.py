@@ -102,6 +102,22 @@ class MetricsCollector:
         
         self.prometheus.record_cache_operation('get', namespace, 'miss')
     
+    def record_cache_lookups(self, namespace: str, hits: int, misses: int):
+        """배치 캐시 조회 결과 기록 (히트/미스 수를 한 번에 반영)"""
+        with self._metrics_lock:
+            self._performance_counters['cache_hits'] += hits
+            self._performance_counters['cache_misses'] += misses
+        
+        if hits:
+            self.prometheus.record_cache_operation('get', namespace, 'hit', hits)
+        if misses:
+            self.prometheus.record_cache_operation('get', namespace, 'miss', misses)
+    
+    def update_namespace_cache_statistics(self, namespace: str, hit_ratio: float, key_count: int):
+        """단일 네임스페이스 캐시의 히트율/키 개수 갱신"""
+        self.prometheus.cache_hit_ratio.labels(namespace=namespace).set(hit_ratio)
+        self.prometheus.cache_keys_count.labels(namespace=namespace).set(key_count)
+    
     def record_cache_set(self, namespace: str, success: bool = True):
         """캐시 저장 기록"""
         result = 'success' if success else 'failed'
@@ -158,6 +174,15 @@ class MetricsCollector:
         status = 'success' if success else 'failed'
         self.prometheus.record_document_processing(operation, duration, status)
     
+    def record_startup(self, system: str, phases: Dict[str, float]):
+        """초기화 단계별 소요 시간 기록"""
+        for phase, duration in phases.items():
+            self.prometheus.record_startup_phase(system, phase, duration)
+    
+    def record_time_to_first_query(self, system: str, seconds: float, snapshot: bool = False):
+        """초기화 시작부터 첫 질문 응답까지의 시간 기록"""
+        self.prometheus.set_time_to_first_query(system, 'yes' if snapshot else 'no', seconds)
+    
     def update_document_count(self, count: int):
         """문서 수 업데이트"""
         self.prometheus.set_document_count(count)
@@ -151,6 +151,21 @@ class PrometheusMetrics:
             registry=self.registry
         )
         
+        # === 시작 메트릭 ===
+        self.startup_phase_duration = Gauge(
+            'rag_startup_phase_duration_seconds',
+            'Duration of each initialization phase in seconds',
+            ['system', 'phase'],
+            registry=self.registry
+        )
+        
+        self.time_to_first_query = Gauge(
+            'rag_time_to_first_query_seconds',
+            'Seconds from the start of initialization to the first answered query',
+            ['system', 'snapshot'],
+            registry=self.registry
+        )
+        
         # === 사용자 메트릭 ===
         self.active_users = Gauge(
             'rag_active_users',
@@ -312,13 +327,13 @@ class PrometheusMetrics:
         self.rag_query_duration.labels(search_method=search_method).observe(duration)
         self.rag_confidence_score.labels(search_method=search_method).observe(confidence)
     
-    def record_cache_operation(self, operation: str, namespace: str, result: str):
+    def record_cache_operation(self, operation: str, namespace: str, result: str, count: int = 1):
         """캐시 작업 메트릭 기록"""
         self.cache_operations_total.labels(
             operation=operation,
             namespace=namespace,
             result=result
-        ).inc()
+        ).inc(count)
     
     def update_cache_metrics(self, hit_ratios: Dict[str, float], key_counts: Dict[str, int], memory_usage: int):
         """캐시 메트릭 업데이트"""
@@ -347,6 +362,14 @@ class PrometheusMetrics:
         self.documents_processed_total.labels(operation=operation, status=status).inc()
         self.document_processing_duration.labels(operation=operation).observe(duration)
     
+    def record_startup_phase(self, system: str, phase: str, duration: float):
+        """초기화 단계별 소요 시간 기록"""
+        self.startup_phase_duration.labels(system=system, phase=phase).set(duration)
+    
+    def set_time_to_first_query(self, system: str, snapshot: str, seconds: float):
+        """초기화 시작부터 첫 질문 응답까지의 시간 기록"""
+        self.time_to_first_query.labels(system=system, snapshot=snapshot).set(seconds)
+    
     def set_active_users(self, count: int):
         """활성 사용자 수 설정"""
         self.active_users.set(count)
@@ -6,8 +6,10 @@
 
 import logging
 import os
+import time
 import yaml
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Iterator, Tuple
 from pathlib import Path
 
 # 각 모듈 임포트
@@ -16,10 +18,15 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # 각 모듈 임포트
 from embeddings.document_processor import DocumentProcessor
+from embeddings.model_registry import prewarm_configured_model
 from embeddings.text_embedder import PowerMarketEmbedder
-from vector_db.vector_store import VectorDatabase
+from data.vectors.factory import create_vector_database, deferred_flush, vector_db_options
+from data.vectors.chunk_store import ChunkStore
+from data.vectors.vector_utils import as_embedding_matrix
+from core.serving_snapshot import StartupProfile, open_configured_snapshot
 from retrieval.document_retriever import PowerMarketRetriever
 from generation.answer_generator import PowerMarketAnswerGenerator
+from generation.answer_cache import AnswerCache
 
 class PowerMarketRAG:
     """전력시장 특화 RAG 시스템 메인 클래스"""
@@ -41,8 +48,12 @@ class PowerMarketRAG:
         self.document_processor = None
         self.text_embedder = None
         self.vector_db = None
+        self.chunk_store = None
         self.retriever = None
         self.answer_generator = None
+        self.answer_cache = None
+        self.serving_snapshot = None
+        self.startup_profile = StartupProfile("power_market_rag")
         
         self.logger.info("PowerMarketRAG 시스템이 생성되었습니다")
     
@@ -55,11 +66,24 @@ class PowerMarketRAG:
             "VECTOR_DB_TYPE": "chromadb",
             "VECTOR_DB_PATH": "./vector_db",
             "COLLECTION_NAME": "power_market_docs",
+            "CHUNK_STORE_PATH": "./data/chunks",
+            "SERVING_SNAPSHOT_PATH": None,
             "EMBEDDING_MODEL": "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+            "EMBEDDING_DEVICE": None,
+            "EMBEDDING_BACKEND": "torch",
+            "EMBEDDING_ONNX_PATH": "./models/onnx",
             "CHUNK_SIZE": 1000,
             "CHUNK_OVERLAP": 200,
             "TOP_K": 5,
             "SIMILARITY_THRESHOLD": 0.7,
+            "HYBRID_SEARCH_MODE": "fused",
+            "HYBRID_RRF_K": 60,
+            "HYBRID_OVERFETCH": 4,
+            "ASK_MANY_WORKERS": None,
+            "ANSWER_CACHE_ENABLED": True,
+            "ANSWER_CACHE_TTL": 3600,
+            "ANSWER_CACHE_MAX_ENTRIES": 1000,
+            "ANSWER_CACHE_MAX_DISTANCE": 0.05,
             "API_HOST": "0.0.0.0",
             "API_PORT": 8000,
             "LOG_LEVEL": "INFO"
@@ -82,6 +106,7 @@ class PowerMarketRAG:
         """모든 구성 요소 초기화"""
         try:
             self.logger.info("RAG 시스템 초기화 시작")
+            self.startup_profile = StartupProfile("power_market_rag")
             
             # 1. 문서 처리기 초기화
             self.logger.info("문서 처리기 초기화 중...")
@@ -89,19 +114,33 @@ class PowerMarketRAG:
                 chunk_size=self.config["CHUNK_SIZE"],
                 chunk_overlap=self.config["CHUNK_OVERLAP"]
             )
+            self.startup_profile.mark("document_processor")
             
             # 2. 텍스트 임베딩 모델 초기화
             self.logger.info("임베딩 모델 초기화 중...")
             self.text_embedder = PowerMarketEmbedder(
-                model_name=self.config["EMBEDDING_MODEL"]
+                model_name=self.config["EMBEDDING_MODEL"],
+                device=self.config["EMBEDDING_DEVICE"],
+                backend=self.config["EMBEDDING_BACKEND"],
+                onnx_path=self.config["EMBEDDING_ONNX_PATH"]
             )
+            self.startup_profile.mark("embedding_model")
             
-            # 3. 벡터 데이터베이스 초기화
+            # 3. 벡터 데이터베이스 초기화 (서빙 스냅샷이 있으면 읽기 전용 메모리 매핑)
             self.logger.info("벡터 데이터베이스 초기화 중...")
-            self.vector_db = VectorDatabase(
-                db_path=self.config["VECTOR_DB_PATH"],
-                collection_name=self.config["COLLECTION_NAME"]
-            )
+            self.serving_snapshot = open_configured_snapshot(self.config)
+            if self.serving_snapshot is not None:
+                self.vector_db = self.serving_snapshot.open_vector_database(**vector_db_options(self.config))
+            else:
+                self.vector_db = create_vector_database(
+                    self.config["VECTOR_DB_TYPE"],
+                    db_path=self.config["VECTOR_DB_PATH"],
+                    collection_name=self.config["COLLECTION_NAME"],
+                    **vector_db_options(self.config)
+                )
+            if self.config["CHUNK_STORE_PATH"]:
+                self.chunk_store = ChunkStore(self.config["CHUNK_STORE_PATH"])
+            self.startup_profile.mark("vector_db")
             
             # 4. 검색 엔진 초기화
             self.logger.info("검색 엔진 초기화 중...")
@@ -109,14 +148,29 @@ class PowerMarketRAG:
                 vector_db=self.vector_db,
                 text_embedder=self.text_embedder,
                 top_k=self.config["TOP_K"],
-                similarity_threshold=self.config["SIMILARITY_THRESHOLD"]
+                similarity_threshold=self.config["SIMILARITY_THRESHOLD"],
+                hybrid_mode=self.config["HYBRID_SEARCH_MODE"],
+                rrf_k=self.config["HYBRID_RRF_K"],
+                overfetch=self.config["HYBRID_OVERFETCH"]
             )
+            self.startup_profile.mark("retriever")
             
             # 5. 답변 생성기 초기화
             self.logger.info("답변 생성기 초기화 중...")
             self.answer_generator = PowerMarketAnswerGenerator()
             
+            # 6. 답변 캐시 초기화
+            if self.config["ANSWER_CACHE_ENABLED"]:
+                self.answer_cache = AnswerCache(
+                    ttl_seconds=self.config["ANSWER_CACHE_TTL"],
+                    max_entries=self.config["ANSWER_CACHE_MAX_ENTRIES"],
+                    max_distance=self.config["ANSWER_CACHE_MAX_DISTANCE"]
+                )
+            
+            self.startup_profile.mark("answer_generator")
+            
             self.is_initialized = True
+            self.startup_profile.finish(self.serving_snapshot.name if self.serving_snapshot else None)
             self.logger.info("RAG 시스템 초기화 완료")
             return True
             
@@ -142,11 +196,20 @@ class PowerMarketRAG:
             
             # 2. 임베딩 생성
             self.logger.info("문서 임베딩 생성 중...")
-            embedded_chunks = self.text_embedder.encode_documents(chunks)
+            embedded_chunks = self.text_embedder.encode_documents(chunks, copy=False)
+            embeddings = as_embedding_matrix([chunk['embedding'] for chunk in embedded_chunks])
+            
+            # 3. 청크 저장소에 기록 (벡터 DB를 재인코딩 없이 다시 만들 수 있는 원본)
+            if self.chunk_store is not None:
+                try:
+                    self.chunk_store.write_documents(self.config["COLLECTION_NAME"], embedded_chunks, embeddings)
+                except Exception as e:
+                    self.logger.error(f"청크 저장소 기록 실패: {e}")
             
-            # 3. 벡터 데이터베이스에 저장
+            # 4. 벡터 데이터베이스에 저장 (바깥 deferred_flush 블록 안이면 블록 끝에 한 번 저장)
             self.logger.info("벡터 데이터베이스에 저장 중...")
-            success = self.vector_db.add_documents(embedded_chunks)
+            with deferred_flush(self.vector_db):
+                success = self.vector_db.add_documents(embedded_chunks, embeddings=embeddings)
             
             if success:
                 stats = self.vector_db.get_collection_stats()
@@ -159,17 +222,61 @@ class PowerMarketRAG:
             self.logger.error(f"문서 로딩 실패: {e}")
             return False
     
+    def rebuild_vector_database(self) -> int:
+        """
+        청크 저장소에서 벡터 데이터베이스 재구축 (문서 처리/임베딩 재실행 없음)
+        
+        VECTOR_DB_TYPE이나 ANN 설정을 바꾼 뒤 컬렉션을 다시 만들 때 사용
+        
+        Returns:
+            적재한 청크 수
+        """
+        if not self.is_initialized or self.chunk_store is None:
+            self.logger.error("시스템이 초기화되지 않았거나 청크 저장소를 사용하지 않습니다")
+            return 0
+        if self.serving_snapshot is not None:
+            self.logger.error("서빙 스냅샷은 읽기 전용입니다 (scripts/build_serving_snapshot.py로 새 스냅샷을 게시하세요)")
+            return 0
+        
+        started = time.perf_counter()
+        self.vector_db.clear_collection()
+        added = self.chunk_store.rebuild(self.config["COLLECTION_NAME"], self.vector_db)
+        self.logger.info(f"벡터 데이터베이스 재구축 완료: {added}개 청크, {time.perf_counter() - started:.1f}초")
+        return added
+    
     def ask(self, question: str, search_method: str = "hybrid") -> Dict:
-        """질문에 대한 답변 생성"""
+        """질문에 대한 답변 생성 (답변 캐시 우선)"""
+        if not self.is_initialized:
+            return {
+                "answer": "시스템이 초기화되지 않았습니다.",
+                "confidence": 0.0,
+                "sources": [],
+                "error": "System not initialized"
+            }
+        
+        result = self._cached_answer(question, search_method)
+        self.startup_profile.record_query()
+        return result
+    
+    def _cached_answer(self, question: str, search_method: str) -> Dict:
+        if self.answer_cache is None:
+            return self._answer(question, search_method)
+        
+        try:
+            return self.answer_cache.get_or_compute(
+                question,
+                AnswerCache.make_filter_key(search_method=search_method),
+                compute=lambda: self._answer(question, search_method),
+                embed=self.text_embedder.encode_text,
+                version=self.vector_db.get_version()
+            )
+        except Exception as e:
+            self.logger.warning(f"답변 캐시 사용 실패, 캐시 없이 처리: {e}")
+            return self._answer(question, search_method)
+    
+    def _answer(self, question: str, search_method: str) -> Dict:
+        """검색 + 답변 생성"""
         try:
-            if not self.is_initialized:
-                return {
-                    "answer": "시스템이 초기화되지 않았습니다.",
-                    "confidence": 0.0,
-                    "sources": [],
-                    "error": "System not initialized"
-                }
-            
             self.logger.info(f"질문 처리 시작: {question}")
             
             # 1. 관련 문서 검색
@@ -184,6 +291,20 @@ class PowerMarketRAG:
             else:
                 search_results = self.retriever.hybrid_search(question)
             
+            return self._generate(question, search_results, search_method)
+            
+        except Exception as e:
+            self.logger.error(f"질문 처리 실패: {e}")
+            return {
+                "answer": "답변 생성 중 오류가 발생했습니다.",
+                "confidence": 0.0,
+                "sources": [],
+                "error": str(e)
+            }
+    
+    def _generate(self, question: str, search_results: List, search_method: str) -> Dict:
+        """검색 결과로 컨텍스트를 만들고 답변 생성"""
+        try:
             if not search_results:
                 return {
                     "answer": "관련 문서를 찾을 수 없습니다.",
@@ -218,7 +339,7 @@ class PowerMarketRAG:
             return result
             
         except Exception as e:
-            self.logger.error(f"질문 처리 실패: {e}")
+            self.logger.error(f"답변 생성 실패: {e}")
             return {
                 "answer": "답변 생성 중 오류가 발생했습니다.",
                 "confidence": 0.0,
@@ -226,6 +347,149 @@ class PowerMarketRAG:
                 "error": str(e)
             }
     
+    def ask_many(self,
+                 questions: List[str],
+                 search_method: str = "hybrid",
+                 ordered: bool = True,
+                 max_workers: Optional[int] = None,
+                 timings: Optional[Dict[str, float]] = None) -> Iterator[Tuple[int, Dict]]:
+        """
+        여러 질문 일괄 처리 (완료되는 대로 결과를 스트리밍)
+        
+        1. 답변 캐시 정확 일치 확인
+        2. 남은 질문을 encode_queries 한 번으로 임베딩 (유사 질문 캐시 확인에도 사용)
+        3. 다중 질의 벡터 검색 1회 (retriever.search_many)
+        4. 답변 생성은 워커 풀에서 병렬 실행
+        
+        Args:
+            questions: 질문 리스트
+            search_method: 검색 방법 (semantic, keyword, hybrid, smart)
+            ordered: True면 입력 순서대로, False면 완료 순서대로 결과 반환
+            max_workers: 답변 생성 워커 수 (기본: 설정 ASK_MANY_WORKERS)
+            timings: 지정 시 단계별 소요 시간(초)을 기록
+                     ('cache', 'embed', 'vector_search', 'rerank', 'generate', 'generate_wall', 'total')
+        
+        Yields:
+            (질문 번호, ask()와 같은 형식의 결과)
+        """
+        if timings is None:
+            timings = {}
+        total_start = time.perf_counter()
+        
+        if not self.is_initialized:
+            for index in range(len(questions)):
+                yield index, {
+                    "answer": "시스템이 초기화되지 않았습니다.",
+                    "confidence": 0.0,
+                    "sources": [],
+                    "error": "System not initialized"
+                }
+            return
+        
+        ready: Dict[int, Dict] = {}
+        next_index = 0
+        
+        def _drain():
+            """내보낼 수 있는 결과 반환 (순서 유지 모드는 앞 번호가 모두 준비될 때까지 대기)"""
+            nonlocal next_index
+            if not ordered:
+                items = sorted(ready.items())
+                ready.clear()
+            else:
+                items = []
+                while next_index in ready:
+                    items.append((next_index, ready.pop(next_index)))
+                    next_index += 1
+            if items:
+                self.startup_profile.record_query()
+            return items
+        
+        # 1. 답변 캐시 정확 일치
+        cache = self.answer_cache
+        filter_key = AnswerCache.make_filter_key(search_method=search_method)
+        pending = list(range(len(questions)))
+        start = time.perf_counter()
+        if cache is not None:
+            cache.check_version(self.vector_db.get_version())
+            remaining = []
+            for index in pending:
+                cached = cache.get_exact(questions[index], filter_key)
+                if cached is None:
+                    remaining.append(index)
+                else:
+                    ready[index] = cached
+            pending = remaining
+        timings["cache"] = time.perf_counter() - start
+        yield from _drain()
+        
+        # 2. 질문 임베딩 1회 + 유사 질문 캐시
+        query_embeddings = None
+        batched_search = search_method == "semantic" or (
+            search_method == "hybrid" and self.retriever.hybrid_mode == "fused"
+        )
+        if pending and (batched_search or (cache is not None and cache.semantic_enabled)):
+            start = time.perf_counter()
+            query_embeddings = self.text_embedder.encode_queries([questions[i] for i in pending])
+            timings["embed"] = timings.get("embed", 0.0) + time.perf_counter() - start
+            
+            if cache is not None and cache.semantic_enabled:
+                start = time.perf_counter()
+                keep = []
+                for row, index in enumerate(pending):
+                    cached = cache.get_similar(query_embeddings[row], filter_key)
+                    if cached is None:
+                        keep.append(row)
+                    else:
+                        ready[index] = cached
+                pending = [pending[row] for row in keep]
+                query_embeddings = query_embeddings[keep]
+                timings["cache"] += time.perf_counter() - start
+                yield from _drain()
+        
+        # 3. 일괄 검색
+        search_batch = []
+        if pending:
+            search_batch = self.retriever.search_many(
+                [questions[i] for i in pending],
+                method=search_method,
+                query_embeddings=query_embeddings,
+                timings=timings
+            )
+        
+        # 4. 답변 생성 (워커 풀)
+        workers = max_workers or self.config["ASK_MANY_WORKERS"] or min(8, os.cpu_count() or 1)
+        generate_seconds = 0.0
+        start = time.perf_counter()
+        
+        def _run(row: int) -> Tuple[int, Dict, float]:
+            index = pending[row]
+            run_start = time.perf_counter()
+            result = self._generate(questions[index], search_batch[row], search_method)
+            return row, result, time.perf_counter() - run_start
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ask-many") as executor:
+                futures = [executor.submit(_run, row) for row in range(len(pending))]
+                for future in as_completed(futures):
+                    row, result, seconds = future.result()
+                    generate_seconds += seconds
+                    index = pending[row]
+                    if cache is not None and "error" not in result:
+                        embedding = query_embeddings[row] if query_embeddings is not None else None
+                        cache.put(questions[index], filter_key, result, embedding)
+                    ready[index] = result
+                    yield from _drain()
+        
+        timings["generate"] = generate_seconds
+        timings["generate_wall"] = time.perf_counter() - start
+        timings["total"] = time.perf_counter() - total_start
+        yield from _drain()
+        
+        self.logger.info(
+            f"일괄 질문 처리 완료: {len(questions)}개 질문, "
+            + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in timings.items())
+        )
+    
     def get_system_status(self) -> Dict:
         """시스템 상태 조회"""
         try:
@@ -238,6 +502,13 @@ class PowerMarketRAG:
                 stats = self.vector_db.get_collection_stats()
                 status.update(stats)
             
+            if self.answer_cache is not None:
+                status["answer_cache"] = self.answer_cache.get_stats()
+            
+            status["startup"] = self.startup_profile.to_dict()
+            if self.serving_snapshot is not None:
+                status["serving_snapshot"] = self.serving_snapshot.get_stats()
+            
             return status
             
         except Exception as e:
@@ -278,10 +549,20 @@ class PowerMarketRAG:
             self.logger.error(f"문서 검색 실패: {e}")
             return []
     
+    def close(self):
+        """공유 임베딩 모델 반환 (다른 구성 요소가 사용하지 않으면 레지스트리가 해제)"""
+        if self.text_embedder is not None:
+            self.text_embedder.close()
+            self.text_embedder = None
+        self.retriever = None
+        self.is_initialized = False
+    
     def clear_database(self) -> bool:
         """벡터 데이터베이스 초기화"""
         try:
             if self.vector_db:
+                if self.answer_cache is not None:
+                    self.answer_cache.invalidate()
                 return self.vector_db.clear_collection()
             return False
         except Exception as e:
@@ -310,8 +591,9 @@ def main():
     # 로깅 설정
     setup_logging("INFO", "logs/rag_system.log")
     
-    # RAG 시스템 생성
+    # RAG 시스템 생성 (임베딩 모델은 서버 시작 시 미리 로드)
     rag_system = PowerMarketRAG()
+    prewarm_configured_model(rag_system.config)
     
     print("=== 전력시장 RAG 시스템 ===")
     print("1. 시스템 초기화 중...")
@@ -348,7 +630,8 @@ def main():
             result = rag_system.ask(question)
             print(f"답변: {result['answer'][:200]}...")
             print(f"신뢰도: {result['confidence']:.3f}")
-            
+        
+        rag_system.close()
     else:
         print("❌ 시스템 초기화 실패")
 
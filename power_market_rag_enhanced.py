@@ -18,11 +18,15 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Enhanced 모듈들
 from core.enhanced_vector_engine import EnhancedVectorEngine
-from core.multimodal_processor import MultimodalProcessor
+from core.multimodal_processor import MultimodalProcessor, multimodal_options
 from core.document_hierarchy_analyzer import DocumentHierarchyAnalyzer
 from core.relationship_mapper import PowerMarketRelationshipMapper
-from embeddings.text_embedder import PowerMarketEmbedder
 from generation.answer_generator import PowerMarketAnswerGenerator
+from generation.answer_cache import AnswerCache
+from core.actual_formula_extractor import ActualFormulaExtractor
+from core.serving_snapshot import StartupProfile, open_configured_snapshot
+from data.vectors.factory import vector_db_options
+from embeddings.model_registry import prewarm_configured_model
 
 
 class EnhancedPowerMarketRAG:
@@ -54,6 +58,10 @@ class EnhancedPowerMarketRAG:
         self.relationship_mapper = None
         self.embedder = None
         self.answer_generator = None
+        self.answer_cache = None
+        self.formula_extractor = None
+        self.serving_snapshot = None
+        self.startup_profile = StartupProfile("power_market_rag_enhanced")
         
         self.logger.info("Enhanced PowerMarketRAG 시스템이 생성되었습니다")
     
@@ -68,10 +76,23 @@ class EnhancedPowerMarketRAG:
             "COLLECTION_NAME": "power_market_docs_enhanced",
             "EMBEDDING_MODEL": "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
             "EMBEDDING_DIMENSION": 768,
+            "EMBEDDING_DEVICE": None,
+            "EMBEDDING_BACKEND": "torch",
+            "EMBEDDING_ONNX_PATH": "./models/onnx",
             "CHUNK_SIZE": 1000,
             "CHUNK_OVERLAP": 200,
+            "CHUNK_FEATURES_MODE": "document",
+            "MULTIMODAL_PAGE_GATING": True,
+            "MULTIMODAL_TIME_BUDGET": None,
+            "MULTIMODAL_INCLUDE_IMAGE_DATA": False,
             "TOP_K": 5,
             "SIMILARITY_THRESHOLD": 0.7,
+            "RELATIONSHIP_GRAPH_PATH": "data/relationships/graph",
+            "SERVING_SNAPSHOT_PATH": None,
+            "ANSWER_CACHE_ENABLED": True,
+            "ANSWER_CACHE_TTL": 3600,
+            "ANSWER_CACHE_MAX_ENTRIES": 1000,
+            "ANSWER_CACHE_MAX_DISTANCE": 0.05,
             "API_HOST": "0.0.0.0",
             "API_PORT": 8000,
             "LOG_LEVEL": "INFO"
@@ -94,34 +115,57 @@ class EnhancedPowerMarketRAG:
         """모든 구성 요소 초기화"""
         try:
             self.logger.info("Enhanced RAG 시스템 초기화 시작")
+            self.startup_profile = StartupProfile("power_market_rag_enhanced")
+            self.serving_snapshot = open_configured_snapshot(self.config)
             
             # 1. Multimodal Processor
             self.logger.info("Multimodal Processor 초기화 중...")
-            self.multimodal_processor = MultimodalProcessor()
+            self.multimodal_processor = MultimodalProcessor(**multimodal_options(self.config))
+            self.startup_profile.mark("multimodal_processor")
             
-            # 2. Enhanced Vector Engine
+            # 2. Enhanced Vector Engine (서빙 스냅샷이 있으면 읽기 전용 메모리 매핑 컬렉션 사용)
             self.logger.info("Enhanced Vector Engine 초기화 중...")
-            self.enhanced_vector_engine = EnhancedVectorEngine(self.config)
+            snapshot_db = None
+            if self.serving_snapshot is not None:
+                snapshot_db = self.serving_snapshot.open_vector_database(**vector_db_options(self.config))
+            self.enhanced_vector_engine = EnhancedVectorEngine(self.config, vector_db=snapshot_db)
+            self.startup_profile.mark("vector_engine")
             
             # 3. Document Hierarchy Analyzer
             self.logger.info("Document Hierarchy Analyzer 초기화 중...")
             self.hierarchy_analyzer = DocumentHierarchyAnalyzer()
             
-            # 4. Power Market Embedder
+            # 4. Power Market Embedder (벡터 엔진과 같은 모델/캐시 공유)
             self.logger.info("임베딩 모델 초기화 중...")
-            self.embedder = PowerMarketEmbedder(
-                model_name=self.config["EMBEDDING_MODEL"]
-            )
+            self.embedder = self.enhanced_vector_engine.embedder
+            self.startup_profile.mark("embedding_model")
             
-            # 5. Relationship Mapper
+            # 5. Relationship Mapper (정산 공식 레지스트리는 상태 조회 시 처음 로드)
             self.logger.info("Relationship Mapper 초기화 중...")
             self.relationship_mapper = PowerMarketRelationshipMapper(self.embedder)
+            if self.serving_snapshot is not None:
+                if self.serving_snapshot.graph_path:
+                    self.relationship_mapper.load_graph(self.serving_snapshot.graph_path)
+            else:
+                self.relationship_mapper.load_graph(self.config["RELATIONSHIP_GRAPH_PATH"])
+            self.startup_profile.mark("relationships")
             
             # 6. Answer Generator
             self.logger.info("Answer Generator 초기화 중...")
             self.answer_generator = PowerMarketAnswerGenerator()
             
+            # 7. Answer Cache
+            if self.config["ANSWER_CACHE_ENABLED"]:
+                self.answer_cache = AnswerCache(
+                    ttl_seconds=self.config["ANSWER_CACHE_TTL"],
+                    max_entries=self.config["ANSWER_CACHE_MAX_ENTRIES"],
+                    max_distance=self.config["ANSWER_CACHE_MAX_DISTANCE"],
+                    namespace="answer_enhanced"
+                )
+            self.startup_profile.mark("answer_generator")
+            
             self.is_initialized = True
+            self.startup_profile.finish(self.serving_snapshot.name if self.serving_snapshot else None)
             self.logger.info("Enhanced RAG 시스템 초기화 완료")
             return True
             
@@ -146,17 +190,61 @@ class EnhancedPowerMarketRAG:
             include_relationships: 관련 문서 연관성 포함 여부
             
         Returns:
-            Enhanced 답변 결과
+            Enhanced 답변 결과 (캐시에서 가져온 경우 "cache" 항목 포함)
         """
+        if not self.is_initialized:
+            return {
+                "answer": "시스템이 초기화되지 않았습니다.",
+                "confidence": 0.0,
+                "sources": [],
+                "error": "System not initialized"
+            }
+        
+        def _compute():
+            return self._answer_enhanced(question, search_method, domain_filter,
+                                         importance_filter, include_relationships)
+        
+        result = self._cached_answer(question, search_method, domain_filter,
+                                     importance_filter, include_relationships, _compute)
+        self.startup_profile.record_query()
+        return result
+    
+    def _cached_answer(self,
+                       question: str,
+                       search_method: str,
+                       domain_filter: Optional[str],
+                       importance_filter: Optional[str],
+                       include_relationships: bool,
+                       _compute) -> Dict[str, Any]:
+        if self.answer_cache is None:
+            return _compute()
+        
+        try:
+            filter_key = AnswerCache.make_filter_key(
+                search_method=search_method,
+                domain=domain_filter,
+                importance=importance_filter,
+                relationships=include_relationships
+            )
+            return self.answer_cache.get_or_compute(
+                question,
+                filter_key,
+                compute=_compute,
+                embed=self.enhanced_vector_engine.embedder.encode_text,
+                version=self.enhanced_vector_engine.vector_db.get_version()
+            )
+        except Exception as e:
+            self.logger.warning(f"답변 캐시 사용 실패, 캐시 없이 처리: {e}")
+            return _compute()
+    
+    def _answer_enhanced(self,
+                         question: str,
+                         search_method: str,
+                         domain_filter: Optional[str],
+                         importance_filter: Optional[str],
+                         include_relationships: bool) -> Dict[str, Any]:
+        """메타데이터 필터 검색 + 연관 문서 + 답변 생성"""
         try:
-            if not self.is_initialized:
-                return {
-                    "answer": "시스템이 초기화되지 않았습니다.",
-                    "confidence": 0.0,
-                    "sources": [],
-                    "error": "System not initialized"
-                }
-            
             self.logger.info(f"Enhanced 질문 처리 시작: {question}")
             
             # 1. 메타데이터 필터를 활용한 정밀 검색
@@ -421,13 +509,46 @@ class EnhancedPowerMarketRAG:
                 if self.hierarchy_analyzer:
                     hierarchy_stats = self.hierarchy_analyzer.get_analysis_statistics()
                     status["hierarchy_analyzer"] = hierarchy_stats
-            
+                
+                # 답변 캐시 통계
+                if self.answer_cache:
+                    status["answer_cache"] = self.answer_cache.get_stats()
+                
+                # 정산 공식 / 서빙 스냅샷
+                formula_extractor = self._get_formula_extractor()
+                if formula_extractor:
+                    status["formulas"] = len(formula_extractor.formulas)
+                if self.serving_snapshot:
+                    status["serving_snapshot"] = self.serving_snapshot.get_stats()
+            
+            status["startup"] = self.startup_profile.to_dict()
             return status
             
         except Exception as e:
             self.logger.error(f"Enhanced 시스템 상태 조회 실패: {e}")
             return {"error": str(e)}
     
+    def close(self):
+        """공유 임베딩 모델 반환 (Relationship Mapper도 같은 임베더를 쓰므로 함께 해제)"""
+        if self.enhanced_vector_engine is not None:
+            self.enhanced_vector_engine.close()
+        if self.relationship_mapper is not None:
+            self.relationship_mapper.embedder = None
+        self.embedder = None
+        self.is_initialized = False
+    
+    def _get_formula_extractor(self) -> Optional[ActualFormulaExtractor]:
+        """정산 공식 레지스트리 지연 로딩 (스냅샷이 있으면 스냅샷 레지스트리, 없으면 공식 추출)"""
+        if self.formula_extractor is None:
+            try:
+                if self.serving_snapshot is not None:
+                    self.formula_extractor = self.serving_snapshot.formula_extractor()
+                else:
+                    self.formula_extractor = ActualFormulaExtractor()
+            except Exception as e:
+                self.logger.warning(f"정산 공식 레지스트리 로드 실패: {e}")
+        return self.formula_extractor
+    
     def analyze_query_complexity(self, question: str) -> Dict[str, Any]:
         """질문 복잡도 분석"""
         try:
@@ -490,8 +611,9 @@ def main():
     # 로깅 설정
     setup_logging("INFO", "logs/enhanced_rag_system.log")
     
-    # Enhanced RAG 시스템 생성
+    # Enhanced RAG 시스템 생성 (임베딩 모델은 서버 시작 시 미리 로드)
     enhanced_rag = EnhancedPowerMarketRAG()
+    prewarm_configured_model(enhanced_rag.config)
     
     print("=== Enhanced 전력시장 RAG 시스템 ===")
     print("1. 시스템 초기화 중...")
@@ -537,7 +659,8 @@ def main():
             print(f"검색 결과: {result['search_results']}개")
             if result.get('related_documents', 0) > 0:
                 print(f"관련 문서: {result['related_documents']}개")
-            
+        
+        enhanced_rag.close()
     else:
         print("❌ Enhanced 시스템 초기화 실패")
 
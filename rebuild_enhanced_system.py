@@ -21,10 +21,10 @@ from core.enhanced_vector_engine import EnhancedVectorEngine
 from core.multimodal_processor import MultimodalProcessor
 from core.document_hierarchy_analyzer import DocumentHierarchyAnalyzer
 from core.relationship_mapper import PowerMarketRelationshipMapper
-from embeddings.text_embedder import PowerMarketEmbedder
+from core.ingestion_pipeline import IngestionPipeline
 
 # 기존 모듈들
-from data.vectors.vector_store import VectorDatabase
+from data.vectors.factory import create_vector_database, vector_db_options
 
 logger = logging.getLogger(__name__)
 
@@ -217,8 +217,7 @@ class EnhancedSystemRebuilder:
             self.hierarchy_analyzer = DocumentHierarchyAnalyzer()
             
             # 4. Relationship Mapper
-            embedder = PowerMarketEmbedder(self.config.get("EMBEDDING_MODEL"))
-            self.relationship_mapper = PowerMarketRelationshipMapper(embedder)
+            self.relationship_mapper = PowerMarketRelationshipMapper(self.enhanced_engine.embedder)
             
             logger.info("모든 구성 요소 초기화 완료")
             return True
@@ -228,43 +227,58 @@ class EnhancedSystemRebuilder:
             return False
     
     def _process_all_documents(self, documents_dir: str) -> List[Dict[str, Any]]:
-        """모든 문서 처리"""
+        """
+        모든 문서 처리
+        
+        추출/계층 분석/청크 메타데이터 강화는 프로세스 풀에서 병렬로 수행하고,
+        임베딩은 단일 단계에서 여러 문서의 청크를 모아 일괄 처리
+        """
         logger.info("문서 처리 시작")
         
-        processed_docs = []
         doc_files = list(Path(documents_dir).rglob("*.pdf")) + list(Path(documents_dir).rglob("*.txt"))
         
-        for i, doc_file in enumerate(doc_files, 1):
-            try:
-                logger.info(f"문서 처리 중 ({i}/{len(doc_files)}): {doc_file.name}")
-                
-                # 1. Multimodal 처리
-                processed_doc = self.multimodal_processor.process_document(str(doc_file))
-                
-                if not processed_doc:
-                    logger.warning(f"문서 처리 실패: {doc_file}")
-                    continue
-                
-                # 2. 계층 구조 분석
-                hierarchy_analysis = self.hierarchy_analyzer.analyze_document_structure(processed_doc)
-                processed_doc["hierarchy_analysis"] = hierarchy_analysis
-                
-                # 3. Enhanced Vector Engine으로 메타데이터 강화 및 청킹
-                enhanced_chunks = self.enhanced_engine.process_document_with_metadata(processed_doc)
-                
-                # 처리된 청크들을 문서와 함께 저장
-                processed_doc["enhanced_chunks"] = enhanced_chunks
-                processed_docs.append(processed_doc)
+        def embed_documents(docs: List[Dict[str, Any]]):
+            """여러 문서의 청크를 한 번에 임베딩하여 문서별로 되돌려 놓음"""
+            all_chunks = []
+            for doc in docs:
+                all_chunks.extend(doc.get("enhanced_chunks", []))
+            
+            embedded_chunks = self.enhanced_engine.embedder.encode_documents(all_chunks, copy=False)
+            
+            offset = 0
+            for doc in docs:
+                count = len(doc.get("enhanced_chunks", []))
+                doc["enhanced_chunks"] = embedded_chunks[offset:offset + count]
+                offset += count
                 
                 self.rebuild_stats["documents_processed"] += 1
-                self.rebuild_stats["chunks_created"] += len(enhanced_chunks)
-                
-            except Exception as e:
-                error_msg = f"문서 처리 오류 ({doc_file}): {e}"
-                logger.error(error_msg)
-                self.rebuild_stats["errors"].append(error_msg)
-                continue
+                self.rebuild_stats["chunks_created"] += count
+        
+        def report_progress(file_path: str, success: bool, seconds: float):
+            if success:
+                logger.info(f"문서 분석 완료 ({seconds:.2f}초): {Path(file_path).name}")
+            else:
+                logger.warning(f"문서 처리 실패: {file_path}")
         
+        pipeline = IngestionPipeline(
+            workers=self.config.get("INGEST_WORKERS"),
+            enhanced_config=self.config
+        )
+        pipeline_result = pipeline.run(doc_files, embed_fn=embed_documents, progress_fn=report_progress)
+        
+        for failed in pipeline_result.failed:
+            error_msg = f"문서 처리 오류 ({failed.get('file', '')}): {failed.get('error', '')}"
+            logger.error(error_msg)
+            self.rebuild_stats["errors"].append(error_msg)
+        
+        self.rebuild_stats["stage_metrics"] = pipeline_result.stage_metrics
+        for stage_name, stage in pipeline_result.stage_metrics.items():
+            logger.info(
+                f"단계 처리량 [{stage_name}]: {stage['items_per_sec']:.2f} docs/s, "
+                f"누적 {stage['busy_seconds']:.2f}초, 활용도 {stage['utilization']:.2f}"
+            )
+        
+        processed_docs = pipeline_result.documents
         logger.info(f"문서 처리 완료: {len(processed_docs)}개 문서, {self.rebuild_stats['chunks_created']}개 청크")
         return processed_docs
     
@@ -297,11 +311,15 @@ class EnhancedSystemRebuilder:
         
         try:
             # 기존 벡터 DB 초기화
-            vector_db = VectorDatabase(
+            vector_db = create_vector_database(
+                self.config.get("VECTOR_DB_TYPE", "chromadb"),
                 db_path=self.config.get("VECTOR_DB_PATH", "./vector_db"),
-                collection_name=self.config.get("COLLECTION_NAME", "power_market_docs_enhanced")
+                collection_name=self.config.get("COLLECTION_NAME", "power_market_docs_enhanced"),
+                **vector_db_options(self.config)
             )
             vector_db.clear_collection()
+            if self.enhanced_engine.chunk_store is not None:
+                self.enhanced_engine.chunk_store.drop(vector_db.collection_name)
             
             # 모든 enhanced chunks 수집
             all_enhanced_chunks = []
@@ -347,6 +365,10 @@ class EnhancedSystemRebuilder:
                 
                 with open(graph_file, "w", encoding="utf-8") as f:
                     json.dump(graph_data, f, ensure_ascii=False, indent=2)
+                
+                # 서빙용 인접 색인 (시작 시 메모리 매핑으로 로드)
+                graph_dir = self.config.get("RELATIONSHIP_GRAPH_PATH", str(relationships_dir / "graph"))
+                self.relationship_mapper.save_graph(graph_dir)
             
             logger.info(f"관계 정보 저장 완료: {relationships_file}")
             
@@ -420,7 +442,8 @@ class EnhancedSystemRebuilder:
                     "documents_processed": self.rebuild_stats["documents_processed"],
                     "chunks_created": self.rebuild_stats["chunks_created"],
                     "relationships_mapped": self.rebuild_stats["relationships_mapped"],
-                    "errors_count": len(self.rebuild_stats["errors"])
+                    "errors_count": len(self.rebuild_stats["errors"]),
+                    "stage_metrics": self.rebuild_stats.get("stage_metrics", {})
                 },
                 "vector_database_stats": vector_stats,
                 "relationship_stats": relationship_stats,
@@ -0,0 +1,329 @@
+"""
+BM25 역색인 모듈
+- 청크 단위 BM25 어휘 검색 (임베딩 모델을 사용하지 않음)
+- 한국어 토큰화: 어절 토큰 + 한글 문자 n-gram (하루전발전계획 -> 하루, 루전, 전발, 발전, 전계, 계획)
+- 포스팅은 용어별 CSR 배열(문서 번호 int32, 빈도 uint16)로 저장하고 .npy로 영구 저장
+- 추가는 새 포스팅을 용어 구간 끝에 삽입(재정렬 없음), 삭제는 삭제 표시 후 일정 비율을 넘으면 압축
+- top-k는 후보 문서에 대해서만 힙으로 선택
+"""
+
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+(?:[.\-][a-z0-9]+)*")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def tokenize(text: str, ngram_range: Tuple[int, int] = (2, 2)) -> List[str]:
+    """
+    한국어 규정 문서용 토큰화
+
+    - 영문/숫자 토큰과 한글 어절 토큰을 그대로 사용
+    - 한글 어절은 문자 n-gram도 추가하여 복합어/조사 결합 형태도 부분 일치되도록 함
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    min_n, max_n = ngram_range
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text):
+        tokens.append(token)
+        if not _HANGUL.match(token):
+            continue
+        for n in range(min_n, max_n + 1):
+            if len(token) <= n:
+                continue
+            tokens.extend(token[i:i + n] for i in range(len(token) - n + 1))
+    return tokens
+
+
+def dedupe_batch(doc_ids: Sequence[str], texts: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """배치 안에서 같은 ID가 여러 번 나오면 마지막 항목만 남김 (순서는 마지막 등장 위치 기준)"""
+    last = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+    if len(last) == len(doc_ids):
+        return list(doc_ids), list(texts)
+    keep = sorted(last.values())
+    return [doc_ids[i] for i in keep], [texts[i] for i in keep]
+
+
+class BM25Index:
+    """증분 갱신이 가능한 BM25 역색인"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self,
+                 k1: float = 1.2,
+                 b: float = 0.75,
+                 ngram_range: Tuple[int, int] = (2, 2),
+                 compact_ratio: float = 0.2):
+        """
+        Args:
+            k1: 용어 빈도 포화 계수
+            b: 문서 길이 정규화 계수
+            ngram_range: 한글 문자 n-gram 범위
+            compact_ratio: 삭제된 문서 비율이 이 값을 넘으면 압축
+        """
+        self.k1 = k1
+        self.b = b
+        self.ngram_range = tuple(ngram_range)
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.RLock()
+
+        # 문서
+        self.doc_ids: List[str] = []
+        self.doc_index: Dict[str, int] = {}
+        self._doc_lengths: List[int] = []
+        self._alive: List[bool] = []
+        self._alive_count = 0
+        self._alive_length = 0
+        self._doc_arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        # 용어별 CSR 포스팅 (용어 안에서는 문서 번호 오름차순)
+        self.vocab: Dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.postings_docs = np.empty(0, dtype=np.int32)
+        self.postings_tfs = np.empty(0, dtype=np.uint16)
+
+    # ------------------------------------------------------------------ 갱신
+
+    def __len__(self) -> int:
+        return self._alive_count
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_index
+
+    def add(self, doc_ids: Sequence[str], texts: Sequence[str]) -> None:
+        """문서 추가 (같은 ID가 있으면 교체, 배치 안의 중복 ID는 마지막 항목 사용)"""
+        doc_ids, texts = dedupe_batch(doc_ids, texts)
+        with self._lock:
+            self.remove(doc_ids, _compact=False)
+            self._doc_arrays = None
+
+            new_terms: List[int] = []
+            new_docs: List[int] = []
+            new_tfs: List[int] = []
+            max_tf = np.iinfo(np.uint16).max
+            for doc_id, text in zip(doc_ids, texts):
+                counts = Counter(tokenize(text, self.ngram_range))
+                doc = len(self.doc_ids)
+                self.doc_ids.append(doc_id)
+                self.doc_index[doc_id] = doc
+                length = sum(counts.values())
+                self._doc_lengths.append(length)
+                self._alive.append(True)
+                self._alive_count += 1
+                self._alive_length += length
+
+                for term, tf in counts.items():
+                    term_id = self.vocab.get(term)
+                    if term_id is None:
+                        term_id = self.vocab[term] = len(self.vocab)
+                    new_terms.append(term_id)
+                    new_docs.append(doc)
+                    new_tfs.append(min(tf, max_tf))
+
+            if new_terms:
+                self._insert_postings(np.asarray(new_terms, dtype=np.int64),
+                                      np.asarray(new_docs, dtype=np.int32),
+                                      np.asarray(new_tfs, dtype=np.uint16))
+
+    def _insert_postings(self, terms: np.ndarray, docs: np.ndarray, tfs: np.ndarray) -> None:
+        """
+        새 포스팅을 각 용어 구간의 끝에 삽입
+
+        새 문서 번호는 기존보다 항상 크므로 구간 끝에 붙이면 정렬이 유지됨 (전체 재정렬 없이 O(P))
+        """
+        order = np.lexsort((docs, terms))
+        terms, docs, tfs = terms[order], docs[order], tfs[order]
+
+        n_terms = len(self.vocab)
+        old_terms = len(self.indptr) - 1
+        indptr = np.concatenate([self.indptr, np.full(n_terms - old_terms, self.indptr[-1], dtype=np.int64)])
+
+        positions = indptr[terms + 1]
+        self.postings_docs = np.insert(self.postings_docs, positions, docs)
+        self.postings_tfs = np.insert(self.postings_tfs, positions, tfs)
+
+        added = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=n_terms), out=added[1:])
+        self.indptr = indptr + added
+
+    def remove(self, doc_ids: Iterable[str], _compact: bool = True) -> int:
+        """문서 삭제 표시 (포스팅은 압축 시 제거)"""
+        removed = 0
+        with self._lock:
+            for doc_id in doc_ids:
+                doc = self.doc_index.pop(doc_id, None)
+                if doc is None or not self._alive[doc]:
+                    continue
+                self._alive[doc] = False
+                self._doc_arrays = None
+                self._alive_count -= 1
+                self._alive_length -= self._doc_lengths[doc]
+                removed += 1
+
+            dead = len(self.doc_ids) - self._alive_count
+            if _compact and dead and dead > self.compact_ratio * len(self.doc_ids):
+                self.compact()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self.__init__(self.k1, self.b, self.ngram_range, self.compact_ratio)
+
+    def _set_postings(self, terms: np.ndarray, docs: np.ndarray, tfs: np.ndarray) -> None:
+        # 용어 순, 용어 안에서는 문서 번호 순으로 정렬
+        order = np.lexsort((docs, terms))
+        self.postings_docs = docs[order].astype(np.int32)
+        self.postings_tfs = tfs[order].astype(np.uint16)
+        self.indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(self.vocab)), out=self.indptr[1:])
+
+    def compact(self) -> None:
+        """삭제된 문서를 제거하고 문서 번호/용어 사전을 다시 부여"""
+        with self._lock:
+            alive = np.asarray(self._alive, dtype=bool)
+            remap = np.full(len(alive), -1, dtype=np.int64)
+            remap[alive] = np.arange(int(alive.sum()))
+
+            terms = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int64), np.diff(self.indptr))
+            keep = alive[self.postings_docs] if self.postings_docs.size else np.empty(0, dtype=bool)
+            terms = terms[keep]
+            docs = remap[self.postings_docs[keep]]
+            tfs = self.postings_tfs[keep]
+
+            # 더 이상 쓰이지 않는 용어 제거
+            used = np.unique(terms)
+            term_remap = np.full(len(self.vocab), -1, dtype=np.int64)
+            term_remap[used] = np.arange(used.size)
+            names = list(self.vocab)
+            self.vocab = {names[t]: i for i, t in enumerate(used)}
+
+            self.doc_ids = [doc_id for doc_id, is_alive in zip(self.doc_ids, self._alive) if is_alive]
+            self.doc_index = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+            self._doc_lengths = [length for length, is_alive in zip(self._doc_lengths, self._alive) if is_alive]
+            self._alive = [True] * len(self.doc_ids)
+            self._doc_arrays = None
+
+            self._set_postings(term_remap[terms], docs, tfs)
+            logger.info(f"BM25 색인 압축 완료: 문서 {len(self.doc_ids)}개, 용어 {len(self.vocab)}개")
+
+    # ------------------------------------------------------------------ 검색
+
+    def _term_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        term_id = self.vocab.get(term)
+        if term_id is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.uint16)
+        start, end = int(self.indptr[term_id]), int(self.indptr[term_id + 1])
+        return self.postings_docs[start:end], self.postings_tfs[start:end]
+
+    def _get_doc_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(문서 길이, 생존 여부) 배열 - 변경 시에만 다시 만듦"""
+        if self._doc_arrays is None:
+            self._doc_arrays = (np.asarray(self._doc_lengths, dtype=np.float32),
+                                np.asarray(self._alive, dtype=bool))
+        return self._doc_arrays
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        BM25 검색
+
+        Returns:
+            [(문서 ID, BM25 점수), ...] 점수 내림차순
+        """
+        with self._lock:
+            if not self._alive_count:
+                return []
+
+            n_docs = len(self.doc_ids)
+            doc_lengths, alive = self._get_doc_arrays()
+            avgdl = self._alive_length / self._alive_count or 1.0
+
+            scores = np.zeros(n_docs, dtype=np.float32)
+            touched = np.zeros(n_docs, dtype=bool)
+            for term in set(tokenize(query, self.ngram_range)):
+                docs, tfs = self._term_postings(term)
+                if docs.size == 0:
+                    continue
+                # 문서 빈도에는 압축 전 삭제 문서가 포함될 수 있음
+                df = docs.size
+                idf = np.log(1.0 + (self._alive_count - df + 0.5) / (df + 0.5))
+                tf = tfs.astype(np.float32)
+                norm = self.k1 * (1.0 - self.b + self.b * doc_lengths[docs] / avgdl)
+                scores[docs] += idf * tf * (self.k1 + 1.0) / (tf + norm)
+                touched[docs] = True
+
+            candidates = np.nonzero(touched & alive)[0]
+            best = heapq.nlargest(top_k, zip(scores[candidates].tolist(), candidates.tolist()))
+            return [(self.doc_ids[doc], score) for score, doc in best]
+
+    # ------------------------------------------------------------------ 저장
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """색인 저장 (삭제 문서가 있으면 압축 후 저장)"""
+        directory = Path(directory)
+        with self._lock:
+            if len(self.doc_ids) != self._alive_count:
+                self.compact()
+
+            directory.mkdir(parents=True, exist_ok=True)
+            np.save(directory / "indptr.npy", self.indptr)
+            np.save(directory / "postings_docs.npy", self.postings_docs)
+            np.save(directory / "postings_tfs.npy", self.postings_tfs)
+            np.save(directory / "doc_lengths.npy", np.asarray(self._doc_lengths, dtype=np.int32))
+
+            temp_path = directory / "index.json.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "format_version": self.FORMAT_VERSION,
+                    "k1": self.k1,
+                    "b": self.b,
+                    "ngram_range": list(self.ngram_range),
+                    "doc_ids": self.doc_ids,
+                    "vocab": list(self.vocab)
+                }, f, ensure_ascii=False)
+            os.replace(temp_path, directory / "index.json")
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], **kwargs) -> "BM25Index":
+        directory = Path(directory)
+        with open(directory / "index.json", "r", encoding="utf-8") as f:
+            header = json.load(f)
+
+        index = cls(k1=header["k1"], b=header["b"], ngram_range=tuple(header["ngram_range"]), **kwargs)
+        index.doc_ids = header["doc_ids"]
+        index.doc_index = {doc_id: i for i, doc_id in enumerate(index.doc_ids)}
+        index.vocab = {term: i for i, term in enumerate(header["vocab"])}
+        index.indptr = np.load(directory / "indptr.npy")
+        index.postings_docs = np.load(directory / "postings_docs.npy")
+        index.postings_tfs = np.load(directory / "postings_tfs.npy")
+        index._doc_lengths = np.load(directory / "doc_lengths.npy").tolist()
+        index._alive = [True] * len(index.doc_ids)
+        index._alive_count = len(index.doc_ids)
+        index._alive_length = int(sum(index._doc_lengths))
+
+        logger.info(f"BM25 색인 로드 완료: 문서 {len(index)}개, 용어 {len(index.vocab)}개")
+        return index
+
+    @staticmethod
+    def exists(directory: Union[str, Path]) -> bool:
+        return (Path(directory) / "index.json").exists()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "documents": self._alive_count,
+            "deleted": len(self.doc_ids) - self._alive_count,
+            "terms": len(self.vocab),
+            "postings": int(self.postings_docs.size)
+        }
@@ -8,8 +8,14 @@ import logging
 from typing import List, Dict, Optional, Union
 import numpy as np
 import re
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 
+from core.keyword_matcher import KeywordMatcher
+from retrieval.rank_fusion import reciprocal_rank_fusion
+
 @dataclass
 class SearchResult:
     """검색 결과를 담는 데이터 클래스"""
@@ -23,23 +29,37 @@ class SearchResult:
 class DocumentRetriever:
     """문서 검색 엔진 클래스"""
     
+    # 단어 매처를 보관할 최근 질문 수 (동시 검색이 서로의 매처를 밀어내지 않도록)
+    QUERY_MATCHER_CACHE_SIZE = 16
+    
     def __init__(self, 
                  vector_db,
                  text_embedder,
                  top_k: int = 5,
-                 similarity_threshold: float = 0.7):
+                 similarity_threshold: float = 0.7,
+                 hybrid_mode: str = "fused",
+                 rrf_k: int = 60,
+                 overfetch: int = 4):
         """
         Args:
             vector_db: 벡터 데이터베이스 인스턴스
             text_embedder: 텍스트 임베딩 인스턴스
             top_k: 반환할 최대 결과 수
             similarity_threshold: 유사도 임계값
+            hybrid_mode: 하이브리드 검색 방식
+                       - fused: 질문을 한 번만 임베딩하고 벡터/키워드 후보를 순위 융합 (기본)
+                       - weighted: 의미적 검색과 키워드 검색을 각각 실행 후 가중합 (기존 방식)
+            rrf_k: 순위 융합 상수
+            overfetch: 융합 전 후보를 top_k의 몇 배까지 가져올지
         """
         self.logger = logging.getLogger(__name__)
         self.vector_db = vector_db
         self.text_embedder = text_embedder
         self.top_k = top_k
         self.similarity_threshold = similarity_threshold
+        self.hybrid_mode = hybrid_mode
+        self.rrf_k = rrf_k
+        self.overfetch = overfetch
         
         # 전력시장 키워드 가중치
         self.power_market_keywords = {
@@ -58,6 +78,10 @@ class DocumentRetriever:
             "발전량": 1.1,
             "수요": 1.1
         }
+        
+        # 최근 질문의 단어 매처 (후보 전체를 같은 질문으로 점수화할 때 재사용, 여러 스레드가 동시에 검색해도 안전)
+        self._query_matchers: "OrderedDict[str, tuple]" = OrderedDict()
+        self._query_matcher_lock = threading.Lock()
     
     def preprocess_query(self, query: str) -> str:
         """질문 전처리"""
@@ -71,18 +95,13 @@ class DocumentRetriever:
     
     def calculate_keyword_score(self, text: str, query: str) -> float:
         """키워드 기반 관련성 점수 계산"""
-        score = 0.0
-        text_lower = text.lower()
-        query_lower = query.lower()
+        query_words, matcher = self._get_query_matcher(query.lower())
         
-        # 질문의 키워드들
-        query_words = query_lower.split()
+        # 텍스트를 한 번만 훑어서 질문 단어 출현 확인
+        found = {term for _, _, term in matcher.iter_matches(text.lower())}
         
-        for word in query_words:
-            if word in text_lower:
-                # 전력시장 특화 키워드면 가중치 적용
-                weight = self.power_market_keywords.get(word, 1.0)
-                score += weight
+        # 전력시장 특화 키워드면 가중치 적용
+        score = sum(self.power_market_keywords.get(word, 1.0) for word in query_words if word in found)
         
         # 전체 단어 수로 정규화
         if len(query_words) > 0:
@@ -90,6 +109,21 @@ class DocumentRetriever:
         
         return score
     
+    def _get_query_matcher(self, query_lower: str):
+        """질문 단어 목록과 단어 매처 (최근 질문이면 재사용)"""
+        with self._query_matcher_lock:
+            cached = self._query_matchers.get(query_lower)
+            if cached is not None:
+                self._query_matchers.move_to_end(query_lower)
+                return cached
+            
+            query_words = query_lower.split()
+            cached = (query_words, KeywordMatcher({"query": query_words}, scan_cache_size=0))
+            self._query_matchers[query_lower] = cached
+            while len(self._query_matchers) > self.QUERY_MATCHER_CACHE_SIZE:
+                self._query_matchers.popitem(last=False)
+            return cached
+    
     def semantic_search(self, query: str, top_k: Optional[int] = None) -> List[SearchResult]:
         """의미적 검색 (임베딩 기반)"""
         try:
@@ -105,22 +139,7 @@ class DocumentRetriever:
                 top_k=top_k * 2  # 더 많이 가져와서 후처리로 필터링
             )
             
-            # 결과 변환 및 필터링
-            search_results = []
-            for result in results:
-                if result['similarity'] >= self.similarity_threshold:
-                    search_result = SearchResult(
-                        id=result['id'],
-                        text=result['text'],
-                        metadata=result['metadata'],
-                        similarity=result['similarity'],
-                        source_file=result['metadata'].get('source_file', ''),
-                        relevance_score=result['similarity']
-                    )
-                    search_results.append(search_result)
-            
-            # 상위 결과만 반환
-            search_results = search_results[:top_k]
+            search_results = self._semantic_results(results, top_k)
             
             self.logger.info(f"의미적 검색 완료: {len(search_results)}개 결과")
             return search_results
@@ -129,13 +148,31 @@ class DocumentRetriever:
             self.logger.error(f"의미적 검색 실패: {e}")
             return []
     
+    def _semantic_results(self, results: List[Dict], top_k: int) -> List[SearchResult]:
+        """벡터 검색 결과를 임계값으로 거르고 상위 결과만 변환"""
+        search_results = []
+        for result in results:
+            if result['similarity'] >= self.similarity_threshold:
+                search_results.append(SearchResult(
+                    id=result['id'],
+                    text=result['text'],
+                    metadata=result['metadata'],
+                    similarity=result['similarity'],
+                    source_file=result['metadata'].get('source_file', ''),
+                    relevance_score=result['similarity']
+                ))
+        return search_results[:top_k]
+    
     def keyword_search(self, query: str, top_k: Optional[int] = None) -> List[SearchResult]:
         """키워드 검색 (텍스트 매칭 기반)"""
         try:
             if top_k is None:
                 top_k = self.top_k
             
-            # ChromaDB의 텍스트 검색 사용
+            if self._has_lexical_index():
+                return self._bm25_search(query, top_k)
+            
+            # BM25 색인이 없으면 ChromaDB의 텍스트 검색 사용
             results = self.vector_db.search_by_text(
                 query_text=query,
                 top_k=top_k * 2
@@ -169,11 +206,34 @@ class DocumentRetriever:
             self.logger.error(f"키워드 검색 실패: {e}")
             return []
     
+    def _bm25_search(self, query: str, top_k: int) -> List[SearchResult]:
+        """BM25 색인 검색 (관련성 점수는 최고 점수 기준 0~1로 정규화)"""
+        results = self.vector_db.search_lexical(query, top_k=top_k)
+        max_score = max((r['score'] for r in results), default=0.0) or 1.0
+        
+        search_results = [
+            SearchResult(
+                id=result['id'],
+                text=result['text'],
+                metadata=result['metadata'],
+                similarity=result['similarity'],
+                source_file=result['metadata'].get('source_file', ''),
+                relevance_score=result['score'] / max_score
+            )
+            for result in results
+        ]
+        
+        self.logger.info(f"BM25 키워드 검색 완료: {len(search_results)}개 결과")
+        return search_results
+    
     def hybrid_search(self, query: str, 
                      semantic_weight: float = 0.7,
                      keyword_weight: float = 0.3,
                      top_k: Optional[int] = None) -> List[SearchResult]:
         """하이브리드 검색 (의미적 + 키워드 검색 결합)"""
+        if self.hybrid_mode == "fused":
+            return self.fused_hybrid_search(query, top_k)
+        
         try:
             if top_k is None:
                 top_k = self.top_k
@@ -218,6 +278,151 @@ class DocumentRetriever:
             self.logger.error(f"하이브리드 검색 실패: {e}")
             return []
     
+    def _query_terms(self, query: str) -> List[str]:
+        """어휘 검색용 질문 키워드 (질문 단어 + 질문에 포함된 전력시장 키워드)"""
+        terms = [word for word in self.preprocess_query(query).lower().split() if len(word) >= 2]
+        query_lower = query.lower()
+        terms.extend(keyword for keyword in self.power_market_keywords if keyword in query_lower)
+        return list(dict.fromkeys(terms))
+    
+    def _has_lexical_index(self) -> bool:
+        return getattr(self.vector_db, 'lexical_index', None) is not None
+    
+    def _lexical_candidates(self, query: str, top_k: int, query_embedding: np.ndarray) -> List[Dict]:
+        """어휘 후보 조회 (BM25 색인이 없으면 벡터 데이터베이스 전문 검색)"""
+        if self._has_lexical_index():
+            return self.vector_db.search_lexical(query, top_k=top_k, query_embedding=query_embedding)
+        return self.vector_db.search_by_keywords(
+            self._query_terms(query), top_k=top_k, query_embedding=query_embedding
+        )
+    
+    def fused_hybrid_search(self, query: str, top_k: Optional[int] = None) -> List[SearchResult]:
+        """
+        단일 패스 하이브리드 검색
+        1. 질문을 한 번만 임베딩하여 후보를 넉넉히 가져오는 벡터 검색 1회
+        2. 어휘 색인에서 키워드 후보 조회 (모델 추론 없음)
+        3. 후보 전체에 키워드 점수 계산 후 벡터/키워드(/어휘 색인) 순위를 RRF로 융합
+        """
+        try:
+            if top_k is None:
+                top_k = self.top_k
+            
+            query_embedding = self.text_embedder.encode_text(query)
+            dense_results = self.vector_db.search_similar(
+                query_embedding=query_embedding,
+                top_k=top_k * self.overfetch
+            )
+            return self._fuse(query, query_embedding, dense_results, top_k)
+            
+        except Exception as e:
+            self.logger.error(f"단일 패스 하이브리드 검색 실패: {e}")
+            return []
+    
+    def _fuse(self, query: str, query_embedding: np.ndarray,
+              dense_results: List[Dict], top_k: int) -> List[SearchResult]:
+        """벡터 후보와 어휘 후보를 순위 융합"""
+        lexical_results = self._lexical_candidates(query, top_k * self.overfetch, query_embedding)
+        
+        candidates = {}
+        for result in dense_results + lexical_results:
+            candidates.setdefault(result['id'], result)
+        
+        # 순위 목록: 벡터 유사도(임계값 이상), 후보 전체의 키워드 점수, 어휘 색인 점수
+        dense_ranking = [r['id'] for r in dense_results if r['similarity'] >= self.similarity_threshold]
+        keyword_scores = {
+            doc_id: self.calculate_keyword_score(result['text'], query)
+            for doc_id, result in candidates.items()
+        }
+        keyword_ranking = sorted(
+            (doc_id for doc_id, score in keyword_scores.items() if score > 0),
+            key=lambda doc_id: keyword_scores[doc_id],
+            reverse=True
+        )
+        rankings = [dense_ranking, keyword_ranking]
+        if any('score' in r for r in lexical_results):
+            rankings.append([r['id'] for r in sorted(lexical_results, key=lambda r: r.get('score', 0.0), reverse=True)])
+        
+        fused_scores = reciprocal_rank_fusion(rankings, k=self.rrf_k)
+        ranked_ids = sorted(fused_scores, key=fused_scores.get, reverse=True)[:top_k]
+        
+        final_results = []
+        for doc_id in ranked_ids:
+            result = candidates[doc_id]
+            metadata = result.get('metadata') or {}
+            final_results.append(SearchResult(
+                id=doc_id,
+                text=result['text'],
+                metadata=metadata,
+                similarity=result.get('similarity', 0.0),
+                source_file=metadata.get('source_file', ''),
+                relevance_score=fused_scores[doc_id]
+            ))
+        
+        self.logger.info(
+            f"단일 패스 하이브리드 검색 완료: 후보 {len(candidates)}개 "
+            f"(벡터 {len(dense_results)}, 어휘 {len(lexical_results)}) -> {len(final_results)}개 결과"
+        )
+        return final_results
+    
+    def search_many(self,
+                    queries: List[str],
+                    method: str = "hybrid",
+                    top_k: Optional[int] = None,
+                    query_embeddings: Optional[np.ndarray] = None,
+                    timings: Optional[Dict[str, float]] = None) -> List[List[SearchResult]]:
+        """
+        여러 질문 일괄 검색
+        - semantic / hybrid(fused): 질문 임베딩 1회(encode_queries) + 다중 질의 벡터 검색 1회
+        - keyword: BM25 색인만 사용 (임베딩 없음)
+        - 그 외(smart, weighted hybrid): 질문별 검색
+        
+        Args:
+            query_embeddings: 미리 계산한 질문 임베딩 (없으면 encode_queries로 계산)
+            timings: 지정 시 단계별 소요 시간(초)을 누적 ('embed', 'vector_search', 'rerank')
+        """
+        if top_k is None:
+            top_k = self.top_k
+        if timings is None:
+            timings = {}
+        
+        batched = method == "semantic" or (method == "hybrid" and self.hybrid_mode == "fused")
+        if not batched:
+            start = time.perf_counter()
+            if method == "keyword":
+                results = [self.keyword_search(query, top_k) for query in queries]
+            elif method == "smart" and hasattr(self, "smart_search"):
+                results = [self.smart_search(query, top_k) for query in queries]
+            else:
+                results = [self.hybrid_search(query, top_k=top_k) for query in queries]
+            timings["rerank"] = timings.get("rerank", 0.0) + time.perf_counter() - start
+            return results
+        
+        if query_embeddings is None:
+            start = time.perf_counter()
+            query_embeddings = self.text_embedder.encode_queries(queries)
+            timings["embed"] = timings.get("embed", 0.0) + time.perf_counter() - start
+        
+        fetch_k = top_k * (2 if method == "semantic" else self.overfetch)
+        start = time.perf_counter()
+        dense_batch = self.vector_db.search_similar_batch(query_embeddings, top_k=fetch_k)
+        timings["vector_search"] = timings.get("vector_search", 0.0) + time.perf_counter() - start
+        
+        start = time.perf_counter()
+        results = []
+        for query, query_embedding, dense_results in zip(queries, query_embeddings, dense_batch):
+            try:
+                if method == "semantic":
+                    results.append(self._semantic_results(dense_results, top_k))
+                else:
+                    results.append(self._fuse(query, query_embedding, dense_results, top_k))
+            except Exception as e:
+                self.logger.error(f"일괄 검색 후처리 실패 ({query}): {e}")
+                results.append([])
+        timings["rerank"] = timings.get("rerank", 0.0) + time.perf_counter() - start
+        
+        self.logger.info(f"일괄 검색 완료: {len(queries)}개 질문 ({method})")
+        return results
+    
     def search_by_category(self, query: str, category: str, top_k: Optional[int] = None) -> List[SearchResult]:
         """카테고리별 검색"""
         try:
@@ -0,0 +1,18 @@
+"""
+검색 결과 순위 융합
+- 문서 검색기(retrieval)와 벡터 엔진(core)이 함께 쓰는 계산 (core를 가져오지 않으므로 순환 임포트 없음)
+"""
+
+from typing import Dict, Sequence
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> Dict[str, float]:
+    """
+    순위 융합 (Reciprocal Rank Fusion)
+    각 순위 목록에서 score += 1 / (k + 순위)를 합산하므로 점수 척도가 다른 검색 결과도 결합 가능
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return scores
@@ -0,0 +1,367 @@
+"""
+TF-IDF 희소 색인 모듈
+- 첫 적재 시 용어 사전을 한 번만 구축하고(문서 빈도 상위 max_features개), 이후 추가는 재학습 없이 행만 덧붙임
+- 추가된 행은 버퍼에 모아 두었다가 검색/저장/압축 시 한 번에 CSR 배열로 병합 (추가마다 전체 배열을 복사하지 않음)
+- 문서-용어 행렬은 CSR 배열(indptr int64, indices int32, 빈도 float32)로 보관하고 .npy로 저장 (로드 시 메모리 매핑)
+- IDF와 행 정규화는 문서 빈도로부터 검색 시점에 계산하므로 추가/삭제 후에도 전체 재학습 없이 일관된 점수 유지
+- 검색은 쿼리 용어 열만 훑는 희소 행렬-벡터 곱 (열 방향 배열은 변경 후 첫 검색 시 한 번 생성)
+- 토큰화는 BM25 색인과 같은 한국어 규칙 (어절 + 한글 문자 n-gram)
+"""
+
+import heapq
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from retrieval.bm25_index import dedupe_batch, tokenize
+
+logger = logging.getLogger(__name__)
+
+_ARRAY_FILES = ("indptr", "indices", "data", "df")
+
+
+class TfidfIndex:
+    """증분 추가가 가능한 TF-IDF 코사인 유사도 색인"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self,
+                 max_features: int = 10000,
+                 ngram_range: Tuple[int, int] = (2, 2),
+                 sublinear_tf: bool = False,
+                 compact_ratio: float = 0.2):
+        """
+        Args:
+            max_features: 용어 사전 최대 크기 (가득 찬 뒤 새 용어는 무시)
+            ngram_range: 한글 문자 n-gram 범위
+            sublinear_tf: True이면 빈도 대신 1 + log(빈도) 사용
+            compact_ratio: 삭제된 문서 비율이 이 값을 넘으면 압축
+        """
+        self.max_features = max_features
+        self.ngram_range = tuple(ngram_range)
+        self.sublinear_tf = sublinear_tf
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.RLock()
+
+        # 문서 (행)
+        self.doc_ids: List[str] = []
+        self.doc_index: Dict[str, int] = {}
+        self._alive: List[bool] = []
+        self._alive_count = 0
+
+        # 용어 사전과 문서 빈도 (열)
+        self.vocab: Dict[str, int] = {}
+        self.df = np.zeros(0, dtype=np.int32)
+
+        # 문서-용어 CSR 행렬 (행 안에서는 용어 번호 오름차순)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int32)
+        self.data = np.empty(0, dtype=np.float32)
+
+        # 아직 CSR 배열에 병합하지 않은 추가 행 (배치별 행 길이, 용어 번호, 빈도)
+        self._pending_lengths: List[np.ndarray] = []
+        self._pending_indices: List[np.ndarray] = []
+        self._pending_data: List[np.ndarray] = []
+
+        # 검색용 파생 배열 (IDF, 정규화된 열 방향 행렬) - 변경 시 무효화
+        self._search_arrays = None
+
+    # ------------------------------------------------------------------ 갱신
+
+    def __len__(self) -> int:
+        return self._alive_count
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_index
+
+    def _extend_vocabulary(self, counts: List[Counter]) -> None:
+        """사전에 없는 용어를 배치 내 문서 빈도 순으로 max_features까지 추가 (첫 적재 시 사전 구축)"""
+        room = self.max_features - len(self.vocab)
+        if room <= 0:
+            return
+        new_df: Counter = Counter()
+        for counter in counts:
+            new_df.update(term for term in counter if term not in self.vocab)
+        if not new_df:
+            return
+        for term, _ in sorted(new_df.items(), key=lambda item: -item[1])[:room]:
+            self.vocab[term] = len(self.vocab)
+        self.df = np.concatenate([self.df, np.zeros(len(self.vocab) - self.df.size, dtype=np.int32)])
+
+    def add(self, doc_ids: Sequence[str], texts: Sequence[str]) -> None:
+        """
+        문서 추가 (같은 ID가 있으면 교체, 배치 안의 중복 ID는 마지막 항목 사용)
+
+        기존 행은 그대로 두고 새 행은 버퍼에 덧붙임 (문서 빈도는 즉시 반영)
+        """
+        doc_ids, texts = dedupe_batch(doc_ids, texts)
+        with self._lock:
+            self.remove(doc_ids, _compact=False)
+            self._search_arrays = None
+
+            counts = [Counter(tokenize(text, self.ngram_range)) for text in texts]
+            self._extend_vocabulary(counts)
+
+            row_lengths = []
+            new_indices: List[int] = []
+            new_data: List[float] = []
+            for doc_id, counter in zip(doc_ids, counts):
+                row = sorted((self.vocab[term], tf) for term, tf in counter.items() if term in self.vocab)
+                row_lengths.append(len(row))
+                for term_id, tf in row:
+                    new_indices.append(term_id)
+                    new_data.append(tf)
+
+                doc = len(self.doc_ids)
+                self.doc_ids.append(doc_id)
+                self.doc_index[doc_id] = doc
+                self._alive.append(True)
+                self._alive_count += 1
+
+            indices = np.asarray(new_indices, dtype=np.int32)
+            data = np.asarray(new_data, dtype=np.float32)
+            if self.sublinear_tf and data.size:
+                data = 1.0 + np.log(data)
+
+            self._pending_lengths.append(np.asarray(row_lengths, dtype=np.int64))
+            self._pending_indices.append(indices)
+            self._pending_data.append(data)
+            if indices.size:
+                self.df = self.df + np.bincount(indices, minlength=self.df.size).astype(np.int32)
+
+    def _merge_pending(self) -> None:
+        """버퍼에 쌓인 추가 행을 CSR 배열에 한 번에 병합 (잠금을 잡은 상태에서 호출)"""
+        if not self._pending_lengths:
+            return
+        lengths = np.concatenate(self._pending_lengths)
+        self.indptr = np.concatenate([self.indptr, self.indptr[-1] + np.cumsum(lengths, dtype=np.int64)])
+        self.indices = np.concatenate([self.indices, *self._pending_indices])
+        self.data = np.concatenate([self.data, *self._pending_data])
+        self._pending_lengths, self._pending_indices, self._pending_data = [], [], []
+
+    def remove(self, doc_ids: Iterable[str], _compact: bool = True) -> int:
+        """문서 삭제 표시 (행은 압축 시 제거, 문서 빈도는 즉시 반영)"""
+        removed = 0
+        with self._lock:
+            df = None
+            for doc_id in doc_ids:
+                doc = self.doc_index.pop(doc_id, None)
+                if doc is None or not self._alive[doc]:
+                    continue
+                if df is None:
+                    df = np.array(self.df)
+                if doc >= self.indptr.size - 1:
+                    self._merge_pending()
+                np.subtract.at(df, self.indices[self.indptr[doc]:self.indptr[doc + 1]], 1)
+                self._alive[doc] = False
+                self._alive_count -= 1
+                removed += 1
+
+            if df is not None:
+                self.df = df
+                self._search_arrays = None
+
+            dead = len(self.doc_ids) - self._alive_count
+            if _compact and dead and dead > self.compact_ratio * len(self.doc_ids):
+                self.compact()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self.__init__(self.max_features, self.ngram_range, self.sublinear_tf, self.compact_ratio)
+
+    def compact(self) -> None:
+        """삭제된 행과 더 이상 쓰이지 않는 용어를 제거"""
+        with self._lock:
+            self._merge_pending()
+            alive = np.asarray(self._alive, dtype=bool)
+            row_lengths = np.diff(self.indptr)
+            keep = np.repeat(alive, row_lengths)
+
+            used = np.flatnonzero(self.df > 0)
+            term_remap = np.full(len(self.vocab), -1, dtype=np.int64)
+            term_remap[used] = np.arange(used.size)
+            names = list(self.vocab)
+            self.vocab = {names[t]: i for i, t in enumerate(used)}
+            self.df = np.asarray(self.df)[used].astype(np.int32)
+
+            self.indices = term_remap[self.indices[keep]].astype(np.int32)
+            self.data = np.asarray(self.data[keep], dtype=np.float32)
+            self.indptr = np.zeros(int(alive.sum()) + 1, dtype=np.int64)
+            np.cumsum(row_lengths[alive], out=self.indptr[1:])
+
+            self.doc_ids = [doc_id for doc_id, is_alive in zip(self.doc_ids, self._alive) if is_alive]
+            self.doc_index = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+            self._alive = [True] * len(self.doc_ids)
+            self._search_arrays = None
+            logger.info(f"TF-IDF 색인 압축 완료: 문서 {len(self.doc_ids)}개, 용어 {len(self.vocab)}개")
+
+    # ------------------------------------------------------------------ 검색
+
+    def _idf(self) -> np.ndarray:
+        """평활 IDF: ln((1 + N) / (1 + df)) + 1"""
+        return (np.log((1.0 + self._alive_count) / (1.0 + self.df)) + 1.0).astype(np.float32)
+
+    def _get_search_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (IDF, 열 포인터, 열별 행 번호, 열별 정규화 가중치) - 변경 후 첫 검색 시 O(nnz)로 생성
+
+        가중치는 tf * idf를 행별 L2 노름으로 나눈 값이므로 쿼리 벡터와의 내적이 곧 코사인 유사도
+        """
+        if self._search_arrays is None:
+            self._merge_pending()
+            n_docs = len(self.doc_ids)
+            idf = self._idf()
+            rows = np.repeat(np.arange(n_docs, dtype=np.int32), np.diff(self.indptr))
+            weights = self.data * idf[self.indices]
+            norms = np.sqrt(np.bincount(rows, weights=weights.astype(np.float64) ** 2, minlength=n_docs))
+            inverse_norms = np.zeros(n_docs, dtype=np.float32)
+            valid = (norms > 0) & np.asarray(self._alive, dtype=bool)
+            inverse_norms[valid] = 1.0 / norms[valid]
+
+            order = np.argsort(self.indices, kind="stable")
+            column_ptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=len(self.vocab)), out=column_ptr[1:])
+            column_rows = rows[order]
+            column_weights = (weights * inverse_norms[rows])[order]
+            self._search_arrays = (idf, column_ptr, column_rows, column_weights)
+        return self._search_arrays
+
+    def _query_vector(self, text: str, idf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """텍스트의 정규화된 TF-IDF 벡터 (용어 번호, 가중치) - 사전에 없는 용어는 무시"""
+        counter = Counter(term for term in tokenize(text, self.ngram_range) if term in self.vocab)
+        if not counter:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        term_ids = np.fromiter((self.vocab[term] for term in counter), dtype=np.int32, count=len(counter))
+        tf = np.fromiter(counter.values(), dtype=np.float32, count=len(counter))
+        if self.sublinear_tf:
+            tf = 1.0 + np.log(tf)
+        weights = tf * idf[term_ids]
+        norm = float(np.linalg.norm(weights))
+        return term_ids, (weights / norm if norm else weights)
+
+    def transform(self, texts: Sequence[str]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """텍스트별 정규화된 TF-IDF 희소 벡터 (용어 번호, 가중치) - 사전은 다시 학습하지 않음"""
+        with self._lock:
+            idf = self._idf()
+            return [self._query_vector(text, idf) for text in texts]
+
+    def search(self,
+               query: str,
+               top_k: int = 10,
+               candidates: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        TF-IDF 코사인 유사도 검색
+
+        Args:
+            candidates: 지정 시 이 문서 ID들 안에서만 검색 (메타데이터 필터 결과)
+
+        Returns:
+            [(문서 ID, 유사도), ...] 유사도 내림차순
+        """
+        with self._lock:
+            if not self._alive_count:
+                return []
+
+            idf, column_ptr, column_rows, column_weights = self._get_search_arrays()
+            term_ids, query_weights = self._query_vector(query, idf)
+            if term_ids.size == 0:
+                return []
+
+            scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+            for term_id, weight in zip(term_ids.tolist(), query_weights.tolist()):
+                start, end = int(column_ptr[term_id]), int(column_ptr[term_id + 1])
+                # 한 열 안의 행 번호는 중복이 없으므로 팬시 인덱싱 누적이 안전
+                scores[column_rows[start:end]] += weight * column_weights[start:end]
+
+            if candidates is not None:
+                allowed = np.zeros(len(scores), dtype=bool)
+                allowed[[self.doc_index[doc_id] for doc_id in candidates if doc_id in self.doc_index]] = True
+                scores[~allowed] = 0
+
+            # 삭제된 행은 정규화 가중치가 0이므로 점수가 0
+            matched = np.flatnonzero(scores > 0)
+            best = heapq.nlargest(top_k, zip(scores[matched].tolist(), matched.tolist()))
+            return [(self.doc_ids[doc], score) for score, doc in best]
+
+    # ------------------------------------------------------------------ 저장
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """
+        색인 저장 (삭제 문서가 있으면 압축 후 저장)
+
+        배열은 임시 파일에 쓴 뒤 교체하므로 기존 파일을 메모리 매핑 중인 색인도 안전하게 저장 가능
+        """
+        directory = Path(directory)
+        with self._lock:
+            self._merge_pending()
+            if len(self.doc_ids) != self._alive_count:
+                self.compact()
+
+            directory.mkdir(parents=True, exist_ok=True)
+            for name in _ARRAY_FILES:
+                temp_path = directory / f"{name}.npy.tmp"
+                with open(temp_path, "wb") as f:
+                    np.save(f, getattr(self, name))
+                os.replace(temp_path, directory / f"{name}.npy")
+
+            temp_path = directory / "index.json.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "format_version": self.FORMAT_VERSION,
+                    "max_features": self.max_features,
+                    "ngram_range": list(self.ngram_range),
+                    "sublinear_tf": self.sublinear_tf,
+                    "doc_ids": self.doc_ids,
+                    "vocab": list(self.vocab)
+                }, f, ensure_ascii=False)
+            os.replace(temp_path, directory / "index.json")
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True, **kwargs) -> "TfidfIndex":
+        """
+        색인 로드
+
+        Args:
+            mmap: True이면 CSR 배열을 읽기 전용 메모리 매핑 (추가/압축 시 새 배열로 교체됨)
+        """
+        directory = Path(directory)
+        with open(directory / "index.json", "r", encoding="utf-8") as f:
+            header = json.load(f)
+
+        index = cls(max_features=header["max_features"], ngram_range=tuple(header["ngram_range"]),
+                    sublinear_tf=header["sublinear_tf"], **kwargs)
+        mmap_mode = "r" if mmap else None
+        index.doc_ids = header["doc_ids"]
+        index.doc_index = {doc_id: i for i, doc_id in enumerate(index.doc_ids)}
+        index.vocab = {term: i for i, term in enumerate(header["vocab"])}
+        index.indptr = np.load(directory / "indptr.npy", mmap_mode=mmap_mode)
+        index.indices = np.load(directory / "indices.npy", mmap_mode=mmap_mode)
+        index.data = np.load(directory / "data.npy", mmap_mode=mmap_mode)
+        index.df = np.load(directory / "df.npy")
+        index._alive = [True] * len(index.doc_ids)
+        index._alive_count = len(index.doc_ids)
+
+        logger.info(f"TF-IDF 색인 로드 완료: 문서 {len(index)}개, 용어 {len(index.vocab)}개")
+        return index
+
+    @staticmethod
+    def exists(directory: Union[str, Path]) -> bool:
+        return (Path(directory) / "index.json").exists()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._merge_pending()
+        return {
+            "documents": self._alive_count,
+            "deleted": len(self.doc_ids) - self._alive_count,
+            "terms": len(self.vocab),
+            "nonzeros": int(self.indices.size)
+        }
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+ANN 벡터 백엔드 재현율-지연 시간 보고서
+- 우리 코퍼스 임베딩(exact 백엔드 저장소의 embeddings.npy)을 exact와 ANN 백엔드(hnsw, ivfpq)에 적재
+- 색인 구축 시간과 디스크 크기 측정
+- efSearch(HNSW) / nprobe(IVF-PQ) 값을 바꿔가며 exact 결과 대비 recall@k와 질문당 지연 시간 측정
+- --report로 마크다운 보고서 저장
+- 저장소가 없으면 --embeddings로 (n, d) .npy 지정, 둘 다 없으면 군집 구조가 있는 난수 임베딩 사용
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import yaml
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data.vectors.factory import create_vector_database
+
+SWEEPS = {
+    "hnsw": ("ef_search", [16, 32, 64, 128, 256]),
+    "ivfpq": ("nprobe", [1, 2, 4, 8, 16, 32, 64])
+}
+
+
+def load_embeddings(args) -> Tuple[np.ndarray, str]:
+    """벤치마크 임베딩과 출처"""
+    if args.embeddings:
+        return np.load(args.embeddings).astype(np.float32), args.embeddings
+
+    store = args.store
+    if store is None:
+        config_path = project_root / "config" / "config.yaml"
+        if config_path.exists():
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            store = os.path.join(config.get("VECTOR_DB_PATH", "./vector_db"),
+                                 f"{config.get('COLLECTION_NAME', 'power_market_docs')}_exact")
+    if store and os.path.exists(os.path.join(store, "embeddings.npy")):
+        return np.load(os.path.join(store, "embeddings.npy")).astype(np.float32), store
+
+    # 실제 임베딩처럼 주제 군집이 있는 난수 (순수 정규분포는 ANN에 가장 불리한 경우)
+    rng = np.random.default_rng(1)
+    topics = rng.normal(size=(max(1, args.count // 200), args.dim)).astype(np.float32)
+    embeddings = topics[rng.integers(0, len(topics), size=args.count)]
+    embeddings = embeddings + 0.6 * rng.normal(size=embeddings.shape).astype(np.float32)
+    return embeddings, f"군집 난수 ({len(topics)}개 주제)"
+
+
+def make_documents(embeddings: np.ndarray) -> List[Dict]:
+    return [{
+        'id': i,
+        'text': f"벤치마크 청크 {i}",
+        'embedding': embeddings[i],
+        'file_name': "bench.pdf",
+        'source_file': "/bench/bench.pdf"
+    } for i in range(len(embeddings))]
+
+
+def directory_size(path: Path, pattern: str) -> int:
+    return sum(f.stat().st_size for f in path.rglob(pattern) if f.is_file())
+
+
+def run_queries(db, queries: np.ndarray, top_k: int, **knobs) -> Tuple[List[List[str]], List[float]]:
+    ids, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results = db.search_similar(query, top_k=top_k, **knobs)
+        latencies.append((time.perf_counter() - started) * 1000)
+        ids.append([r['id'] for r in results])
+    return ids, latencies
+
+
+def recall(reference: List[List[str]], ids: List[List[str]]) -> float:
+    return statistics.mean(len(set(a) & set(b)) / max(len(a), 1) for a, b in zip(reference, ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN 벡터 백엔드 재현율-지연 시간 보고서")
+    parser.add_argument("--store", default=None, help="exact 백엔드 저장소 디렉토리 (기본: 설정의 컬렉션)")
+    parser.add_argument("--embeddings", default=None, help="(n, d) 임베딩 .npy 파일")
+    parser.add_argument("--count", type=int, default=30000, help="난수 임베딩 청크 수")
+    parser.add_argument("--dim", type=int, default=384, help="난수 임베딩 차원")
+    parser.add_argument("--backends", default="hnsw,ivfpq", help="쉼표로 구분한 ANN 백엔드")
+    parser.add_argument("--queries", type=int, default=200, help="질문 수")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--report", default=None, help="마크다운 보고서 저장 경로")
+    args = parser.parse_args()
+
+    embeddings, source = load_embeddings(args)
+    rng = np.random.default_rng(0)
+    # 질문은 저장된 청크 근처의 점 (실제 질문처럼 가까운 이웃이 존재)
+    picks = rng.choice(len(embeddings), size=min(args.queries, len(embeddings)), replace=False)
+    noise = rng.normal(size=(len(picks), embeddings.shape[1])).astype(np.float32)
+    queries = embeddings[picks] + 0.3 * np.linalg.norm(embeddings[picks], axis=1, keepdims=True) * \
+        noise / np.sqrt(embeddings.shape[1])
+    documents = make_documents(embeddings)
+    print(f"코퍼스: {source}, {len(embeddings)}개 x {embeddings.shape[1]}차원, 질문: {len(queries)}개")
+
+    lines = [
+        "# ANN 재현율-지연 시간 보고서",
+        "",
+        f"- 코퍼스: {source} ({len(embeddings)}개 x {embeddings.shape[1]}차원)",
+        f"- 질문: {len(queries)}개, top_k={args.top_k}, 기준: exact 백엔드",
+        ""
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        exact = create_vector_database("exact", db_path=str(Path(temp_dir) / "exact"),
+                                       collection_name="bench", enable_lexical_index=False)
+        exact.add_documents(documents)
+        exact.search_similar(queries[0], top_k=args.top_k)  # 워밍업
+        reference, exact_latencies = run_queries(exact, queries, args.top_k)
+        exact_p50 = statistics.median(exact_latencies)
+        exact_bytes = directory_size(Path(temp_dir) / "exact", "embeddings.npy")
+        print(f"exact: p50 {exact_p50:.2f}ms, 벡터 {exact_bytes / 1e6:.1f}MB")
+        lines += [f"- exact: p50 {exact_p50:.2f}ms, 벡터 {exact_bytes / 1e6:.1f}MB", ""]
+
+        for db_type in [name.strip() for name in args.backends.split(",") if name.strip()]:
+            knob, values = SWEEPS[db_type]
+            db_path = Path(temp_dir) / db_type
+            db = create_vector_database(db_type, db_path=str(db_path), collection_name="bench",
+                                        enable_lexical_index=False)
+            db.add_documents(documents)
+
+            started = time.perf_counter()
+            if not db.build_index():
+                print(f"{db_type}: 색인을 사용할 수 없음 (정확 검색으로 동작)")
+                lines += [f"## {db_type}", "", "색인을 사용할 수 없음 (faiss 미설치 또는 컬렉션이 작음)", ""]
+                continue
+            build_seconds = time.perf_counter() - started
+            index_bytes = directory_size(db_path, "ann_*")
+            stats = db.get_collection_stats()
+
+            header = f"{db_type} ({stats['ann_backend']}): 구축 {build_seconds:.1f}s, 색인 {index_bytes / 1e6:.1f}MB"
+            print(f"\n{header}")
+            print(f"{knob:>10}{'recall@k':>10}{'p50 ms':>9}{'mean ms':>9}{'speedup':>9}")
+            lines += [f"## {header}", "", f"| {knob} | recall@{args.top_k} | p50 ms | mean ms | speedup |",
+                      "|---:|---:|---:|---:|---:|"]
+
+            db.search_similar(queries[0], top_k=args.top_k)  # 워밍업
+            for value in values:
+                ids, latencies = run_queries(db, queries, args.top_k, **{knob: value})
+                row_recall = recall(reference, ids)
+                p50, mean = statistics.median(latencies), statistics.mean(latencies)
+                speedup = exact_p50 / p50 if p50 else 0.0
+                print(f"{value:>10}{row_recall:>10.3f}{p50:>9.2f}{mean:>9.2f}{speedup:>8.1f}x")
+                lines.append(f"| {value} | {row_recall:.3f} | {p50:.2f} | {mean:.2f} | {speedup:.1f}x |")
+            lines.append("")
+
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        print(f"\n보고서 저장: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
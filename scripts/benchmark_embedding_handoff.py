@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+임베딩 전달 경로 메모리 할당 측정
+- 임베더 출력 (n, d) float32 행렬이 벡터 저장소 호출 직전까지 만드는 할당 횟수/바이트를 1천 청크 기준으로 측정 (tracemalloc)
+- 이전 방식: 문서 dict 복사(doc.copy()) + 청크마다 embedding.tolist() + 질문 벡터 tolist()
+- 현재 방식: 문서 dict에 행 뷰를 그대로 부착 + 행렬 한 번 정리(as_embedding_matrix) + 경계에서만 변환(chroma_embeddings)
+- ChromaDB 0.4.x(리스트 필요)와 0.5 이상(numpy 그대로) 경계 변환을 모두 보고
+"""
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data.vectors.vector_utils import as_embedding_matrix
+from data.vectors.chroma_compat import CHROMA_ACCEPTS_NDARRAY
+
+
+def make_documents(count: int) -> List[Dict]:
+    return [{
+        'id': i,
+        'text': f"벤치마크 청크 {i}",
+        'file_name': "bench.pdf",
+        'source_file': "/bench/bench.pdf"
+    } for i in range(count)]
+
+
+def before_ingest(documents: List[Dict], matrix: np.ndarray, as_list: bool):
+    """이전 방식: 복사본 dict + 청크별 리스트 변환"""
+    embedded_docs = []
+    for doc, embedding in zip(documents, matrix):
+        embedded_doc = doc.copy()
+        embedded_doc['embedding'] = embedding
+        embedded_docs.append(embedded_doc)
+    return embedded_docs, [doc['embedding'].tolist() for doc in embedded_docs]
+
+
+def after_ingest(documents: List[Dict], matrix: np.ndarray, as_list: bool):
+    """현재 방식: 행 뷰 부착 + 행렬 단위 경계 변환"""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    for doc, embedding in zip(documents, matrix):
+        doc['embedding'] = embedding
+    stacked = as_embedding_matrix(matrix)
+    return documents, (stacked.tolist() if as_list else stacked)
+
+
+def before_query(queries: np.ndarray, as_list: bool):
+    return [[query.tolist()] for query in queries]
+
+
+def after_query(queries: np.ndarray, as_list: bool):
+    results = []
+    for query in queries:
+        matrix = as_embedding_matrix(query)
+        results.append(matrix.tolist() if as_list else matrix)
+    return results
+
+
+def measure(func: Callable, *args) -> Tuple[int, int, int]:
+    """(경계까지 남는 할당 블록 수, 남는 바이트, 최대 사용 바이트)"""
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1] - start_bytes
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = snapshot.compare_to(baseline, "filename")
+    blocks = sum(max(stat.count_diff, 0) for stat in stats)
+    size = sum(max(stat.size_diff, 0) for stat in stats)
+    del result
+    return blocks, size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 전달 경로 메모리 할당 측정")
+    parser.add_argument("--chunks", type=int, default=1000, help="청크 수")
+    parser.add_argument("--dim", type=int, default=768, help="임베딩 차원")
+    parser.add_argument("--queries", type=int, default=100, help="질문 수")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(args.chunks, args.dim)).astype(np.float32)
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+    scale = 1000 / args.chunks
+
+    print(f"청크 {args.chunks}개 x {args.dim}차원, 질문 {args.queries}개 "
+          f"(설치된 ChromaDB numpy 수용: {CHROMA_ACCEPTS_NDARRAY})")
+    print(f"{'경로':<16}{'경계 형식':>10}{'블록/1k':>12}{'MB/1k':>10}{'최대 MB/1k':>12}")
+    for name, func, inputs in [
+        ("수집 (이전)", before_ingest, lambda: (make_documents(args.chunks), matrix)),
+        ("수집 (현재)", after_ingest, lambda: (make_documents(args.chunks), matrix)),
+        ("질문 (이전)", before_query, lambda: (queries,)),
+        ("질문 (현재)", after_query, lambda: (queries,))
+    ]:
+        for as_list in (True, False):
+            if func in (before_ingest, before_query) and not as_list:
+                continue
+            blocks, size, peak = measure(func, *inputs(), as_list)
+            per = scale if func in (before_ingest, after_ingest) else 1000 / max(args.queries, 1)
+            label = "list" if as_list else "ndarray"
+            print(f"{name:<16}{label:>10}{blocks * per:>12.0f}{size * per / 1e6:>10.2f}{peak * per / 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+청크 메타데이터 강화 처리량 벤치마크
+- 처리된 문서(data/processed/*_processed.json)의 청크로 EnhancedVectorEngine.prepare_document_chunks를 반복 실행하여 chunks/sec 측정
+- chunk 모드(청크마다 텍스트 특성 계산)와 document 모드(문서의 청크 전체를 한 번에 계산)를 비교
+- 문서 메타데이터 추출은 측정에서 제외 (청크 강화 단계만 측정)
+- CHUNK_FEATURES_MODE가 없는 이전 버전에서 실행하면 기존 방식 하나만 측정하므로 변경 전/후 비교에 사용 가능
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.enhanced_vector_engine import EnhancedVectorEngine
+
+
+def load_documents(processed_dir: str, min_chunks: int) -> List[Dict[str, Any]]:
+    """처리된 문서 로드 (청크가 없으면 엔진의 청킹 규칙으로 생성, 청크가 적으면 본문을 반복해서 채움)"""
+    engine = EnhancedVectorEngine({}, load_models=False)
+    documents = []
+    for path in sorted(Path(processed_dir).glob("*_processed.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        chunks = doc.get("chunks") or engine._create_chunks_from_processed_doc(doc)
+        if not chunks:
+            continue
+        while len(chunks) < min_chunks:
+            chunks = chunks + chunks
+        doc["chunks"] = chunks
+        documents.append(doc)
+    return documents
+
+
+def measure(engine: EnhancedVectorEngine, documents: List[Dict[str, Any]], repeat: int) -> float:
+    """chunks/sec 측정"""
+    total_chunks = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for doc in documents:
+            total_chunks += len(engine.prepare_document_chunks(doc, metadata={}))
+    elapsed = time.perf_counter() - start
+    return total_chunks / elapsed if elapsed else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="청크 메타데이터 강화 처리량 벤치마크")
+    parser.add_argument("--processed", default="data/processed", help="처리된 문서 디렉토리")
+    parser.add_argument("--min-chunks", type=int, default=200, help="문서당 최소 청크 수")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수")
+    args = parser.parse_args()
+
+    documents = load_documents(args.processed, args.min_chunks)
+    if not documents:
+        print("벤치마크할 문서가 없습니다.")
+        return
+    print(f"문서: {len(documents)}개, 청크: {sum(len(doc['chunks']) for doc in documents)}개")
+
+    results = {}
+    probe = EnhancedVectorEngine({}, load_models=False)
+    if hasattr(probe, "chunk_features_mode"):
+        for mode in ("chunk", "document"):
+            engine = EnhancedVectorEngine({"CHUNK_FEATURES_MODE": mode}, load_models=False)
+            measure(engine, documents, 1)  # 워밍업 (키워드 오토마톤 구축)
+            results[mode] = measure(engine, documents, args.repeat)
+    else:
+        measure(probe, documents, 1)
+        results["per-helper (legacy)"] = measure(probe, documents, args.repeat)
+
+    print(f"\n{'mode':<22}{'chunks/sec':>14}")
+    for mode, chunks_per_sec in results.items():
+        print(f"{mode:<22}{chunks_per_sec:>14.0f}")
+
+    if "chunk" in results and results["chunk"]:
+        print(f"\ndocument/chunk: {results['document'] / results['chunk']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
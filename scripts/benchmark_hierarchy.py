@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+계층 분석 라인 처리량 벤치마크
+- 별표 문서 코퍼스의 각 라인을 기존 순차 패턴 매칭(match_hierarchy_patterns_sequential)과
+  컴파일된 단일 정규식 분류(DocumentHierarchyAnalyzer._match_hierarchy_patterns)로 각각 처리하여 lines/sec 비교
+- 두 방식의 분류 결과가 같은지도 함께 확인
+- 이미 처리된 문서(data/processed/*_processed.json)가 있으면 재사용, 없으면 PDF 텍스트 추출
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.document_hierarchy_analyzer import DocumentHierarchyAnalyzer, HierarchyLevel, HierarchyNode
+
+
+def match_hierarchy_patterns_sequential(analyzer: DocumentHierarchyAnalyzer, line: str,
+                                        line_num: int) -> Optional[HierarchyNode]:
+    """텍스트 라인을 계층 패턴과 순차 매칭 (컴파일된 단일 정규식 이전 방식, 비교 기준)"""
+    # 법령 조항 패턴
+    for pattern in analyzer.document_patterns["legal_article"]:
+        match = re.match(pattern, line)
+        if match:
+            number = match.group(1)
+            title = match.group(3) if len(match.groups()) >= 3 else ""
+            return HierarchyNode(
+                level=HierarchyLevel.ARTICLE,
+                number=f"제{number}조",
+                title=title,
+                content=line,
+                metadata={"line_number": line_num, "pattern_type": "legal_article"}
+            )
+
+    # 법령 항 패턴
+    for pattern in analyzer.document_patterns["legal_paragraph"]:
+        match = re.match(pattern, line)
+        if match:
+            content = match.group(1)
+            return HierarchyNode(
+                level=HierarchyLevel.PARAGRAPH,
+                number=line[0],  # ①, ②, ③
+                title="",
+                content=content,
+                metadata={"line_number": line_num, "pattern_type": "legal_paragraph"}
+            )
+
+    # 장 패턴
+    for pattern in analyzer.document_patterns["chapter"]:
+        match = re.match(pattern, line)
+        if match:
+            if "제" in pattern:  # 제1장 형태
+                number = match.group(1)
+                title = match.group(2)
+                return HierarchyNode(
+                    level=HierarchyLevel.CHAPTER,
+                    number=f"제{number}장",
+                    title=title,
+                    content=line,
+                    metadata={"line_number": line_num, "pattern_type": "chapter"}
+                )
+            else:  # 1. 형태
+                number = match.group(1)
+                title = match.group(2)
+                return HierarchyNode(
+                    level=HierarchyLevel.CHAPTER,
+                    number=number,
+                    title=title,
+                    content=line,
+                    metadata={"line_number": line_num, "pattern_type": "chapter"}
+                )
+
+    # 절 패턴
+    for pattern in analyzer.document_patterns["section"]:
+        match = re.match(pattern, line)
+        if match:
+            if "제" in pattern:  # 제1절 형태
+                number = match.group(1)
+                title = match.group(2)
+                return HierarchyNode(
+                    level=HierarchyLevel.SECTION,
+                    number=f"제{number}절",
+                    title=title,
+                    content=line,
+                    metadata={"line_number": line_num, "pattern_type": "section"}
+                )
+            else:  # 1.1 형태
+                number = f"{match.group(1)}.{match.group(2)}"
+                title = match.group(3)
+                return HierarchyNode(
+                    level=HierarchyLevel.SECTION,
+                    number=number,
+                    title=title,
+                    content=line,
+                    metadata={"line_number": line_num, "pattern_type": "section"}
+                )
+
+    # 별표/부록 패턴
+    for pattern in analyzer.document_patterns["annex"]:
+        match = re.match(pattern, line)
+        if match:
+            number = match.group(1)
+            title = match.group(2) if len(match.groups()) >= 2 else ""
+            return HierarchyNode(
+                level=HierarchyLevel.ANNEX,
+                number=number,
+                title=title,
+                content=line,
+                metadata={"line_number": line_num, "pattern_type": "annex"}
+            )
+
+    # 번호 매기기 패턴
+    for pattern in analyzer.document_patterns["legal_item"]:
+        match = re.match(pattern, line)
+        if match:
+            number = match.group(1)
+            content = match.group(2)
+            return HierarchyNode(
+                level=HierarchyLevel.ITEM,
+                number=number,
+                title="",
+                content=content,
+                metadata={"line_number": line_num, "pattern_type": "legal_item"}
+            )
+
+    return None
+
+
+def load_lines(documents_dir: str, processed_dir: str, pattern: str) -> List[str]:
+    """벤치마크용 라인 로드 (빈 줄 제외)"""
+    texts = []
+    processed_path = Path(processed_dir)
+    for pdf_path in sorted(Path(documents_dir).glob(pattern)):
+        cached = processed_path / f"{pdf_path.stem}_processed.json"
+        if cached.exists():
+            with open(cached, "r", encoding="utf-8") as f:
+                texts.append(json.load(f)["content"]["document"])
+            continue
+
+        try:
+            import fitz
+        except ImportError:
+            continue
+        with fitz.open(str(pdf_path)) as doc:
+            texts.append("\n".join(page.get_text() for page in doc))
+
+    return [line.strip() for text in texts for line in text.split("\n") if line.strip()]
+
+
+def measure(match_fn: Callable, lines: List[str], repeat: int) -> float:
+    """lines/sec 측정"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for line_num, line in enumerate(lines):
+            match_fn(line, line_num)
+    elapsed = time.perf_counter() - start
+    return len(lines) * repeat / elapsed if elapsed else 0.0
+
+
+def same_node(a, b) -> bool:
+    if a is None or b is None:
+        return a is b
+    return (a.level, a.number, a.title, a.content, a.metadata) == (b.level, b.number, b.title, b.content, b.metadata)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="계층 분석 라인 처리량 벤치마크")
+    parser.add_argument("--documents", default="data/documents", help="PDF 문서 디렉토리")
+    parser.add_argument("--processed", default="data/processed", help="처리 결과 캐시 디렉토리")
+    parser.add_argument("--pattern", default="*별표*.pdf", help="코퍼스 파일 패턴")
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수")
+    args = parser.parse_args()
+
+    lines = load_lines(args.documents, args.processed, args.pattern)
+    if not lines:
+        print("벤치마크할 문서가 없습니다.")
+        return
+
+    analyzer = DocumentHierarchyAnalyzer()
+    sequential = partial(match_hierarchy_patterns_sequential, analyzer)
+    mismatches = sum(
+        not same_node(sequential(line, i),
+                      analyzer._match_hierarchy_patterns(line, i))
+        for i, line in enumerate(lines)
+    )
+    print(f"코퍼스: {len(lines)}개 라인, 분류 불일치: {mismatches}개")
+
+    results = {
+        "before (sequential)": measure(sequential, lines, args.repeat),
+        "after (compiled)": measure(analyzer._match_hierarchy_patterns, lines, args.repeat)
+    }
+
+    print(f"\n{'mode':<22}{'lines/sec':>14}")
+    for mode, lines_per_sec in results.items():
+        print(f"{mode:<22}{lines_per_sec:>14.0f}")
+
+    before = results["before (sequential)"]
+    if before:
+        print(f"\nspeedup: {results['after (compiled)'] / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+하이브리드 검색 지연 시간 벤치마크
+- PowerMarketRAG.ask(search_method="hybrid")를 기존 가중합 방식과 단일 패스 융합 방식으로 각각 실행
+- 답변 캐시는 끄고 질문별 지연 시간의 p50/p95 비교
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from power_market_rag import PowerMarketRAG
+
+DEFAULT_QUESTIONS = [
+    "하루전발전계획이 무엇인가요?",
+    "계통운영의 기본 원칙은 무엇인가요?",
+    "전력시장에서 예비력의 역할은?",
+    "실시간 급전 지시는 어떻게 이루어지나요?",
+    "송전제약이 발생하면 발전계획은 어떻게 조정되나요?",
+    "입찰 가격은 어떻게 결정되나요?"
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_mode(config_path: str, mode: str, questions: List[str], repeat: int) -> Dict[str, float]:
+    """지정한 하이브리드 방식으로 질문들을 반복 실행하여 지연 시간 측정"""
+    rag = PowerMarketRAG(config_path)
+    rag.config["HYBRID_SEARCH_MODE"] = mode
+    rag.config["ANSWER_CACHE_ENABLED"] = False
+    if not rag.initialize():
+        raise RuntimeError("RAG 시스템 초기화 실패")
+
+    # 모델/색인 준비 (측정 제외)
+    rag.ask(questions[0], search_method="hybrid")
+
+    latencies = []
+    for _ in range(repeat):
+        for question in questions:
+            start = time.perf_counter()
+            rag.ask(question, search_method="hybrid")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": percentile(latencies, 0.95),
+        "mean_ms": statistics.mean(latencies),
+        "queries": len(latencies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="하이브리드 검색 지연 시간 벤치마크")
+    parser.add_argument("--config", default="config/config.yaml", help="설정 파일 경로")
+    parser.add_argument("--repeat", type=int, default=5, help="질문 세트 반복 횟수")
+    args = parser.parse_args()
+
+    results = {
+        "before (weighted)": run_mode(args.config, "weighted", DEFAULT_QUESTIONS, args.repeat),
+        "after (fused)": run_mode(args.config, "fused", DEFAULT_QUESTIONS, args.repeat)
+    }
+
+    print(f"\n{'mode':<20}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'queries':>9}")
+    for mode, stats in results.items():
+        print(f"{mode:<20}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['mean_ms']:>10.1f}{stats['queries']:>9}")
+
+    before = results["before (weighted)"]["p50_ms"]
+    after = results["after (fused)"]["p50_ms"]
+    if after:
+        print(f"\np50 speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+벡터 적재 벤치마크
+- data/documents 코퍼스를 기존 방식(항목별 인코딩/저장)과 배치 방식으로 각각 적재하여 docs/sec 비교
+- 이미 처리된 문서(data/processed/*_processed.json)가 있으면 재사용, 없으면 PDF를 처리
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.vector_engine import VectorEngine
+
+
+def load_corpus(documents_dir: str, processed_dir: str, limit: int = 0) -> List[Dict[str, Any]]:
+    """벤치마크용 처리 문서 로드"""
+    corpus = []
+    processed_path = Path(processed_dir)
+    pdf_files = sorted(Path(documents_dir).glob("*.pdf"))
+    if limit:
+        pdf_files = pdf_files[:limit]
+
+    processor = None
+    for pdf_path in pdf_files:
+        cached = processed_path / f"{pdf_path.stem}_processed.json"
+        if cached.exists():
+            with open(cached, "r", encoding="utf-8") as f:
+                corpus.append(json.load(f))
+            continue
+
+        if processor is None:
+            from core.multimodal_processor import MultimodalProcessor
+            processor = MultimodalProcessor()
+        processed_doc = processor.process_document(str(pdf_path))
+        if processed_doc:
+            corpus.append(processed_doc)
+
+    return corpus
+
+
+def run_ingestion(corpus: List[Dict[str, Any]], batched: bool, model_name: str) -> Dict[str, float]:
+    """임시 디렉토리에 코퍼스를 적재하고 처리량 측정"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = VectorEngine(data_dir=temp_dir, dense_model=model_name, enable_sparse=False)
+
+        item_count = 0
+        start = time.perf_counter()
+        for doc in corpus:
+            content = doc["content"]
+            engine.add_document(doc["document_id"], content, doc.get("metadata", {}), batched=batched)
+            item_count += 1 + sum(len(content.get(key, [])) for key in ("sections", "paragraphs", "sentences"))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "documents": len(corpus),
+        "items": item_count,
+        "seconds": elapsed,
+        "docs_per_sec": len(corpus) / elapsed if elapsed else 0.0,
+        "items_per_sec": item_count / elapsed if elapsed else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 적재 처리량 벤치마크")
+    parser.add_argument("--documents", default="data/documents", help="PDF 문서 디렉토리")
+    parser.add_argument("--processed", default="data/processed", help="처리 결과 캐시 디렉토리")
+    parser.add_argument("--model", default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    parser.add_argument("--limit", type=int, default=0, help="사용할 최대 문서 수 (0이면 전체)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.documents, args.processed, args.limit)
+    if not corpus:
+        print("벤치마크할 문서가 없습니다.")
+        return
+
+    print(f"코퍼스: {len(corpus)}개 문서")
+
+    results = {
+        "before (per-item)": run_ingestion(corpus, batched=False, model_name=args.model),
+        "after (batched)": run_ingestion(corpus, batched=True, model_name=args.model)
+    }
+
+    print(f"\n{'mode':<20}{'docs/sec':>12}{'items/sec':>12}{'seconds':>10}")
+    for mode, stats in results.items():
+        print(f"{mode:<20}{stats['docs_per_sec']:>12.2f}{stats['items_per_sec']:>12.1f}{stats['seconds']:>10.2f}")
+
+    before = results["before (per-item)"]["docs_per_sec"]
+    after = results["after (batched)"]["docs_per_sec"]
+    if before:
+        print(f"\nspeedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
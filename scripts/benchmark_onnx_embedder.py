@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+ONNX Runtime / int8 임베딩 백엔드 정확도 및 지연 시간 벤치마크
+- 설정의 EMBEDDING_MODEL을 EMBEDDING_ONNX_PATH 아래로 내보내기 (없을 때만, --export로 다시 내보내기)
+- 정확도: 청크 저장소(CHUNK_STORE_PATH / COLLECTION_NAME)의 청크 본문으로 fp32 PyTorch 모델과 onnx / onnx-int8 임베딩의
+  행별 코사인 일치도(평균, 최솟값, 1% 분위)와 청크 간 최근접 이웃 top-k 일치율 측정
+- 지연 시간/처리량: 같은 하드웨어에서 배치 크기 1, 8, 32, 128마다 encode 한 번의 p50/p95 지연과 초당 텍스트 수 측정
+- --min-cosine보다 int8 평균 코사인이 낮으면 종료 코드 1
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import yaml
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data.vectors.chunk_store import ChunkStore
+from embeddings.model_registry import get_model_registry
+from embeddings.onnx_backend import export_onnx_model, onnx_model_dir, onnx_model_exists
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def load_texts(config: Dict[str, Any], limit: int) -> List[str]:
+    """청크 저장소에서 청크 본문 읽기"""
+    store = ChunkStore(config.get("CHUNK_STORE_PATH") or "./data/chunks")
+    level = config.get("COLLECTION_NAME", "power_market_docs")
+    if level not in store:
+        return []
+    texts = []
+    for batch in store.iter_batches(level, with_embeddings=False, batch_size=min(limit, 5000)):
+        texts.extend(text for text in batch.texts if text and text.strip())
+        if len(texts) >= limit:
+            break
+    return texts[:limit]
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    return embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+
+def agreement(reference: np.ndarray, candidate: np.ndarray, top_k: int = 10, queries: int = 200) -> Dict[str, float]:
+    """행별 코사인 일치도 + 청크 간 최근접 이웃 top-k 일치율"""
+    reference = _normalize(reference)
+    candidate = _normalize(candidate)
+    cosine = (reference * candidate).sum(axis=1)
+
+    rows = np.arange(min(queries, len(reference)))
+    k = min(top_k, len(reference) - 1)
+    overlap = 0.0
+    if k > 0:
+        ref_scores = reference[rows] @ reference.T
+        cand_scores = candidate[rows] @ candidate.T
+        ref_scores[rows, rows] = -np.inf
+        cand_scores[rows, rows] = -np.inf
+        ref_top = np.argpartition(-ref_scores, k - 1, axis=1)[:, :k]
+        cand_top = np.argpartition(-cand_scores, k - 1, axis=1)[:, :k]
+        overlap = float(np.mean([len(set(a) & set(b)) / k for a, b in zip(ref_top, cand_top)]))
+
+    return {
+        "cosine_mean": float(cosine.mean()),
+        "cosine_min": float(cosine.min()),
+        "cosine_p1": float(np.percentile(cosine, 1)),
+        f"neighbors@{k}": overlap
+    }
+
+
+def latency(model, texts: List[str], batch_size: int, repeat: int) -> Dict[str, float]:
+    """배치 한 번 encode의 지연 시간(ms)과 처리량(텍스트/초)"""
+    batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+    batches = [batch for batch in batches if len(batch) == batch_size] or [texts[:batch_size]]
+    model.encode(batches[0], batch_size=batch_size)  # 워밍업
+
+    timings = []
+    encoded = 0
+    for index in range(repeat):
+        batch = batches[index % len(batches)]
+        started = time.perf_counter()
+        model.encode(batch, batch_size=batch_size)
+        timings.append(time.perf_counter() - started)
+        encoded += len(batch)
+
+    timings_ms = sorted(seconds * 1000 for seconds in timings)
+    return {
+        "p50_ms": statistics.median(timings_ms),
+        "p95_ms": timings_ms[min(len(timings_ms) - 1, int(len(timings_ms) * 0.95))],
+        "texts_per_second": encoded / sum(timings)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX Runtime / int8 임베딩 백엔드 벤치마크")
+    parser.add_argument("--config", default=str(project_root / "config" / "config.yaml"))
+    parser.add_argument("--model", default=None, help="모델 이름 (기본: EMBEDDING_MODEL)")
+    parser.add_argument("--onnx-path", default=None, help="ONNX 내보내기 경로 (기본: EMBEDDING_ONNX_PATH)")
+    parser.add_argument("--export", action="store_true", help="이미 내보낸 모델이 있어도 다시 내보내기")
+    parser.add_argument("--limit", type=int, default=2000, help="정확도 측정에 사용할 청크 수")
+    parser.add_argument("--batch-sizes", default="1,8,32,128")
+    parser.add_argument("--repeat", type=int, default=20, help="배치 크기별 측정 횟수")
+    parser.add_argument("--min-cosine", type=float, default=0.99, help="int8 평균 코사인 하한")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    config = {}
+    if Path(args.config).exists():
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+
+    model_name = args.model or config.get("EMBEDDING_MODEL",
+                                          "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    model_dir = onnx_model_dir(model_name, args.onnx_path or config.get("EMBEDDING_ONNX_PATH") or "./models/onnx")
+    if args.export or not onnx_model_exists(model_dir):
+        started = time.perf_counter()
+        export_onnx_model(model_name, model_dir, overwrite=args.export)
+        print(f"내보내기: {model_dir} ({time.perf_counter() - started:.1f}s)")
+    for path in sorted(model_dir.glob("*.onnx")):
+        print(f"  {path.name}: {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+    texts = load_texts(config, args.limit)
+    if not texts:
+        print("청크 저장소에 청크가 없습니다. 문서를 먼저 적재하세요")
+        return 1
+    print(f"청크 {len(texts)}개, 모델 {model_name}")
+
+    registry = get_model_registry()
+    models = {backend: registry.acquire(model_name if backend == "torch" else str(model_dir), backend=backend)
+              for backend in BACKENDS}
+    results: Dict[str, Any] = {"model": model_name, "chunks": len(texts), "accuracy": {}, "latency": {}}
+
+    # 1. 정확도 (fp32 PyTorch 기준)
+    embeddings = {}
+    for backend, model in models.items():
+        started = time.perf_counter()
+        embeddings[backend] = np.asarray(model.encode(texts, batch_size=32), dtype=np.float32)
+        print(f"{backend}: 전체 인코딩 {time.perf_counter() - started:.1f}s")
+    for backend in BACKENDS[1:]:
+        results["accuracy"][backend] = agreement(embeddings["torch"], embeddings[backend])
+        print(f"정확도 {backend}: " + ", ".join(f"{key} {value:.4f}"
+                                               for key, value in results["accuracy"][backend].items()))
+
+    # 2. 지연 시간 / 처리량
+    print(f"\n{'backend':<10} {'batch':>5} {'p50 ms':>9} {'p95 ms':>9} {'texts/s':>9}")
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        for backend, model in models.items():
+            stats = latency(model, texts, batch_size, args.repeat)
+            results["latency"].setdefault(str(batch_size), {})[backend] = stats
+            print(f"{backend:<10} {batch_size:>5} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+                  f"{stats['texts_per_second']:>9.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    cosine = results["accuracy"]["onnx-int8"]["cosine_mean"]
+    if cosine < args.min_cosine:
+        print(f"\nint8 평균 코사인 {cosine:.4f} < {args.min_cosine}: EMBEDDING_BACKEND onnx-int8 사용 비권장")
+        return 1
+    print(f"\nint8 평균 코사인 {cosine:.4f} >= {args.min_cosine}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+계층 검색 지연 시간/재현율 벤치마크
+- 처리된 문서(data/processed/*_processed.json)를 임시 디렉토리의 VectorEngine에 적재한 뒤 쿼리별 지연 시간 측정
+- sequential: 레벨마다 쿼리를 다시 인코딩하여 순서대로 검색 (기존 방식)
+- fan-out: 쿼리를 한 번만 인코딩하고 4개 레벨을 스레드 풀에서 동시에 검색 (flat 모드)
+- cascade: 문서 -> 섹션 -> 문단 -> 문장 순으로 부모 document_id 범위를 좁혀 검색 (cascade 모드)
+- cascade의 문장 top-k를 전체 문장 검색 결과와 비교한 recall@k와 실제 검색 범위(문장 수 비율) 출력
+- 문서 수가 적으면 --copies로 문서 ID만 바꿔 코퍼스를 복제
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.vector_engine import VectorEngine
+
+DEFAULT_QUERIES = [
+    "하루전 발전계획 수립 절차",
+    "계통한계가격 결정 방법",
+    "수요반응자원 전력거래 운영",
+    "전기소비형태 검증 기준",
+    "용량가격 정산 절차",
+    "급전지시 이행 여부 확인",
+    "예비력 확보 기준",
+    "전력거래시스템 등록 절차"
+]
+
+
+def load_corpus(processed_dir: str, copies: int) -> List[Dict[str, Any]]:
+    """처리된 문서 로드 (copies > 1이면 문서 ID를 바꿔 복제)"""
+    corpus = []
+    for path in sorted(Path(processed_dir).glob("*_processed.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        for copy_index in range(copies):
+            document_id = doc["document_id"] if copies == 1 else f"{doc['document_id']}_copy{copy_index}"
+            corpus.append({
+                "document_id": document_id,
+                "content": doc["content"],
+                "metadata": doc.get("metadata", {})
+            })
+    return corpus
+
+
+def measure(run: Callable[[str], Any], queries: List[str], repeat: int) -> Dict[str, float]:
+    """쿼리별 지연 시간(ms) 평균/p95"""
+    for query in queries:
+        run(query)  # 워밍업
+    latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            run(query)
+            latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="계층 검색 지연 시간/재현율 벤치마크")
+    parser.add_argument("--processed", default="data/processed", help="처리된 문서 디렉토리")
+    parser.add_argument("--model", default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    parser.add_argument("--copies", type=int, default=1, help="코퍼스 복제 수")
+    parser.add_argument("--top-k", type=int, default=10, help="문장 레벨 top-k")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+    parser.add_argument("--cascade-documents", type=int, default=5)
+    parser.add_argument("--cascade-sections", type=int, default=20)
+    parser.add_argument("--cascade-paragraphs", type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.processed, args.copies)
+    if not corpus:
+        print("벤치마크할 문서가 없습니다.")
+        return
+
+    sentence_counts = {
+        doc["document_id"]: sum(1 for s in doc["content"].get("sentences", []) if s.get("content"))
+        for doc in corpus
+    }
+    total_sentences = sum(sentence_counts.values())
+    print(f"문서: {len(corpus)}개, 문장: {total_sentences}개, 쿼리: {len(DEFAULT_QUERIES)}개")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = VectorEngine(
+            data_dir=temp_dir,
+            dense_model=args.model,
+            enable_sparse=False,
+            cascade_documents=args.cascade_documents,
+            cascade_sections=args.cascade_sections,
+            cascade_paragraphs=args.cascade_paragraphs
+        )
+        engine.add_documents(corpus)
+
+        per_level_k = max(1, args.top_k // len(engine.LEVELS))
+
+        def sequential(query: str):
+            return [engine._search_level(query, level, "hybrid", per_level_k) for level in engine.LEVELS]
+
+        modes = {
+            "sequential (legacy)": sequential,
+            "fan-out": lambda query: engine.search(query, top_k=args.top_k, mode="flat", ai_friendly=False),
+            "cascade": lambda query: engine.search(query, top_k=args.top_k, mode="cascade", ai_friendly=False),
+            "sentence exhaustive": lambda query: engine.search(
+                query, level="sentence", top_k=args.top_k, mode="flat", ai_friendly=False),
+            "sentence cascade": lambda query: engine.search(
+                query, level="sentence", top_k=args.top_k, mode="cascade", ai_friendly=False)
+        }
+        results = {name: measure(run, DEFAULT_QUERIES, args.repeat) for name, run in modes.items()}
+
+        # recall@k: cascade 문장 결과 중 전체 문장 검색 top-k에 포함된 비율
+        # 검색 범위: 문장 단계의 부모 문서(문단 단계 결과의 document_id)에 속한 문장 수 / 전체 문장 수
+        recalls = []
+        scopes = []
+        for query in DEFAULT_QUERIES:
+            exact = engine.search(query, level="sentence", top_k=args.top_k, mode="flat", ai_friendly=False)
+            cascade = engine.search(query, level="sentence", top_k=args.top_k, mode="cascade", ai_friendly=False)
+            exact_ids = {hit["id"] for hit in exact.get("sentence", [])}
+            cascade_ids = {hit["id"] for hit in cascade.get("sentence", [])}
+            if exact_ids:
+                recalls.append(len(exact_ids & cascade_ids) / len(exact_ids))
+
+            paragraphs = engine.search(query, level="paragraph", top_k=args.cascade_paragraphs,
+                                       mode="cascade", ai_friendly=False).get("paragraph", [])
+            parents = {hit["metadata"].get("document_id") for hit in paragraphs}
+            if parents and total_sentences:
+                scopes.append(sum(sentence_counts.get(doc_id, 0) for doc_id in parents) / total_sentences)
+
+    print(f"\n{'mode':<22}{'mean ms':>10}{'p95 ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<22}{stats['mean_ms']:>10.2f}{stats['p95_ms']:>10.2f}")
+
+    if results["fan-out"]["mean_ms"]:
+        print(f"\nsequential/fan-out: {results['sequential (legacy)']['mean_ms'] / results['fan-out']['mean_ms']:.2f}x")
+    if results["sentence cascade"]["mean_ms"]:
+        print(f"sentence exhaustive/cascade: "
+              f"{results['sentence exhaustive']['mean_ms'] / results['sentence cascade']['mean_ms']:.2f}x")
+    if recalls:
+        print(f"cascade recall@{args.top_k}: {statistics.mean(recalls):.3f}")
+    if scopes:
+        print(f"cascade 문장 검색 범위: 전체의 {statistics.mean(scopes) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
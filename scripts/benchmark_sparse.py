@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+TF-IDF 희소 색인 벤치마크
+- 처리된 문서(data/processed/*_processed.json)를 임시 디렉토리의 VectorEngine에 적재
+- 색인 구축 시간, 마지막 10% 문서 증분 추가 시간과 전체 재구축 시간, 저장/메모리 매핑 로드 시간 측정
+- 레벨별 쿼리 지연 시간을 dense 검색(쿼리 인코딩 + ChromaDB)과 sparse 검색(TF-IDF 색인 + 본문 조회)으로 비교
+- dense/sparse top-k 겹침 비율 출력
+- 문서 수가 적으면 --copies로 문서 ID만 바꿔 코퍼스를 복제
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.vector_engine import VectorEngine
+from retrieval.tfidf_index import TfidfIndex
+
+DEFAULT_QUERIES = [
+    "하루전 발전계획 수립 절차",
+    "계통한계가격 결정 방법",
+    "수요반응자원 전력거래 운영",
+    "전기소비형태 검증 기준",
+    "용량가격 정산 절차",
+    "급전지시 이행 여부 확인",
+    "예비력 확보 기준",
+    "전력거래시스템 등록 절차"
+]
+
+
+def load_corpus(processed_dir: str, copies: int) -> List[Dict[str, Any]]:
+    """처리된 문서 로드 (copies > 1이면 문서 ID를 바꿔 복제)"""
+    corpus = []
+    for path in sorted(Path(processed_dir).glob("*_processed.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        for copy_index in range(copies):
+            document_id = doc["document_id"] if copies == 1 else f"{doc['document_id']}_copy{copy_index}"
+            corpus.append({
+                "document_id": document_id,
+                "content": doc["content"],
+                "metadata": doc.get("metadata", {})
+            })
+    return corpus
+
+
+def timed(func: Callable) -> float:
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(run: Callable[[str], object], queries: List[str], repeat: int) -> float:
+    """쿼리당 평균 지연 시간(ms)"""
+    for query in queries:
+        run(query)  # 워밍업
+    latencies = [timed(lambda: run(query)) for _ in range(repeat) for query in queries]
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TF-IDF 희소 색인 벤치마크")
+    parser.add_argument("--processed", default="data/processed", help="처리된 문서 디렉토리")
+    parser.add_argument("--model", default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    parser.add_argument("--copies", type=int, default=1, help="코퍼스 복제 수")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.processed, args.copies)
+    if not corpus:
+        print("벤치마크할 문서가 없습니다.")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = VectorEngine(data_dir=temp_dir, dense_model=args.model)
+        engine.add_documents(corpus)
+        merged = engine._merge_level_items(corpus)
+        print(f"문서: {len(corpus)}개, " + ", ".join(
+            f"{level}: {len(merged[level]['ids'])}개" for level in engine.LEVELS))
+
+        print(f"\n{'level':<12}{'build ms':>10}{'append ms':>11}{'rebuild ms':>12}{'save ms':>9}{'load ms':>9}")
+        for level in engine.LEVELS:
+            ids, texts = merged[level]["ids"], merged[level]["documents"]
+            if not ids:
+                continue
+            split = max(1, int(len(ids) * 0.9))
+
+            index = TfidfIndex()
+            build_ms = timed(lambda: index.add(ids, texts))
+
+            partial = TfidfIndex()
+            partial.add(ids[:split], texts[:split])
+            append_ms = timed(lambda: partial.add(ids[split:], texts[split:]))
+            rebuild_ms = timed(lambda: TfidfIndex().add(ids, texts))
+
+            index_dir = Path(temp_dir) / "bench_sparse" / level
+            save_ms = timed(lambda: index.save(index_dir))
+            load_ms = timed(lambda: TfidfIndex.load(index_dir))
+            print(f"{level:<12}{build_ms:>10.1f}{append_ms:>11.1f}{rebuild_ms:>12.1f}{save_ms:>9.1f}{load_ms:>9.1f}")
+
+        print(f"\n{'level':<12}{'dense ms':>10}{'sparse ms':>11}{'index ms':>10}{'overlap@k':>11}")
+        for level in engine.LEVELS:
+            if not merged[level]["ids"]:
+                continue
+            index = engine.get_sparse_index(level)
+            dense_ms = measure(lambda q: engine._search_level(q, level, "dense", args.top_k), DEFAULT_QUERIES, args.repeat)
+            sparse_ms = measure(lambda q: engine._search_level(q, level, "sparse", args.top_k), DEFAULT_QUERIES, args.repeat)
+            index_ms = measure(lambda q: index.search(q, args.top_k), DEFAULT_QUERIES, args.repeat)
+
+            overlaps = []
+            for query in DEFAULT_QUERIES:
+                dense_ids = {hit["id"] for hit in engine._search_level(query, level, "dense", args.top_k)}
+                sparse_ids = {hit["id"] for hit in engine._search_level(query, level, "sparse", args.top_k)}
+                if dense_ids:
+                    overlaps.append(len(dense_ids & sparse_ids) / len(dense_ids))
+            overlap = statistics.mean(overlaps) if overlaps else 0.0
+            print(f"{level:<12}{dense_ms:>10.2f}{sparse_ms:>11.2f}{index_ms:>10.2f}{overlap:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+벡터 데이터베이스 백엔드 벤치마크
+- VECTOR_DB_TYPE로 선택 가능한 백엔드(chromadb, exact)를 같은 임베딩으로 적재하고 검색 지연 시간 비교
+- 단일 질문(search_similar)과 일괄 질문(search_similar_batch) 지연 시간, 적재 처리량 측정
+- 임베딩은 기본적으로 정규분포 난수 (검색 비용은 내용과 무관), --embeddings로 (n, d) .npy 파일 지정 가능
+- exact 결과를 기준으로 다른 백엔드의 recall@k 출력
+- 선택도가 다른 메타데이터 필터(1%, 10%, 50%)의 단일 질문 지연 시간과 필터 계획, 반환 결과 수 비교
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data.vectors.factory import create_vector_database
+
+
+# 이름 -> (where 필터, 대략적인 일치 비율)
+FILTERS = {
+    "1%": ({"market_domain": "수요반응"}, 0.01),
+    "10%": ({"market_domain": "정산"}, 0.10),
+    "50%": ({"has_tables": True}, 0.50)
+}
+
+
+def make_documents(embeddings: np.ndarray) -> List[Dict]:
+    return [{
+        'id': i,
+        'text': f"벤치마크 청크 {i}",
+        'embedding': embeddings[i],
+        'file_name': f"bench{i % 50}.pdf",
+        'source_file': f"/bench/bench{i % 50}.pdf",
+        'market_domain': "수요반응" if i % 100 == 0 else "정산" if i % 10 == 1 else "전력거래",
+        'has_tables': i % 2 == 0
+    } for i in range(len(embeddings))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 데이터베이스 백엔드 벤치마크")
+    parser.add_argument("--backends", default="exact,chromadb", help="쉼표로 구분한 VECTOR_DB_TYPE 목록")
+    parser.add_argument("--count", type=int, default=30000, help="청크 수")
+    parser.add_argument("--dim", type=int, default=384, help="임베딩 차원")
+    parser.add_argument("--embeddings", default=None, help="(n, d) 임베딩 .npy 파일")
+    parser.add_argument("--queries", type=int, default=64, help="질문 수")
+    parser.add_argument("--batch-size", type=int, default=32, help="일괄 검색 질문 수")
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.embeddings:
+        embeddings = np.load(args.embeddings).astype(np.float32)
+    else:
+        embeddings = rng.normal(size=(args.count, args.dim)).astype(np.float32)
+    # 질문은 저장된 청크 근처의 점 (실제 질문처럼 가까운 이웃이 존재)
+    picks = rng.choice(len(embeddings), size=args.queries, replace=False)
+    queries = embeddings[picks] + 0.3 * rng.normal(size=(args.queries, embeddings.shape[1])).astype(np.float32)
+    documents = make_documents(embeddings)
+    print(f"청크: {len(embeddings)}개 x {embeddings.shape[1]}차원, 질문: {args.queries}개")
+
+    reference = None
+    rows = []
+    filter_rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for db_type in [name.strip() for name in args.backends.split(",") if name.strip()]:
+            try:
+                db = create_vector_database(db_type, db_path=str(Path(temp_dir) / db_type),
+                                            collection_name="bench", enable_lexical_index=False)
+            except Exception as e:
+                print(f"{db_type}: 사용할 수 없음 ({e})")
+                continue
+
+            started = time.perf_counter()
+            for start in range(0, len(documents), 5000):
+                db.add_documents(documents[start:start + 5000])
+            add_seconds = time.perf_counter() - started
+
+            db.search_similar(queries[0], top_k=args.top_k)  # 워밍업
+            single = []
+            for query in queries:
+                started = time.perf_counter()
+                db.search_similar(query, top_k=args.top_k)
+                single.append((time.perf_counter() - started) * 1000)
+
+            results = []
+            started = time.perf_counter()
+            for start in range(0, len(queries), args.batch_size):
+                results.extend(db.search_similar_batch(queries[start:start + args.batch_size], top_k=args.top_k))
+            batch_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+            ids = [[r['id'] for r in query_results] for query_results in results]
+            if reference is None and db_type in ("exact", "numpy"):
+                reference = ids
+            recall = None
+            if reference is not None:
+                recall = statistics.mean(len(set(a) & set(b)) / max(len(a), 1) for a, b in zip(reference, ids))
+
+            rows.append((db_type, len(documents) / add_seconds, statistics.median(single), batch_ms, recall))
+
+            for name, (where, _) in FILTERS.items():
+                latencies, counts = [], []
+                for query in queries:
+                    started = time.perf_counter()
+                    hits = db.search_similar(query, top_k=args.top_k, where=where)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    counts.append(len(hits))
+                strategy = db.plan_where(where, args.top_k).strategy
+                filter_rows.append((db_type, name, strategy, statistics.median(latencies), min(counts)))
+
+    print(f"\n{'backend':<12}{'add/sec':>10}{'single p50 ms':>15}{'batch ms/q':>12}{'recall@k':>10}")
+    for db_type, add_rate, single_ms, batch_ms, recall in rows:
+        recall_text = f"{recall:.3f}" if recall is not None else "-"
+        print(f"{db_type:<12}{add_rate:>10.0f}{single_ms:>15.2f}{batch_ms:>12.3f}{recall_text:>10}")
+
+    print(f"\n{'backend':<12}{'filter':>8}{'plan':>12}{'p50 ms':>10}{'min hits':>10}")
+    for db_type, name, strategy, p50, min_hits in filter_rows:
+        print(f"{db_type:<12}{name:>8}{strategy:>12}{p50:>10.2f}{min_hits:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+서빙 스냅샷 구축 및 게시
+- 청크 저장소(CHUNK_STORE_PATH)의 COLLECTION_NAME 테이블로 벡터 컬렉션(메타데이터/BM25/ANN 색인 포함)을 만들고
+  관계 그래프와 정산 공식 레지스트리를 함께 SERVING_SNAPSHOT_PATH 아래에 게시
+- 워커는 SERVING_SNAPSHOT_PATH를 설정하면 CURRENT가 가리키는 스냅샷을 읽기 전용 메모리 매핑으로 열어 시작
+- --measure: 게시한 스냅샷 열기와 기존 방식(청크 저장소에서 컬렉션 재구축) 시간 비교 (임베딩 모델 로드 제외)
+- EMBEDDING_BACKEND가 onnx / onnx-int8이면 EMBEDDING_ONNX_PATH에 내보낸 모델이 없을 때 내보내기
+  (python -m embeddings.onnx_backend --export와 같은 함수 사용, --export-onnx: 백엔드 설정과 관계없이 다시 내보내기,
+  워커는 내보내지 않고 읽기만 함)
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.serving_snapshot import ServingSnapshot, build_snapshot
+from core.relationship_mapper import PowerMarketRelationshipMapper
+from data.vectors.chunk_store import ChunkStore
+from data.vectors.factory import create_vector_database, vector_db_options
+from embeddings.onnx_backend import export_configured_model
+
+
+def _time(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def measure(snapshot: ServingSnapshot, config: dict, query_count: int = 1):
+    """스냅샷 열기 vs 청크 저장소 재구축 (첫 검색 포함)"""
+    # 스냅샷: 읽기 전용 메모리 매핑 + 그래프 + 공식 레지스트리
+    db, open_seconds = _time(snapshot.open_vector_database)
+    _, graph_seconds = _time(
+        lambda: snapshot.graph_path and PowerMarketRelationshipMapper(None).load_graph(snapshot.graph_path)
+    )
+    _, formula_seconds = _time(snapshot.formula_extractor)
+
+    if not snapshot.manifest["documents"]:
+        print("스냅샷이 비어 있어 측정을 건너뜁니다")
+        return
+    batch = next(ChunkStore(config["CHUNK_STORE_PATH"]).iter_batches(
+        snapshot.manifest["collection_name"], batch_size=query_count))
+    queries = batch.embeddings
+    _, first_query_seconds = _time(lambda: db.search_similar_batch(queries, top_k=5))
+
+    print(f"스냅샷 열기: 벡터 {open_seconds:.3f}s, 그래프 {graph_seconds:.3f}s, 공식 {formula_seconds:.3f}s, "
+          f"첫 검색 {first_query_seconds:.3f}s")
+
+    # 기존 방식: 임시 경로에 컬렉션 재구축 후 첫 검색
+    work_dir = Path(tempfile.mkdtemp(prefix="snapshot_measure_"))
+    try:
+        def _rebuild():
+            scratch = create_vector_database(
+                snapshot.manifest["vector_db_type"],
+                db_path=str(work_dir),
+                collection_name=snapshot.manifest["collection_name"],
+                **vector_db_options({**config, "VECTOR_DB_TYPE": snapshot.manifest["vector_db_type"]})
+            )
+            ChunkStore(config["CHUNK_STORE_PATH"]).rebuild(snapshot.manifest["collection_name"], scratch)
+            if hasattr(scratch, "build_index"):
+                scratch.build_index()
+            scratch.search_similar_batch(queries, top_k=5)
+
+        _, rebuild_seconds = _time(_rebuild)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    snapshot_seconds = open_seconds + graph_seconds + formula_seconds + first_query_seconds
+    print(f"재구축: {rebuild_seconds:.3f}s / 스냅샷: {snapshot_seconds:.3f}s "
+          f"({rebuild_seconds / max(snapshot_seconds, 1e-9):.1f}배)")
+
+
+def export_onnx(config: dict, force: bool):
+    """질문 임베딩용 ONNX 모델 내보내기 (구축 단계에서만 실행)"""
+    if not force and config.get("EMBEDDING_BACKEND", "torch") == "torch":
+        return
+    model_dir, seconds = _time(lambda: export_configured_model(config, overwrite=force))
+    print(f"ONNX 모델: {model_dir} ({seconds:.1f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서빙 스냅샷 구축 및 게시")
+    parser.add_argument("--config", default=str(project_root / "config" / "config.yaml"))
+    parser.add_argument("--output", default=None, help="게시 경로 (기본: SERVING_SNAPSHOT_PATH)")
+    parser.add_argument("--keep", type=int, default=3, help="보관할 스냅샷 수")
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--measure", action="store_true", help="스냅샷 열기와 재구축 시간 비교")
+    parser.add_argument("--export-onnx", action="store_true", help="ONNX 임베딩 모델 다시 내보내기")
+    args = parser.parse_args()
+
+    config = {}
+    if Path(args.config).exists():
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+    config.setdefault("CHUNK_STORE_PATH", "./data/chunks")
+
+    export_onnx(config, args.export_onnx)
+
+    output = args.output or config.get("SERVING_SNAPSHOT_PATH") or "./snapshots"
+    try:
+        snapshot = build_snapshot(config, output_root=output, keep=args.keep, batch_size=args.batch_size)
+    except FileNotFoundError as e:
+        print(e)
+        return 1
+
+    print(f"게시: {snapshot.path}")
+    print(json.dumps(snapshot.get_stats(), ensure_ascii=False, indent=2))
+    if not config.get("SERVING_SNAPSHOT_PATH"):
+        print(f"워커에서 사용하려면 설정에 SERVING_SNAPSHOT_PATH: \"{output}\"를 추가하세요")
+
+    if args.measure:
+        measure(ServingSnapshot.open(output), config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
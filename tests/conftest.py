@@ -28,6 +28,7 @@ from database.connection import get_database_connection
 from database.models import Base, create_tables
 from cache.redis_client import get_redis_client
 from monitoring import get_logger, setup_logging
+from embeddings.model_registry import ModelRegistry
 
 
 @pytest.fixture(scope="session")
@@ -196,8 +197,8 @@ def mock_embedding_model(monkeypatch):
     
     mock_model = MockEmbeddingModel()
     monkeypatch.setattr(
-        "embeddings.text_embedder.SentenceTransformer", 
-        lambda model_name: mock_model
+        "embeddings.model_registry._registry",
+        ModelRegistry(loader=lambda model_name, device: mock_model)
     )
     return mock_model
 
@@ -0,0 +1,145 @@
+"""
+ANN 벡터 데이터베이스 테스트
+- numpy IVF-PQ 색인의 exact 대비 재현율
+- 색인 저장/로드, 증분 추가, 삭제 후 재구축
+- 읽기 전용으로 열 때 색인이 컬렉션과 다르면 재구축하지 않고 실패
+- faiss HNSW / IVF-PQ 색인 (faiss가 설치된 환경에서만)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from data.vectors.factory import create_vector_database
+
+
+def _documents(embeddings, offset=0):
+    return [{
+        "id": offset + i,
+        "text": f"청크 {offset + i}",
+        "embedding": embedding,
+        "file_name": "rules.pdf",
+        "source_file": "/docs/rules.pdf"
+    } for i, embedding in enumerate(embeddings)]
+
+
+def _clustered(rng, count, dim=32, topics=20):
+    centers = rng.normal(size=(topics, dim))
+    return (centers[rng.integers(0, topics, size=count)] + 0.5 * rng.normal(size=(count, dim))).astype(np.float32)
+
+
+def _recall(reference, results, k=10):
+    return np.mean([len({r["id"] for r in a} & {r["id"] for r in b}) / k for a, b in zip(reference, results)])
+
+
+class TestAnnVectorDatabase:
+    def test_ivfpq_recall_against_exact(self, tmp_path):
+        rng = np.random.default_rng(0)
+        embeddings = _clustered(rng, 3000)
+        queries = embeddings[:50] + 0.05 * rng.normal(size=(50, 32)).astype(np.float32)
+
+        exact = create_vector_database("exact", db_path=str(tmp_path), collection_name="exact",
+                                       enable_lexical_index=False)
+        ann = create_vector_database("ivfpq", db_path=str(tmp_path), collection_name="ann",
+                                     enable_lexical_index=False, pq_m=8)
+        exact.add_documents(_documents(embeddings))
+        ann.add_documents(_documents(embeddings))
+
+        reference = exact.search_similar_batch(queries, top_k=10)
+        results = ann.search_similar_batch(queries, top_k=10, nprobe=1000)
+        recall = np.mean([
+            len({r["id"] for r in a} & {r["id"] for r in b}) / 10 for a, b in zip(reference, results)
+        ])
+        assert recall >= 0.9
+        # 후보는 원본 벡터로 재계산하므로 거리 기준이 exact와 같음
+        assert results[0][0]["id"] == reference[0][0]["id"]
+        assert abs(results[0][0]["distance"] - reference[0][0]["distance"]) < 1e-5
+
+        # nprobe가 작을수록 재현율이 낮거나 같음
+        narrow = ann.search_similar_batch(queries, top_k=10, nprobe=1)
+        narrow_recall = np.mean([
+            len({r["id"] for r in a} & {r["id"] for r in b}) / 10 for a, b in zip(reference, narrow)
+        ])
+        assert narrow_recall <= recall
+
+    def test_index_persistence_append_and_delete(self, tmp_path):
+        rng = np.random.default_rng(1)
+        embeddings = _clustered(rng, 2500)
+        db = create_vector_database("ivfpq", db_path=str(tmp_path), collection_name="ann",
+                                    enable_lexical_index=False, pq_m=8)
+        db.add_documents(_documents(embeddings[:2000]))
+        assert db.build_index()
+
+        # 같은 버전이면 재구축 없이 로드
+        reloaded = create_vector_database("ivfpq", db_path=str(tmp_path), collection_name="ann",
+                                          enable_lexical_index=False, pq_m=8)
+        assert reloaded._ann is not None and reloaded._ann_rows == 2000
+
+        # 추가된 행은 증분으로 색인
+        reloaded.add_documents(_documents(embeddings[2000:], offset=2000))
+        hits = reloaded.search_similar(embeddings[2100], top_k=1, nprobe=8)
+        assert hits[0]["id"] == "rules.pdf_2100"
+        assert reloaded._ann_rows == 2500 and not reloaded._ann_stale
+
+        # 삭제 후에는 재구축되어 삭제된 문서가 나오지 않음
+        reloaded.delete_documents(["rules.pdf_2100"])
+        hits = reloaded.search_similar(embeddings[2100], top_k=5, nprobe=8)
+        assert "rules.pdf_2100" not in {hit["id"] for hit in hits}
+        assert reloaded._ann_rows == 2499
+
+    def test_read_only_refuses_stale_index(self, tmp_path):
+        rng = np.random.default_rng(2)
+        embeddings = _clustered(rng, 1100)
+        db = create_vector_database("ivfpq", db_path=str(tmp_path), collection_name="ann",
+                                    enable_lexical_index=False, pq_m=8)
+        db.add_documents(_documents(embeddings[:1050]))
+        assert db.build_index()
+
+        reader = create_vector_database("ivfpq", db_path=str(tmp_path), collection_name="ann",
+                                        enable_lexical_index=False, pq_m=8, read_only=True)
+        assert reader._ann_rows == 1050
+
+        # 색인 저장 후 컬렉션이 바뀌면 읽기 전용 열기는 실패 (메모리에서 재구축하지 않음)
+        db.add_documents(_documents(embeddings[1050:], offset=1050))
+        with pytest.raises(ValueError):
+            create_vector_database("ivfpq", db_path=str(tmp_path), collection_name="ann",
+                                   enable_lexical_index=False, pq_m=8, read_only=True)
+
+
+class TestFaissAnnVectorDatabase:
+    """faiss HNSW / IVF-PQ 색인 (faiss-cpu가 설치된 환경에서만 실행)"""
+
+    @pytest.mark.parametrize("db_type, options, knob", [
+        ("hnsw", {"hnsw_m": 16}, {"ef_search": 128}),
+        ("ivfpq", {"pq_m": 8}, {"nprobe": 64})
+    ])
+    def test_recall_and_read_only_reload(self, tmp_path, db_type, options, knob):
+        pytest.importorskip("faiss")
+        rng = np.random.default_rng(3)
+        embeddings = _clustered(rng, 3000)
+        queries = embeddings[:50] + 0.05 * rng.normal(size=(50, 32)).astype(np.float32)
+
+        exact = create_vector_database("exact", db_path=str(tmp_path), collection_name="exact",
+                                       enable_lexical_index=False)
+        exact.add_documents(_documents(embeddings))
+        ann = create_vector_database(db_type, db_path=str(tmp_path), collection_name="ann",
+                                     enable_lexical_index=False, **options)
+        ann.add_documents(_documents(embeddings))
+        assert ann.build_index()
+        assert ann.get_collection_stats()["ann_backend"] == "faiss"
+
+        reference = exact.search_similar_batch(queries, top_k=10)
+        results = ann.search_similar_batch(queries, top_k=10, **knob)
+        assert _recall(reference, results) >= 0.9
+        assert abs(results[0][0]["distance"] - reference[0][0]["distance"]) < 1e-5
+
+        # 저장된 색인을 읽기 전용(메모리 매핑)으로 열어도 같은 결과
+        reader = create_vector_database(db_type, db_path=str(tmp_path), collection_name="ann",
+                                        enable_lexical_index=False, read_only=True, **options)
+        assert reader._ann_rows == 3000
+        assert [[r["id"] for r in hits] for hits in reader.search_similar_batch(queries, top_k=10, **knob)] == \
+               [[r["id"] for r in hits] for hits in results]
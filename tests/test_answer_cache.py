@@ -0,0 +1,65 @@
+"""
+답변 캐시 모듈 테스트
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# 상위 디렉토리의 모듈을 임포트하기 위한 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generation.answer_cache import AnswerCache
+
+
+class TestAnswerCache:
+    """답변 캐시 테스트 클래스"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        base = rng.normal(size=16)
+        self.embeddings = {
+            "하루전발전계획이란?": base,
+            "하루전 발전계획이 뭔가요": base + 0.01 * rng.normal(size=16),
+            "예비력의 역할은?": rng.normal(size=16)
+        }
+        self.calls = []
+
+    def _ask(self, cache, question, version=1, **filters):
+        def compute():
+            self.calls.append(question)
+            return {"answer": question}
+        return cache.get_or_compute(question, AnswerCache.make_filter_key(**filters),
+                                    compute, embed=self.embeddings.get, version=version)
+
+    def test_exact_and_semantic_hits(self):
+        """정규화된 질문은 정확 일치, 임베딩이 가까운 질문은 유사 질문으로 재사용"""
+        cache = AnswerCache(max_distance=0.05)
+        self._ask(cache, "하루전발전계획이란?", search_method="hybrid")
+
+        exact = self._ask(cache, "  하루전발전계획이란 ", search_method="hybrid")
+        similar = self._ask(cache, "하루전 발전계획이 뭔가요", search_method="hybrid")
+        other_filter = self._ask(cache, "하루전발전계획이란?", search_method="keyword")
+
+        assert exact["cache"]["hit"] == "exact"
+        assert similar["cache"]["hit"] == "semantic"
+        assert "cache" not in other_filter
+        assert self.calls == ["하루전발전계획이란?", "하루전발전계획이란?"]
+
+    def test_invalidation_ttl_and_lru(self, monkeypatch):
+        """컬렉션 버전 변경, TTL 만료, 최대 크기 초과 시 다시 계산"""
+        cache = AnswerCache(ttl_seconds=10, max_entries=1, max_distance=0)
+        now = [1000.0]
+        monkeypatch.setattr("generation.answer_cache.time.time", lambda: now[0])
+
+        self._ask(cache, "하루전발전계획이란?", version=1)
+        assert "cache" in self._ask(cache, "하루전발전계획이란?", version=1)
+        assert "cache" not in self._ask(cache, "하루전발전계획이란?", version=2)
+
+        now[0] += 11
+        assert "cache" not in self._ask(cache, "하루전발전계획이란?", version=2)
+
+        self._ask(cache, "예비력의 역할은?", version=2)
+        assert len(cache) == 1
+        assert "cache" not in self._ask(cache, "하루전발전계획이란?", version=2)
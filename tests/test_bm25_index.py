@@ -0,0 +1,50 @@
+"""
+BM25 색인 모듈 테스트
+"""
+
+import os
+import sys
+
+# 상위 디렉토리의 모듈을 임포트하기 위한 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from retrieval.bm25_index import BM25Index, tokenize
+
+
+class TestBM25Index:
+    """BM25 색인 테스트 클래스"""
+
+    def test_korean_compound_terms_match(self):
+        """띄어쓰기/조사가 달라도 문자 n-gram으로 복합어가 검색됨"""
+        assert "발전" in tokenize("하루전발전계획")
+
+        index = BM25Index()
+        index.add(["a", "b"], ["하루전발전계획은 전일에 수립한다", "실시간 급전 지시와 예비력"])
+
+        results = index.search("하루전 발전계획이 무엇인가요?", top_k=2)
+        assert [doc_id for doc_id, _ in results] == ["a"]
+
+    def test_incremental_update_and_persistence(self, tmp_path):
+        """추가/교체/삭제 후 저장-로드 결과가 같음"""
+        index = BM25Index()
+        index.add(["a", "b"], ["계통운영 기본 원칙", "예비력 확보 기준"])
+        index.add(["a"], ["송전제약 발생 시 발전계획 조정"])
+        index.remove(["b"])
+
+        assert len(index) == 1
+        assert index.search("계통운영", top_k=5) == []
+        assert index.search("송전제약", top_k=5)[0][0] == "a"
+
+        index.save(tmp_path)
+        loaded = BM25Index.load(tmp_path)
+        assert loaded.search("발전계획 조정", top_k=5) == index.search("발전계획 조정", top_k=5)
+
+    def test_duplicate_ids_in_one_batch_keep_last(self):
+        """한 배치 안의 중복 ID는 마지막 항목만 색인되고 이전 행이 남지 않음"""
+        index = BM25Index()
+        index.add(["a", "b", "a"], ["계통운영 기본 원칙", "예비력 확보 기준", "송전제약 발전계획 조정"])
+
+        assert len(index) == 2
+        assert index.get_stats()["deleted"] == 0
+        assert index.search("계통운영", top_k=5) == []
+        assert index.search("송전제약", top_k=5)[0][0] == "a"
@@ -0,0 +1,47 @@
+"""
+청크 텍스트 특성 모듈 테스트
+"""
+
+import os
+import random
+import re
+import sys
+
+# 상위 디렉토리의 모듈을 임포트하기 위한 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chunk_features import compute_chunk_features, compute_text_features
+from core.keyword_matcher import KeywordMatcher
+
+
+class TestChunkFeatures:
+    """청크 텍스트 특성 테스트 클래스"""
+
+    def setup_method(self):
+        rng = random.Random(0)
+        alphabet = "가나다 \t\n　.!?전력시장 발전계획 제3조 별표1 SMP 100MW"
+        self.texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 120)))
+                      for _ in range(200)] + ["", "  ", "발전계획은 전력시장 규칙을 따른다."]
+        self.matcher = KeywordMatcher({"power": ["전력", "발전", "시장"]})
+
+    def test_statistics_match_split_semantics(self):
+        """단어/문장 통계가 str.split()과 re.split(r'[.!?]+') 기준과 같음"""
+        for text, features in zip(self.texts, compute_chunk_features(self.texts)):
+            words = text.split()
+            sentences = re.split(r'[.!?]+', text)
+            assert features.word_count == len(words)
+            assert features.complex_word_count == sum(1 for w in words if len(w) > 6)
+            assert features.sentence_count == len(sentences)
+            assert features.sentence_word_count == sum(len(s.split()) for s in sentences)
+            assert features.keyword_word_count == 0
+
+    def test_document_mode_matches_single_chunk(self):
+        """문서 단위 계산과 청크 단위 계산 결과가 같음"""
+        batch = compute_chunk_features(self.texts, self.matcher, "power")
+        for text, features in zip(self.texts, batch):
+            single = compute_text_features(text, self.matcher, "power")
+            assert features == single
+
+        last = batch[-1]
+        assert last.keyword_word_count == 2
+        assert last.ends_with_terminal
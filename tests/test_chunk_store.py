@@ -0,0 +1,91 @@
+"""
+청크 저장소 테스트
+- 교체/삭제/재로드/압축 후에도 살아 있는 청크와 타입이 유지된 메타데이터가 같은지
+- where 필터 결과가 직접 검사와 같은지
+- 저장소에서 재구축한 벡터 백엔드가 같은 ID와 검색 결과를 내는지
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from data.vectors.chunk_store import ChunkStore
+from data.vectors.factory import create_vector_database
+
+DOMAINS = ["전력거래", "계통운영", "정산"]
+
+
+def _documents(count, offset=0):
+    return [{
+        "id": offset + i,
+        "text": f"청크 {offset + i}",
+        "file_name": f"rule{(offset + i) % 7}.pdf",
+        "market_domain": DOMAINS[(offset + i) % 3],
+        "page": (offset + i) % 11,
+        "keywords": ["입찰", "정산"][:(offset + i) % 3],
+        "section": {"title": f"제{(offset + i) % 5}장"}
+    } for i in range(count)]
+
+
+class TestChunkStore:
+    def test_upsert_delete_reload_and_filter(self, tmp_path):
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(300, 8)).astype(np.float32)
+        documents = _documents(300)
+
+        store = ChunkStore(tmp_path, compact_ratio=0.9)
+        store.write_documents("chunks", documents[:200], embeddings[:200])
+        # 겹치는 ID는 나중 세그먼트가 우선
+        replaced = [{**doc, "text": "교체됨"} for doc in documents[150:300]]
+        store.write_documents("chunks", replaced, embeddings[150:300])
+        store.delete("chunks", ["rule0.pdf_7", "rule1.pdf_253"])
+
+        expected = {f"{doc['file_name']}_{doc['id']}": i for i, doc in enumerate(documents)}
+        expected.pop("rule0.pdf_7")
+        expected.pop("rule1.pdf_253")
+
+        for current in (store, ChunkStore(tmp_path)):
+            batch = current.scan("chunks")
+            assert sorted(batch.ids) == sorted(expected)
+            for doc_id, text, metadata, embedding in zip(batch.ids, batch.texts, batch.metadatas, batch.embeddings):
+                row = expected[doc_id]
+                assert text == ("교체됨" if row >= 150 else f"청크 {row}")
+                assert metadata["keywords"] == documents[row]["keywords"]
+                assert metadata["section"] == documents[row]["section"]
+                assert isinstance(metadata["page"], int)
+                assert np.allclose(embedding, embeddings[row])
+
+            where = {"$and": [{"market_domain": "정산"}, {"page": {"$lt": 4}}]}
+            filtered = current.scan("chunks", where=where, with_embeddings=False)
+            assert sorted(filtered.ids) == sorted(
+                doc_id for doc_id, row in expected.items()
+                if documents[row]["market_domain"] == "정산" and documents[row]["page"] < 4
+            )
+
+        store.compact("chunks")
+        reloaded = ChunkStore(tmp_path)
+        assert reloaded.get_stats()["levels"]["chunks"]["segments"] == 1
+        assert sorted(reloaded.scan("chunks").ids) == sorted(expected)
+
+    def test_rebuild_vector_backend(self, tmp_path):
+        rng = np.random.default_rng(1)
+        embeddings = rng.normal(size=(120, 16)).astype(np.float32)
+        documents = _documents(120)
+
+        store = ChunkStore(tmp_path / "chunks")
+        store.write_documents("docs", documents, embeddings)
+        original = create_vector_database("exact", db_path=str(tmp_path / "a"), collection_name="docs",
+                                          enable_lexical_index=False)
+        original.add_documents(documents, embeddings=embeddings)
+        rebuilt = create_vector_database("exact", db_path=str(tmp_path / "b"), collection_name="docs",
+                                         enable_lexical_index=False)
+
+        assert store.rebuild("docs", rebuilt, batch_size=50) == 120
+        assert sorted(rebuilt.ids) == sorted(original.ids)
+        queries = rng.normal(size=(5, 16)).astype(np.float32)
+        for a, b in zip(original.search_similar_batch(queries, top_k=5),
+                        rebuilt.search_similar_batch(queries, top_k=5)):
+            assert [hit["id"] for hit in a] == [hit["id"] for hit in b]
@@ -0,0 +1,56 @@
+"""
+문서 계층 분석 테스트
+- 컴파일된 단일 정규식 분류가 기존 순차 패턴 매칭과 같은 결과를 내는지
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.document_hierarchy_analyzer import DocumentHierarchyAnalyzer, HierarchyLevel
+from scripts.benchmark_hierarchy import match_hierarchy_patterns_sequential
+
+LINES = {
+    "제1장 총칙": HierarchyLevel.CHAPTER,
+    "제 2 장 전력시장의 운영": HierarchyLevel.CHAPTER,
+    "제1절 일반사항": HierarchyLevel.SECTION,
+    "1.2 용량가격 산정": HierarchyLevel.CHAPTER,  # 기존 순서대로 "1. 제목" 장 패턴이 먼저 일치
+    "제3조(정의) 이 규칙에서 사용하는 용어의 뜻은 다음과 같다": HierarchyLevel.ARTICLE,
+    "제12조의2 계통한계가격의 결정": HierarchyLevel.ARTICLE,
+    "① 전력거래소는 하루전발전계획을 수립한다": HierarchyLevel.PARAGRAPH,
+    "⑩ 그 밖에 필요한 사항": HierarchyLevel.PARAGRAPH,
+    "1. 발전기의 출력": HierarchyLevel.CHAPTER,
+    "3. 예비력 확보 기준을 따른다.": HierarchyLevel.ITEM,
+    "가. 급전지시에 따른 발전": HierarchyLevel.ITEM,
+    "ㄱ. 송전제약 발생 시": HierarchyLevel.ITEM,
+    "별표 3 정산금 산정 방법": HierarchyLevel.ANNEX,
+    "[별첨 1] 계통운영 절차": HierarchyLevel.ANNEX,
+    "1) 번호 목록은 계층 노드가 아님": None,
+    "(2) 괄호 번호도 계층 노드가 아님": None,
+    "전력시장운영규칙에 따라 정산한다": None,
+    "": None
+}
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return DocumentHierarchyAnalyzer()
+
+
+class TestHierarchyMatcher:
+    """계층 패턴 분류 테스트 클래스"""
+
+    @pytest.mark.parametrize("line, level", LINES.items())
+    def test_compiled_matcher_equals_sequential(self, analyzer, line, level):
+        compiled = analyzer._match_hierarchy_patterns(line, 7)
+        sequential = match_hierarchy_patterns_sequential(analyzer, line, 7)
+
+        if level is None:
+            assert compiled is None and sequential is None
+            return
+        assert compiled.level == sequential.level == level
+        assert (compiled.number, compiled.title, compiled.content, compiled.metadata) == \
+               (sequential.number, sequential.title, sequential.content, sequential.metadata)
@@ -0,0 +1,262 @@
+"""
+문서 검색기 테스트
+- 일괄 검색(search_many)이 질문별 검색과 같은 결과를 내는지, 임베딩/벡터 검색을 한 번씩만 하는지
+- 단계별 소요 시간 기록
+- 단일 패스 하이브리드 검색: 질문 임베딩 1회, 어휘 후보 포함, 동점 순위는 RRF로 결정
+"""
+
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import core  # noqa: F401  (core 패키지를 먼저 임포트하여 순환 임포트 방지)
+from retrieval.document_retriever import DocumentRetriever
+from retrieval.rank_fusion import reciprocal_rank_fusion
+
+DIMENSION = 8
+
+TEXTS = [
+    "하루전 발전계획은 전력거래일 전일에 수립됩니다",
+    "실시간 급전 지시는 계통운영 상황에 따라 달라집니다",
+    "예비력 확보 기준과 송전제약 처리 절차",
+    "입찰 가격 상한과 정산 방법",
+    "수요 예측 오차에 따른 당일 발전계획 변경",
+    "전력거래 대금 정산 일정",
+    "계통운영 보조서비스 예비력 정산",
+    "발전량 계량 데이터 제출 절차",
+] * 3
+
+QUERIES = ["하루전 발전계획 수립", "예비력 정산", "입찰 가격", "계통운영 급전"]
+
+
+def embed(text):
+    rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+    vector = rng.standard_normal(DIMENSION).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class StubEmbedder:
+    """PowerMarketEmbedder 대역 (호출 기록)"""
+
+    def __init__(self):
+        self.encode_text_calls = []
+        self.encode_queries_calls = []
+
+    def encode_text(self, text):
+        self.encode_text_calls.append(text)
+        return embed(text)
+
+    def encode_queries(self, texts):
+        self.encode_queries_calls.append(list(texts))
+        return np.stack([embed(text) for text in texts])
+
+
+class FakeVectorDB:
+    """VectorDatabase 대역 (코사인 전수 검색 + 단어 일치 어휘 검색)"""
+
+    def __init__(self, texts=TEXTS, lexical=True):
+        self.ids = [f"chunk_{i}" for i in range(len(texts))]
+        self.texts = list(texts)
+        self.embeddings = np.stack([embed(f"{text} {i}") for i, text in enumerate(texts)])
+        self.lexical_index = object() if lexical else None
+        self._query = None
+        self.calls = {"search_similar": 0, "search_similar_batch": 0, "search_lexical": 0, "search_by_keywords": 0}
+
+    def _result(self, i, **extra):
+        return {
+            "id": self.ids[i],
+            "text": self.texts[i],
+            "metadata": {"source_file": f"rule{i % 4}.pdf"},
+            "similarity": float(self.embeddings[i] @ self._query) if self._query is not None else 0.0,
+            **extra,
+        }
+
+    def _similar(self, query_embedding, top_k):
+        self._query = np.asarray(query_embedding, dtype=np.float32)
+        order = np.argsort(-(self.embeddings @ self._query), kind="stable")[:top_k]
+        return [self._result(i) for i in order]
+
+    def search_similar(self, query_embedding, top_k=5):
+        self.calls["search_similar"] += 1
+        return self._similar(query_embedding, top_k)
+
+    def search_similar_batch(self, query_embeddings, top_k=5):
+        self.calls["search_similar_batch"] += 1
+        return [self._similar(query_embedding, top_k) for query_embedding in query_embeddings]
+
+    def _lexical(self, terms, top_k, query_embedding):
+        self._query = None if query_embedding is None else np.asarray(query_embedding, dtype=np.float32)
+        scores = [(sum(term in text for term in terms), i) for i, text in enumerate(self.texts)]
+        ranked = sorted((item for item in scores if item[0] > 0), key=lambda item: (-item[0], item[1]))
+        return [self._result(i, score=float(score)) for score, i in ranked[:top_k]]
+
+    def search_lexical(self, query, top_k=5, query_embedding=None):
+        self.calls["search_lexical"] += 1
+        return self._lexical(query.split(), top_k, query_embedding)
+
+    def search_by_keywords(self, terms, top_k=5, query_embedding=None):
+        self.calls["search_by_keywords"] += 1
+        return [
+            {key: value for key, value in result.items() if key != "score"}
+            for result in self._lexical(terms, top_k, query_embedding)
+        ]
+
+
+def as_tuples(results):
+    return [(result.id, round(result.relevance_score, 6)) for result in results]
+
+
+@pytest.fixture
+def retriever():
+    return DocumentRetriever(FakeVectorDB(), StubEmbedder(), top_k=4, similarity_threshold=0.0)
+
+
+class TestSearchMany:
+    """일괄 검색"""
+
+    @pytest.mark.parametrize("method", ["semantic", "hybrid"])
+    def test_matches_per_query_search(self, retriever, method):
+        single = retriever.semantic_search if method == "semantic" else retriever.fused_hybrid_search
+        expected = [as_tuples(single(query)) for query in QUERIES]
+        retriever.text_embedder.encode_queries_calls.clear()
+        retriever.vector_db.calls["search_similar"] = 0
+
+        timings = {}
+        results = retriever.search_many(QUERIES, method=method, timings=timings)
+
+        assert [as_tuples(result) for result in results] == expected
+        # 질문 임베딩 1회, 다중 질의 벡터 검색 1회
+        assert retriever.text_embedder.encode_queries_calls == [QUERIES]
+        assert retriever.vector_db.calls["search_similar_batch"] == 1
+        assert retriever.vector_db.calls["search_similar"] == 0
+        assert set(timings) == {"embed", "vector_search", "rerank"}
+        assert all(seconds >= 0 for seconds in timings.values())
+
+    def test_precomputed_embeddings_skip_encoding(self, retriever):
+        query_embeddings = np.stack([embed(query) for query in QUERIES])
+        timings = {"embed": 1.5}
+
+        results = retriever.search_many(QUERIES, method="semantic", query_embeddings=query_embeddings,
+                                        timings=timings)
+
+        assert len(results) == len(QUERIES)
+        assert retriever.text_embedder.encode_queries_calls == []
+        # 호출자가 기록한 임베딩 시간은 그대로 두고 검색 단계 시간만 누적
+        assert timings["embed"] == 1.5
+        assert "vector_search" in timings and "rerank" in timings
+
+    def test_keyword_search_uses_lexical_index_only(self, retriever):
+        timings = {}
+
+        results = retriever.search_many(QUERIES, method="keyword", timings=timings)
+
+        assert [as_tuples(result) for result in results] == [
+            as_tuples(retriever.keyword_search(query)) for query in QUERIES
+        ]
+        assert retriever.text_embedder.encode_queries_calls == []
+        assert retriever.text_embedder.encode_text_calls == []
+        assert retriever.vector_db.calls["search_similar_batch"] == 0
+        assert set(timings) == {"rerank"}
+
+    def test_weighted_hybrid_falls_back_to_per_query(self):
+        retriever = DocumentRetriever(FakeVectorDB(), StubEmbedder(), top_k=4,
+                                      similarity_threshold=0.0, hybrid_mode="weighted")
+
+        results = retriever.search_many(QUERIES, method="hybrid")
+
+        assert len(results) == len(QUERIES)
+        assert retriever.vector_db.calls["search_similar_batch"] == 0
+        assert retriever.vector_db.calls["search_similar"] == len(QUERIES)
+
+
+class ScriptedVectorDB:
+    """미리 정한 벡터/어휘 후보를 돌려주는 VectorDatabase 대역 (받은 질의 임베딩 기록)"""
+
+    def __init__(self, dense, lexical):
+        self.dense = dense
+        self.lexical = lexical
+        self.lexical_index = object()
+        self.query_embeddings = []
+
+    def search_similar(self, query_embedding, top_k=5):
+        self.query_embeddings.append(query_embedding)
+        return self.dense[:top_k]
+
+    def search_lexical(self, query, top_k=5, query_embedding=None):
+        self.query_embeddings.append(query_embedding)
+        return self.lexical[:top_k]
+
+
+def chunk(chunk_id, text, similarity, score=None):
+    result = {"id": chunk_id, "text": text, "metadata": {"source_file": f"{chunk_id}.pdf"}, "similarity": similarity}
+    if score is not None:
+        result["score"] = score
+    return result
+
+
+class TestFusedHybridSearch:
+    """단일 패스 하이브리드 검색의 순위 융합"""
+
+    def test_query_is_embedded_once(self, retriever):
+        results = retriever.fused_hybrid_search(QUERIES[0])
+
+        assert results
+        assert retriever.text_embedder.encode_text_calls == [QUERIES[0]]
+        assert retriever.text_embedder.encode_queries_calls == []
+        assert retriever.vector_db.calls["search_similar"] == 1
+        assert retriever.vector_db.calls["search_lexical"] == 1
+
+    def test_lexical_candidates_reuse_query_embedding(self):
+        vector_db = ScriptedVectorDB([chunk("a", "예비력 기준", 0.9)], [chunk("b", "예비력 정산", 0.4, 3.0)])
+        retriever = DocumentRetriever(vector_db, StubEmbedder(), top_k=2, similarity_threshold=0.5)
+
+        retriever.fused_hybrid_search("예비력 정산")
+
+        assert len(vector_db.query_embeddings) == 2
+        assert vector_db.query_embeddings[0] is vector_db.query_embeddings[1]
+
+    def test_lexical_only_candidate_enters_ranking(self):
+        dense = [chunk(f"d{i}", "보조서비스 안내", 0.9 - 0.1 * i) for i in range(3)]
+        lexical = [chunk("lex", "예비력 정산 기준과 예비력 정산 절차", 0.1, 5.0)]
+        retriever = DocumentRetriever(ScriptedVectorDB(dense, lexical), StubEmbedder(), top_k=3,
+                                      similarity_threshold=0.5)
+
+        results = retriever.fused_hybrid_search("예비력 정산")
+
+        # 키워드 순위와 어휘 색인 순위 모두 1위이므로 벡터 1위보다 앞섬
+        assert results[0].id == "lex"
+        assert results[0].similarity == 0.1
+        assert results[0].source_file == "lex.pdf"
+        assert [result.id for result in results[1:]] == ["d0", "d1"]
+
+    def test_ties_are_broken_by_rank_fusion(self):
+        same_text = "하루전 발전계획 수립 절차"
+        dense = [
+            chunk("other", "계량 데이터", 0.95),
+            chunk("tie_b", same_text, 0.9),
+            chunk("below", "정산 일정", 0.3),  # 임계값 미만이라 벡터 순위에서 제외
+            chunk("tie_a", same_text, 0.8),
+        ]
+        lexical = [chunk("tie_a", same_text, 0.8, 2.0), chunk("tie_b", same_text, 0.9, 2.0)]
+        retriever = DocumentRetriever(ScriptedVectorDB(dense, lexical), StubEmbedder(), top_k=4,
+                                      similarity_threshold=0.5)
+        query = "하루전 발전계획"
+
+        results = retriever.fused_hybrid_search(query)
+
+        # 키워드 점수가 같은 두 청크는 벡터/어휘 색인 순위를 합한 RRF 점수로 순서가 정해짐
+        expected = reciprocal_rank_fusion([
+            ["other", "tie_b", "tie_a"],
+            ["tie_b", "tie_a"],  # 키워드 점수 동점은 후보 순서 유지
+            ["tie_a", "tie_b"],
+        ], k=retriever.rrf_k)
+        assert [result.id for result in results] == ["tie_b", "tie_a", "other"]
+        for result in results:
+            assert result.relevance_score == pytest.approx(expected[result.id])
+        assert retriever.calculate_keyword_score(same_text, query) > 0
+        assert retriever.calculate_keyword_score("정산 일정", query) == 0
@@ -0,0 +1,57 @@
+"""
+임베딩 캐시 모듈 테스트
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# 상위 디렉토리의 모듈을 임포트하기 위한 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embeddings.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """임베딩 캐시 테스트 클래스"""
+
+    def test_roundtrip_and_key_versioning(self, tmp_path):
+        """저장한 임베딩을 그대로 조회하고, 전처리 버전이 다르면 미스"""
+        cache = EmbeddingCache(str(tmp_path), max_entries=10)
+        key_v1 = EmbeddingCache.make_key("model", "v1", "하루전발전계획")
+        key_v2 = EmbeddingCache.make_key("model", "v2", "하루전발전계획")
+        vector = np.arange(4, dtype=np.float32)
+
+        cache.put_many({key_v1: vector}, "model")
+        found = cache.get_many([key_v1, key_v2])
+
+        assert np.array_equal(found[key_v1], vector)
+        assert key_v2 not in found
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_persistence(self, tmp_path):
+        """캐시를 다시 열어도 항목이 유지되는지 확인"""
+        key = EmbeddingCache.make_key("model", "v1", "계통한계가격")
+        cache = EmbeddingCache(str(tmp_path))
+        cache.put_many({key: np.ones(3, dtype=np.float32)}, "model")
+        cache.close()
+
+        reopened = EmbeddingCache(str(tmp_path))
+        assert key in reopened.get_many([key])
+
+    def test_lru_eviction(self, tmp_path):
+        """최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거"""
+        cache = EmbeddingCache(str(tmp_path), max_entries=2)
+        keys = [EmbeddingCache.make_key("model", "v1", f"text{i}") for i in range(3)]
+
+        cache.put_many({keys[0]: np.zeros(2, dtype=np.float32)}, "model")
+        cache.put_many({keys[1]: np.zeros(2, dtype=np.float32)}, "model")
+        cache.get_many([keys[0]])  # keys[0] 최근 사용으로 갱신
+        cache.put_many({keys[2]: np.zeros(2, dtype=np.float32)}, "model")
+
+        found = cache.get_many(keys)
+        assert len(cache) == 2
+        assert keys[1] not in found
+        assert keys[0] in found and keys[2] in found
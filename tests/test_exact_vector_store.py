@@ -0,0 +1,137 @@
+"""
+정확 검색 벡터 데이터베이스 테스트
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# 상위 디렉토리의 모듈을 임포트하기 위한 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.vectors.exact_store import ExactVectorDatabase
+from data.vectors.factory import create_vector_database
+
+
+def make_documents(count, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{
+        'id': i,
+        'text': f"전력시장 문서 {i} {'발전계획' if i % 3 == 0 else '계통운영'}",
+        'embedding': rng.normal(size=dim).astype(np.float32),
+        'file_name': f"rule{i % 4}.pdf",
+        'source_file': f"/docs/rule{i % 4}.pdf",
+        'chunk_index': i
+    } for i in range(count)]
+
+
+class TestExactVectorDatabase:
+    """정확 검색 벡터 데이터베이스 테스트 클래스"""
+
+    def test_batch_search_matches_brute_force_with_filters(self, tmp_path):
+        """일괄 검색 결과가 코사인 유사도 전수 비교 및 where 필터와 일치"""
+        documents = make_documents(60)
+        db = create_vector_database("exact", db_path=str(tmp_path), collection_name="test")
+        assert isinstance(db, ExactVectorDatabase)
+        assert db.add_documents(documents)
+
+        matrix = np.stack([doc['embedding'] for doc in documents])
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        queries = np.random.default_rng(1).normal(size=(5, 16)).astype(np.float32)
+        normalized = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+        where = {"$and": [{"file_name": {"$in": ["rule1.pdf", "rule2.pdf"]}}, {"chunk_index": {"$gte": 10}}]}
+        allowed = np.array([doc['file_name'] in ("rule1.pdf", "rule2.pdf") and doc['chunk_index'] >= 10
+                            for doc in documents])
+
+        for filter_, mask in ((None, np.ones(60, dtype=bool)), (where, allowed)):
+            batch = db.search_similar_batch(queries, top_k=7, where=filter_)
+            for q, results in enumerate(batch):
+                cosine = normalized[q] @ matrix.T
+                cosine[~mask] = -np.inf
+                expected = [f"{documents[i]['file_name']}_{i}" for i in np.argsort(-cosine)[:7]]
+                assert [r['id'] for r in results] == expected
+                assert np.isclose(results[0]['similarity'], 2 * cosine.max() - 1, atol=1e-5)
+                assert all(mask[r['metadata']['chunk_index']] for r in results)
+
+    def test_persistence_delete_and_replace(self, tmp_path):
+        """삭제/교체 후 다시 열어도(메모리 매핑) 같은 결과"""
+        documents = make_documents(20)
+        db = ExactVectorDatabase(db_path=str(tmp_path), collection_name="test")
+        db.add_documents(documents)
+        db.delete_documents(["rule1.pdf_1", "rule2.pdf_2"])
+        replaced = dict(documents[0], text="교체된 본문", embedding=documents[5]['embedding'])
+        db.add_documents([replaced])
+
+        reopened = ExactVectorDatabase(db_path=str(tmp_path), collection_name="test")
+        assert isinstance(reopened.embeddings, np.memmap)
+        assert reopened.get_collection_stats()['document_count'] == 18
+        assert reopened.get_document_by_id("rule1.pdf_1") is None
+        assert reopened.get_document_by_id("rule0.pdf_0")['text'] == "교체된 본문"
+
+        query = documents[5]['embedding']
+        assert [r['id'] for r in reopened.search_similar(query, top_k=3)] == \
+               [r['id'] for r in db.search_similar(query, top_k=3)]
+        assert {r['id'] for r in reopened.search_similar(query, top_k=2)} == {"rule0.pdf_0", "rule1.pdf_5"}
+        assert reopened.search_lexical("발전계획", top_k=3)
+        assert len(reopened.filter_by_source("/docs/rule3.pdf")) == 5
+
+    def test_deferred_flush_writes_once(self, tmp_path):
+        """deferred_flush 블록 안의 추가/삭제는 블록이 끝날 때 한 번만 저장"""
+        documents = make_documents(30)
+        db = ExactVectorDatabase(db_path=str(tmp_path), collection_name="test")
+        embeddings_file = os.path.join(db.store_path, "embeddings.npy")
+
+        with db.deferred_flush():
+            for start in range(0, 30, 10):
+                assert db.add_documents(documents[start:start + 10])
+            db.delete_documents(["rule1.pdf_1"])
+            assert not os.path.exists(embeddings_file)
+            assert db.get_collection_stats()['document_count'] == 29
+        assert db.auto_flush and not db.flush()
+
+        reopened = ExactVectorDatabase(db_path=str(tmp_path), collection_name="test")
+        assert reopened.get_collection_stats()['document_count'] == 29
+        assert reopened.get_document_by_id("rule1.pdf_1") is None
+        assert reopened.search_lexical("발전계획", top_k=3)
+
+    def test_nested_deferred_flush_and_incremental_appends(self, tmp_path):
+        """중첩된 deferred_flush는 가장 바깥 블록 끝에 저장하고, 여러 번 추가/삭제/저장해도 행과 임베딩이 맞음"""
+        documents = make_documents(50)
+        db = ExactVectorDatabase(db_path=str(tmp_path), collection_name="test")
+        embeddings_file = os.path.join(db.store_path, "embeddings.npy")
+
+        with db.deferred_flush():
+            for start in range(0, 20, 5):
+                with db.deferred_flush():
+                    assert db.add_documents(documents[start:start + 5])
+                assert not os.path.exists(embeddings_file)
+        assert os.path.exists(embeddings_file)
+
+        # 저장 후(메모리 매핑), 삭제 후, 연속 추가 모두 거친 뒤에도 각 문서가 자기 임베딩으로 검색됨
+        db.add_documents(documents[20:35])
+        db.delete_documents(["rule0.pdf_4"])
+        db.add_documents(documents[35:50])
+        for current in (db, ExactVectorDatabase(db_path=str(tmp_path), collection_name="test")):
+            assert current.get_collection_stats()['document_count'] == 49
+            for doc in documents[::7]:
+                if doc['id'] == 4:
+                    continue
+                top = current.search_similar(doc['embedding'], top_k=1)[0]
+                assert top['id'] == f"{doc['file_name']}_{doc['id']}"
+
+    def test_duplicate_ids_in_one_batch(self, tmp_path):
+        """배치 안에서 같은 ID가 반복되면 마지막 항목만 남음"""
+        documents = make_documents(3)
+        duplicate = dict(documents[0], text="마지막 본문", embedding=documents[2]['embedding'])
+        db = ExactVectorDatabase(db_path=str(tmp_path), collection_name="test")
+
+        assert db.add_documents([documents[0], documents[1], duplicate])
+
+        assert db.ids == ["rule1.pdf_1", "rule0.pdf_0"]
+        assert db.get_document_by_id("rule0.pdf_0")['text'] == "마지막 본문"
+        assert db.metadata_index.doc_ids == db.ids
+        db.delete_documents(["rule0.pdf_0"])
+        assert db.ids == ["rule1.pdf_1"]
+        assert [r['id'] for r in db.search_similar(documents[2]['embedding'], top_k=5)] == ["rule1.pdf_1"]
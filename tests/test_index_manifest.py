@@ -0,0 +1,112 @@
+"""
+증분 재색인 매니페스트 테스트
+- 디렉토리 비교에서 mtime/size가 같으면 유지, mtime만 바뀌고 내용이 같으면 유지(지문 갱신),
+  내용이 바뀌면 변경, 사라진 파일은 삭제로 분류되는지
+- 저장/로드 후에도 청크 해시가 유지되는지
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import core.index_manifest as index_manifest
+from core.index_manifest import IndexManifest
+
+MTIME = 1_700_000_000
+
+
+@pytest.fixture
+def indexed_dir(tmp_path):
+    """문서 3개를 기록한 매니페스트와 문서 디렉토리"""
+    documents_dir = tmp_path / "documents"
+    documents_dir.mkdir()
+    manifest = IndexManifest(tmp_path / "manifest.json")
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        path = documents_dir / name
+        path.write_bytes(f"%PDF {name}".encode())
+        os.utime(path, (MTIME, MTIME))
+        manifest.record(path, name[0], {"document": {name[0]: f"hash-{name}"}})
+    manifest.save()
+    return documents_dir, IndexManifest(tmp_path / "manifest.json")
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    """compute_file_hash 호출 경로 기록"""
+    calls = []
+    original = index_manifest.compute_file_hash
+
+    def counting_hash(file_path, *args, **kwargs):
+        calls.append(Path(file_path).name)
+        return original(file_path, *args, **kwargs)
+
+    monkeypatch.setattr(index_manifest, "compute_file_hash", counting_hash)
+    return calls
+
+
+class TestDiffDirectory:
+    """매니페스트와 디렉토리 비교"""
+
+    def test_unchanged_files_are_not_hashed(self, indexed_dir, hash_calls):
+        documents_dir, manifest = indexed_dir
+
+        diff = manifest.diff_directory(documents_dir)
+
+        assert diff.summary() == {"added": 0, "modified": 0, "removed": 0, "unchanged": 3}
+        assert diff.to_index == []
+        assert hash_calls == []
+
+    def test_touched_file_with_same_content_stays_unchanged(self, indexed_dir, hash_calls):
+        documents_dir, manifest = indexed_dir
+        touched = documents_dir / "a.pdf"
+        os.utime(touched, (MTIME + 60, MTIME + 60))
+
+        diff = manifest.diff_directory(documents_dir)
+
+        assert diff.unchanged == sorted(str(path) for path in documents_dir.glob("*.pdf"))
+        assert diff.to_index == []
+        assert hash_calls == ["a.pdf"]
+        # 지문만 갱신되어 다음 비교에서는 해시를 다시 계산하지 않음
+        assert manifest.files[str(touched)]["mtime"] == MTIME + 60
+        assert manifest.get_chunks(touched) == {"document": {"a": "hash-a.pdf"}}
+        hash_calls.clear()
+        manifest.diff_directory(documents_dir)
+        assert hash_calls == []
+
+    def test_modified_added_and_removed(self, indexed_dir):
+        documents_dir, manifest = indexed_dir
+        modified = documents_dir / "b.pdf"
+        modified.write_bytes(b"%PDF b.pdf v2")
+        os.utime(modified, (MTIME, MTIME))  # mtime이 같아도 크기가 다르면 해시 비교
+        (documents_dir / "c.pdf").unlink()
+        added = documents_dir / "d.pdf"
+        added.write_bytes(b"%PDF d.pdf")
+
+        diff = manifest.diff_directory(documents_dir)
+
+        assert diff.modified == [str(modified)]
+        assert diff.added == [str(added)]
+        assert diff.removed == [str(documents_dir / "c.pdf")]
+        assert diff.unchanged == [str(documents_dir / "a.pdf")]
+        assert diff.to_index == sorted([str(modified), str(added)])
+        assert set(diff.fingerprints) == {str(modified), str(added)}
+        assert diff.fingerprints[str(modified)]["sha256"] == index_manifest.compute_file_hash(modified)
+
+    def test_record_and_remove_round_trip(self, indexed_dir, tmp_path):
+        documents_dir, manifest = indexed_dir
+        path = documents_dir / "a.pdf"
+        chunks = {"document": {"a": "h0"}, "sentence": {"a_sent_0": "h1"}}
+        manifest.record(path, "a", chunks)
+        manifest.remove(documents_dir / "c.pdf")
+        manifest.save()
+
+        reloaded = IndexManifest(tmp_path / "manifest.json")
+
+        assert reloaded.get_chunks(path) == chunks
+        assert reloaded.get_document_id(path) == "a"
+        assert reloaded.get_chunks(documents_dir / "c.pdf") is None
+        assert reloaded.diff_directory(documents_dir).removed == []
@@ -0,0 +1,145 @@
+"""
+병렬 적재 파이프라인 테스트
+- 워커 프로세스 대신 같은 프로세스의 스레드 풀과 가짜 분석 함수로 실행
+- 실패 집계 (워커 예외, 분석 오류, 임베딩 함수 예외)
+- 동시에 제출된 작업 수 상한 (workers + queue_size)
+- embed_batch_chunks 기준 임베딩 배치 구성
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import core.ingestion_pipeline as ingestion_pipeline
+from core.ingestion_pipeline import IngestionPipeline
+
+CHUNKS_PER_DOCUMENT = 3  # 문서 1 + 문장 2
+
+
+def fake_analyze(file_path):
+    """_analyze_document 대역: 파일 이름으로 결과 결정"""
+    name = Path(file_path).stem
+    if name.startswith("crash"):
+        raise RuntimeError(f"워커 종료: {name}")
+    if name.startswith("broken"):
+        return {"file_path": file_path, "error": "멀티모달 처리 실패", "timings": {"extract": 0.01}}
+    return {
+        "file_path": file_path,
+        "document": {
+            "file_name": f"{name}.pdf",
+            "document_id": name,
+            "content": {"sentences": [{"content": "가"}, {"content": "나"}]},
+        },
+        "timings": {"extract": 0.01, "analyze": 0.02},
+    }
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """ProcessPoolExecutor 대역 (제출 수 기록)"""
+
+    submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        CountingExecutor.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.fixture
+def inline_workers(monkeypatch):
+    CountingExecutor.submitted = 0
+    monkeypatch.setattr(ingestion_pipeline, "ProcessPoolExecutor", CountingExecutor)
+    monkeypatch.setattr(ingestion_pipeline, "_init_worker", lambda *args: None)
+    monkeypatch.setattr(ingestion_pipeline, "_analyze_document", fake_analyze)
+
+
+def paths(*names):
+    return [f"/docs/{name}.pdf" for name in names]
+
+
+class TestIngestionPipeline:
+    """적재 파이프라인 실행"""
+
+    def test_failure_accounting(self, inline_workers):
+        embedded = []
+
+        def embed_fn(docs):
+            if any(doc["document_id"] == "poison" for doc in docs):
+                raise ValueError("인코딩 실패")
+            embedded.extend(doc["document_id"] for doc in docs)
+
+        progress = []
+        pipeline = IngestionPipeline(workers=1, queue_size=2, embed_batch_chunks=1)
+        result = pipeline.run(
+            paths("ok1", "crash", "broken", "poison", "ok2"), embed_fn,
+            progress_fn=lambda path, success, seconds: progress.append((Path(path).stem, success))
+        )
+
+        # 완료 순서대로 수집하므로 순서는 비교하지 않음
+        assert sorted(embedded) == ["ok1", "ok2"]
+        assert sorted(doc["document_id"] for doc in result.documents) == ["ok1", "ok2"]
+        failed = {entry["file"]: entry["error"] for entry in result.failed}
+        assert failed["crash.pdf"] == "워커 종료: crash"
+        assert failed["broken.pdf"] == "멀티모달 처리 실패"
+        assert failed["poison.pdf"] == "임베딩 실패: 인코딩 실패"
+        assert len(result.failed) == 3
+
+        metrics = result.stage_metrics
+        assert metrics["extract"]["items"] == 3 and metrics["extract"]["failures"] == 2
+        assert metrics["analyze"]["items"] == 3
+        assert metrics["embed"]["items"] == 2 and metrics["embed"]["failures"] == 1
+        # 임베딩 실패는 분석 완료 후에 일어나므로 진행 콜백에는 성공으로 보고됨
+        assert sorted(progress) == [("broken", False), ("crash", False), ("ok1", True), ("ok2", True), ("poison", True)]
+
+    def test_embed_failure_fails_whole_batch(self, inline_workers):
+        def embed_fn(docs):
+            raise ValueError("저장소 오류")
+
+        pipeline = IngestionPipeline(workers=1, embed_batch_chunks=100)
+        result = pipeline.run(paths("a", "b", "c"), embed_fn)
+
+        assert result.documents == []
+        assert sorted(entry["file"] for entry in result.failed) == ["a.pdf", "b.pdf", "c.pdf"]
+        assert result.stage_metrics["embed"]["failures"] == 3
+
+    @pytest.mark.parametrize("workers, queue_size", [(1, 1), (1, 3), (2, 2)])
+    def test_in_flight_submissions_are_bounded(self, inline_workers, workers, queue_size):
+        pipeline = IngestionPipeline(workers=workers, queue_size=queue_size)
+        collected = 0
+        max_in_flight = 0
+        original_collect = pipeline._collect
+
+        def collect(*args, **kwargs):
+            nonlocal collected, max_in_flight
+            max_in_flight = max(max_in_flight, CountingExecutor.submitted - collected)
+            collected += 1
+            return original_collect(*args, **kwargs)
+
+        pipeline._collect = collect
+        result = pipeline.run(paths(*(f"doc{i}" for i in range(20))), lambda docs: None)
+
+        assert len(result.documents) == 20
+        assert CountingExecutor.submitted == 20
+        assert max_in_flight == workers + queue_size
+
+    def test_batches_by_embed_batch_chunks(self, inline_workers):
+        batches = []
+        pipeline = IngestionPipeline(workers=1, embed_batch_chunks=7, keep_documents=False)
+
+        result = pipeline.run(
+            paths(*(f"doc{i}" for i in range(10))),
+            lambda docs: batches.append([doc["document_id"] for doc in docs])
+        )
+
+        # 문서당 청크 3개: 누적 9개에서 7개 이상이 되어 3개 문서씩 처리, 남은 1개는 마지막에 처리
+        assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+        assert sorted(doc_id for batch in batches for doc_id in batch) == sorted(f"doc{i}" for i in range(10))
+        assert result.documents == []
+        assert result.stage_metrics["embed"]["items"] == 10
+
+    def test_count_chunks(self):
+        assert IngestionPipeline._count_chunks(fake_analyze("/docs/x.pdf")["document"]) == CHUNKS_PER_DOCUMENT
+        assert IngestionPipeline._count_chunks({"enhanced_chunks": [{}] * 5, "content": {"sections": [{}]}}) == 5
@@ -0,0 +1,89 @@
+"""
+공용 키워드 매처 테스트
+"""
+
+import os
+import random
+import sys
+
+# 상위 디렉토리의 모듈을 임포트하기 위한 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.keyword_matcher import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    """키워드 매처 테스트 클래스"""
+
+    def test_overlapping_matches_with_categories(self):
+        """겹치는 용어, 여러 범주에 속한 용어, 대소문자 무시"""
+        matcher = KeywordMatcher({
+            "domain": ["발전", "발전계획", "주파수조정"],
+            "units": ["MW", "MWh"],
+            "reserve": ["주파수조정"]
+        })
+        text = "하루전 발전계획은 100mwh 단위로 주파수조정을 반영"
+        scan = matcher.scan(text)
+
+        assert scan.terms("domain") == {"발전", "발전계획", "주파수조정"}
+        assert scan.terms("units") == {"mw", "mwh"}
+        assert scan.any("reserve")
+        assert [text[m.start:m.end] for m in scan.occurrences("units")] == ["mw", "mwh"]
+        assert scan.count("domain") == 3
+
+    def test_matches_brute_force_for_large_vocabulary(self):
+        """큰 사전(트라이 정규식 또는 Aho-Corasick)도 모든 출현을 빠짐없이 찾음"""
+        rng = random.Random(0)
+        alphabet = "가나다ab.*("
+        for _ in range(50):
+            terms = list({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                          for _ in range(40)})
+            text = "".join(rng.choice(alphabet + " ") for _ in range(80))
+            matcher = KeywordMatcher({"terms": terms})
+
+            expected = sorted((i, i + len(term), term) for term in terms
+                              for i in range(len(text)) if text.startswith(term, i))
+            assert sorted(matcher.iter_matches(text)) == expected
+
+
+class TestKeywordMatcherUsers:
+    """공용 매처를 쓰는 구성 요소가 기존 정규식 방식과 같은 결과를 내는지"""
+
+    def test_entity_spans_match_per_pattern_finditer(self, tmp_path, monkeypatch):
+        """용어가 자기 자신과 겹쳐 출현해도 패턴별 re.finditer처럼 겹치지 않는 출현만 보고"""
+        import re
+        import core.metadata_extractor as metadata_extractor
+
+        monkeypatch.setattr(metadata_extractor, "get_keyword_matcher", lambda: KeywordMatcher())
+        extractor = metadata_extractor.MetadataExtractor(data_dir=str(tmp_path))
+        extractor.entity_patterns["repeats"] = [r"가가", r"가나가", r"\d+가"]
+        extractor._register_entity_patterns()
+        content = ("2024년 3월 전력거래소는 SMP와 시스템한계가격을 MWh, mwh 단위로 공시하고 "
+                   "가가가가 가나가나가 12가가 14:30 첨두시간 계통운영")
+
+        spans = extractor._find_entity_spans(content)
+
+        for entity_type, patterns in extractor.entity_patterns.items():
+            expected = [(m.start(), m.end()) for pattern in patterns
+                        for m in re.finditer(pattern, content, re.IGNORECASE)]
+            assert spans[entity_type] == expected, entity_type
+        assert spans["repeats"][:2] == [(content.index("가가가가"), content.index("가가가가") + 2),
+                                        (content.index("가가가가") + 2, content.index("가가가가") + 4)]
+
+    def test_keyword_score_is_stable_across_threads(self):
+        """여러 스레드가 서로 다른 질문으로 동시에 점수를 계산해도 단일 스레드 결과와 같음"""
+        from concurrent.futures import ThreadPoolExecutor
+        from retrieval.document_retriever import DocumentRetriever
+
+        retriever = DocumentRetriever(vector_db=None, text_embedder=None)
+        texts = ["하루전 발전계획과 예비력 확보", "실시간 급전 지시와 송전제약", "입찰 가격과 수요 예측"] * 20
+        queries = ["발전계획 예비력", "급전 송전제약 실시간", "입찰 가격", "수요 발전량 당일"]
+        expected = {query: [DocumentRetriever(None, None).calculate_keyword_score(text, query) for text in texts]
+                    for query in queries}
+
+        def score_all(query):
+            return query, [retriever.calculate_keyword_score(text, query) for text in texts]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for query, scores in executor.map(score_all, queries * 25):
+                assert scores == expected[query]
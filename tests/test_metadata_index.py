@@ -0,0 +1,124 @@
+"""
+메타데이터 역색인 테스트
+- where 필터 집합 연산 결과가 문서별 직접 검사와 같은지
+- 삭제/압축/저장 후에도 결과 유지
+- 정확 검색 백엔드의 필터 검색이 필터된 전수 검색과 같은 top-k를 반환하는지
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from data.vectors.factory import create_vector_database
+from data.vectors.metadata_index import MetadataIndex
+
+DOMAINS = ["전력거래", "계통운영", "정산", "수요반응"]
+LEVELS = ["critical", "important", "informational"]
+
+WHERES = [
+    {"market_domain": "정산"},
+    {"market_domain": {"$eq": "계통운영"}},
+    {"$and": [{"market_domain": "정산"}, {"importance_level": "critical"}]},
+    {"$or": [{"market_domain": "수요반응"}, {"importance_level": {"$in": ["critical"]}}]},
+    {"importance_level": {"$ne": "informational"}},
+    {"market_domain": {"$nin": ["정산", "전력거래"]}},
+    {"file_name": {"$contains": "rule1"}},
+    {"has_tables": True},
+    {"market_domain": "없음"}
+]
+
+
+def _metadata(i):
+    return {
+        "market_domain": DOMAINS[i % 4],
+        "importance_level": LEVELS[i % 3],
+        "file_name": f"rule{i % 25}.pdf",
+        "has_tables": i % 2 == 0
+    }
+
+
+def _matches(metadata, where):
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_matches(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(_matches(metadata, clause) for clause in condition):
+                return False
+        else:
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                test = {"$eq": lambda: value == operand, "$ne": lambda: value != operand,
+                        "$in": lambda: value in operand, "$nin": lambda: value not in operand,
+                        "$contains": lambda: str(operand) in str(value)}[op]
+                if not test():
+                    return False
+    return True
+
+
+class TestMetadataIndex:
+    def test_set_algebra_matches_scan(self, tmp_path):
+        ids = [f"chunk_{i}" for i in range(600)]
+        metadatas = [_metadata(i) for i in range(600)]
+        index = MetadataIndex()
+        index.add(ids, metadatas)
+
+        # 삭제 표시(압축 전)와 교체 후에도 직접 검사와 같아야 함
+        removed = {f"chunk_{i}" for i in range(0, 600, 11)}
+        index.remove(sorted(removed))
+        index.add(["chunk_5"], [{**_metadata(5), "market_domain": "정산"}])
+        live = {doc_id: metadata for doc_id, metadata in zip(ids, metadatas) if doc_id not in removed}
+        live["chunk_5"] = {**_metadata(5), "market_domain": "정산"}
+
+        index.save(tmp_path / "metadata")
+        for current in (index, MetadataIndex.load(tmp_path / "metadata")):
+            for where in WHERES:
+                expected = {doc_id for doc_id, metadata in live.items() if _matches(metadata, where)}
+                assert set(current.ids_for(current.evaluate(where))) == expected, where
+
+        assert index.evaluate({"chunk_index": {"$gt": 3}}) is None
+        assert index.plan({"market_domain": "없음"}, top_k=5).strategy == "empty"
+        assert index.plan({"$and": [{"market_domain": "정산"}, {"importance_level": "critical"}]},
+                          top_k=5).strategy == "prefilter"
+        assert index.plan({"has_tables": True}, top_k=5).strategy == "postfilter"
+
+    def test_duplicate_ids_in_one_batch(self):
+        index = MetadataIndex()
+        index.add(["a", "b", "a"], [{"market_domain": "x"}, {"market_domain": "x"}, {"market_domain": "y"}])
+
+        assert len(index) == 2
+        assert index.ids_for(index.evaluate({"market_domain": "x"})) == ["b"]
+        assert index.ids_for(index.evaluate({"market_domain": "y"})) == ["a"]
+
+        index.remove(["a"])
+        assert index.ids_for(index.evaluate({"market_domain": "x"})) == ["b"]
+        assert index.ids_for(index.evaluate({"market_domain": "y"})) == []
+
+    def test_exact_backend_filtered_top_k(self, tmp_path):
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(800, 16)).astype(np.float32)
+        documents = [{"id": i, "text": f"청크 {i}", "embedding": embeddings[i], **_metadata(i)} for i in range(800)]
+        db = create_vector_database("exact", db_path=str(tmp_path), collection_name="test",
+                                    enable_lexical_index=False)
+        db.add_documents(documents)
+        db.delete_documents([f"rule{i % 25}.pdf_{i}" for i in range(0, 800, 9)])
+
+        normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        queries = rng.normal(size=(4, 16)).astype(np.float32)
+        for where in WHERES:
+            results = db.search_similar_batch(queries, top_k=5, where=where)
+            rows = [i for i in range(800) if i % 9 and _matches(_metadata(i), where)]
+            for query, hits in zip(queries, results):
+                scores = normalized[rows] @ (query / np.linalg.norm(query))
+                expected = [f"rule{rows[i] % 25}.pdf_{rows[i]}" for i in np.argsort(-scores, kind="stable")[:5]]
+                assert [hit["id"] for hit in hits] == expected, where
+
+        # 저장된 색인은 행 번호와 맞춰 다시 로드
+        reloaded = create_vector_database("exact", db_path=str(tmp_path), collection_name="test",
+                                          enable_lexical_index=False)
+        assert reloaded.metadata_index.doc_ids == reloaded.ids
@@ -0,0 +1,85 @@
+"""
+모델 레지스트리 테스트
+- 같은 (모델, 장치)는 동시에 요청해도 한 번만 로드되고 같은 객체를 공유하는지
+- 참조가 모두 반환되면 해제되고, prewarm한 모델은 유지되는지
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import embeddings.model_registry as model_registry
+from embeddings.model_registry import ModelRegistry, prewarm_configured_model
+
+
+class _CountingLoader:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, model_name, device):
+        time.sleep(0.05)
+        with self._lock:
+            self.calls.append((model_name, device))
+        return object()
+
+
+class TestModelRegistry:
+    def test_shared_load_and_reference_counting(self):
+        loader = _CountingLoader()
+        registry = ModelRegistry(loader=loader)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            models = list(executor.map(lambda _: registry.acquire("mini"), range(16)))
+        assert loader.calls == [("mini", None)]
+        assert all(model is models[0] for model in models)
+        assert registry.get_stats()["mini@auto"]["refs"] == 16
+
+        # 장치가 다르면 별도 모델
+        cpu_model = registry.acquire("mini", "cpu")
+        assert cpu_model is not models[0]
+        registry.release("mini", "cpu")
+        assert not registry.is_loaded("mini", "cpu")
+
+        for _ in range(15):
+            registry.release("mini")
+        assert registry.is_loaded("mini")
+        registry.release("mini")
+        assert not registry.is_loaded("mini")
+
+        # 해제 후 다시 요청하면 새로 로드
+        with registry.lease("mini") as model:
+            assert model is not models[0]
+        assert len(loader.calls) == 3
+
+    def test_prewarm_keeps_model_loaded(self):
+        loader = _CountingLoader()
+        registry = ModelRegistry(loader=loader)
+
+        assert registry.prewarm(["mini"])["mini"] > 0
+        assert registry.prewarm(["mini"])["mini"] == 0.0
+        model = registry.acquire("mini")
+        registry.release("mini")
+        assert registry.is_loaded("mini")
+        assert registry.acquire("mini") is model
+        assert len(loader.calls) == 1
+
+        registry.release("mini")
+        registry.unpin("mini")
+        assert not registry.is_loaded("mini")
+
+    def test_prewarm_configured_model_uses_embedder_key(self, monkeypatch):
+        loader = _CountingLoader()
+        registry = ModelRegistry(loader=loader)
+        monkeypatch.setattr(model_registry, "_registry", registry)
+
+        prewarm_configured_model({"EMBEDDING_MODEL": "mini", "EMBEDDING_DEVICE": "cpu"})
+        model = registry.acquire("mini", "cpu")
+        registry.release("mini", "cpu")
+
+        assert loader.calls == [("mini", "cpu")]
+        assert registry.is_loaded("mini", "cpu") and registry.acquire("mini", "cpu") is model
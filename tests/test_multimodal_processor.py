@@ -0,0 +1,356 @@
+"""
+멀티모달 처리기 페이지 처리 테스트
+- PyMuPDF 없이 페이지 객체를 흉내 내어 OCR/표 감지 실행 여부, 시간 예산 소진 시 OCR 지연,
+  지연된 OCR 결과 반영을 확인
+- 페이지 스트림(iter_pages) 기반 처리가 기존 문서 단위 처리와 같은 결과를 내는지 확인
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import core.multimodal_processor as multimodal_processor
+from core.multimodal_processor import MultimodalProcessor, PageSignals
+
+
+class FakePage:
+    """fitz.Page 대역 (사전 분류에 쓰는 배치 정보와 텍스트만 제공)"""
+
+    def __init__(self, text="", image_bboxes=(), drawings=0, width=100.0, height=100.0):
+        self.text = text
+        self.image_bboxes = list(image_bboxes)
+        self.drawings = drawings
+        self.rect = SimpleNamespace(width=width, height=height)
+        self.parent = None
+
+    def get_text(self):
+        return self.text
+
+    def get_image_info(self):
+        return [{"bbox": bbox} for bbox in self.image_bboxes]
+
+    def get_images(self):
+        return [(index + 1,) for index in range(len(self.image_bboxes))]
+
+    def get_drawings(self):
+        return [{} for _ in range(self.drawings)]
+
+
+class FakeDocument:
+    """fitz.Document 대역"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.closed = False
+
+    def __len__(self):
+        return len(self.pages)
+
+    def load_page(self, page_num):
+        return self.pages[page_num]
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def fake_images(page, page_num, run_ocr=True):
+    """_extract_images_from_page 대역 (이미지마다 OCR 여부를 텍스트로 남김)"""
+    return [
+        {"page_number": page_num, "image_index": index, "ocr_text": "ocr" if run_ocr else ""}
+        for index in range(len(page.get_images()))
+    ]
+
+
+@pytest.fixture
+def fake_pdf(tmp_path, monkeypatch):
+    """페이지 목록을 받아 fitz.open이 그 문서를 돌려주도록 설정하고 PDF 경로 반환"""
+    def install(pages):
+        document = FakeDocument(pages)
+        monkeypatch.setattr(multimodal_processor, "PDF_AVAILABLE", True)
+        monkeypatch.setattr(multimodal_processor, "fitz", SimpleNamespace(open=lambda path: document),
+                            raising=False)
+        path = tmp_path / "sample.pdf"
+        path.write_bytes(b"%PDF-1.4")
+        return path
+    return install
+
+
+@pytest.fixture
+def processor(tmp_path):
+    return MultimodalProcessor(data_dir=str(tmp_path / "data"))
+
+
+LONG_TEXT = "전력시장 운영규칙 본문 " * 10
+FULL_PAGE_IMAGE = (0, 0, 100, 100)
+SMALL_IMAGE = (0, 0, 10, 10)  # 페이지 면적의 1%
+
+
+class TestPageGating:
+    """페이지 사전 분류와 OCR/표 감지 실행 여부"""
+
+    def test_classify_page_uses_layout_only(self, processor):
+        page = FakePage(text=f"  {LONG_TEXT}  ", image_bboxes=[(0, 0, 50, 50), (50, 50, 100, 80)], drawings=7)
+
+        signals = processor._classify_page(page, page.get_text())
+
+        assert signals.text_chars == len(LONG_TEXT.strip())
+        assert signals.image_count == 2
+        assert signals.drawing_count == 7
+        assert signals.image_area_ratio == pytest.approx((2500 + 1500) / 10000)
+
+    def test_classify_page_clamps_overlapping_images(self, processor):
+        page = FakePage(image_bboxes=[FULL_PAGE_IMAGE, FULL_PAGE_IMAGE])
+
+        assert processor._classify_page(page, "").image_area_ratio == 1.0
+
+    def test_classify_page_falls_back_without_image_info(self, processor):
+        page = FakePage(image_bboxes=[SMALL_IMAGE])
+        page.get_image_info = None  # 호출하면 TypeError
+
+        signals = processor._classify_page(page, LONG_TEXT)
+
+        # 배치 정보가 없으면 이미지가 페이지 전체를 덮는 것으로 보고 OCR 대상에 남김
+        assert signals.image_count == 1
+        assert signals.image_area_ratio == 1.0
+
+    @pytest.mark.parametrize("signals, expected", [
+        (PageSignals(text_chars=0, drawing_count=0, image_count=0, image_area_ratio=0.0), False),
+        (PageSignals(text_chars=500, drawing_count=0, image_count=1, image_area_ratio=0.5), True),
+        (PageSignals(text_chars=500, drawing_count=0, image_count=3, image_area_ratio=0.01), False),
+        (PageSignals(text_chars=20, drawing_count=0, image_count=1, image_area_ratio=0.01), True),
+    ])
+    def test_should_run_ocr(self, processor, signals, expected):
+        assert processor._should_run_ocr(signals) is expected
+
+    @pytest.mark.parametrize("drawings, expected", [(0, False), (5, False), (6, True), (40, True)])
+    def test_should_detect_tables(self, processor, drawings, expected):
+        signals = PageSignals(text_chars=500, drawing_count=drawings, image_count=0, image_area_ratio=0.0)
+
+        assert processor._should_detect_tables(signals) is expected
+
+    def test_gate_disabled_runs_everything_with_images(self, tmp_path):
+        processor = MultimodalProcessor(data_dir=str(tmp_path / "data"), gate_pages=False)
+        small = PageSignals(text_chars=500, drawing_count=0, image_count=1, image_area_ratio=0.01)
+        no_images = PageSignals(text_chars=500, drawing_count=0, image_count=0, image_area_ratio=0.0)
+
+        assert processor._should_run_ocr(small) is True
+        assert processor._should_run_ocr(no_images) is False
+        assert processor._should_detect_tables(no_images) is True
+
+
+class TestTimeBudget:
+    """문서당 시간 예산을 넘긴 뒤의 페이지는 OCR 지연, 표 감지 생략"""
+
+    def test_pages_after_budget_are_deferred(self, processor, fake_pdf, monkeypatch):
+        pages = [FakePage(text="스캔 페이지", image_bboxes=[FULL_PAGE_IMAGE]) for _ in range(4)]
+        path = fake_pdf(pages)
+
+        # perf_counter를 호출마다 1초씩 진행시켜 페이지마다 1초를 쓴 것으로 만듦
+        clock = iter(range(1000))
+        monkeypatch.setattr(multimodal_processor.time, "perf_counter", lambda: float(next(clock)))
+        monkeypatch.setattr(processor, "_extract_images_from_page", fake_images)
+        processor.ocr_reader = object()
+        processor._ocr_reader_checked = True
+        processor.time_budget_seconds = 1.5
+
+        analyses = [page.analysis for page in processor.iter_pages(path)]
+
+        assert [analysis["ocr"] for analysis in analyses] == ["done", "done", "deferred", "deferred"]
+        assert [analysis["tables"] for analysis in analyses] == ["skipped", "skipped",
+                                                                 "skipped_budget", "skipped_budget"]
+        assert processor.processing_stats["ocr_pages"] == 2
+        assert processor.processing_stats["ocr_deferred_pages"] == 2
+
+    def test_gated_out_pages_are_deferred_not_budget_skipped(self, processor, fake_pdf, monkeypatch):
+        pages = [
+            FakePage(text=LONG_TEXT, image_bboxes=[SMALL_IMAGE], drawings=10),  # 작은 로고 + 표
+            FakePage(text=LONG_TEXT),  # 텍스트만
+        ]
+        path = fake_pdf(pages)
+        monkeypatch.setattr(processor, "_extract_images_from_page", fake_images)
+        monkeypatch.setattr(processor, "_extract_tables_from_page", lambda page, page_num: [{"page_number": page_num}])
+
+        result = processor._process_pdf(path)
+
+        analyses = result["metadata"]["page_analysis"]
+        assert [analysis["ocr"] for analysis in analyses] == ["deferred", "none"]
+        assert [analysis["tables"] for analysis in analyses] == ["done", "skipped"]
+        assert result["metadata"]["deferred_ocr_pages"] == [0]
+        assert result["multimodal_content"]["tables"] == [{"page_number": 0}]
+
+
+class TestDeferredOcr:
+    """지연된 OCR 실행과 처리 결과 반영"""
+
+    def test_run_deferred_ocr_forces_ocr_on_page(self, processor, fake_pdf, monkeypatch):
+        path = fake_pdf([FakePage(text=LONG_TEXT), FakePage(text=LONG_TEXT, image_bboxes=[SMALL_IMAGE] * 2)])
+        calls = []
+
+        def extract(page, page_num, run_ocr=True):
+            calls.append((page_num, run_ocr))
+            return fake_images(page, page_num, run_ocr)
+
+        monkeypatch.setattr(processor, "_extract_images_from_page", extract)
+        processor.ocr_reader = object()
+
+        images = processor.run_deferred_ocr(path, 1)
+
+        assert calls == [(1, True)]
+        assert [image["ocr_text"] for image in images] == ["ocr", "ocr"]
+        assert processor.processing_stats["ocr_pages"] == 1
+
+    def test_apply_deferred_ocr_merges_into_processed_document(self, processor, monkeypatch):
+        processed = {
+            "file_path": "sample.pdf",
+            "multimodal_content": {"images": [
+                {"page_number": 0, "image_index": 0, "ocr_text": "ocr"},
+                {"page_number": 2, "image_index": 0, "ocr_text": ""},
+                {"page_number": 2, "image_index": 1, "ocr_text": ""},
+                {"page_number": 3, "image_index": 0, "ocr_text": ""},
+            ]},
+            "metadata": {
+                "deferred_ocr_pages": [2, 3],
+                "page_analysis": [
+                    {"page_number": 0, "ocr": "done"},
+                    {"page_number": 1, "ocr": "none"},
+                    {"page_number": 2, "ocr": "deferred"},
+                    {"page_number": 3, "ocr": "deferred"},
+                ]
+            }
+        }
+        monkeypatch.setattr(processor, "run_deferred_ocr", lambda file_path, page_number: [
+            {"page_number": page_number, "image_index": 1, "ocr_text": "두 번째"},
+            {"page_number": page_number, "image_index": 0, "ocr_text": "첫 번째"},
+        ])
+        processor.ocr_reader = object()
+
+        processor.apply_deferred_ocr(processed, 2)
+
+        images = processed["multimodal_content"]["images"]
+        assert [(image["page_number"], image["image_index"], image["ocr_text"]) for image in images] == [
+            (0, 0, "ocr"), (2, 0, "첫 번째"), (2, 1, "두 번째"), (3, 0, "")
+        ]
+        assert processed["metadata"]["deferred_ocr_pages"] == [3]
+        assert [analysis["ocr"] for analysis in processed["metadata"]["page_analysis"]] == [
+            "done", "none", "done", "deferred"
+        ]
+
+    def test_apply_deferred_ocr_without_reader_leaves_document(self, processor, monkeypatch):
+        processed = {
+            "file_path": "sample.pdf",
+            "multimodal_content": {"images": [{"page_number": 0, "image_index": 0, "ocr_text": ""}]},
+            "metadata": {"deferred_ocr_pages": [0], "page_analysis": [{"page_number": 0, "ocr": "deferred"}]}
+        }
+        monkeypatch.setattr(processor, "run_deferred_ocr", lambda file_path, page_number: [
+            {"page_number": page_number, "image_index": 0, "ocr_text": ""}
+        ])
+
+        processor.apply_deferred_ocr(processed, 0)
+
+        assert processed["metadata"]["deferred_ocr_pages"] == [0]
+        assert processed["metadata"]["page_analysis"][0]["ocr"] == "deferred"
+
+
+PAGE_TEXTS = [
+    "제1장 총칙\n\n전력시장 운영규칙의 목적을 정한다. 시장 참여자는 규칙을 따른다.\n\n짧음",
+    "",
+    "제2조 정의\n\n계통한계가격은 시간대별로 결정된다! 용량가격은 별도로 산정한다?\n\n"
+    "발전기 출력 = 0.95 × 설비용량",
+    "부칙\n\n이 규칙은 공포한 날부터 시행한다. 경과 조치는 따로 정한다.",
+]
+
+
+class TestPageStreaming:
+    """iter_pages 기반 _process_pdf가 기존 문서 단위 처리와 같은 결과를 내는지"""
+
+    def _list_based(self, processor, page_texts):
+        """페이지 스트림 도입 전 방식: 전체 문단을 모은 뒤 문장을 한 번에 추출"""
+        full_text = ""
+        paragraphs = []
+        for page_num, page_text in enumerate(page_texts):
+            full_text += page_text + "\n"
+            paragraphs.extend(processor._analyze_paragraphs(page_text, page_num))
+        return full_text.strip(), paragraphs, processor._extract_sentences(paragraphs)
+
+    def test_process_pdf_matches_list_based_output(self, processor, fake_pdf):
+        path = fake_pdf([FakePage(text=text) for text in PAGE_TEXTS])
+        expected_text, expected_paragraphs, expected_sentences = self._list_based(processor, PAGE_TEXTS)
+
+        result = processor._process_pdf(path)
+
+        assert result["metadata"]["total_pages"] == len(PAGE_TEXTS)
+        assert result["content"]["document"] == expected_text
+        assert result["content"]["paragraphs"] == expected_paragraphs
+        assert result["content"]["sentences"] == expected_sentences
+        assert [s["sentence_index"] for s in result["content"]["sentences"]] == list(range(len(expected_sentences)))
+        page_numbers = [s["page_number"] for s in result["content"]["sentences"]]
+        assert page_numbers == sorted(page_numbers) and set(page_numbers) == {0, 2, 3}
+        assert result["content"]["sections"] == processor._analyze_document_structure(expected_text + "\n")
+
+    def test_iter_pages_offsets_and_closes_document(self, processor, fake_pdf):
+        pages = [FakePage(text=text) for text in PAGE_TEXTS]
+        path = fake_pdf(pages)
+        document = multimodal_processor.fitz.open(path)
+        full_text = "".join(text + "\n" for text in PAGE_TEXTS)
+
+        streamed = list(processor.iter_pages(path))
+
+        assert [page.page_number for page in streamed] == list(range(len(PAGE_TEXTS)))
+        for page in streamed:
+            assert full_text[page.char_offset:page.char_offset + len(page.text)] == page.text
+        assert document.closed
+
+    def test_iter_pages_closes_document_when_stopped_early(self, processor, fake_pdf):
+        path = fake_pdf([FakePage(text=text) for text in PAGE_TEXTS])
+        document = multimodal_processor.fitz.open(path)
+
+        stream = processor.iter_pages(path)
+        next(stream)
+        stream.close()
+
+        assert document.closed
+
+
+class TestConfigOptions:
+    """MULTIMODAL_* 설정이 처리기와 적재 파이프라인 워커에 전달되는지"""
+
+    CONFIG = {
+        "MULTIMODAL_PAGE_GATING": False,
+        "MULTIMODAL_TIME_BUDGET": 2.5,
+        "MULTIMODAL_INCLUDE_IMAGE_DATA": True,
+    }
+
+    def test_multimodal_options_maps_config_keys(self):
+        assert multimodal_processor.multimodal_options(self.CONFIG) == {
+            "gate_pages": False,
+            "time_budget_seconds": 2.5,
+            "include_image_data": True,
+        }
+        # 값이 없는 키는 생성자 기본값 사용
+        assert multimodal_processor.multimodal_options({"MULTIMODAL_TIME_BUDGET": None}) == {}
+        assert multimodal_processor.multimodal_options(None) == {}
+
+    @pytest.mark.parametrize("pipeline_kwargs", [{"enhanced_config": CONFIG}, {"config": CONFIG}])
+    def test_pipeline_worker_uses_config(self, tmp_path, monkeypatch, pipeline_kwargs):
+        import core.ingestion_pipeline as ingestion_pipeline
+        from core.ingestion_pipeline import IngestionPipeline
+
+        monkeypatch.setattr(ingestion_pipeline, "_worker_components", {})
+        # 워커 초기화에서 청크 강화 엔진은 생성하지 않음 (처리기 설정만 확인)
+        pipeline = IngestionPipeline(workers=1, data_dir=str(tmp_path / "data"), **pipeline_kwargs)
+        ingestion_pipeline._init_worker(pipeline.data_dir, None, pipeline.processor_options)
+
+        processor = ingestion_pipeline._worker_components["processor"]
+        assert processor.gate_pages is False
+        assert processor.time_budget_seconds == 2.5
+        assert processor.include_image_data is True
@@ -0,0 +1,152 @@
+"""
+ONNX 임베딩 백엔드 테스트
+- pooling이 패딩 토큰을 무시하여 패딩 길이와 관계없이 같은 문장 임베딩을 내는지
+- OnnxEncoder.encode가 길이순으로 묶어 실행하고 입력 순서대로 되돌려 주는지 (세션/토크나이저 대체 객체 사용)
+- python -m embeddings.onnx_backend --export가 서빙 시 찾는 경로로 내보내는지 (실제 내보내기는 대체 함수 사용)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import embeddings.onnx_backend as onnx_backend
+from embeddings.onnx_backend import (ENCODER_CONFIG_FILE, OnnxEncoder, export_configured_model, main,
+                                     pool_token_embeddings, resolve_onnx_model)
+
+
+class StubTokenizer:
+    """문자 코드를 토큰 번호로 쓰는 토크나이저 (오른쪽 패딩)"""
+
+    def __call__(self, texts, padding=True, truncation=True, max_length=None, return_tensors="np"):
+        rows = [[ord(char) for char in text][:max_length] for text in texts]
+        width = max(len(row) for row in rows)
+        input_ids = np.zeros((len(rows), width), dtype=np.int64)
+        attention_mask = np.zeros((len(rows), width), dtype=np.int64)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = row
+            attention_mask[i, :len(row)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class StubSession:
+    """토큰 번호로 토큰 임베딩을 만드는 세션 (배치별 입력 기록)"""
+
+    def __init__(self):
+        self.batches = []
+
+    def run(self, output_names, feeds):
+        input_ids = feeds["input_ids"]
+        self.batches.append(feeds["attention_mask"].sum(axis=1).tolist())
+        ids = input_ids.astype(np.float32)[:, :, None]
+        return [np.concatenate([ids, np.sqrt(ids), np.ones_like(ids)], axis=2)]
+
+
+def make_encoder(max_seq_length=16):
+    encoder = OnnxEncoder.__new__(OnnxEncoder)
+    encoder.config = {"dimension": 3, "input_names": ["input_ids", "attention_mask"],
+                      "pooling": "mean", "normalize": False}
+    encoder.max_seq_length = max_seq_length
+    encoder.tokenizer = StubTokenizer()
+    encoder.session = StubSession()
+    return encoder
+
+
+def expected_embedding(text, max_seq_length=16):
+    ids = np.array([ord(char) for char in text][:max_seq_length], dtype=np.float32)
+    return np.array([ids.mean(), np.sqrt(ids).mean(), 1.0], dtype=np.float32)
+
+
+class TestPoolTokenEmbeddings:
+    def test_padding_is_ignored(self):
+        rng = np.random.default_rng(0)
+        tokens = rng.normal(size=(1, 4, 8)).astype(np.float32)
+        padded = np.concatenate([tokens, rng.normal(size=(1, 3, 8)).astype(np.float32)], axis=1)
+        mask = np.ones((1, 4), dtype=np.int64)
+        padded_mask = np.concatenate([mask, np.zeros((1, 3), dtype=np.int64)], axis=1)
+
+        for mode in ("mean", "cls", "max"):
+            expected = pool_token_embeddings(tokens, mask, mode)
+            assert np.allclose(pool_token_embeddings(padded, padded_mask, mode), expected, atol=1e-6)
+
+        assert np.allclose(pool_token_embeddings(tokens, mask, "mean"), tokens.mean(axis=1), atol=1e-6)
+        normalized = pool_token_embeddings(padded, padded_mask, "mean", normalize=True)
+        assert np.allclose(np.linalg.norm(normalized, axis=1), 1.0)
+
+
+class TestOnnxEncoder:
+    def test_length_sorted_batches_return_in_input_order(self):
+        texts = ["가", "전력시장 운영규칙", "정산", "계통한계가격 결정 방법은?", "급전지시", "a" * 40]
+        encoder = make_encoder()
+
+        embeddings = encoder.encode(texts, batch_size=2)
+
+        assert embeddings.shape == (len(texts), 3)
+        for text, embedding in zip(texts, embeddings):
+            assert np.allclose(embedding, expected_embedding(text), rtol=1e-5)
+        # 긴 문장부터 길이순으로 묶여 배치 안 패딩이 최소
+        lengths = [length for batch in encoder.session.batches for length in batch]
+        assert lengths == sorted(lengths, reverse=True)
+        assert [len(batch) for batch in encoder.session.batches] == [2, 2, 2]
+
+    def test_single_string_and_empty_input(self):
+        encoder = make_encoder()
+        assert np.allclose(encoder.encode("정산"), expected_embedding("정산"))
+        assert encoder.encode([]).shape == (0, 3)
+        assert encoder.session.batches == [[2]]
+
+
+class TestResolveOnnxModel:
+    def test_missing_export_fails_loudly(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            resolve_onnx_model("sentence-transformers/test-model", tmp_path)
+
+
+@pytest.fixture
+def export_calls(monkeypatch):
+    """_export_onnx_model 대역: 설정 파일만 써서 내보낸 것으로 표시 (호출 기록)"""
+    calls = []
+
+    def fake_export(model_name, output_dir, quantize, opset):
+        calls.append((model_name, output_dir))
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / ENCODER_CONFIG_FILE).write_text("{}")
+        return output_dir
+
+    monkeypatch.setattr(onnx_backend, "_export_onnx_model", fake_export)
+    return calls
+
+
+class TestExportEntryPoint:
+    MODEL = "sentence-transformers/test-model"
+
+    def test_exports_where_serving_resolves(self, tmp_path, export_calls):
+        config = {"EMBEDDING_MODEL": self.MODEL, "EMBEDDING_ONNX_PATH": str(tmp_path)}
+
+        model_dir = export_configured_model(config)
+
+        assert model_dir == resolve_onnx_model(self.MODEL, tmp_path)
+        assert export_calls == [(self.MODEL, model_dir)]
+        # 이미 있으면 다시 내보내지 않고, overwrite이면 다시 내보냄
+        export_configured_model(config)
+        assert len(export_calls) == 1
+        export_configured_model(config, overwrite=True)
+        assert len(export_calls) == 2
+
+    def test_main_export(self, tmp_path, export_calls):
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(f'EMBEDDING_MODEL: "{self.MODEL}"\nEMBEDDING_ONNX_PATH: "{tmp_path / "onnx"}"\n',
+                               encoding="utf-8")
+
+        assert main(["--config", str(config_path)]) == 1  # 내보낸 모델 없음
+        assert export_calls == []
+        assert main(["--config", str(config_path), "--export"]) == 0
+        assert main(["--config", str(config_path)]) == 0
+        assert main(["--config", str(config_path), "--export"]) == 0
+        assert len(export_calls) == 1
+        assert main(["--config", str(config_path), "--force"]) == 0
+        assert len(export_calls) == 2
+        assert export_calls[0][1] == tmp_path / "onnx" / "sentence-transformers__test-model"
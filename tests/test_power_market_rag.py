@@ -0,0 +1,146 @@
+"""
+RAG 시스템 일괄 질문(ask_many) 테스트
+- 순서 유지 모드는 생성 완료 순서와 관계없이 입력 순서대로 반환
+- 완료 순서 모드는 모든 질문 번호를 정확히 한 번씩 반환
+- 답변 캐시(정확 일치/유사 질문) 적중은 답변 생성 없이 반환
+- 단계별 소요 시간 기록
+"""
+
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+power_market_rag = pytest.importorskip("power_market_rag")
+
+from generation.answer_cache import AnswerCache
+
+QUESTIONS = [f"질문 {i}: 하루전 발전계획 절차" for i in range(5)]
+
+
+def embed(text):
+    rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+    return rng.standard_normal(8).astype(np.float32)
+
+
+class StubEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def encode_queries(self, texts):
+        self.calls.append(list(texts))
+        return np.stack([embed(text) for text in texts])
+
+
+class StubRetriever:
+    hybrid_mode = "fused"
+
+    def __init__(self):
+        self.calls = []
+
+    def search_many(self, queries, method="hybrid", query_embeddings=None, timings=None):
+        self.calls.append(list(queries))
+        timings["vector_search"] = timings.get("vector_search", 0.0)
+        return [[f"검색 결과: {query}"] for query in queries]
+
+
+class StubVectorDB:
+    def get_version(self):
+        return 1
+
+
+@pytest.fixture
+def rag(tmp_path):
+    rag = power_market_rag.PowerMarketRAG(config_path=str(tmp_path / "missing.yaml"))
+    rag.is_initialized = True
+    rag.vector_db = StubVectorDB()
+    rag.text_embedder = StubEmbedder()
+    rag.retriever = StubRetriever()
+    rag.answer_cache = AnswerCache(max_distance=0.05)
+    rag.answer_cache.check_version(StubVectorDB().get_version())  # 미리 넣은 항목이 무효화되지 않도록
+    rag.generated = []
+    lock = threading.Lock()
+
+    def generate(question, search_results, search_method):
+        # 뒤 질문일수록 빨리 끝나도록 지연 (완료 순서가 입력 순서의 역순)
+        index = QUESTIONS.index(question)
+        time.sleep(0.05 * (len(QUESTIONS) - index))
+        with lock:
+            rag.generated.append(index)
+        return {"answer": f"답변 {index}", "confidence": 0.9, "sources": search_results}
+
+    rag._generate = generate
+    return rag
+
+
+class TestAskMany:
+    """일괄 질문 처리"""
+
+    def test_ordered_mode_yields_input_order(self, rag):
+        results = list(rag.ask_many(QUESTIONS, ordered=True, max_workers=len(QUESTIONS)))
+
+        assert [index for index, _ in results] == list(range(len(QUESTIONS)))
+        assert [result["answer"] for _, result in results] == [f"답변 {i}" for i in range(len(QUESTIONS))]
+        assert rag.generated[0] == len(QUESTIONS) - 1  # 생성은 역순으로 끝남
+
+    def test_unordered_mode_yields_every_index_once(self, rag):
+        results = list(rag.ask_many(QUESTIONS, ordered=False, max_workers=len(QUESTIONS)))
+
+        indices = [index for index, _ in results]
+        assert sorted(indices) == list(range(len(QUESTIONS)))
+        assert indices == rag.generated  # 완료되는 대로 반환
+        for index, result in results:
+            assert result["answer"] == f"답변 {index}"
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_cache_hits_skip_generation(self, rag, ordered):
+        filter_key = AnswerCache.make_filter_key(search_method="hybrid")
+        rag.answer_cache.put(QUESTIONS[1], filter_key, {"answer": "캐시 1"})
+        similar = "질문 3 하루전 발전계획 절차는?"
+        rag.answer_cache.put(similar, filter_key, {"answer": "캐시 3"}, embed(QUESTIONS[3]))
+
+        results = dict(rag.ask_many(QUESTIONS, ordered=ordered, max_workers=2))
+
+        assert sorted(results) == list(range(len(QUESTIONS)))
+        assert results[1]["answer"] == "캐시 1"
+        assert results[3]["answer"] == "캐시 3"
+        assert sorted(rag.generated) == [0, 2, 4]
+        # 정확 일치 적중은 임베딩하지 않고, 유사 질문 적중은 검색하지 않음
+        assert rag.text_embedder.calls == [[QUESTIONS[i] for i in (0, 2, 3, 4)]]
+        assert rag.retriever.calls == [[QUESTIONS[i] for i in (0, 2, 4)]]
+
+    def test_all_cached_questions_do_not_search(self, rag):
+        filter_key = AnswerCache.make_filter_key(search_method="hybrid")
+        for index, question in enumerate(QUESTIONS):
+            rag.answer_cache.put(question, filter_key, {"answer": f"캐시 {index}"})
+
+        results = list(rag.ask_many(QUESTIONS))
+
+        assert [result["answer"] for _, result in results] == [f"캐시 {i}" for i in range(len(QUESTIONS))]
+        assert rag.generated == [] and rag.text_embedder.calls == [] and rag.retriever.calls == []
+
+    def test_timings_are_recorded(self, rag):
+        timings = {}
+
+        list(rag.ask_many(QUESTIONS, max_workers=len(QUESTIONS), timings=timings))
+
+        for stage in ("cache", "embed", "vector_search", "generate", "generate_wall", "total"):
+            assert stage in timings
+        # 생성 시간 합계는 병렬 실행 경과 시간보다 큼
+        assert timings["generate"] > timings["generate_wall"]
+        assert timings["total"] >= timings["generate_wall"]
+
+    def test_generated_answers_are_cached(self, rag):
+        list(rag.ask_many(QUESTIONS[:2], max_workers=2))
+        rag.generated.clear()
+
+        results = list(rag.ask_many(QUESTIONS[:2], max_workers=2))
+
+        assert [result["answer"] for _, result in results] == ["답변 0", "답변 1"]
+        assert rag.generated == []
@@ -0,0 +1,85 @@
+"""
+관계 그래프 저장소 테스트
+- 저장/로드 왕복 후 이웃 조회, 관계 상세 정보, 다중 홉 확장이 구축 직후와 같은지
+- 로드한 그래프의 관계 상세 조회가 여러 스레드에서 동시에 호출되어도 안전한지
+"""
+
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import core.relationship_graph as relationship_graph
+from core.relationship_graph import RelationshipGraph
+
+TYPES = ["references", "similar_content", "amends"]
+
+
+def make_relationships(num_nodes=60, num_edges=500, seed=0):
+    rng = random.Random(seed)
+    relationships = []
+    for e in range(num_edges):
+        source, target = rng.sample(range(num_nodes), 2)
+        relationships.append({
+            "source_id": f"doc_{source}",
+            "target_id": f"doc_{target}",
+            "relationship_type": rng.choice(TYPES),
+            "strength": round(rng.random(), 4),
+            "confidence": round(rng.uniform(0.5, 1.0), 4),
+            "evidence": [f"근거 {e}", "전력시장운영규칙 " * rng.randint(0, 5)],
+        })
+    return relationships
+
+
+@pytest.fixture
+def saved_graph(tmp_path):
+    relationships = make_relationships()
+    built = RelationshipGraph.build(relationships, TYPES)
+    built.save(tmp_path / "graph")
+    loaded = RelationshipGraph.load(tmp_path / "graph")
+    yield relationships, built, loaded
+    loaded.close()
+
+
+class TestRelationshipGraph:
+    """관계 그래프 저장소 테스트 클래스"""
+
+    def test_save_load_round_trip(self, saved_graph):
+        relationships, built, loaded = saved_graph
+
+        assert loaded.num_nodes == built.num_nodes
+        assert loaded.num_edges == len(relationships)
+        assert [loaded.get_edge(e) for e in range(loaded.num_edges)] == relationships
+        for node_id in built.node_ids:
+            assert loaded.neighbors_of(node_id) == built.neighbors_of(node_id)
+            assert loaded.neighbors_of(node_id, ["amends"], min_strength=0.3, max_results=3) == \
+                built.neighbors_of(node_id, ["amends"], min_strength=0.3, max_results=3)
+        assert loaded.expand("doc_0", max_hops=2, limit=20) == built.expand("doc_0", max_hops=2, limit=20)
+        assert loaded.node_statistics() == built.node_statistics()
+
+    def test_neighbors_sorted_by_relevance(self, saved_graph):
+        _, _, loaded = saved_graph
+
+        for node_id in loaded.node_ids:
+            scores = [score for _, _, score in loaded.neighbors_of(node_id)]
+            assert scores == sorted(scores, reverse=True)
+            assert len(scores) == loaded.degree(node_id)
+
+    @pytest.mark.parametrize("has_pread", [True, False])
+    def test_concurrent_edge_reads(self, saved_graph, monkeypatch, has_pread):
+        relationships, _, loaded = saved_graph
+        monkeypatch.setattr(relationship_graph, "HAS_PREAD", has_pread)
+
+        def read_edges(seed):
+            rng = random.Random(seed)
+            for _ in range(2000):
+                edge_id = rng.randrange(loaded.num_edges)
+                assert loaded.get_edge(edge_id) == relationships[edge_id]
+            return True
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert all(executor.map(read_edges, range(8)))
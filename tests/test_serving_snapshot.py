@@ -0,0 +1,56 @@
+"""
+서빙 스냅샷 테스트
+- 게시한 스냅샷을 읽기 전용으로 열어 청크 저장소 원본과 같은 검색 결과를 내는지
+- 읽기 전용 컬렉션 변경이 거부되고 이전 스냅샷이 정리되는지
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.actual_formula_extractor import ActualFormulaExtractor
+from core.serving_snapshot import ServingSnapshot, build_snapshot, list_snapshots, open_configured_snapshot
+from data.vectors.chunk_store import ChunkStore
+from data.vectors.factory import create_vector_database
+
+
+class TestServingSnapshot:
+    def test_build_and_open_read_only(self, tmp_path):
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(200, 16)).astype(np.float32)
+        documents = [{"id": i, "text": f"청크 {i}", "file_name": "rule.pdf", "page": i % 5} for i in range(200)]
+        ChunkStore(tmp_path / "chunks").write_documents("docs", documents, embeddings)
+
+        config = {
+            "CHUNK_STORE_PATH": str(tmp_path / "chunks"),
+            "COLLECTION_NAME": "docs",
+            "VECTOR_DB_TYPE": "chromadb",
+            "SERVING_SNAPSHOT_PATH": str(tmp_path / "snapshots"),
+            "EMBEDDING_MODEL": "test-model"
+        }
+        for _ in range(3):
+            build_snapshot(config, keep=2)
+        assert len(list_snapshots(tmp_path / "snapshots")) == 2
+
+        snapshot = open_configured_snapshot(config)
+        assert snapshot.manifest["vector_db_type"] == "exact"
+        assert snapshot.manifest["documents"] == 200
+        assert open_configured_snapshot({**config, "EMBEDDING_MODEL": "other-model"}) is None
+
+        db = snapshot.open_vector_database()
+        reference = create_vector_database("exact", db_path=str(tmp_path / "reference"), collection_name="docs")
+        reference.add_documents(documents, embeddings=embeddings)
+        queries = rng.normal(size=(5, 16)).astype(np.float32)
+        for a, b in zip(db.search_similar_batch(queries, top_k=5),
+                        reference.search_similar_batch(queries, top_k=5)):
+            assert [hit["id"] for hit in a] == [hit["id"] for hit in b]
+
+        assert db.add_documents(documents[:1], embeddings=embeddings[:1]) is False
+        assert db.delete_documents([db.ids[0]]) is False
+        assert ServingSnapshot.open(tmp_path / "snapshots").open_vector_database().get_collection_stats()[
+            "document_count"] == 200
+
+        assert snapshot.formula_extractor().to_registry() == ActualFormulaExtractor().to_registry()
@@ -0,0 +1,100 @@
+"""
+블록 단위 유사 쌍 탐색 테스트
+- 정확 모드가 전체 유사도 행렬로 구한 결과와 같은지 (top-k 유무, 블록 경계)
+- 근사 모드가 임계값 미만 쌍을 내지 않고, 군집된 데이터에서 정확 모드 쌍을 충분히 찾는지
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.similarity_pairs import approximate_similar_pairs, blockwise_similar_pairs
+
+
+def normalized(matrix):
+    return (matrix / np.linalg.norm(matrix, axis=1, keepdims=True)).astype(np.float32)
+
+
+def clustered_matrix(n=400, dim=32, n_centers=12, noise=0.15, seed=0):
+    """중심 주변에 모인 정규화 벡터 (같은 중심에서 나온 벡터끼리 유사도가 높음)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_centers, dim))
+    labels = rng.integers(0, n_centers, n)
+    return normalized(centers[labels] + noise * rng.standard_normal((n, dim)))
+
+
+def brute_force_pairs(matrix, threshold, top_k=None):
+    """전체 유사도 행렬로 구한 {(i, j): 유사도} (i < j)"""
+    sim = matrix @ matrix.T
+    np.fill_diagonal(sim, -np.inf)
+    pairs = {}
+    for i in range(matrix.shape[0]):
+        neighbors = np.argsort(-sim[i], kind="stable")
+        if top_k is not None:
+            neighbors = neighbors[:top_k]
+        for j in neighbors:
+            if sim[i, j] >= threshold:
+                pairs[(min(i, j), max(i, j))] = float(sim[i, j])
+    return pairs
+
+
+def as_dict(pairs):
+    rows, cols, sims = pairs
+    assert np.all(rows < cols)
+    assert len(set(zip(rows.tolist(), cols.tolist()))) == rows.size
+    return {(int(r), int(c)): float(s) for r, c, s in zip(rows, cols, sims)}
+
+
+class TestBlockwiseSimilarPairs:
+    """정확 모드와 전수 비교 결과 일치"""
+
+    @pytest.mark.parametrize("top_k", [None, 1, 5, 1000])
+    @pytest.mark.parametrize("block_size", [7, 64, 1024])
+    def test_matches_brute_force(self, top_k, block_size):
+        matrix = clustered_matrix(n=203, seed=1)
+
+        result = as_dict(blockwise_similar_pairs(matrix, 0.5, top_k=top_k, block_size=block_size))
+        expected = brute_force_pairs(matrix, 0.5, top_k=top_k)
+
+        assert result.keys() == expected.keys()
+        for pair, similarity in expected.items():
+            assert result[pair] == pytest.approx(similarity, abs=1e-5)
+
+    def test_small_inputs(self):
+        assert blockwise_similar_pairs(np.zeros((1, 4), dtype=np.float32), 0.0)[0].size == 0
+        assert approximate_similar_pairs(np.zeros((0, 4), dtype=np.float32), 0.0)[0].size == 0
+
+        duplicate = normalized(np.ones((2, 4)))
+        assert as_dict(blockwise_similar_pairs(duplicate, 0.99)).keys() == {(0, 1)}
+
+
+class TestApproximateSimilarPairs:
+    """근사 모드의 정확도 (오탐 없음, 재현율)"""
+
+    @pytest.mark.parametrize("top_k", [None, 10])
+    def test_no_false_positives_and_high_recall(self, top_k):
+        matrix = clustered_matrix(n=600, seed=2)
+        sim = matrix @ matrix.T
+
+        result = as_dict(approximate_similar_pairs(matrix, 0.8, top_k=top_k, block_size=50, n_probe=2))
+        expected = brute_force_pairs(matrix, 0.8, top_k=top_k)
+
+        assert result
+        for (i, j), similarity in result.items():
+            assert similarity >= 0.8
+            assert similarity == pytest.approx(float(sim[i, j]), abs=1e-5)
+        if top_k is None:
+            assert result.keys() <= expected.keys()
+        recall = len(result.keys() & expected.keys()) / len(expected)
+        assert recall >= 0.9
+
+    def test_probing_all_clusters_is_exact(self):
+        matrix = clustered_matrix(n=150, seed=3)
+
+        result = approximate_similar_pairs(matrix, 0.6, top_k=None, n_clusters=4, n_probe=4)
+
+        assert as_dict(result).keys() == brute_force_pairs(matrix, 0.6).keys()
@@ -0,0 +1,102 @@
+"""
+TF-IDF 희소 색인 모듈 테스트
+"""
+
+import math
+import os
+import sys
+from collections import Counter
+
+# 상위 디렉토리의 모듈을 임포트하기 위한 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from retrieval.bm25_index import tokenize
+from retrieval.tfidf_index import TfidfIndex
+
+
+TEXTS = {
+    "a": "하루전발전계획은 전일에 수립한다",
+    "b": "실시간 급전 지시와 예비력 확보",
+    "c": "발전계획 변경 시 계통운영자에게 통보",
+    "d": "예비력 부족 시 급전 지시 변경"
+}
+
+
+def brute_force_cosine(texts, query):
+    """모든 용어를 사용하는 TF-IDF 코사인 유사도 (평활 IDF, L2 정규화)"""
+    counts = {doc_id: Counter(tokenize(text)) for doc_id, text in texts.items()}
+    df = Counter(term for counter in counts.values() for term in counter)
+    n = len(texts)
+
+    def vector(counter):
+        weights = {t: tf * (math.log((1 + n) / (1 + df[t])) + 1) for t, tf in counter.items() if t in df}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {t: w / norm for t, w in weights.items()}
+
+    query_vector = vector(Counter(tokenize(query)))
+    scores = {}
+    for doc_id, counter in counts.items():
+        doc_vector = vector(counter)
+        score = sum(w * doc_vector.get(t, 0.0) for t, w in query_vector.items())
+        if score > 0:
+            scores[doc_id] = score
+    return scores
+
+
+class TestTfidfIndex:
+    """TF-IDF 색인 테스트 클래스"""
+
+    def test_scores_match_brute_force_cosine(self):
+        """희소 행렬-벡터 곱 점수가 직접 계산한 코사인 유사도와 같음"""
+        index = TfidfIndex()
+        index.add(list(TEXTS), list(TEXTS.values()))
+
+        for query in ["발전계획 변경", "급전 지시", "예비력"]:
+            expected = brute_force_cosine(TEXTS, query)
+            results = dict(index.search(query, top_k=10))
+            assert set(results) == set(expected)
+            for doc_id, score in expected.items():
+                assert math.isclose(results[doc_id], score, rel_tol=1e-5)
+
+    def test_incremental_update_matches_rebuild_and_persistence(self, tmp_path):
+        """추가/교체/삭제 후 결과가 처음부터 구축한 색인과 같고, 메모리 매핑 로드 후에도 같음"""
+        index = TfidfIndex()
+        index.add(["a", "b"], [TEXTS["a"], "계통운영 기본 원칙"])
+        index.add(["c", "d"], [TEXTS["c"], TEXTS["d"]])
+        index.add(["b"], [TEXTS["b"]])
+        index.remove(["d"])
+
+        rebuilt = TfidfIndex()
+        rebuilt.add(["a", "c", "b"], [TEXTS["a"], TEXTS["c"], TEXTS["b"]])
+
+        assert len(index) == 3
+        assert index.search("기본 원칙", top_k=5) == rebuilt.search("기본 원칙", top_k=5) == []
+        for query in ["발전계획 변경", "급전 지시 예비력"]:
+            assert [doc_id for doc_id, _ in index.search(query)] == [doc_id for doc_id, _ in rebuilt.search(query)]
+
+        index.save(tmp_path)
+        loaded = TfidfIndex.load(tmp_path)
+        assert loaded.search("발전계획 변경", top_k=5) == index.search("발전계획 변경", top_k=5)
+
+        loaded.add(["e"], ["발전계획 변경 절차"])
+        loaded.save(tmp_path)
+        assert TfidfIndex.load(tmp_path).search("발전계획", top_k=1)[0][0] in {"a", "c", "e"}
+
+    def test_buffered_adds_and_duplicate_ids_in_one_batch(self, tmp_path):
+        """문서별로 나눠 추가해도 한 번에 추가한 색인과 같고, 배치 안의 중복 ID는 마지막 항목만 남음"""
+        index = TfidfIndex()
+        for doc_id, text in TEXTS.items():
+            index.add([doc_id], [text])
+        index.remove(["b"])
+        index.add(["b", "e", "b"], ["계통운영 기본 원칙", "송전제약 조정", TEXTS["b"]])
+
+        rebuilt = TfidfIndex()
+        rebuilt.add(["a", "c", "d", "e", "b"], [TEXTS["a"], TEXTS["c"], TEXTS["d"], "송전제약 조정", TEXTS["b"]])
+
+        assert len(index) == 5
+        assert index.search("기본 원칙", top_k=5) == []
+        for query in ["발전계획 변경", "급전 지시 예비력"]:
+            assert index.search(query, top_k=5) == rebuilt.search(query, top_k=5)
+
+        index.save(tmp_path)
+        assert TfidfIndex.load(tmp_path).get_stats() == {**rebuilt.get_stats(), "deleted": 0}
@@ -0,0 +1,329 @@
+"""
+계층 벡터 엔진 테스트
+- ChromaDB 없이 메모리 컬렉션으로 색인/검색 흐름 확인
+- 문단/문장 메타데이터의 부모 ID가 실제 저장 ID와 일치하는지
+- cascade 검색 결과가 이전 단계에서 남은 부모 범위 안에 있는지
+- 증분 재색인이 사라진 청크만 삭제하고 해시가 바뀐 청크만 upsert하는지
+- 전 레벨을 한 번에 인코딩한 행렬에서 레벨별로 자기 행을 받아 저장하는지
+"""
+
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.vector_engine import VectorEngine
+
+DIMENSION = 16
+
+
+class StubModel:
+    """SentenceTransformer 대역 (텍스트별로 고정된 단위 벡터, 호출 기록)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return DIMENSION
+
+    def encode(self, texts, batch_size=None):
+        self.calls.append(texts)
+        if isinstance(texts, str):
+            return self._vector(texts)
+        return np.stack([self._vector(text) for text in texts])
+
+    @staticmethod
+    def _vector(text):
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        vector = rng.random(DIMENSION).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+
+class FakeCollection:
+    """ChromaDB 컬렉션 대역 (where는 {키: 값} / {키: {"$in": [...]}}만 지원)"""
+
+    def __init__(self):
+        self.rows = {}  # id -> (본문, 임베딩, 메타데이터)
+
+    @staticmethod
+    def _matches(metadata, where):
+        for key, condition in (where or {}).items():
+            if isinstance(condition, dict):
+                if metadata.get(key) not in condition["$in"]:
+                    return False
+            elif metadata.get(key) != condition:
+                return False
+        return True
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        for item_id, text, embedding, metadata in zip(ids, documents, embeddings, metadatas):
+            self.rows[item_id] = (text, np.asarray(embedding, dtype=np.float32), metadata)
+
+    add = upsert
+
+    def delete(self, ids):
+        for item_id in ids:
+            self.rows.pop(item_id, None)
+
+    def count(self):
+        return len(self.rows)
+
+    def get(self, ids=None, where=None, include=None):
+        selected = [
+            item_id for item_id in (ids if ids is not None else self.rows)
+            if item_id in self.rows and self._matches(self.rows[item_id][2], where)
+        ]
+        return {
+            "ids": selected,
+            "documents": [self.rows[item_id][0] for item_id in selected],
+            "metadatas": [self.rows[item_id][2] for item_id in selected],
+        }
+
+    def query(self, query_embeddings, n_results, include=None, where=None):
+        query = np.asarray(query_embeddings[0], dtype=np.float32)
+        candidates = [
+            (1 - float(row[1] @ query), item_id)
+            for item_id, row in self.rows.items() if self._matches(row[2], where)
+        ]
+        candidates.sort()
+        top = [item_id for _, item_id in candidates[:n_results]]
+        return {
+            "ids": [top],
+            "documents": [[self.rows[item_id][0] for item_id in top]],
+            "metadatas": [[self.rows[item_id][2] for item_id in top]],
+            "distances": [[distance for distance, _ in candidates[:n_results]]],
+        }
+
+
+class FakeClient:
+    """ChromaDB 클라이언트 대역"""
+
+    def __init__(self):
+        self.collections = {}
+
+    def get_collection(self, name):
+        return self.collections[name]
+
+    def create_collection(self, name, metadata=None):
+        return self.collections.setdefault(name, FakeCollection())
+
+
+def make_document(doc_id, num_sections=3, paragraphs_per_section=2):
+    """섹션 제목 -> 문단 순서의 본문과 추출기 형식의 섹션/문단/문장 목록"""
+    lines, sections, paragraphs, sentences = [], [], [], []
+    for s in range(num_sections):
+        title = f"제{s + 1}조 {doc_id} 조항 {s}"
+        section_paragraphs = []
+        for p in range(paragraphs_per_section):
+            paragraph = f"{doc_id} 섹션 {s} 문단 {p} 첫 문장입니다. {doc_id} 섹션 {s} 문단 {p} 둘째 문장입니다."
+            section_paragraphs.append(paragraph)
+            paragraphs.append({"content": paragraph, "paragraph_index": p, "page_number": s})
+            for sentence in paragraph.split(". "):
+                # 추출기가 넘기는 paragraph_id는 페이지 단위 번호 (저장 ID와 다름)
+                sentences.append({"content": sentence.rstrip("."), "paragraph_id": f"para_{p}"})
+        sections.append({"title": title, "content": "\n".join(section_paragraphs)})
+        lines.append(title)
+        lines.append("\n\n".join(section_paragraphs))
+    return {
+        "document_id": doc_id,
+        "content": {
+            "document": "\n".join(lines),
+            "sections": sections,
+            "paragraphs": paragraphs,
+            "sentences": sentences,
+        },
+        "metadata": {"file_name": f"{doc_id}.pdf"},
+    }
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = VectorEngine(data_dir=str(tmp_path / "data"), enable_multimodal=False,
+                          enable_sparse=False, enable_chunk_store=False,
+                          cascade_documents=2, cascade_sections=3, cascade_paragraphs=3)
+    engine.dense_model = StubModel()
+    engine.chroma_client = FakeClient()
+    return engine
+
+
+class TestParentIds:
+    """문단/문장 메타데이터의 부모 ID"""
+
+    def test_parent_ids_match_stored_ids(self, engine):
+        document = make_document("doc_a")
+
+        items = engine._collect_level_items("doc_a", document["content"], document["metadata"])
+
+        assert [metadata["section_id"] for metadata in items["paragraph"]["metadatas"]] == [
+            f"doc_a_section_{i // 2}" for i in range(6)
+        ]
+        assert [metadata["paragraph_id"] for metadata in items["sentence"]["metadatas"]] == [
+            f"doc_a_para_{i // 2}" for i in range(12)
+        ]
+        stored_ids = set(items["section"]["ids"]) | set(items["paragraph"]["ids"])
+        for metadata in items["paragraph"]["metadatas"] + items["sentence"]["metadatas"]:
+            assert metadata.get("section_id", metadata.get("paragraph_id")) in stored_ids
+
+    def test_paragraph_before_first_section_has_no_parent(self, engine):
+        content = {
+            "document": "머리말 문단입니다\n제1조 목적\n본문 문단입니다",
+            "sections": [{"title": "제1조 목적", "content": "본문 문단입니다"}],
+            "paragraphs": [{"content": "머리말 문단입니다"}, {"content": "본문 문단입니다"}],
+            "sentences": [{"content": "본문 문단"}, {"content": "찾을 수 없는 문장"}],
+        }
+
+        section_ids, paragraph_ids = engine._parent_ids("doc_b", content)
+
+        assert section_ids == ["", "doc_b_section_0"]
+        assert paragraph_ids == ["doc_b_para_1", ""]
+
+
+class TestCascadeSearch:
+    """cascade 검색의 단계별 부모 범위"""
+
+    def test_results_stay_within_surviving_parents(self, engine):
+        engine.add_documents([make_document(f"doc_{i}") for i in range(6)])
+        query_vector = StubModel._vector("doc_3 섹션 1 문단 0 첫 문장입니다")
+
+        results, details = engine._cascade_search(
+            "질의", list(VectorEngine.LEVELS), "dense", 5, query_vector
+        )
+
+        documents = {result["id"] for result in results["document"]}
+        sections = {result["id"] for result in results["section"]}
+        paragraphs = {result["id"] for result in results["paragraph"]}
+        assert len(documents) == 2 and len(sections) == 3 and len(paragraphs) == 3
+        assert {result["metadata"]["document_id"] for result in results["section"]} <= documents
+        assert {result["metadata"]["section_id"] for result in results["paragraph"]} <= sections
+        assert results["sentence"]
+        assert {result["metadata"]["paragraph_id"] for result in results["sentence"]} <= paragraphs
+        assert details["cascade"]["parent_counts"] == {
+            "document": None, "section": 2, "paragraph": 3, "sentence": 3
+        }
+
+    def test_empty_parent_scope_falls_back_to_documents(self, engine):
+        engine.add_documents([make_document(f"doc_{i}") for i in range(3)])
+        # 부모 ID 없이 색인된 문단 (이전 형식의 색인)
+        paragraphs = engine.chroma_client.collections["paragraphs"]
+        for item_id, (text, embedding, metadata) in list(paragraphs.rows.items()):
+            paragraphs.rows[item_id] = (text, embedding, {**metadata, "section_id": ""})
+
+        results, _ = engine._cascade_search(
+            "질의", ["paragraph"], "dense", 4, StubModel._vector("doc_1")
+        )
+
+        documents = {f"doc_{i}" for i in range(3)}
+        assert len(results["paragraph"]) == 4
+        assert {result["metadata"]["document_id"] for result in results["paragraph"]} <= documents
+
+
+class TestSyncDocuments:
+    """증분 재색인: 바뀐 청크만 upsert, 사라진 청크만 삭제"""
+
+    @staticmethod
+    def _record_writes(engine, monkeypatch):
+        writes = {"upserted": [], "deleted": []}
+        original_upsert = engine._upsert_level_items
+        original_delete = engine.delete_chunks
+
+        def upsert(merged):
+            for level in VectorEngine.LEVELS:
+                writes["upserted"].extend(merged[level]["ids"])
+            return original_upsert(merged)
+
+        def delete(chunk_ids, persist=True):
+            for ids in chunk_ids.values():
+                writes["deleted"].extend(ids)
+            return original_delete(chunk_ids, persist=persist)
+
+        monkeypatch.setattr(engine, "_upsert_level_items", upsert)
+        monkeypatch.setattr(engine, "delete_chunks", delete)
+        return writes
+
+    def test_only_changed_chunks_are_written(self, engine, monkeypatch):
+        first = engine.sync_documents([make_document("doc_0"), make_document("doc_1")], {})
+        rows_before = {
+            name: dict(collection.rows) for name, collection in engine.chroma_client.collections.items()
+        }
+        writes = self._record_writes(engine, monkeypatch)
+
+        # doc_0: 섹션 1 제목 변경 (문서 본문도 바뀜) + 마지막 문장 삭제, doc_1: 변경 없음
+        revised = make_document("doc_0")
+        content = revised["content"]
+        old_title = content["sections"][1]["title"]
+        content["sections"][1]["title"] = f"{old_title} 개정"
+        content["document"] = content["document"].replace(old_title, f"{old_title} 개정")
+        content["sentences"].pop()
+
+        second = engine.sync_documents([revised, make_document("doc_1")], first)
+
+        assert sorted(writes["upserted"]) == ["doc_0", "doc_0_section_1"]
+        assert writes["deleted"] == ["doc_0_sent_11"]
+        assert "doc_0_sent_11" not in second["doc_0"]["sentence"]
+        assert second["doc_1"] == first["doc_1"]
+        collections = engine.chroma_client.collections
+        assert "doc_0_sent_11" not in collections["sentences"].rows
+        assert collections["sections"].rows["doc_0_section_1"][2]["title"].endswith("개정")
+        for name, rows in rows_before.items():
+            for item_id, row in rows.items():
+                if item_id not in ("doc_0", "doc_0_section_1", "doc_0_sent_11"):
+                    assert collections[name].rows[item_id] is row
+
+    def test_resync_without_changes_writes_nothing(self, engine, monkeypatch):
+        documents = [make_document("doc_0")]
+        first = engine.sync_documents(documents, {})
+        writes = self._record_writes(engine, monkeypatch)
+
+        assert engine.sync_documents(documents, first) == first
+        assert writes["upserted"] == []
+        assert writes["deleted"] == []
+
+
+class TestUpsertLevelItems:
+    """전 레벨 일괄 인코딩 후 레벨별 upsert"""
+
+    @pytest.mark.parametrize("drop_sections", [False, True])
+    def test_each_level_gets_its_own_rows(self, engine, drop_sections):
+        documents = [make_document("doc_0"), make_document("doc_1", num_sections=2)]
+        if drop_sections:
+            for document in documents:
+                document["content"]["sections"] = []
+        merged = engine._merge_level_items(documents)
+        engine.encode_batch_size = 1000
+        engine.max_batch_chars = 10 ** 6
+        engine.upsert_batch_size = 4  # 레벨 안에서도 여러 번 나눠 upsert
+
+        embeddings = engine._upsert_level_items(merged)
+
+        # 모든 레벨 텍스트를 한 번에 인코딩
+        assert len(engine.dense_model.calls) == 1
+        all_texts = [text for level in VectorEngine.LEVELS for text in merged[level]["documents"]]
+        assert embeddings.shape == (len(all_texts), DIMENSION)
+
+        offset = 0
+        for level in VectorEngine.LEVELS:
+            level_items = merged[level]
+            count = len(level_items["ids"])
+            if drop_sections and level == "section":
+                assert count == 0
+                assert "sections" not in engine.chroma_client.collections
+                continue
+            rows = engine.chroma_client.collections[f"{level}s"].rows
+            assert list(rows) == level_items["ids"]
+            for row, (item_id, text) in enumerate(zip(level_items["ids"], level_items["documents"])):
+                stored_text, stored_embedding, _ = rows[item_id]
+                assert stored_text == text
+                np.testing.assert_allclose(stored_embedding, embeddings[offset + row])
+                np.testing.assert_allclose(stored_embedding, StubModel._vector(text), rtol=1e-6)
+            offset += count
+        assert offset == len(all_texts)
+
+    def test_empty_input_encodes_nothing(self, engine):
+        merged = engine._merge_level_items([])
+
+        assert engine._upsert_level_items(merged) is None
+        assert engine.dense_model.calls == []